@@ -0,0 +1,35 @@
+"""
+PEP 562 lazy re-exports for the package ``__init__`` modules.
+
+``from japan_stock_youtube_shorts.market import HistoryProvider`` keeps working,
+but the submodule that defines a name (and the pandas/matplotlib/SDK imports it
+carries) is only loaded the first time that name is accessed.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Return ``(__getattr__, __dir__)`` for ``package``.
+
+    ``exports`` maps each public name to the relative submodule defining it; a name
+    mapped to its own submodule (``{"updater": ".updater"}``) exports the module.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        target = importlib.import_module(module, package)
+        value = target if module == f".{name}" else getattr(target, name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted({*vars(sys.modules[package]), *exports})
+
+    return __getattr__, __dir__
@@ -0,0 +1,88 @@
+"""
+Run the offline benchmark suite and compare it with a saved baseline.
+
+    python -m japan_stock_youtube_shorts.bench --save-baseline
+    python -m japan_stock_youtube_shorts.bench --threshold 0.15
+    python -m japan_stock_youtube_shorts.bench --quick --require-baseline
+
+Exits with status 1 when any metric is worse than the baseline by more than the
+threshold (a fraction, default 0.2 or ``BENCH_THRESHOLD``). Full and ``--quick``
+runs keep separate baselines, since their inputs differ. With ``--require-baseline``
+a missing baseline, or one recorded at another scale, exits with status 2 instead
+of skipping the comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+from pathlib import Path
+
+from ..config import ASSETS_DIR
+from .suite import CASES, DEFAULT_THRESHOLD, METRICS, QUICK, Scale, compare, run_suite
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma-separated cases ({', '.join(CASES)}).")
+    parser.add_argument("--quick", action="store_true", help="Smaller inputs, for CI smoke runs.")
+    parser.add_argument("--output", type=Path, help="Write this run's results here as JSON.")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="Baseline JSON to compare against (default: BENCH_BASELINE, else assets/bench/baseline.json, "
+        "or baseline-quick.json with --quick).",
+    )
+    parser.add_argument("--require-baseline", action="store_true", help="Fail instead of skipping when there is no usable baseline.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("BENCH_THRESHOLD", str(DEFAULT_THRESHOLD))))
+    args = parser.parse_args()
+    if args.baseline is None:
+        args.baseline = Path(os.getenv("BENCH_BASELINE") or ASSETS_DIR / "bench" / ("baseline-quick.json" if args.quick else "baseline.json"))
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else None
+    if baseline is None and args.require_baseline and not args.save_baseline:
+        print(f"error: no baseline at {args.baseline}; record one with --save-baseline")
+        return 2
+
+    results = run_suite(cases, scale=QUICK if args.quick else Scale())
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+
+    comparisons = {item.name: item for item in compare(results["metrics"], baseline["metrics"])} if baseline else {}
+    if baseline and baseline.get("scale") != results["scale"]:
+        print(f"warning: baseline {args.baseline} was recorded at a different scale; comparisons are not meaningful")
+        if args.require_baseline and not args.save_baseline:
+            return 2
+
+    regressions = []
+    print(f"{'metric':<26}{'value':>12}  {'unit':<18}{'vs baseline':>12}")
+    for name, value in results["metrics"].items():
+        item = comparisons.get(name)
+        delta = f"{item.change:+.1%}" if item else "-"
+        if item and item.regressed(args.threshold):
+            regressions.append(item)
+            delta += " !"
+        print(f"{name:<26}{value:>12.3f}  {METRICS[name].unit:<18}{delta:>12}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(text + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}: {', '.join(r.name for r in regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
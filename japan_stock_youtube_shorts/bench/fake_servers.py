@@ -0,0 +1,216 @@
+"""
+Minimal local stand-ins for the OpenAI and Notion HTTP APIs.
+
+Only the endpoints the pipelines call are implemented, with canned responses, an
+optional fixed latency and an optional per-completion-token latency, so client-side
+overhead can be measured offline.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Type
+
+CANNED_SCRIPT = "【ベンチマーク】本日の値動きを事実と解釈に分けて整理します。" * 4
+# Ticker headings of a packed script prompt (see openai.packed_generator).
+_PACKED_TICKER = re.compile(r"^### (\S+)$", re.MULTILINE)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler: Type[BaseHTTPRequestHandler], *, latency: float, token_latency: float, rows: int) -> None:
+        super().__init__(("127.0.0.1", 0), handler)
+        self.latency = latency
+        self.token_latency = token_latency
+        self.rows = rows
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.lock = threading.Lock()
+
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    server: _Server
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _reply(self, payload: Dict[str, Any], status: int = 200, *, generation: float = 0.0) -> None:
+        with self.server.lock:
+            self.server.requests += 1
+        if self.server.latency or generation:
+            time.sleep(self.server.latency + generation)
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeOpenAIHandler(_JSONHandler):
+    """
+    ``POST /v1/chat/completions`` returning ``CANNED_SCRIPT``, optionally as server-sent events.
+
+    A ``json_schema`` request gets ``{"scripts": [...]}`` with the canned script for
+    every ``### <ticker>`` heading in its prompt. ``POST /v1/audio/speech`` returns
+    silent 24 kHz PCM, 0.1 s per input character.
+    """
+
+    def _speech(self, body: Dict[str, Any]) -> None:
+        with self.server.lock:
+            self.server.requests += 1
+        text = body.get("input") or ""
+        if self.server.latency or self.server.token_latency:
+            time.sleep(self.server.latency + len(text) * self.server.token_latency)
+        data = bytes(2 * 2_400 * len(text))
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/pcm")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, model: str, usage: Dict[str, int]) -> None:
+        with self.server.lock:
+            self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        base = {"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+        events = [
+            {**base, "choices": [{"index": 0, "delta": {"content": f"{sentence}。"}, "finish_reason": None}]}
+            for sentence in CANNED_SCRIPT.split("。")
+            if sentence
+        ]
+        events.append({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        events.append({**base, "choices": [], "usage": usage})
+        for event in [*(json.dumps(event, ensure_ascii=False) for event in events), "[DONE]"]:
+            data = f"data: {event}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def do_POST(self) -> None:
+        body = self._body()
+        if self.path.endswith("/audio/speech"):
+            self._speech(body)
+            return
+        if not self.path.endswith("/chat/completions"):
+            self._reply({"error": {"message": f"unsupported path {self.path}"}}, status=404)
+            return
+        prompt_tokens = sum(len(message.get("content") or "") for message in body.get("messages", []))
+        with self.server.lock:
+            self.server.prompt_tokens += prompt_tokens
+        if body.get("stream"):
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(CANNED_SCRIPT), "total_tokens": prompt_tokens + len(CANNED_SCRIPT)}
+            self._stream(body.get("model", "bench"), usage)
+            return
+        content = CANNED_SCRIPT
+        if (body.get("response_format") or {}).get("type") == "json_schema":
+            prompt = "".join(message.get("content") or "" for message in body.get("messages", []))
+            scripts = [{"ticker": ticker, "script": CANNED_SCRIPT} for ticker in _PACKED_TICKER.findall(prompt)]
+            content = json.dumps({"scripts": scripts}, ensure_ascii=False)
+        self._reply(
+            {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "bench"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(content),
+                    "total_tokens": prompt_tokens + len(content),
+                },
+            },
+            generation=len(content) * self.server.token_latency,
+        )
+
+
+def _page(index: int) -> Dict[str, Any]:
+    return {
+        "object": "page",
+        "id": f"bench-page-{index}",
+        "last_edited_time": "2026-01-01T00:00:00.000Z",
+        "properties": {
+            "Ticker": {"type": "title", "title": [{"plain_text": f"{1301 + index}.T"}]},
+            "Company": {"type": "rich_text", "rich_text": [{"plain_text": f"Company {index}"}]},
+            "Period": {"type": "select", "select": {"name": "1mo"}},
+        },
+    }
+
+
+def data_source_for(database_id: str) -> str:
+    """The id the fake server lists as ``database_id``'s only data source."""
+    return f"{database_id}-source"
+
+
+class FakeNotionHandler(_JSONHandler):
+    """
+    Page updates plus paginated queries over ``rows`` pages.
+
+    Both API versions are served: ``databases/<id>/query`` (notion-client 2.x) and,
+    as in Notion-Version 2025-09-03, ``databases/<id>`` listing one data source
+    that ``data_sources/<source id>/query`` reads. Querying a data source by the
+    database id is a 404, like on a real workspace.
+    """
+
+    def do_GET(self) -> None:
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        if len(parts) == 3 and parts[1] == "databases":
+            self._reply({"object": "database", "id": parts[2], "data_sources": [{"id": data_source_for(parts[2]), "name": parts[2]}]})
+            return
+        self._reply({"object": "error", "status": 404, "code": "object_not_found", "message": f"unsupported path {self.path}"}, status=404)
+
+    def do_PATCH(self) -> None:
+        body = self._body()
+        page_id = self.path.rstrip("/").rsplit("/", 1)[-1]
+        self._reply({"object": "page", "id": page_id, "properties": body.get("properties", {})})
+
+    def do_POST(self) -> None:
+        body = self._body()
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        if parts[-1] != "query" or (parts[1] == "data_sources" and not parts[2].endswith("-source")):
+            self._reply({"object": "error", "status": 404, "code": "object_not_found", "message": f"unsupported path {self.path}"}, status=404)
+            return
+        start = int(body.get("start_cursor") or 0)
+        end = min(self.server.rows, start + int(body.get("page_size") or 100))
+        more = end < self.server.rows
+        self._reply(
+            {
+                "object": "list",
+                "results": [_page(index) for index in range(start, end)],
+                "has_more": more,
+                "next_cursor": str(end) if more else None,
+            }
+        )
+
+
+@contextmanager
+def serve(
+    handler: Type[BaseHTTPRequestHandler], *, latency: float = 0.0, token_latency: float = 0.0, rows: int = 0
+) -> Iterator[_Server]:
+    """Run ``handler`` on an ephemeral localhost port; ``server.url`` is its base URL."""
+    server = _Server(handler, latency=latency, token_latency=token_latency, rows=rows)
+    thread = threading.Thread(target=server.serve_forever, name="bench-fake-server", daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,60 @@
+"""
+Synthetic, deterministic inputs for the benchmarks (no network access needed).
+"""
+
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ..market.history import FixtureBackend, HistoryProvider
+from ..market.summary import DEFAULT_BENCHMARK
+
+
+def universe(count: int) -> List[str]:
+    """``count`` TSE-style ticker codes."""
+    return [f"{1301 + i}.T" for i in range(count)]
+
+
+def synthetic_history(sessions: int = 250, *, seed: int = 0, start_price: float = 2_000.0) -> pd.DataFrame:
+    """A geometric random walk of daily OHLCV bars ending today."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=sessions)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0003, 0.015, sessions)))
+    open_ = close * np.exp(rng.normal(0.0, 0.004, sessions))
+    spread = np.abs(rng.normal(0.0, 0.006, sessions))
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) * (1 + spread),
+            "Low": np.minimum(open_, close) * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(10_000, 5_000_000, sessions).astype(float),
+        },
+        index=dates,
+    )
+
+
+def synthetic_frames(tickers: List[str], *, sessions: int = 250) -> Dict[str, pd.DataFrame]:
+    """One history per ticker plus the summary benchmark, seeded by position."""
+    names = [*tickers, DEFAULT_BENCHMARK]
+    return {ticker: synthetic_history(sessions, seed=i) for i, ticker in enumerate(names)}
+
+
+def fixture_provider(frames: Dict[str, pd.DataFrame]) -> HistoryProvider:
+    return HistoryProvider(FixtureBackend(frames))
+
+
+def write_tone(path: Path, seconds: float, *, rate: int = 44_100) -> Path:
+    """Write a mono 440 Hz WAV file to stand in for narration."""
+    samples = (np.sin(2 * np.pi * 440 * np.arange(int(seconds * rate)) / rate) * 0.2 * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(rate)
+        handle.writeframes(samples.tobytes())
+    return path
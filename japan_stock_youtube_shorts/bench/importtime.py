@@ -0,0 +1,161 @@
+"""
+Startup budget check for the CLI, based on ``python -X importtime``.
+
+    python -m japan_stock_youtube_shorts.bench.importtime
+    python -m japan_stock_youtube_shorts.bench.importtime --budget-ms 300 -- main.py --help
+
+Each check runs a command in a fresh interpreter, sums the per-module import times
+and fails when the total is over budget or when a module the command should not
+need (pandas for ``--help``, say) was imported. Budgets are scaled by
+``--budget-scale`` (or ``IMPORT_BUDGET_SCALE``) for slower machines.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)$")
+
+# Imports that cost a few hundred milliseconds to seconds each.
+HEAVY = ("pandas", "numpy", "matplotlib", "yfinance", "moviepy", "openai", "notion_client")
+
+
+@dataclass(frozen=True)
+class StartupCheck:
+    name: str
+    # Interpreter arguments; ``{tmp}`` is replaced by a scratch directory.
+    argv: Tuple[str, ...]
+    budget_ms: float
+    forbidden: Tuple[str, ...] = ()
+
+
+CHECKS: Dict[str, StartupCheck] = {
+    check.name: check
+    for check in (
+        StartupCheck("help", ("main.py", "--help"), 250, HEAVY),
+        StartupCheck(
+            "script-dry-run",
+            ("main.py", "--dry-run", "--log-level", "WARN", "script", "--ticker", "7203.T", "--company", "Toyota", "--output", "{tmp}/script.txt"),
+            400,
+            ("pandas", "numpy", "matplotlib", "yfinance", "moviepy", "openai"),
+        ),
+        StartupCheck("submit", ("main.py", "--dry-run", "--log-level", "WARN", "submit", "chart", "--ticker", "7203.T"), 250, HEAVY),
+        # healthcheck talks to both APIs, so only its imports are measured.
+        StartupCheck(
+            "healthcheck",
+            ("-c", "import main, japan_stock_youtube_shorts.notion.health, japan_stock_youtube_shorts.openai.health"),
+            1_500,
+            ("pandas", "numpy", "matplotlib", "yfinance", "moviepy"),
+        ),
+    )
+}
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse ``-X importtime`` lines, ignoring any other stderr output."""
+    records = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us)))
+    return records
+
+
+def total_ms(records: Sequence[ImportRecord]) -> float:
+    return sum(record.self_us for record in records) / 1000
+
+
+def by_package(records: Sequence[ImportRecord]) -> List[Tuple[str, float]]:
+    """Self time summed per top-level package, heaviest first, in milliseconds."""
+    totals: Dict[str, int] = {}
+    for record in records:
+        root = record.module.split(".", 1)[0]
+        totals[root] = totals.get(root, 0) + record.self_us
+    return sorted(((name, us / 1000) for name, us in totals.items()), key=lambda item: -item[1])
+
+
+def imported(records: Sequence[ImportRecord], names: Sequence[str]) -> List[str]:
+    """Which of ``names`` (packages or modules) were imported."""
+    seen = {record.module for record in records}
+    return [name for name in names if any(module == name or module.startswith(f"{name}.") for module in seen)]
+
+
+def profile(argv: Sequence[str], *, tmp: str) -> List[ImportRecord]:
+    command = [sys.executable, "-X", "importtime", *(arg.format(tmp=tmp) for arg in argv)]
+    env = {**os.environ, "METRICS_DIR": tmp, "JOB_QUEUE_PATH": os.path.join(tmp, "jobs.sqlite3")}
+    result = subprocess.run(command, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    records = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"{' '.join(argv)} exited with {result.returncode}:\n" + "\n".join(errors[-20:]))
+    return records
+
+
+def run_check(check: StartupCheck, *, repeat: int = 3, scale: float = 1.0) -> Tuple[bool, str]:
+    """Run ``check`` ``repeat`` times; returns (passed, one-line report)."""
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeat):
+            runs.append(profile(check.argv, tmp=tmp))
+    median = statistics.median(total_ms(records) for records in runs)
+    budget = check.budget_ms * scale
+    unwanted = imported(runs[0], check.forbidden)
+    heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in by_package(runs[0])[:4])
+    passed = median <= budget and not unwanted
+    report = f"{check.name:<16}{median:>8.0f} ms  budget {budget:>6.0f} ms  {'ok' if passed else 'FAIL'}  [{heaviest}]"
+    if unwanted:
+        report += f"\n{'':<16}imports {', '.join(unwanted)}"
+    return passed, report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", default=",".join(CHECKS), help=f"Comma-separated checks ({', '.join(CHECKS)}).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per check; the median total is compared.")
+    parser.add_argument("--budget-scale", type=float, default=float(os.getenv("IMPORT_BUDGET_SCALE", "1.0")))
+    parser.add_argument("--budget-ms", type=float, help="Budget for a custom command given after --.")
+    parser.add_argument("command", nargs="*", help="Custom interpreter arguments to check instead (after --).")
+    args = parser.parse_args(argv)
+
+    if args.command:
+        if args.budget_ms is None:
+            parser.error("--budget-ms is required with a custom command")
+        checks = [StartupCheck("custom", tuple(args.command), args.budget_ms)]
+    else:
+        names = [name.strip() for name in args.checks.split(",") if name.strip()]
+        unknown = set(names) - set(CHECKS)
+        if unknown:
+            parser.error(f"unknown check(s): {', '.join(sorted(unknown))}")
+        checks = [CHECKS[name] for name in names]
+
+    failed = 0
+    for check in checks:
+        passed, report = run_check(check, repeat=max(1, args.repeat), scale=args.budget_scale)
+        failed += not passed
+        print(report)
+    if failed:
+        print(f"{failed} startup check(s) failed; see `python -X importtime` for the full tree")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
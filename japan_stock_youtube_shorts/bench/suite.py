@@ -0,0 +1,345 @@
+"""
+Hot-path benchmarks and baseline comparison.
+
+Every case runs offline: price data is synthetic, and OpenAI/Notion requests go to
+the local fakes in ``fake_servers``. Client-side rate limits are disabled so the
+numbers reflect our own overhead rather than API quotas.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from ..config import RuntimeConfig
+from ..market.history import FixtureBackend
+from ..market.intraday import IntradayMonitor, ReplaySource, synthetic_session
+from ..market.master import TickerInfo
+from ..market.screener import compute_signals, rank_candidates, store_panel
+from ..market.store import OHLCVStore
+from ..market.summary import DEFAULT_BENCHMARK, summarize_universe
+from ..notion.async_client import AsyncNotionClient, AsyncRateLimiter
+from ..notion.notion_client import NotionClient, RateLimiter
+from ..notion.write_queue import NotionWriteQueue
+from ..openai.packed_generator import PackedScriptGenerator
+from ..openai.prompt_generator import PromptContext, PromptGenerator
+from ..pipelines.chart_renderer import LANDSCAPE_STYLE
+from ..pipelines.ffmpeg_video import EncoderOptions, ffmpeg_exe
+from ..pipelines.generate_chart import create_price_chart
+from ..pipelines.generate_script import fetch_stock_summary
+from ..pipelines.generate_video import assemble_reveal_video, assemble_short, assemble_video
+from ..pipelines.narration import Narrator, SentenceAudioCache
+from .fake_servers import FakeNotionHandler, FakeOpenAIHandler, serve
+from .fixtures import fixture_provider, synthetic_frames, universe, write_tone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.2
+
+
+@dataclass(frozen=True)
+class Metric:
+    unit: str
+    higher_is_better: bool
+
+
+METRICS: Dict[str, Metric] = {
+    "summary_tickers_per_sec": Metric("tickers/s", True),
+    "fetch_summary_per_sec": Metric("tickers/s", True),
+    "intraday_bars_per_sec": Metric("bars/s", True),
+    "screen_tickers_per_sec": Metric("tickers/s", True),
+    "charts_per_sec": Metric("charts/s", True),
+    "still_encode_ratio": Metric("s per s of audio", False),
+    "reveal_encode_ratio": Metric("s per s of audio", False),
+    "short_encode_ratio": Metric("s per s of audio", False),
+    "openai_requests_per_sec": Metric("req/s", True),
+    "openai_stream_ttft_ms": Metric("ms", False),
+    "packed_prompt_token_ratio": Metric("packed/single", False),
+    "packed_speedup": Metric("single/packed", True),
+    "narration_sentences_per_sec": Metric("sentences/s", True),
+    "notion_updates_per_sec": Metric("updates/s", True),
+    "notion_rows_per_sec": Metric("rows/s", True),
+    "peak_rss_mb": Metric("MiB", False),
+}
+
+
+@dataclass(frozen=True)
+class Scale:
+    tickers: int = 4_000
+    per_ticker: int = 200
+    charts: int = 50
+    audio_seconds: float = 10.0
+    requests: int = 50
+    notion_updates: int = 200
+    notion_rows: int = 2_000
+
+
+QUICK = Scale(tickers=500, per_ticker=50, charts=10, audio_seconds=3.0, requests=20, notion_updates=50, notion_rows=500)
+
+
+def _runtime() -> RuntimeConfig:
+    return RuntimeConfig(dry_run=False, run_id="bench", log_level="WARN", llm_cache="bypass", artifact_cache="bypass")
+
+
+def _elapsed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+@contextmanager
+def _env(**values: str) -> Iterator[None]:
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def bench_summary(scale: Scale) -> Dict[str, float]:
+    tickers = universe(scale.tickers)
+    provider = fixture_provider(synthetic_frames(tickers))
+    provider.prefetch([*tickers, DEFAULT_BENCHMARK], period="1y")
+    universe_seconds = _elapsed(lambda: summarize_universe(tickers, period="1y", provider=provider))
+    sample = tickers[: scale.per_ticker]
+    per_ticker_seconds = _elapsed(lambda: [fetch_stock_summary(ticker, "1y", provider=provider) for ticker in sample])
+    return {
+        "summary_tickers_per_sec": len(tickers) / universe_seconds,
+        "fetch_summary_per_sec": len(sample) / per_ticker_seconds,
+    }
+
+
+def bench_intraday(scale: Scale) -> Dict[str, float]:
+    """Replay one session of 1-minute bars for the whole universe through the trigger monitor."""
+    tickers = universe(scale.tickers)
+    monitor = IntradayMonitor(tickers, ReplaySource(synthetic_session(tickers)))
+    seconds = _elapsed(lambda: monitor.run(lambda event: None))
+    return {"intraday_bars_per_sec": monitor.bars / seconds}
+
+
+def bench_screen(scale: Scale) -> Dict[str, float]:
+    """Rank the whole universe from an OHLCV store, as the nightly ``main.py screen`` does."""
+    tickers = universe(scale.tickers)
+    master = {ticker: TickerInfo(ticker, ticker, sector=f"S{i % 33}") for i, ticker in enumerate(tickers)}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OHLCVStore(Path(tmp))
+        store.sync(tickers, period="1y", backend=FixtureBackend(synthetic_frames(tickers)))
+
+        def screen() -> None:
+            rank_candidates(compute_signals(store_panel(store, tickers, period="1y"), master), master, min_turnover=0)
+
+        seconds = _elapsed(screen)
+    return {"screen_tickers_per_sec": len(tickers) / seconds}
+
+
+def bench_chart(scale: Scale) -> Dict[str, float]:
+    tickers = universe(scale.charts)
+    frames = synthetic_frames(tickers, sessions=60)
+    runtime = _runtime()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        def render(ticker: str) -> Path:
+            return create_price_chart(
+                ticker, output_path=root / f"{ticker}.png", runtime_config=runtime, history=frames[ticker], style=LANDSCAPE_STYLE
+            )
+
+        render(tickers[0])  # builds the figure template
+        seconds = _elapsed(lambda: [render(ticker) for ticker in tickers])
+    return {"charts_per_sec": len(tickers) / seconds}
+
+
+def bench_video(scale: Scale) -> Dict[str, float]:
+    try:
+        ffmpeg_exe()
+    except RuntimeError as exc:
+        logger.warning("Skipping video benchmark: %s", exc)
+        return {}
+    runtime = _runtime()
+    options = EncoderOptions()
+    frames = synthetic_frames(["BENCH"], sessions=60)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        audio = write_tone(root / "narration.wav", scale.audio_seconds)
+        image = create_price_chart("BENCH", output_path=root / "chart.png", runtime_config=runtime, history=frames["BENCH"])
+        still = _elapsed(lambda: assemble_video(image, audio, output_path=root / "still.mp4", runtime_config=runtime, options=options))
+        reveal = _elapsed(
+            lambda: assemble_reveal_video(
+                "BENCH",
+                audio,
+                output_path=root / "reveal.mp4",
+                runtime_config=runtime,
+                options=options,
+                provider=fixture_provider(frames),
+            )
+        )
+        script = root / "script.md"
+        script.write_text("ベンチマーク用の台本です。株価は上昇しました。\nチャンネル登録もよろしくお願いします！\n", encoding="utf-8")
+        short = _elapsed(
+            lambda: assemble_short(
+                "BENCH",
+                audio,
+                company="Bench",
+                output_path=root / "short.mp4",
+                script_path=script,
+                runtime_config=runtime,
+                history=frames["BENCH"],
+            )
+        )
+    return {
+        "still_encode_ratio": still / scale.audio_seconds,
+        "reveal_encode_ratio": reveal / scale.audio_seconds,
+        "short_encode_ratio": short / scale.audio_seconds,
+    }
+
+
+def bench_openai(scale: Scale) -> Dict[str, float]:
+    with serve(FakeOpenAIHandler) as server, _env(OPENAI_BASE_URL=f"{server.url}/v1", OPENAI_API_KEY="bench"):
+        generator = PromptGenerator(model="bench", runtime=_runtime())
+        contexts = [PromptContext(ticker=ticker, company_name=ticker) for ticker in universe(scale.requests)]
+        generator.generate_script(contexts[0], "warm-up")
+        seconds = _elapsed(lambda: [generator.generate_script(context, f"{context.ticker} facts") for context in contexts])
+        ttfts = []
+        for context in contexts:
+            completion = generator.stream_script(context, f"{context.ticker} facts")
+            for _ in completion:
+                pass
+            ttfts.append(completion.stats.ttft or 0.0)
+    return {"openai_requests_per_sec": len(contexts) / seconds, "openai_stream_ttft_ms": 1000 * sum(ttfts) / len(ttfts)}
+
+
+def bench_packing(scale: Scale) -> Dict[str, float]:
+    """Prompt tokens and wall time of packed vs one-request-per-ticker script generation."""
+    tickers = universe(scale.requests)
+    summaries = summarize_universe(tickers, provider=fixture_provider(synthetic_frames(tickers)))
+    items = [(PromptContext(ticker=ticker, company_name=ticker, timeframe="1mo"), summaries[ticker]) for ticker in tickers]
+    # Roughly a hosted model scaled down 50x: fixed overhead plus time per generated token.
+    with serve(FakeOpenAIHandler, latency=0.01, token_latency=0.0002) as server, _env(
+        OPENAI_BASE_URL=f"{server.url}/v1", OPENAI_API_KEY="bench"
+    ):
+        # A real model name, so the pack size comes from its limits.
+        generator = PromptGenerator(model="gpt-4o-mini", runtime=_runtime())
+        single = _elapsed(lambda: [generator.generate_script(context, summary) for context, summary in items])
+        single_tokens = server.prompt_tokens
+        packed = _elapsed(lambda: PackedScriptGenerator(generator).generate(items))
+        packed_tokens = server.prompt_tokens - single_tokens
+    return {"packed_prompt_token_ratio": packed_tokens / single_tokens, "packed_speedup": single / packed}
+
+
+def bench_narration(scale: Scale) -> Dict[str, float]:
+    """Cold-cache OpenAI TTS narration of ``scale.requests`` sentences against the fake server."""
+    from ..openai.tts import OpenAITTSBackend
+
+    script = "".join(f"{ticker}の値動きを事実と解釈に分けて整理します。" for ticker in universe(scale.requests))
+    with tempfile.TemporaryDirectory() as tmp, serve(FakeOpenAIHandler, latency=0.02) as server, _env(
+        OPENAI_BASE_URL=f"{server.url}/v1", OPENAI_API_KEY="bench"
+    ):
+        narrator = Narrator(OpenAITTSBackend(), cache=SentenceAudioCache(Path(tmp) / "tts"), mode="bypass")
+        seconds = _elapsed(lambda: narrator.narrate(script, Path(tmp) / "narration.wav"))
+    return {"narration_sentences_per_sec": scale.requests / seconds}
+
+
+def bench_notion(scale: Scale) -> Dict[str, float]:
+    runtime = _runtime()
+    with serve(FakeNotionHandler, rows=scale.notion_rows) as server:
+        client = NotionClient(token="bench", runtime=runtime, limiter=RateLimiter(0), base_url=server.url)
+        pages = max(1, scale.notion_updates // 2)
+
+        def write() -> None:
+            with NotionWriteQueue(client) as queue:
+                for index in range(scale.notion_updates):
+                    queue.enqueue(f"bench-page-{index % pages}", {"Status": {"status": {"name": "Ready"}}})
+
+        updates = _elapsed(write)
+
+        async def read() -> int:
+            async with AsyncNotionClient(token="bench", runtime=runtime, limiter=AsyncRateLimiter(0), base_url=server.url) as reader:
+                return len([row async for row in reader.iter_database("bench-db")])
+
+        start = time.perf_counter()
+        rows = asyncio.run(read())
+        reads = time.perf_counter() - start
+    return {"notion_updates_per_sec": scale.notion_updates / updates, "notion_rows_per_sec": rows / reads}
+
+
+CASES: Dict[str, Callable[[Scale], Dict[str, float]]] = {
+    "summary": bench_summary,
+    "intraday": bench_intraday,
+    "screen": bench_screen,
+    "chart": bench_chart,
+    "video": bench_video,
+    "openai": bench_openai,
+    "packing": bench_packing,
+    "narration": bench_narration,
+    "notion": bench_notion,
+}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process or its largest child (ffmpeg)."""
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is bytes on macOS and KiB elsewhere.
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_suite(cases: List[str], *, scale: Scale = Scale()) -> Dict[str, Any]:
+    """Run the named cases and return a JSON-serialisable result document."""
+    metrics: Dict[str, float] = {}
+    durations: Dict[str, float] = {}
+    for name in cases:
+        logger.info("Running benchmark case %s", name)
+        start = time.perf_counter()
+        metrics.update(CASES[name](scale))
+        durations[name] = round(time.perf_counter() - start, 3)
+    metrics["peak_rss_mb"] = peak_rss_mb()
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "scale": asdict(scale),
+        "case_seconds": durations,
+        "metrics": {name: round(value, 4) for name, value in metrics.items()},
+    }
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change where positive is always an improvement."""
+        delta = (self.current - self.baseline) / self.baseline
+        return delta if METRICS[self.name].higher_is_better else -delta
+
+    def regressed(self, threshold: float) -> bool:
+        return self.change < -threshold
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float]) -> List[Comparison]:
+    """Pair up metrics present (and non-zero) in both result sets."""
+    return [
+        Comparison(name, baseline[name], value)
+        for name, value in current.items()
+        if name in METRICS and baseline.get(name)
+    ]
+
@@ -0,0 +1,71 @@
+"""
+Compare video backends on the same chart and narration length.
+
+    python -m japan_stock_youtube_shorts.bench.video --seconds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from ..config import RuntimeConfig
+from ..market.history import dummy_history
+from ..pipelines.chart_renderer import SHORTS_STYLE, get_renderer
+from ..pipelines.ffmpeg_video import EncoderOptions, render_reveal
+from ..pipelines.generate_video import assemble_video
+from .fixtures import write_tone
+
+
+def _time(func: Callable[[], Path], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(seconds: float, *, repeat: int = 1, fps: int = 30, options: EncoderOptions = EncoderOptions()) -> Dict[str, float]:
+    """Return the best wall-clock time per backend in seconds."""
+    runtime = RuntimeConfig(dry_run=True, run_id="bench", log_level="WARNING")
+    history = dummy_history(periods=60)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        audio = write_tone(root / "narration.wav", seconds)
+        image = get_renderer(SHORTS_STYLE).render("BENCH", history, root / "chart.png")
+        cases: Dict[str, Callable[[], Path]] = {
+            "moviepy still": lambda: assemble_video(
+                image, audio, output_path=root / "moviepy.mp4", fps=fps, runtime_config=runtime, backend="moviepy", options=options
+            ),
+            "ffmpeg still": lambda: assemble_video(
+                image, audio, output_path=root / "ffmpeg.mp4", fps=fps, runtime_config=runtime, backend="ffmpeg", options=options
+            ),
+            "ffmpeg reveal": lambda: render_reveal("BENCH", history, audio, root / "reveal.mp4", fps=fps, options=options),
+        }
+        return {name: min(_time(func, repeat)) for name, func in cases.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=20.0, help="Narration length to render.")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per backend (best time is reported).")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--encoder", default="libx264")
+    parser.add_argument("--preset", default="veryfast")
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    options = EncoderOptions(encoder=args.encoder, preset=args.preset, threads=args.threads)
+    results = run(args.seconds, repeat=args.repeat, fps=args.fps, options=options)
+    baseline = results["moviepy still"]
+    print(f"{args.seconds:.0f}s clip @ {args.fps} fps, {options.encoder}/{options.preset}")
+    for name, seconds in results.items():
+        print(f"  {name:<14} {seconds:7.2f}s  ({baseline / seconds:4.1f}x vs moviepy)")
+
+
+if __name__ == "__main__":
+    main()
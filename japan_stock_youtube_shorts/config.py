@@ -7,11 +7,15 @@ from __future__ import annotations
 import os
 import uuid
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Literal, Optional
 
 from dotenv import load_dotenv
 
 LogLevel = Literal["INFO", "WARN", "ERROR", "DEBUG"]
+LLMCacheMode = Literal["use", "refresh", "bypass"]
+
+ASSETS_DIR = Path(__file__).resolve().parent / "assets"
 
 
 @dataclass(frozen=True)
@@ -21,14 +25,26 @@ class RuntimeConfig:
     dry_run: bool
     run_id: str
     log_level: LogLevel
+    llm_cache: LLMCacheMode = "use"
+    artifact_cache: LLMCacheMode = "use"
 
     @classmethod
-    def from_env(cls, *, run_id: Optional[str] = None, log_level: Optional[str] = None, dry_run: Optional[bool] = None) -> "RuntimeConfig":
+    def from_env(
+        cls,
+        *,
+        run_id: Optional[str] = None,
+        log_level: Optional[str] = None,
+        dry_run: Optional[bool] = None,
+        llm_cache: Optional[str] = None,
+        artifact_cache: Optional[str] = None,
+    ) -> "RuntimeConfig":
         load_dotenv()
         return cls(
             dry_run=bool(int(os.getenv("DRY_RUN", "0"))) if dry_run is None else dry_run,
             run_id=run_id or os.getenv("RUN_ID") or uuid.uuid4().hex,
             log_level=cast_log_level(log_level or os.getenv("LOG_LEVEL", "INFO")),
+            llm_cache=cast_llm_cache(llm_cache or os.getenv("LLM_CACHE", "use")),
+            artifact_cache=cast_llm_cache(artifact_cache or os.getenv("ARTIFACT_CACHE", "use")),
         )
 
 
@@ -37,3 +53,10 @@ def cast_log_level(value: str) -> LogLevel:
     if upper not in {"INFO", "WARN", "ERROR", "DEBUG"}:
         return "INFO"
     return upper  # type: ignore[return-value]
+
+
+def cast_llm_cache(value: str) -> LLMCacheMode:
+    lower = value.lower()
+    if lower not in {"use", "refresh", "bypass"}:
+        return "use"
+    return lower  # type: ignore[return-value]
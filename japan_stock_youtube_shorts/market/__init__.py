@@ -0,0 +1,43 @@
+"""Market data access shared by the pipelines."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .calendar import JPXCalendar
+    from .history import FixtureBackend, HistoryProvider, YFinanceBackend, get_provider, set_provider
+    from .intraday import IntradayMonitor, LiveSource, ReplaySource, TriggerEvent, TriggerRule
+    from .master import TickerInfo, load_master
+    from .screener import Candidate, ScreenWeights, rank_candidates
+    from .store import OHLCVStore
+    from .summary import MarketSummary, Panel, summarize_frames, summarize_universe
+
+_EXPORTS = {
+    "Candidate": ".screener",
+    "FixtureBackend": ".history",
+    "HistoryProvider": ".history",
+    "IntradayMonitor": ".intraday",
+    "JPXCalendar": ".calendar",
+    "LiveSource": ".intraday",
+    "MarketSummary": ".summary",
+    "OHLCVStore": ".store",
+    "Panel": ".summary",
+    "ReplaySource": ".intraday",
+    "ScreenWeights": ".screener",
+    "TickerInfo": ".master",
+    "TriggerEvent": ".intraday",
+    "TriggerRule": ".intraday",
+    "YFinanceBackend": ".history",
+    "get_provider": ".history",
+    "load_master": ".master",
+    "rank_candidates": ".screener",
+    "set_provider": ".history",
+    "summarize_frames": ".summary",
+    "summarize_universe": ".summary",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
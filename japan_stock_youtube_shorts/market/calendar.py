@@ -0,0 +1,133 @@
+"""
+Japan Exchange Group (JPX) trading calendar helpers.
+
+Holidays are derived from the rules of the Act on National Holidays (fixed days,
+Happy Monday days, equinoxes, substitute and sandwiched holidays) plus the
+exchange's year-end closure (Dec 31 - Jan 3).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+JST = ZoneInfo("Asia/Tokyo")
+SESSION_OPEN = time(9, 0)
+LUNCH_BREAK = (time(11, 30), time(12, 30))
+SESSION_CLOSE = time(15, 30)
+
+
+def _nth_monday(year: int, month: int, n: int) -> date:
+    first = date(year, month, 1)
+    offset = (0 - first.weekday()) % 7
+    return first + timedelta(days=offset + 7 * (n - 1))
+
+
+def _vernal_equinox(year: int) -> date:
+    return date(year, 3, int(20.8431 + 0.242194 * (year - 1980) - (year - 1980) // 4))
+
+
+def _autumnal_equinox(year: int) -> date:
+    return date(year, 9, int(23.2488 + 0.242194 * (year - 1980) - (year - 1980) // 4))
+
+
+@lru_cache(maxsize=64)
+def national_holidays(year: int) -> FrozenSet[date]:
+    """Return Japanese national holidays for a year (rules in force since 2020)."""
+    days = {
+        date(year, 1, 1),
+        _nth_monday(year, 1, 2),
+        date(year, 2, 11),
+        date(year, 2, 23),
+        _vernal_equinox(year),
+        date(year, 4, 29),
+        date(year, 5, 3),
+        date(year, 5, 4),
+        date(year, 5, 5),
+        _nth_monday(year, 7, 3),
+        date(year, 8, 11),
+        _nth_monday(year, 9, 3),
+        _autumnal_equinox(year),
+        _nth_monday(year, 10, 2),
+        date(year, 11, 3),
+        date(year, 11, 23),
+    }
+
+    # A regular day sandwiched between two holidays becomes a holiday.
+    for day in sorted(days):
+        middle = day + timedelta(days=1)
+        if middle not in days and middle.weekday() != 6 and middle + timedelta(days=1) in days:
+            days.add(middle)
+
+    # A holiday falling on Sunday moves to the next day that is not a holiday.
+    for day in sorted(days):
+        if day.weekday() == 6:
+            substitute = day + timedelta(days=1)
+            while substitute in days:
+                substitute += timedelta(days=1)
+            days.add(substitute)
+
+    return frozenset(days)
+
+
+@dataclass(frozen=True)
+class JPXCalendar:
+    """Trading-day arithmetic for the Tokyo Stock Exchange."""
+
+    extra_closures: FrozenSet[date] = field(default_factory=frozenset)
+    close_time: time = SESSION_CLOSE
+    settle_delay: timedelta = timedelta(minutes=30)
+
+    def is_trading_day(self, day: date) -> bool:
+        if day.weekday() >= 5:
+            return False
+        if (day.month, day.day) in {(12, 31), (1, 1), (1, 2), (1, 3)}:
+            return False
+        return day not in national_holidays(day.year) and day not in self.extra_closures
+
+    def previous_trading_day(self, day: date) -> date:
+        day -= timedelta(days=1)
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def next_trading_day(self, day: date) -> date:
+        day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return day
+
+    def trading_days(self, start: date, end: date) -> Iterable[date]:
+        day = start
+        while day <= end:
+            if self.is_trading_day(day):
+                yield day
+            day += timedelta(days=1)
+
+    def is_session_open(self, now: Optional[datetime] = None) -> bool:
+        """Whether continuous trading is running (outside the lunch break) at ``now``."""
+        current = (now or datetime.now(JST)).astimezone(JST)
+        if not self.is_trading_day(current.date()):
+            return False
+        moment = current.time()
+        return SESSION_OPEN <= moment < self.close_time and not LUNCH_BREAK[0] <= moment < LUNCH_BREAK[1]
+
+    def latest_closed_session(self, now: Optional[datetime] = None) -> date:
+        """
+        Return the most recent session whose daily bar is final.
+
+        Today's session only counts once the close plus ``settle_delay`` has passed,
+        so partial intraday bars are never treated as complete.
+        """
+        current = (now or datetime.now(JST)).astimezone(JST)
+        today = current.date()
+        settled = datetime.combine(today, self.close_time, tzinfo=JST) + self.settle_delay
+        if self.is_trading_day(today) and current >= settled:
+            return today
+        return self.previous_trading_day(today)
+
+
+DEFAULT_CALENDAR = JPXCalendar()
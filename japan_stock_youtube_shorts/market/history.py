@@ -0,0 +1,186 @@
+"""
+Shared price-history provider that batches yfinance downloads across tickers.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Dict, Mapping, Optional, Protocol, Sequence, Tuple
+
+import pandas as pd
+
+from ..metrics import get_metrics
+from .store import OHLCVStore
+
+logger = logging.getLogger(__name__)
+
+HistoryKey = Tuple[str, str, str]
+
+
+class HistoryBackend(Protocol):
+    """Anything that can return per-ticker OHLCV frames for a ticker list."""
+
+    def fetch(self, tickers: Sequence[str], *, period: str, interval: str) -> Dict[str, pd.DataFrame]:
+        ...
+
+    def fetch_range(self, tickers: Sequence[str], *, start: date, end: date, interval: str) -> Dict[str, pd.DataFrame]:
+        ...
+
+
+def dummy_history(periods: int = 5) -> pd.DataFrame:
+    """Return the placeholder price history used for dry runs."""
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=periods)
+    values = [float(i) for i in range(1, periods + 1)]
+    return pd.DataFrame(
+        {"Open": values, "High": values, "Low": values, "Close": values, "Volume": [1000.0] * periods},
+        index=dates,
+    )
+
+
+def split_grouped_frame(data: pd.DataFrame, tickers: Sequence[str]) -> Dict[str, pd.DataFrame]:
+    """Split a grouped ``yf.download`` result into one flat frame per ticker."""
+    frames: Dict[str, pd.DataFrame] = {}
+    if data is None or data.empty:
+        return frames
+    if not isinstance(data.columns, pd.MultiIndex):
+        if len(tickers) == 1:
+            frames[tickers[0]] = data.dropna(how="all")
+        return frames
+
+    level = 0 if set(tickers) & set(data.columns.get_level_values(0)) else 1
+    available = set(data.columns.get_level_values(level))
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        frame = data.xs(ticker, axis=1, level=level).dropna(how="all")
+        if not frame.empty:
+            frames[ticker] = frame
+    return frames
+
+
+class YFinanceBackend:
+    """Fetch many tickers with a single grouped ``yf.download`` call."""
+
+    def __init__(self, *, threads: bool = True) -> None:
+        self.threads = threads
+
+    def fetch(self, tickers: Sequence[str], *, period: str, interval: str) -> Dict[str, pd.DataFrame]:
+        import yfinance as yf  # slow to import; only needed once something is downloaded
+
+        logger.info("Downloading %s/%s price history for %d ticker(s)", period, interval, len(tickers))
+        data = yf.download(
+            list(tickers),
+            period=period,
+            interval=interval,
+            group_by="ticker",
+            threads=self.threads,
+            progress=False,
+        )
+        return split_grouped_frame(data, tickers)
+
+    def fetch_range(self, tickers: Sequence[str], *, start: date, end: date, interval: str) -> Dict[str, pd.DataFrame]:
+        import yfinance as yf
+
+        logger.info("Downloading %s price history %s..%s for %d ticker(s)", interval, start, end, len(tickers))
+        data = yf.download(
+            list(tickers),
+            start=start.isoformat(),
+            end=(end + timedelta(days=1)).isoformat(),
+            interval=interval,
+            group_by="ticker",
+            threads=self.threads,
+            progress=False,
+        )
+        return split_grouped_frame(data, tickers)
+
+
+class FixtureBackend:
+    """Offline backend serving canned frames in place of yfinance."""
+
+    def __init__(self, frames: Optional[Mapping[str, pd.DataFrame]] = None) -> None:
+        self.frames = dict(frames or {})
+
+    def fetch(self, tickers: Sequence[str], *, period: str, interval: str) -> Dict[str, pd.DataFrame]:
+        logger.info("[fixture] Serving %s/%s price history for %d ticker(s)", period, interval, len(tickers))
+        return {ticker: self.frames.get(ticker, dummy_history()).copy() for ticker in tickers}
+
+    def fetch_range(self, tickers: Sequence[str], *, start: date, end: date, interval: str) -> Dict[str, pd.DataFrame]:
+        frames = self.fetch(tickers, period="max", interval=interval)
+        window = slice(pd.Timestamp(start), pd.Timestamp(end) + pd.Timedelta(days=1) - pd.Timedelta(1))
+        return {ticker: frame.loc[window] for ticker, frame in frames.items() if not frame.loc[window].empty}
+
+
+class HistoryProvider:
+    """
+    In-process cache of price histories keyed by (ticker, period, interval).
+
+    ``prefetch`` downloads every missing ticker in one grouped request so that the
+    script and chart pipelines can share the same frames. When an ``OHLCVStore`` is
+    attached, daily bars are served from disk and only the missing sessions are
+    requested from the backend.
+    """
+
+    def __init__(self, backend: Optional[HistoryBackend] = None, *, store: Optional[OHLCVStore] = None) -> None:
+        self.backend = backend or YFinanceBackend()
+        self.store = store
+        self._cache: Dict[HistoryKey, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, tickers: Sequence[str], *, period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """Ensure all tickers are cached and return the frames that are available."""
+        unique = list(dict.fromkeys(tickers))
+        with self._lock:
+            missing = [ticker for ticker in unique if (ticker, period, interval) not in self._cache]
+            if missing:
+                metrics = get_metrics()
+                with metrics.timer("market_fetch_seconds", backend=type(self.backend).__name__):
+                    if self.store is not None and interval == self.store.interval:
+                        fetched = self.store.load(missing, period=period, backend=self.backend)
+                    else:
+                        fetched = self.backend.fetch(missing, period=period, interval=interval)
+                for ticker, frame in fetched.items():
+                    self._cache[(ticker, period, interval)] = frame
+                    metrics.inc("market_rows", len(frame))
+                    metrics.inc("market_bytes", int(frame.memory_usage(index=True).sum()))
+                absent = sorted(set(missing) - set(fetched))
+                if absent:
+                    logger.warning("No price data returned for: %s", ", ".join(absent))
+            return {
+                ticker: self._cache[(ticker, period, interval)]
+                for ticker in unique
+                if (ticker, period, interval) in self._cache
+            }
+
+    def get(self, ticker: str, *, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        """Return the cached history for a single ticker, fetching it if needed."""
+        frames = self.prefetch([ticker], period=period, interval=interval)
+        if ticker not in frames:
+            raise ValueError(f"No price data for ticker {ticker}")
+        return frames[ticker]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_providers: Dict[bool, HistoryProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(*, dry_run: bool = False) -> HistoryProvider:
+    """Return the process-wide provider (fixture-backed for dry runs, disk-backed otherwise)."""
+    with _providers_lock:
+        if dry_run not in _providers:
+            if dry_run:
+                _providers[dry_run] = HistoryProvider(FixtureBackend())
+            else:
+                _providers[dry_run] = HistoryProvider(YFinanceBackend(), store=OHLCVStore())
+        return _providers[dry_run]
+
+
+def set_provider(provider: HistoryProvider, *, dry_run: bool = False) -> None:
+    """Install a custom provider, e.g. one backed by recorded fixtures."""
+    with _providers_lock:
+        _providers[dry_run] = provider
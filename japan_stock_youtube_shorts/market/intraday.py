@@ -0,0 +1,536 @@
+"""
+Intraday mode: poll minute bars for a watchlist and flag breaking moves.
+
+``IntradayMonitor`` polls a ``BarSource`` for the whole watchlist at once (one
+grouped yfinance request per poll when live), appends the new bars to a
+fixed-size ring per ticker and updates that ticker's indicators in O(1) per bar,
+so a tick never rescans the window. Moves that satisfy a ``TriggerRule`` come out
+as ``TriggerEvent``s for the pipelines to act on. ``ReplaySource`` plays recorded
+bars through the same code for offline runs, dry runs and benchmarks.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..metrics import get_metrics
+from .calendar import DEFAULT_CALENDAR, JST, LUNCH_BREAK, SESSION_CLOSE, SESSION_OPEN, JPXCalendar
+from .history import HistoryBackend, HistoryProvider, YFinanceBackend
+from .summary import FIELDS
+
+logger = logging.getLogger(__name__)
+
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(FIELDS))
+# 9:00-11:30 and 12:30-15:30: one TSE session of 1-minute bars.
+SESSION_BARS = 330
+
+_NS_PER_DAY = 86_400 * 10**9
+_JST_OFFSET_NS = 9 * 3_600 * 10**9  # Japan has no daylight saving time.
+_NO_BAR = np.iinfo("i8").min
+
+
+def session_day(stamp: int) -> int:
+    """The JST calendar day (days since the epoch) of a bar time in ns since the epoch."""
+    return (stamp + _JST_OFFSET_NS) // _NS_PER_DAY
+
+
+@dataclass(frozen=True)
+class Bars:
+    """Bars of one ticker: ns-since-epoch ``times`` and an (n, 5) OHLCV ``values`` array."""
+
+    times: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "Bars":
+        index = pd.DatetimeIndex(frame.index)
+        # yfinance intraday bars are tz-aware; naive timestamps are taken as JST.
+        index = index.tz_localize(JST) if index.tz is None else index
+        values = frame.reindex(columns=list(FIELDS)).to_numpy(dtype="f8", na_value=np.nan)
+        return cls(index.as_unit("ns").asi8, values)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+
+class BarRing:
+    """The last ``capacity`` bars of one ticker in preallocated arrays."""
+
+    def __init__(self, capacity: int = SESSION_BARS) -> None:
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype="i8")
+        self.values = np.full((capacity, len(FIELDS)), np.nan)
+        self.count = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def last_time(self) -> int:
+        return int(self.times[(self.count - 1) % self.capacity]) if self.count else _NO_BAR
+
+    def append(self, stamp: int, row: Sequence[float]) -> None:
+        slot = self.count % self.capacity
+        self.times[slot] = stamp
+        self.values[slot] = row
+        self.count += 1
+        if self.size < self.capacity:
+            self.size += 1
+
+    def ago(self, bars: int, field: int = CLOSE) -> float:
+        """``field`` of the bar ``bars`` before the latest (0 = latest); NaN once it has left the ring."""
+        if bars >= self.size:
+            return math.nan
+        return float(self.values[(self.count - 1 - bars) % self.capacity, field])
+
+    def tail(self, bars: int, field: int = CLOSE) -> np.ndarray:
+        """The last ``bars`` values of ``field``, oldest first."""
+        bars = min(bars, self.size)
+        slots = np.arange(self.count - bars, self.count) % self.capacity
+        return self.values[slots, field]
+
+    def reset(self) -> None:
+        self.count = self.size = 0
+
+    def frame(self) -> pd.DataFrame:
+        """The buffered bars as an OHLCV frame indexed in JST, oldest first."""
+        slots = np.arange(self.count - self.size, self.count) % self.capacity
+        index = pd.DatetimeIndex(self.times[slots].astype("datetime64[ns]")).tz_localize("UTC").tz_convert(JST)
+        return pd.DataFrame(self.values[slots], index=index, columns=list(FIELDS))
+
+
+class IntradayIndicators:
+    """
+    Session indicators for one ticker, updated in O(1) per bar.
+
+    Window sums are running totals: the bar that leaves the ``window`` is read back
+    from the ring and subtracted, so no update rescans the window. They are
+    recomputed from the ring once per ``capacity`` bars to keep rounding drift out.
+    """
+
+    def __init__(self, *, window: int = 5, capacity: int = SESSION_BARS, reference: Optional[float] = None) -> None:
+        if capacity <= window:
+            raise ValueError(f"ring capacity ({capacity}) must exceed the window ({window})")
+        self.ring = BarRing(capacity)
+        self.window = window
+        self.reference = reference
+        self.day: Optional[int] = None
+        self._reset_session()
+
+    def _reset_session(self) -> None:
+        self.ring.reset()
+        self.last = math.nan
+        self.open = math.nan
+        self.high = -math.inf
+        self.low = math.inf
+        self._window_close = 0.0
+        self._window_volume = 0.0
+        self._turnover = 0.0
+        self._volume = 0.0
+
+    def update(self, stamp: int, row: Sequence[float]) -> None:
+        """Add one bar (``row`` in ``FIELDS`` order); the first bar of a new day starts a new session."""
+        day = session_day(stamp)
+        if day != self.day:
+            if self.day is not None and len(self.ring):
+                # Yesterday's last close is today's reference.
+                self.reference = self.last
+            self.day = day
+            self._reset_session()
+        open_, high, low, close, volume = row
+        if math.isnan(volume):
+            volume = 0.0
+            row = [open_, high, low, close, volume]
+        ring = self.ring
+        if ring.size >= self.window:
+            self._window_close -= ring.ago(self.window - 1)
+            self._window_volume -= ring.ago(self.window - 1, VOLUME)
+        ring.append(stamp, row)
+        if ring.count % ring.capacity == 0:
+            self._window_close = float(np.sum(ring.tail(self.window)))
+            self._window_volume = float(np.sum(ring.tail(self.window, VOLUME)))
+        else:
+            self._window_close += close
+            self._window_volume += volume
+        if math.isnan(self.open):
+            self.open = close if math.isnan(open_) else open_
+        self.high = max(self.high, close if math.isnan(high) else high)
+        self.low = min(self.low, close if math.isnan(low) else low)
+        self._turnover += close * volume
+        self._volume += volume
+        self.last = close
+
+    @property
+    def bars(self) -> int:
+        """Bars seen this session."""
+        return self.ring.count
+
+    @property
+    def base(self) -> float:
+        """What ``change_pct`` is measured against: the previous close, else the session open."""
+        return self.reference if self.reference else self.open
+
+    @property
+    def change_pct(self) -> float:
+        return (self.last / self.base - 1.0) * 100.0 if self.base else math.nan
+
+    @property
+    def window_change_pct(self) -> float:
+        """Change over the last ``window`` bars (since the open for the first ones)."""
+        earlier = self.ring.ago(self.window) if self.ring.size > self.window else self.open
+        return (self.last / earlier - 1.0) * 100.0 if earlier else math.nan
+
+    @property
+    def sma(self) -> float:
+        return self._window_close / min(self.ring.size, self.window) if self.ring.size else math.nan
+
+    @property
+    def vwap(self) -> float:
+        return self._turnover / self._volume if self._volume else math.nan
+
+    @property
+    def volume_ratio(self) -> float:
+        """Average volume per bar in the window relative to the session's earlier bars."""
+        window = min(self.ring.count, self.window)
+        earlier = self.ring.count - window
+        if not earlier or not window:
+            return math.nan
+        baseline = (self._volume - self._window_volume) / earlier
+        return (self._window_volume / window) / baseline if baseline > 0 else math.nan
+
+
+@dataclass(frozen=True)
+class TriggerEvent:
+    """A ticker whose intraday move crossed a ``TriggerRule``."""
+
+    ticker: str
+    time: pd.Timestamp
+    reason: str
+    price: float
+    reference: float
+    reference_label: str
+    change_pct: float
+    window_change_pct: float
+    window: int
+    volume_ratio: float
+
+    def render(self) -> str:
+        """Facts for the script prompt, in the style of ``MarketSummary.render``."""
+        lines = [
+            f"Intraday move at {self.time:%H:%M} JST: {self.price:.2f} "
+            f"({self.change_pct:+.2f}% vs {self.reference_label} {self.reference:.2f}).",
+            f"Last {self.window} minutes: {self.window_change_pct:+.2f}%.",
+        ]
+        if not math.isnan(self.volume_ratio):
+            lines.append(f"Recent volume: {self.volume_ratio:.1f}x the session's earlier pace.")
+        return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class TriggerRule:
+    """
+    When a ticker counts as moving.
+
+    A move of ``move_pct`` against the reference, or ``window_move_pct`` within the
+    indicator window, fires once ``min_bars`` bars are in; with ``volume_ratio`` set,
+    the window's volume must also run that many times the session's earlier pace.
+    The same day, a ticker fires again only after ``cooldown`` of bar time and only
+    if its move has grown by another ``move_pct`` or reversed since it last fired.
+    """
+
+    move_pct: float = 3.0
+    window_move_pct: float = 1.5
+    volume_ratio: float = 0.0
+    min_bars: int = 5
+    cooldown: timedelta = timedelta(minutes=30)
+
+    def repeats(self, fired_at: int, fired_change: float, stamp: int, change: float) -> bool:
+        """Whether a ticker that fired at ``fired_at`` (ns) with ``fired_change`` may fire again at ``stamp``."""
+        if session_day(fired_at) != session_day(stamp):
+            return True
+        if stamp - fired_at < self.cooldown.total_seconds() * 10**9:
+            return False
+        return abs(change) >= abs(fired_change) + self.move_pct or change * fired_change < 0
+
+    def reason(self, indicators: IntradayIndicators) -> Optional[str]:
+        if indicators.bars < self.min_bars:
+            return None
+        if self.volume_ratio and not indicators.volume_ratio >= self.volume_ratio:
+            return None
+        if abs(indicators.change_pct) >= self.move_pct:
+            return "move"
+        if abs(indicators.window_change_pct) >= self.window_move_pct:
+            return "window"
+        return None
+
+
+class BarSource(Protocol):
+    """Anything that returns the latest bars for a ticker list; bars already seen are skipped by the monitor."""
+
+    live: bool
+
+    @property
+    def exhausted(self) -> bool:
+        ...
+
+    def poll(self, tickers: Sequence[str]) -> Dict[str, Bars]:
+        ...
+
+
+class LiveSource:
+    """Today's 1-minute bars for every ticker from one grouped ``HistoryBackend.fetch`` per poll."""
+
+    live = True
+    exhausted = False
+
+    def __init__(self, backend: Optional[HistoryBackend] = None) -> None:
+        self.backend = backend or YFinanceBackend()
+
+    def poll(self, tickers: Sequence[str]) -> Dict[str, Bars]:
+        frames = self.backend.fetch(tickers, period="1d", interval="1m")
+        return {ticker: Bars.from_frame(frame) for ticker, frame in frames.items() if not frame.empty}
+
+
+class ReplaySource:
+    """Recorded bars played back ``step`` timestamps per poll, as fast as they are polled."""
+
+    live = False
+
+    def __init__(self, bars: Mapping[str, Bars], *, step: int = 1) -> None:
+        self.bars = {ticker: series for ticker, series in bars.items() if len(series)}
+        self.step = max(1, step)
+        self.clock = np.unique(np.concatenate([series.times for series in self.bars.values()])) if self.bars else np.empty(0, "i8")
+        # Per ticker, how many of its bars are due by each tick of the merged clock.
+        self._due = {ticker: np.searchsorted(series.times, self.clock, side="right") for ticker, series in self.bars.items()}
+        self.position = 0
+
+    @classmethod
+    def from_frames(cls, frames: Mapping[str, pd.DataFrame], *, step: int = 1) -> "ReplaySource":
+        return cls({ticker: Bars.from_frame(frame.sort_index()) for ticker, frame in frames.items()}, step=step)
+
+    @classmethod
+    def from_csv(cls, path: Path, *, step: int = 1) -> "ReplaySource":
+        """Replay a recording written by ``RecordingSource`` (``Datetime,Ticker,Open,High,Low,Close,Volume``)."""
+        data = pd.read_csv(path)
+        data.index = pd.DatetimeIndex(pd.to_datetime(data.pop("Datetime"), utc=True))
+        frames = {str(ticker): group.drop(columns="Ticker") for ticker, group in data.groupby("Ticker", sort=False)}
+        logger.info("Loaded %d recorded bar(s) for %d ticker(s) from %s", len(data), len(frames), path)
+        return cls.from_frames(frames, step=step)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.position >= len(self.clock)
+
+    def poll(self, tickers: Sequence[str]) -> Dict[str, Bars]:
+        if self.exhausted:
+            return {}
+        start, self.position = self.position, min(self.position + self.step, len(self.clock))
+        polled = {}
+        for ticker in tickers:
+            due = self._due.get(ticker)
+            if due is None:
+                continue
+            lo, hi = (due[start - 1] if start else 0), due[self.position - 1]
+            if hi > lo:
+                series = self.bars[ticker]
+                polled[ticker] = Bars(series.times[lo:hi], series.values[lo:hi])
+        return polled
+
+
+class RecordingSource:
+    """Wrap a source and append every new bar it returns to a CSV that ``ReplaySource.from_csv`` reads."""
+
+    def __init__(self, source: BarSource, path: Path) -> None:
+        self.source = source
+        self.live = source.live
+        self.path = path
+        self._seen: Dict[str, int] = {}
+
+    @property
+    def exhausted(self) -> bool:
+        return self.source.exhausted
+
+    def poll(self, tickers: Sequence[str]) -> Dict[str, Bars]:
+        polled = self.source.poll(tickers)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        with self.path.open("a", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            if new_file:
+                writer.writerow(["Datetime", "Ticker", *FIELDS])
+            for ticker, series in polled.items():
+                fresh = series.times > self._seen.get(ticker, _NO_BAR)
+                if not fresh.any():
+                    continue
+                stamps = pd.DatetimeIndex(series.times[fresh].astype("datetime64[ns]")).tz_localize("UTC").tz_convert(JST)
+                writer.writerows([stamp.isoformat(), ticker, *row] for stamp, row in zip(stamps, series.values[fresh].tolist()))
+                self._seen[ticker] = int(series.times[-1])
+        return polled
+
+
+def synthetic_session(
+    tickers: Sequence[str], *, day: Optional[date] = None, seed: int = 0, movers: float = 0.05, start_price: float = 2_000.0
+) -> Dict[str, Bars]:
+    """
+    One session of random-walk 1-minute bars for dry runs and benchmarks.
+
+    About ``movers`` of the tickers jump 4-6% (on heavy volume) at a random minute.
+    """
+    rng = np.random.default_rng(seed)
+    day = day or datetime.now(JST).date()
+    morning = pd.date_range(datetime.combine(day, SESSION_OPEN), datetime.combine(day, LUNCH_BREAK[0]), freq="min", inclusive="left")
+    afternoon = pd.date_range(datetime.combine(day, LUNCH_BREAK[1]), datetime.combine(day, SESSION_CLOSE), freq="min", inclusive="left")
+    times = morning.append(afternoon).tz_localize(JST).as_unit("ns").asi8
+    count, width = len(times), len(tickers)
+    steps = rng.normal(0.0, 0.0004, (count, width))
+    volume = rng.gamma(2.0, 5_000.0, (count, width))
+    jumpers = np.flatnonzero(rng.random(width) < movers)
+    at = rng.integers(30, count - 30, len(jumpers))
+    steps[at, jumpers] += rng.choice([-1.0, 1.0], len(jumpers)) * rng.uniform(0.04, 0.06, len(jumpers))
+    volume[at, jumpers] *= 12.0
+    close = start_price * np.exp(np.cumsum(steps, axis=0))
+    open_ = np.vstack([close[:1], close[:-1]])
+    spread = np.abs(rng.normal(0.0, 0.0005, (count, width)))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    values = np.stack([open_, high, low, close, np.round(volume)], axis=-1)
+    return {ticker: Bars(times, np.ascontiguousarray(values[:, column])) for column, ticker in enumerate(tickers)}
+
+
+def previous_closes(
+    provider: HistoryProvider, tickers: Sequence[str], *, now: Optional[datetime] = None
+) -> Dict[str, float]:
+    """Each ticker's last daily close before today (JST): the reference for intraday moves."""
+    today = pd.Timestamp((now or datetime.now(JST)).astimezone(JST).date())
+    closes = {}
+    for ticker, frame in provider.prefetch(tickers, period="5d").items():
+        close = frame["Close"].dropna()
+        index = pd.DatetimeIndex(close.index)
+        index = index.tz_convert(JST).tz_localize(None) if index.tz is not None else index
+        earlier = close[index < today]
+        if len(earlier):
+            closes[ticker] = float(earlier.iloc[-1])
+    return closes
+
+
+class IntradayMonitor:
+    """
+    Poll ``source`` for the watchlist and turn threshold moves into ``TriggerEvent``s.
+
+    The rule is checked after each poll's newest bar, so a poll that returns a whole
+    morning (the first live poll) fires at most once per ticker, on the current state.
+    """
+
+    def __init__(
+        self,
+        tickers: Sequence[str],
+        source: BarSource,
+        *,
+        rule: TriggerRule = TriggerRule(),
+        window: int = 5,
+        capacity: int = SESSION_BARS,
+        references: Optional[Mapping[str, float]] = None,
+        calendar: JPXCalendar = DEFAULT_CALENDAR,
+    ) -> None:
+        references = references or {}
+        self.source = source
+        self.rule = rule
+        self.calendar = calendar
+        self.indicators = {
+            ticker: IntradayIndicators(window=window, capacity=capacity, reference=references.get(ticker))
+            for ticker in dict.fromkeys(tickers)
+        }
+        self.polls = 0
+        self.bars = 0
+        self._fired: Dict[str, Tuple[int, float]] = {}
+        self._stop = threading.Event()
+
+    def frame(self, ticker: str) -> pd.DataFrame:
+        """The buffered bars of ``ticker`` (for charting the move)."""
+        return self.indicators[ticker].ring.frame()
+
+    def step(self) -> List[TriggerEvent]:
+        """Poll once, fold the new bars into the indicators and return the triggers."""
+        metrics = get_metrics()
+        with metrics.timer("market_fetch_seconds", backend=f"intraday_{type(self.source).__name__}"):
+            polled = self.source.poll(list(self.indicators))
+        self.polls += 1
+        events = []
+        added = 0
+        for ticker, series in polled.items():
+            indicators = self.indicators.get(ticker)
+            if indicators is None:
+                continue
+            last_time = indicators.ring.last_time
+            for stamp, row in zip(series.times.tolist(), series.values.tolist()):
+                if stamp > last_time and not math.isnan(row[CLOSE]):
+                    indicators.update(stamp, row)
+                    last_time = stamp
+                    added += 1
+            reason = self.rule.reason(indicators)
+            fired = self._fired.get(ticker)
+            if reason is None or (fired is not None and not self.rule.repeats(*fired, last_time, indicators.change_pct)):
+                continue
+            self._fired[ticker] = (last_time, indicators.change_pct)
+            events.append(self._event(ticker, indicators, reason))
+        self.bars += added
+        metrics.inc("intraday_bars", added)
+        for event in events:
+            metrics.inc("intraday_triggers", reason=event.reason)
+            logger.info("Trigger %s (%s): %+.2f%% at %s", event.ticker, event.reason, event.change_pct, f"{event.time:%H:%M}")
+        return events
+
+    def _event(self, ticker: str, indicators: IntradayIndicators, reason: str) -> TriggerEvent:
+        return TriggerEvent(
+            ticker=ticker,
+            time=pd.Timestamp(indicators.ring.last_time, tz="UTC").tz_convert(JST),
+            reason=reason,
+            price=indicators.last,
+            reference=indicators.base,
+            reference_label="previous close" if indicators.reference else "today's open",
+            change_pct=indicators.change_pct,
+            window_change_pct=indicators.window_change_pct,
+            window=indicators.window,
+            volume_ratio=indicators.volume_ratio,
+        )
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self, on_event: Callable[[TriggerEvent], None], *, interval: float = 60.0, max_polls: Optional[int] = None) -> int:
+        """
+        Poll until stopped, ``max_polls`` is reached or a replay runs out; returns the trigger count.
+
+        Live sources are polled every ``interval`` seconds while the session is open;
+        replays are polled back to back.
+        """
+        fired = 0
+        waiting = False
+        while not self._stop.is_set() and not self.source.exhausted and (max_polls is None or self.polls < max_polls):
+            if self.source.live and not self.calendar.is_session_open():
+                if not waiting:
+                    logger.info("Market closed; waiting for the session to open")
+                waiting = True
+                self._stop.wait(interval)
+                continue
+            waiting = False
+            started = time.monotonic()
+            for event in self.step():
+                on_event(event)
+                fired += 1
+            if self.source.live:
+                self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
+        logger.info("Intraday monitor stopped after %d poll(s), %d bar(s), %d trigger(s)", self.polls, self.bars, fired)
+        return fired
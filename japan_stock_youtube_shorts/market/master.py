@@ -0,0 +1,103 @@
+"""
+Local ticker master: TSE code -> company name, sector, market segment and next earnings date.
+
+The file is a CSV at ``TICKER_MASTER`` (default ``assets/data/ticker_master.csv``)
+with ``ticker,company,sector,segment[,earnings_date]`` columns. The Japanese
+headers of JPX's listed-issues sheet (コード, 銘柄名, 33業種区分, 市場・商品区分)
+are accepted too, so a CSV export of that sheet works as is; bare codes get ``.T``.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import os
+from dataclasses import dataclass, replace
+from datetime import date
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+from ..config import ASSETS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Accepted header names for each field, English first.
+COLUMNS = {
+    "ticker": ("ticker", "code", "コード"),
+    "company": ("company", "name", "銘柄名"),
+    "sector": ("sector", "33業種区分"),
+    "segment": ("segment", "market", "市場・商品区分"),
+    "earnings_date": ("earnings_date", "決算発表予定日"),
+}
+
+
+@dataclass(frozen=True)
+class TickerInfo:
+    ticker: str
+    company: str
+    sector: str = ""
+    segment: str = ""
+    earnings_date: Optional[date] = None
+
+
+def master_path() -> Path:
+    return Path(os.getenv("TICKER_MASTER") or ASSETS_DIR / "data" / "ticker_master.csv")
+
+
+def normalize_ticker(code: str) -> str:
+    """``"7203"`` -> ``"7203.T"``; symbols that already carry a suffix are kept."""
+    code = code.strip().upper()
+    return code if "." in code else f"{code}.T"
+
+
+def _parse_date(value: str) -> Optional[date]:
+    value = value.strip().replace("/", "-")
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        logger.warning("Ignoring unparseable earnings date %r", value)
+        return None
+
+
+def _field(entry: Mapping[str, str], name: str) -> str:
+    for column in COLUMNS[name]:
+        value = entry.get(column)
+        if value:
+            return value.strip()
+    return ""
+
+
+def load_master(path: Optional[Path] = None) -> Dict[str, TickerInfo]:
+    """Read the ticker master keyed by ticker symbol."""
+    path = path or master_path()
+    if not path.exists():
+        raise FileNotFoundError(f"Ticker master not found at {path} (set TICKER_MASTER or pass --master)")
+    master: Dict[str, TickerInfo] = {}
+    with path.open(newline="", encoding="utf-8-sig") as handle:
+        for entry in csv.DictReader(handle):
+            code = _field(entry, "ticker")
+            if not code:
+                continue
+            ticker = normalize_ticker(code)
+            master[ticker] = TickerInfo(
+                ticker=ticker,
+                company=_field(entry, "company") or ticker,
+                sector=_field(entry, "sector"),
+                segment=_field(entry, "segment"),
+                earnings_date=_parse_date(_field(entry, "earnings_date")),
+            )
+    logger.info("Loaded %d ticker(s) from %s", len(master), path)
+    return master
+
+
+def merge_earnings(master: Mapping[str, TickerInfo], path: Path) -> Dict[str, TickerInfo]:
+    """Overlay a ``ticker,earnings_date`` calendar CSV on the master."""
+    merged = dict(master)
+    with path.open(newline="", encoding="utf-8-sig") as handle:
+        for entry in csv.DictReader(handle):
+            ticker = normalize_ticker(_field(entry, "ticker"))
+            if ticker in merged:
+                merged[ticker] = replace(merged[ticker], earnings_date=_parse_date(_field(entry, "earnings_date")))
+    return merged
@@ -0,0 +1,223 @@
+"""
+Vectorized universe screen: rank every ticker by how much of a story its latest session is.
+
+The price panel is assembled straight from the ``OHLCVStore`` record files (no
+per-ticker DataFrames), and every signal is one array pass over the (dates x
+tickers) panel, so screening the ~4,000 TSE names takes a fraction of a second.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import warnings
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .master import TickerInfo
+from .store import FIELDS, OHLCVStore, period_start
+from .summary import Panel
+
+logger = logging.getLogger(__name__)
+
+# Fewer sessions than this and a "52-week" extreme means little.
+MIN_EXTREME_SESSIONS = 120
+
+
+def store_panel(store: OHLCVStore, tickers: Sequence[str], *, period: str = "1y", now: Optional[datetime] = None) -> Panel:
+    """Aligned OHLCV arrays for ``tickers`` read from the memory-mapped store files."""
+    end = store.calendar.latest_closed_session(now)
+    start = period_start(period, end, store.calendar)
+    lo_date = None if start is None else np.datetime64(start, "D")
+    hi_date = np.datetime64(end, "D")
+    windows = {}
+    for ticker in dict.fromkeys(tickers):
+        records = store.read_records(ticker)
+        if records is None or not len(records):
+            continue
+        dates = records["date"]
+        lo = 0 if lo_date is None else int(np.searchsorted(dates, lo_date, side="left"))
+        hi = int(np.searchsorted(dates, hi_date, side="right"))
+        if hi > lo:
+            windows[ticker] = records[lo:hi]
+    if not windows:
+        return Panel.from_frames({})
+    names = list(windows)
+    stamps = np.unique(np.concatenate([window["date"] for window in windows.values()]))
+    arrays = {name: np.full((len(stamps), len(names)), np.nan) for name in FIELDS}
+    for column, window in enumerate(windows.values()):
+        rows = np.searchsorted(stamps, window["date"])
+        for name in FIELDS:
+            arrays[name][rows, column] = window[name]
+    dates = pd.DatetimeIndex(stamps.astype("datetime64[ns]"))
+    return Panel(dates, names, arrays["Open"], arrays["High"], arrays["Low"], arrays["Close"], arrays["Volume"])
+
+
+@dataclass(frozen=True)
+class ScreenWeights:
+    """How much each signal adds to a ticker's score."""
+
+    move: float = 1.0  # robust z-score of the 1-day change, capped at 5
+    volume: float = 1.0  # log2 of volume vs the 20-day median, capped at 5
+    extreme: float = 2.0  # closed at a 52-week high or low
+    earnings: float = 1.5  # reported yesterday or reports within ``earnings_days``
+
+
+@dataclass(frozen=True)
+class Signals:
+    """Per-ticker screen inputs as arrays aligned with ``tickers``."""
+
+    tickers: List[str]
+    as_of: pd.Timestamp
+    close: np.ndarray
+    change_1d: np.ndarray
+    change_5d: np.ndarray
+    volume_ratio: np.ndarray
+    turnover: np.ndarray
+    new_high: np.ndarray
+    new_low: np.ndarray
+    days_to_earnings: np.ndarray
+
+
+def compute_signals(panel: Panel, master: Mapping[str, TickerInfo]) -> Signals:
+    """Every signal for every ticker in one pass; tickers without a bar in the latest session get NaN."""
+    close, volume = panel.close, panel.volume
+    n_rows, width = close.shape
+    with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        last = close[-1] if n_rows else np.full(width, np.nan)
+        prev = close[-2] if n_rows > 1 else np.full(width, np.nan)
+        week = close[-6] if n_rows > 5 else np.full(width, np.nan)
+        change_1d = (last / prev - 1.0) * 100.0
+        change_5d = (last / week - 1.0) * 100.0
+        baseline = np.nanmedian(volume[-21:-1], axis=0) if n_rows > 1 else np.full(width, np.nan)
+        volume_ratio = np.where(baseline > 0, volume[-1] / baseline, np.nan) if n_rows else baseline
+        turnover = np.nanmedian(close[-20:] * volume[-20:], axis=0) if n_rows else np.full(width, np.nan)
+        enough = np.sum(~np.isnan(close), axis=0) >= MIN_EXTREME_SESSIONS
+        if n_rows > 1:
+            prior_high = np.nanmax(np.where(np.isnan(panel.high[:-1]), close[:-1], panel.high[:-1]), axis=0)
+            prior_low = np.nanmin(np.where(np.isnan(panel.low[:-1]), close[:-1], panel.low[:-1]), axis=0)
+        else:
+            prior_high = prior_low = np.full(width, np.nan)
+        new_high = enough & (last >= prior_high)
+        new_low = enough & (last <= prior_low)
+
+    as_of = panel.dates[-1] if n_rows else pd.NaT
+    earnings = np.full(width, np.datetime64("NaT"), dtype="datetime64[D]")
+    for column, ticker in enumerate(panel.tickers):
+        info = master.get(ticker)
+        if info is not None and info.earnings_date is not None:
+            earnings[column] = info.earnings_date
+    days_to_earnings = np.full(width, np.nan)
+    known = ~np.isnat(earnings)
+    if n_rows:
+        days_to_earnings[known] = (earnings[known] - np.datetime64(as_of.date(), "D")).astype("f8")
+    return Signals(
+        tickers=list(panel.tickers),
+        as_of=as_of,
+        close=last,
+        change_1d=change_1d,
+        change_5d=change_5d,
+        volume_ratio=volume_ratio,
+        turnover=turnover,
+        new_high=new_high,
+        new_low=new_low,
+        days_to_earnings=days_to_earnings,
+    )
+
+
+@dataclass(frozen=True)
+class Candidate:
+    ticker: str
+    company: str
+    sector: str
+    score: float
+    reason: str
+
+
+def _robust_z(values: np.ndarray) -> np.ndarray:
+    median = np.nanmedian(values)
+    spread = 1.4826 * np.nanmedian(np.abs(values - median))
+    return (values - median) / spread if spread > 0 else np.zeros_like(values)
+
+
+def _reason(signals: Signals, column: int, *, earnings_days: int) -> str:
+    parts = [f"{signals.change_1d[column]:+.1f}% on the day"]
+    if not math.isnan(signals.change_5d[column]):
+        parts.append(f"{signals.change_5d[column]:+.1f}% over 5 days")
+    if signals.volume_ratio[column] >= 2.0:
+        parts.append(f"volume {signals.volume_ratio[column]:.1f}x the 20-day median")
+    if signals.new_high[column]:
+        parts.append("52-week high")
+    if signals.new_low[column]:
+        parts.append("52-week low")
+    days = signals.days_to_earnings[column]
+    if -1 <= days <= earnings_days:
+        parts.append("reported earnings" if days < 0 else "earnings today" if days == 0 else f"earnings in {int(days)} day(s)")
+    return "; ".join(parts)
+
+
+def rank_candidates(
+    signals: Signals,
+    master: Mapping[str, TickerInfo],
+    *,
+    top: int = 20,
+    weights: ScreenWeights = ScreenWeights(),
+    min_turnover: float = 1e8,
+    segments: Sequence[str] = (),
+    max_per_sector: Optional[int] = None,
+    earnings_days: int = 7,
+) -> List[Candidate]:
+    """
+    Score every ticker and return the ``top`` candidates, best first.
+
+    Only tickers in ``master`` that traded in the latest session, with a median
+    daily turnover of at least ``min_turnover`` yen (and, if given, in one of
+    ``segments``) are eligible; ``max_per_sector`` keeps one hot sector from
+    taking every slot.
+    """
+    with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        move = np.minimum(np.abs(_robust_z(signals.change_1d)), 5.0)
+        volume = np.clip(np.log2(signals.volume_ratio), 0.0, 5.0)
+        extreme = (signals.new_high | signals.new_low).astype("f8")
+        earnings = ((signals.days_to_earnings >= -1) & (signals.days_to_earnings <= earnings_days)).astype("f8")
+        score = (
+            weights.move * np.nan_to_num(move)
+            + weights.volume * np.nan_to_num(volume)
+            + weights.extreme * extreme
+            + weights.earnings * earnings
+        )
+    infos = [master.get(ticker) for ticker in signals.tickers]
+    eligible = ~np.isnan(signals.change_1d) & (np.nan_to_num(signals.turnover) >= min_turnover)
+    eligible &= np.array([info is not None for info in infos], dtype=bool)
+    if segments:
+        wanted = {segment.casefold() for segment in segments}
+        eligible &= np.array([info is not None and any(w in info.segment.casefold() for w in wanted) for info in infos], dtype=bool)
+
+    columns = np.flatnonzero(eligible)
+    order = columns[np.argsort(-score[columns], kind="stable")]
+    picks: List[Candidate] = []
+    per_sector: Dict[str, int] = {}
+    for column in order:
+        if len(picks) >= top:
+            break
+        info = infos[column]
+        if max_per_sector is not None and per_sector.get(info.sector, 0) >= max_per_sector:
+            continue
+        per_sector[info.sector] = per_sector.get(info.sector, 0) + 1
+        picks.append(
+            Candidate(
+                ticker=info.ticker,
+                company=info.company,
+                sector=info.sector,
+                score=float(score[column]),
+                reason=_reason(signals, int(column), earnings_days=earnings_days),
+            )
+        )
+    logger.info("Screened %d ticker(s) (%d eligible) as of %s: picked %d", len(signals.tickers), len(columns), signals.as_of, len(picks))
+    return picks
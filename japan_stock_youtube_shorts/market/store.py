@@ -0,0 +1,224 @@
+"""
+Persistent OHLCV store: one memory-mapped NumPy file per ticker, refreshed incrementally.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import re
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..config import ASSETS_DIR
+from .calendar import DEFAULT_CALENDAR, JPXCalendar
+
+if TYPE_CHECKING:
+    from .history import HistoryBackend
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+RECORD_DTYPE = np.dtype([("date", "datetime64[D]"), *[(name, "f8") for name in FIELDS]])
+# The header ``np.save`` writes for a 1-D RECORD_DTYPE array, up to the shape.
+_HEADER = re.compile(
+    re.escape(f"{{'descr': {np.lib.format.dtype_to_descr(RECORD_DTYPE)!r}, 'fortran_order': False, 'shape': (") + rb"(\d+),\)".decode()
+)
+
+
+def period_start(period: str, end: date, calendar: JPXCalendar = DEFAULT_CALENDAR) -> Optional[date]:
+    """Translate a yfinance ``period`` string into the first date it covers (``None`` for max)."""
+    if period == "max":
+        return None
+    if period == "ytd":
+        return date(end.year, 1, 1)
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        start = end
+        for _ in range(count - 1):
+            start = calendar.previous_trading_day(start)
+        return start
+    offset = {"wk": pd.DateOffset(weeks=count), "mo": pd.DateOffset(months=count), "y": pd.DateOffset(years=count)}[unit]
+    return (pd.Timestamp(end) - offset).date()
+
+
+def frame_to_records(frame: pd.DataFrame) -> np.ndarray:
+    """Convert a yfinance-style frame into a sorted, de-duplicated record array."""
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_convert("Asia/Tokyo").tz_localize(None)
+    records = np.empty(len(frame), dtype=RECORD_DTYPE)
+    records["date"] = index.normalize().values.astype("datetime64[D]")
+    for name in FIELDS:
+        records[name] = frame[name].to_numpy(dtype="f8") if name in frame else np.nan
+    _, last_positions = np.unique(records["date"][::-1], return_index=True)
+    keep = len(records) - 1 - last_positions
+    return records[np.sort(keep)]
+
+
+def records_to_frame(records: np.ndarray) -> pd.DataFrame:
+    index = pd.DatetimeIndex(records["date"].astype("datetime64[ns]"), name="Date")
+    return pd.DataFrame({name: np.asarray(records[name]) for name in FIELDS}, index=index)
+
+
+class OHLCVStore:
+    """
+    Daily OHLCV bars partitioned by ticker under ``root``.
+
+    Each ticker has a structured ``.npy`` file (read with ``mmap_mode="r"``) and a
+    small JSON sidecar recording how far back the data is complete and up to which
+    JPX session it has been checked. ``sync`` only asks the backend for bars after
+    the last stored date unless a wider range than ever fetched is requested.
+    """
+
+    interval = "1d"
+
+    def __init__(self, root: Optional[Path] = None, *, calendar: JPXCalendar = DEFAULT_CALENDAR) -> None:
+        self.root = root or Path(os.getenv("OHLCV_STORE_DIR") or ASSETS_DIR / "ohlcv")
+        self.calendar = calendar
+
+    def _paths(self, ticker: str) -> tuple[Path, Path]:
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return self.root / f"{name}.npy", self.root / f"{name}.json"
+
+    def _read_meta(self, ticker: str) -> Dict[str, Any]:
+        meta_path = self._paths(ticker)[1]
+        if not meta_path.exists():
+            return {}
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+
+    def records(self, ticker: str) -> Optional[np.ndarray]:
+        """Return the memory-mapped record array for a ticker, if stored."""
+        data_path = self._paths(ticker)[0]
+        if not data_path.exists():
+            return None
+        return np.load(data_path, mmap_mode="r")
+
+    def read_records(self, ticker: str) -> Optional[np.ndarray]:
+        """
+        Read a ticker's whole record file into memory, if stored.
+
+        Scanning thousands of tickers this way is several times faster than ``records``:
+        files written by ``_write`` have a known header, so the bytes are wrapped
+        directly instead of going through ``np.load``'s header parsing and mmap setup.
+        """
+        try:
+            raw = self._paths(ticker)[0].read_bytes()
+        except FileNotFoundError:
+            return None
+        major = raw[6] if raw[:6] == b"\x93NUMPY" else 0
+        start, size = (10, int.from_bytes(raw[8:10], "little")) if major == 1 else (12, int.from_bytes(raw[8:12], "little"))
+        match = _HEADER.match(raw[start : start + size].decode("latin1")) if major else None
+        if match is None:
+            return np.load(io.BytesIO(raw))
+        return np.frombuffer(raw, RECORD_DTYPE, count=int(match.group(1)), offset=start + size)
+
+    def _write(self, ticker: str, records: np.ndarray, meta: Dict[str, Any]) -> None:
+        data_path, meta_path = self._paths(ticker)
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_data = data_path.with_suffix(".npy.tmp")
+        with tmp_data.open("wb") as handle:
+            np.save(handle, records)
+        os.replace(tmp_data, data_path)
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+
+    def read(self, ticker: str, period: str = "1mo", *, now: Optional[datetime] = None) -> pd.DataFrame:
+        """Serve a ``period`` window for a ticker straight from disk."""
+        records = self.records(ticker)
+        if records is None or len(records) == 0:
+            raise ValueError(f"No stored price data for ticker {ticker}")
+        end = self.calendar.latest_closed_session(now)
+        start = period_start(period, end, self.calendar)
+        dates = records["date"]
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+        hi = int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        return records_to_frame(records[lo:hi])
+
+    def _covers(self, meta: Dict[str, Any], start: Optional[date]) -> bool:
+        covered_from = meta.get("covered_from")
+        if covered_from == "max":
+            return True
+        if covered_from is None or start is None:
+            return False
+        return date.fromisoformat(covered_from) <= start
+
+    def sync(self, tickers: Sequence[str], *, period: str, backend: "HistoryBackend", now: Optional[datetime] = None) -> None:
+        """
+        Bring the stored bars for ``tickers`` up to the latest closed JPX session.
+
+        A ticker is only marked as checked through that session when the backend
+        returned a frame for it (an empty frame means "no new bars"); tickers the
+        download dropped are retried on the next sync.
+        """
+        target = self.calendar.latest_closed_session(now)
+        start = period_start(period, target, self.calendar)
+        backfill: list[str] = []
+        stale: Dict[str, date] = {}
+        for ticker in dict.fromkeys(tickers):
+            meta = self._read_meta(ticker)
+            records = self.records(ticker)
+            if records is None or len(records) == 0 or not self._covers(meta, start):
+                backfill.append(ticker)
+                continue
+            checked = meta.get("checked_through")
+            if checked is None or date.fromisoformat(checked) < target:
+                stale[ticker] = records["date"][-1].astype("O")
+
+        if backfill:
+            logger.info("OHLCV store backfilling %d ticker(s) for %s", len(backfill), period)
+            frames = backend.fetch(backfill, period=period, interval=self.interval)
+            for ticker, frame in frames.items():
+                records = frame_to_records(frame)
+                records = records[records["date"] <= np.datetime64(target, "D")]
+                meta = {"covered_from": "max" if start is None else start.isoformat(), "checked_through": target.isoformat()}
+                self._write(ticker, records, meta)
+
+        if stale:
+            since = min(stale.values()) + timedelta(days=1)
+            logger.info("OHLCV store fetching bars since %s for %d ticker(s)", since, len(stale))
+            frames = backend.fetch_range(list(stale), start=since, end=target, interval=self.interval)
+            missing = [ticker for ticker in stale if ticker not in frames]
+            if missing:
+                logger.warning("No bars returned for %d ticker(s); they stay due for a refresh: %s", len(missing), ", ".join(missing[:20]))
+            for ticker, last in stale.items():
+                if ticker not in frames:
+                    continue
+                existing = np.array(self.records(ticker))
+                meta = self._read_meta(ticker)
+                meta["checked_through"] = target.isoformat()
+                new = frame_to_records(frames[ticker])
+                mask = (new["date"] > np.datetime64(last, "D")) & (new["date"] <= np.datetime64(target, "D"))
+                if mask.any():
+                    logger.debug("Appending %d bar(s) for %s", int(mask.sum()), ticker)
+                self._write(ticker, np.concatenate([existing, new[mask]]), meta)
+
+    def load(
+        self,
+        tickers: Sequence[str],
+        *,
+        period: str,
+        backend: "HistoryBackend",
+        now: Optional[datetime] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Sync the tickers, then return their ``period`` windows from disk."""
+        self.sync(tickers, period=period, backend=backend, now=now)
+        frames: Dict[str, pd.DataFrame] = {}
+        for ticker in dict.fromkeys(tickers):
+            try:
+                frame = self.read(ticker, period, now=now)
+            except ValueError:
+                continue
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
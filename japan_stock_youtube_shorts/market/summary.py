@@ -0,0 +1,240 @@
+"""
+Vectorized market-summary engine operating on a (dates x tickers) price panel.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .history import HistoryProvider, get_provider
+
+logger = logging.getLogger(__name__)
+
+# NEXT FUNDS TOPIX ETF; yfinance does not carry the TOPIX index itself.
+DEFAULT_BENCHMARK = "1306.T"
+TRADING_DAYS_PER_YEAR = 245
+GAP_THRESHOLD = 0.02
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+@dataclass(frozen=True)
+class Panel:
+    """Aligned OHLCV arrays of shape (len(dates), len(tickers)); missing bars are NaN."""
+
+    dates: pd.DatetimeIndex
+    tickers: List[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_frames(cls, frames: Mapping[str, pd.DataFrame]) -> "Panel":
+        tickers = list(frames)
+        if not tickers:
+            empty = np.empty((0, 0))
+            return cls(pd.DatetimeIndex([]), [], empty, empty, empty, empty, empty)
+        indexes = [np.asarray(frames[ticker].index.values, dtype="datetime64[ns]") for ticker in tickers]
+        stamps = np.unique(np.concatenate(indexes))
+        arrays = {name: np.full((len(stamps), len(tickers)), np.nan) for name in FIELDS}
+        for column, ticker in enumerate(tickers):
+            frame = frames[ticker]
+            rows = np.searchsorted(stamps, indexes[column])
+            columns = list(frame.columns)
+            positions = [columns.index(name) if name in columns else -1 for name in FIELDS]
+            values = frame.to_numpy(dtype="f8", na_value=np.nan)
+            for name, position in zip(FIELDS, positions):
+                if position >= 0:
+                    arrays[name][rows, column] = values[:, position]
+        dates = pd.DatetimeIndex(stamps)
+        return cls(dates, tickers, arrays["Open"], arrays["High"], arrays["Low"], arrays["Close"], arrays["Volume"])
+
+
+@dataclass(frozen=True)
+class MarketSummary:
+    """Compact per-ticker facts rendered into the script prompt."""
+
+    ticker: str
+    period: str
+    start_date: str
+    end_date: str
+    start: float
+    end: float
+    pct_change: float
+    high: float
+    low: float
+    ma5: float
+    ma25: float
+    close_vs_ma25: float
+    volatility: float
+    max_drawdown: float
+    volume_ratio: float
+    gap_days: int
+    max_gap: float
+    relative_strength: float
+    benchmark: Optional[str] = None
+
+    def render(self) -> str:
+        lines = [
+            f"{self.period} closing price: {self.start:.2f} -> {self.end:.2f} ({self.pct_change:+.2f}%). "
+            f"Highest: {self.high:.2f}, Lowest: {self.low:.2f}."
+        ]
+        if not math.isnan(self.ma25):
+            lines.append(
+                f"Moving averages: 5-day {self.ma5:.2f}, 25-day {self.ma25:.2f} "
+                f"(close {self.close_vs_ma25:+.2f}% vs 25-day)."
+            )
+        elif not math.isnan(self.ma5):
+            lines.append(f"5-day moving average: {self.ma5:.2f}.")
+        if not math.isnan(self.volatility):
+            lines.append(f"Annualized volatility: {self.volatility:.1f}%. Max drawdown: {self.max_drawdown:.2f}%.")
+        if not math.isnan(self.volume_ratio):
+            lines.append(f"Latest volume: {self.volume_ratio:.1f}x the 20-day median.")
+        if self.gap_days:
+            lines.append(f"Gap days (>= {GAP_THRESHOLD:.0%}): {self.gap_days} (largest {self.max_gap:+.2f}%).")
+        if self.benchmark and not math.isnan(self.relative_strength):
+            lines.append(f"Relative to TOPIX ({self.benchmark}): {self.relative_strength:+.2f} pts.")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.render()
+
+
+def _take(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    return values[rows, np.arange(values.shape[1])]
+
+
+def _trailing_mean(close: np.ndarray, window: int) -> np.ndarray:
+    tail = close[-window:]
+    counts = np.sum(~np.isnan(tail), axis=0)
+    means = np.nansum(tail, axis=0) / np.maximum(counts, 1)
+    return np.where(counts >= window, means, np.nan)
+
+
+def summarize_panel(
+    panel: Panel,
+    *,
+    period: str,
+    benchmark: Optional[pd.Series] = None,
+    benchmark_name: Optional[str] = DEFAULT_BENCHMARK,
+) -> List[MarketSummary]:
+    """Compute every indicator for all tickers in a handful of array passes."""
+    close = panel.close
+    if close.size == 0:
+        return []
+    n_rows = close.shape[0]
+    valid = ~np.isnan(close)
+    has_data = valid.any(axis=0)
+    first = valid.argmax(axis=0)
+    last = n_rows - 1 - valid[::-1].argmax(axis=0)
+
+    with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        start = _take(close, first)
+        end = _take(close, last)
+        pct_change = (end / start - 1.0) * 100.0
+        high = np.nanmax(np.where(np.isnan(panel.high), close, panel.high), axis=0)
+        low = np.nanmin(np.where(np.isnan(panel.low), close, panel.low), axis=0)
+
+        ma5 = _trailing_mean(close, 5)
+        ma25 = _trailing_mean(close, 25)
+        close_vs_ma25 = (end / ma25 - 1.0) * 100.0
+
+        log_returns = np.diff(np.log(close), axis=0)
+        return_counts = np.sum(~np.isnan(log_returns), axis=0)
+        volatility = np.nanstd(log_returns, axis=0, ddof=1) * math.sqrt(TRADING_DAYS_PER_YEAR) * 100.0
+        volatility = np.where(return_counts >= 2, volatility, np.nan)
+
+        running_peak = np.fmax.accumulate(close, axis=0)
+        max_drawdown = np.nanmin(close / running_peak - 1.0, axis=0) * 100.0
+
+        last_volume = _take(panel.volume, last)
+        baseline = np.nanmedian(panel.volume[-21:-1], axis=0) if n_rows > 1 else np.full(close.shape[1], np.nan)
+        volume_ratio = np.where(baseline > 0, last_volume / baseline, np.nan)
+
+        gaps = panel.open[1:] / close[:-1] - 1.0
+        gap_days = (np.abs(gaps) >= GAP_THRESHOLD).sum(axis=0)
+        if n_rows > 1:
+            abs_gaps = np.where(np.isnan(gaps), -1.0, np.abs(gaps))
+            max_gap = _take(gaps, abs_gaps.argmax(axis=0)) * 100.0
+        else:
+            max_gap = np.full(close.shape[1], np.nan)
+
+        relative_strength = np.full(close.shape[1], np.nan)
+        if benchmark is not None and not benchmark.dropna().empty:
+            aligned = benchmark.reindex(panel.dates).to_numpy(dtype="f8")
+            bench_valid = ~np.isnan(aligned)
+            if bench_valid.any():
+                # Compare each ticker against the benchmark over the ticker's own window.
+                bench_filled = pd.Series(aligned).ffill().bfill().to_numpy()
+                bench_pct = (bench_filled[last] / bench_filled[first] - 1.0) * 100.0
+                relative_strength = pct_change - bench_pct
+
+    dates = panel.dates.strftime("%Y-%m-%d")
+    summaries = []
+    for column, ticker in enumerate(panel.tickers):
+        if not has_data[column]:
+            continue
+        summaries.append(
+            MarketSummary(
+                ticker=ticker,
+                period=period,
+                start_date=dates[first[column]],
+                end_date=dates[last[column]],
+                start=float(start[column]),
+                end=float(end[column]),
+                pct_change=float(pct_change[column]),
+                high=float(high[column]),
+                low=float(low[column]),
+                ma5=float(ma5[column]),
+                ma25=float(ma25[column]),
+                close_vs_ma25=float(close_vs_ma25[column]),
+                volatility=float(volatility[column]),
+                max_drawdown=float(max_drawdown[column]),
+                volume_ratio=float(volume_ratio[column]),
+                gap_days=int(gap_days[column]),
+                max_gap=float(max_gap[column]),
+                relative_strength=float(relative_strength[column]),
+                benchmark=benchmark_name if benchmark is not None else None,
+            )
+        )
+    return summaries
+
+
+def summarize_frames(
+    frames: Mapping[str, pd.DataFrame],
+    *,
+    period: str,
+    benchmark: Optional[pd.DataFrame] = None,
+    benchmark_name: Optional[str] = DEFAULT_BENCHMARK,
+) -> Dict[str, MarketSummary]:
+    """Build a panel from per-ticker frames and summarize it, keyed by ticker."""
+    panel = Panel.from_frames(frames)
+    bench_close = benchmark["Close"] if benchmark is not None and "Close" in benchmark else None
+    summaries = summarize_panel(panel, period=period, benchmark=bench_close, benchmark_name=benchmark_name)
+    logger.debug("Summarized %d ticker(s) over %d session(s)", len(summaries), len(panel.dates))
+    return {summary.ticker: summary for summary in summaries}
+
+
+def summarize_universe(
+    tickers: Sequence[str],
+    *,
+    period: str = "1mo",
+    provider: Optional[HistoryProvider] = None,
+    benchmark: Optional[str] = DEFAULT_BENCHMARK,
+) -> Dict[str, MarketSummary]:
+    """Fetch (one grouped request) and summarize a whole ticker universe."""
+    history_provider = provider or get_provider()
+    wanted = list(tickers) + ([benchmark] if benchmark and benchmark not in tickers else [])
+    frames = history_provider.prefetch(wanted, period=period)
+    bench_frame = frames.get(benchmark) if benchmark else None
+    universe = {ticker: frames[ticker] for ticker in tickers if ticker in frames}
+    return summarize_frames(universe, period=period, benchmark=bench_frame, benchmark_name=benchmark)
@@ -0,0 +1,259 @@
+"""
+In-process run metrics with OpenMetrics text and JSON report output.
+
+Counters, gauges and latency histograms are keyed by metric name plus labels.
+Worker processes drain their registry into the results they send back so the
+parent's registry covers the whole run.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "shorts"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# name -> (type, help). Counter names omit the ``_total`` suffix added on output.
+METRICS: Dict[str, Tuple[str, str]] = {
+    "stage_seconds": ("histogram", "Wall time of one pipeline stage for one ticker."),
+    "stages": ("counter", "Pipeline stages finished, by outcome."),
+    "market_fetch_seconds": ("histogram", "Latency of one grouped price-history download."),
+    "market_rows": ("counter", "Price bars received from the history backend."),
+    "market_bytes": ("counter", "In-memory size of the price bars received from the history backend."),
+    "intraday_bars": ("counter", "Intraday bars folded into the watch indicators."),
+    "intraday_triggers": ("counter", "Intraday trigger events, by reason (move/window)."),
+    "intraday_dispatch_errors": ("counter", "Trigger events whose chart or script job could not be started."),
+    "openai_request_seconds": ("histogram", "Latency of one OpenAI chat completion request."),
+    "openai_ttft_seconds": ("histogram", "Time to the first content token of a streamed OpenAI completion."),
+    "openai_generation_seconds": ("histogram", "Time from the first to the last token of a streamed OpenAI completion."),
+    "openai_tokens": ("counter", "Tokens reported by OpenAI usage, by kind (prompt/completion)."),
+    "script_pack_tickers": ("counter", "Tickers sent in packed script requests, by outcome (ok/missing)."),
+    "tts_request_seconds": ("histogram", "Latency of one sentence synthesis request, by TTS backend."),
+    "tts_characters": ("counter", "Characters sent to a TTS backend (cache misses only)."),
+    "notion_request_seconds": ("histogram", "Latency of one Notion API request."),
+    "notion_throttle_seconds": ("counter", "Time spent waiting on the client-side Notion rate limiter."),
+    "retries": ("counter", "Retried calls after a retryable error, by operation."),
+    "cache_lookups": ("counter", "Cache lookups by cache and result (hit/miss/bypass)."),
+    "render_seconds": ("histogram", "Time to render one chart, video or narration, by kind."),
+    "screen_seconds": ("histogram", "Time to score and rank the ticker universe."),
+    "run_duration_seconds": ("gauge", "Wall time of the last run."),
+    "run_failed_rows": ("gauge", "Batch rows with at least one failed stage in the last run."),
+    "last_run_timestamp_seconds": ("gauge", "Unix time the last run finished."),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [*labels, *([extra] if extra else [])]
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts: List[int], total: float) -> None:
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += sum(counts)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        running = 0
+        out = []
+        for bound, count in zip([*map(repr, self.buckets), "+Inf"], self.counts):
+            running += count
+            out.append((bound, running))
+        return out
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges, histograms and per-stage events."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self.events: List[Dict[str, Any]] = []
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._gauges[(name, _labels(labels))] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the duration of the ``with`` block, including when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def record_stage(self, stage: str, seconds: float, *, ticker: Optional[str] = None, status: str = "ok", **detail: Any) -> None:
+        """Record a stage timing; the per-ticker event only goes to the JSON report."""
+        self.observe("stage_seconds", seconds, stage=stage)
+        self.inc("stages", stage=stage, status=status)
+        event = {"stage": stage, "ticker": ticker, "status": status, "seconds": round(seconds, 4), **detail}
+        with self._lock:
+            self.events.append(event)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return {
+            "counters": [[name, list(map(list, labels)), value] for (name, labels), value in self._counters.items()],
+            "gauges": [[name, list(map(list, labels)), value] for (name, labels), value in self._gauges.items()],
+            "histograms": [
+                [name, list(map(list, labels)), list(hist.counts), hist.sum] for (name, labels), hist in self._histograms.items()
+            ],
+            "events": list(self.events),
+        }
+
+    def _clear(self) -> None:
+        self._counters.clear()
+        self._gauges.clear()
+        self._histograms.clear()
+        self.events.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable copy of every series."""
+        with self._lock:
+            return self._snapshot()
+
+    def drain(self) -> Dict[str, Any]:
+        """Snapshot and reset, e.g. before handing a worker's metrics to the parent."""
+        with self._lock:
+            snapshot = self._snapshot()
+            self._clear()
+        return snapshot
+
+    def merge(self, snapshot: Optional[Dict[str, Any]]) -> None:
+        if not snapshot:
+            return
+        with self._lock:
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                self._counters[key] = self._counters.get(key, 0.0) + value
+            for name, labels, value in snapshot["gauges"]:
+                self._gauges[(name, tuple(map(tuple, labels)))] = value
+            for name, labels, counts, total in snapshot["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram()
+                histogram.merge(counts, total)
+            self.events.extend(snapshot["events"])
+
+    def reset(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def render_openmetrics(self) -> str:
+        """Render every series in the OpenMetrics text format."""
+        with self._lock:
+            families: Dict[str, List[str]] = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                families.setdefault(name, []).append(f"{PREFIX}_{name}_total{_format_labels(labels)} {float(value)!r}")
+            for (name, labels), value in sorted(self._gauges.items()):
+                families.setdefault(name, []).append(f"{PREFIX}_{name}{_format_labels(labels)} {float(value)!r}")
+            for (name, labels), hist in sorted(self._histograms.items()):
+                lines = families.setdefault(name, [])
+                for bound, count in hist.cumulative():
+                    lines.append(f"{PREFIX}_{name}_bucket{_format_labels(labels, ('le', bound))} {count}")
+                lines.append(f"{PREFIX}_{name}_count{_format_labels(labels)} {hist.count}")
+                lines.append(f"{PREFIX}_{name}_sum{_format_labels(labels)} {hist.sum!r}")
+        out: List[str] = []
+        for name in sorted(families):
+            kind, help_text = METRICS.get(name, ("unknown", ""))
+            out.append(f"# TYPE {PREFIX}_{name} {kind}")
+            if help_text:
+                out.append(f"# HELP {PREFIX}_{name} {help_text}")
+            out.extend(families[name])
+        out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+    def cache_hit_rates(self) -> Dict[str, float]:
+        lookups: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                if name == "cache_lookups":
+                    values = dict(labels)
+                    by_result = lookups.setdefault(values.get("cache", ""), {})
+                    by_result[values.get("result", "")] = by_result.get(values.get("result", ""), 0.0) + value
+        return {
+            cache: counts.get("hit", 0.0) / (counts.get("hit", 0.0) + counts.get("miss", 0.0))
+            for cache, counts in lookups.items()
+            if counts.get("hit", 0.0) + counts.get("miss", 0.0)
+        }
+
+    def report(self, **run: Any) -> Dict[str, Any]:
+        """The JSON run report: run metadata, cache hit rates and every series."""
+        return {"run": {"started": self.started, **run}, "cache_hit_rates": self.cache_hit_rates(), **self.snapshot()}
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_textfile(registry: "MetricsRegistry", path: Path) -> Path:
+    """Write the OpenMetrics dump atomically, as node_exporter's textfile collector expects."""
+    _write_atomic(path, registry.render_openmetrics())
+    logger.info("Wrote metrics textfile to %s", path)
+    return path
+
+
+def write_report(registry: "MetricsRegistry", path: Path, **run: Any) -> Path:
+    _write_atomic(path, json.dumps(registry.report(**run), ensure_ascii=False, indent=2, default=str))
+    logger.info("Wrote run report to %s", path)
+    return path
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return this process's metrics registry."""
+    return _registry
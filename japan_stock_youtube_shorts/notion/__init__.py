@@ -1,7 +1,28 @@
 """Notion helpers for syncing pipeline outputs."""
 
-from .notion_client import NotionClient
-from . import updater
-from .health import healthcheck
+from __future__ import annotations
 
-__all__ = ["NotionClient", "updater", "healthcheck"]
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from . import updater
+    from .async_client import AsyncNotionClient
+    from .health import healthcheck
+    from .mirror import NotionMirror
+    from .notion_client import NotionClient, get_notion_client
+    from .write_queue import NotionWriteQueue
+
+_EXPORTS = {
+    "AsyncNotionClient": ".async_client",
+    "NotionClient": ".notion_client",
+    "NotionMirror": ".mirror",
+    "NotionWriteQueue": ".write_queue",
+    "get_notion_client": ".notion_client",
+    "updater": ".updater",
+    "healthcheck": ".health",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
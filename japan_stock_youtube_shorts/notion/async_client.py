@@ -0,0 +1,153 @@
+"""
+Asyncio Notion client for streaming large databases.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from notion_client import AsyncClient
+
+from ..config import RuntimeConfig
+from ..metrics import get_metrics
+from ..utils import is_retryable, retry_after_seconds
+from .data_sources import first_data_source, queries_data_sources
+
+logger = logging.getLogger(__name__)
+
+NOTION_PAGE_SIZE = 100
+
+
+class AsyncRateLimiter:
+    """Space awaited calls at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Wait for the next slot and return the seconds waited."""
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return max(slot - now, 0.0)
+
+
+class AsyncNotionClient:
+    """Non-blocking counterpart of ``NotionClient`` for reads over whole databases."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        runtime: Optional[RuntimeConfig] = None,
+        *,
+        limiter: Optional[AsyncRateLimiter] = None,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        **client_options: Any,
+    ) -> None:
+        self.runtime = runtime or RuntimeConfig.from_env()
+        self.token = token or os.getenv("NOTION_API_KEY")
+        if not self.token:
+            raise ValueError(
+                "NOTION_API_KEY is required. Configure via GitHub secrets or environment variables; avoid printing the token."
+            )
+        self.client = AsyncClient(auth=self.token, **client_options)
+        self.limiter = limiter or AsyncRateLimiter(float(os.getenv("NOTION_REQUESTS_PER_SECOND", "3")))
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self._data_sources: Dict[str, str] = {}
+
+    async def _call(self, operation: str, method: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Rate-limit and retry one API call (only retryable errors are retried)."""
+        metrics = get_metrics()
+        for attempt in range(1, self.max_attempts + 1):
+            metrics.inc("notion_throttle_seconds", await self.limiter.acquire())
+            try:
+                with metrics.timer("notion_request_seconds", operation=operation):
+                    return await method(**kwargs)
+            except Exception as exc:  # noqa: BLE001
+                if not is_retryable(exc) or attempt == self.max_attempts:
+                    raise
+                metrics.inc("retries", operation=f"AsyncNotionClient.{operation}")
+                delay = retry_after_seconds(exc)
+                if delay is None:
+                    delay = min(self.base_delay * 2 ** (attempt - 1), 30.0) * random.uniform(0.8, 1.2)
+                logger.warning("Notion request failed (%s); retry %d/%d in %.1fs", exc, attempt, self.max_attempts - 1, delay)
+                await asyncio.sleep(delay)
+        raise RuntimeError("Notion request did not complete.")
+
+    async def data_source_id(self, database_id: str) -> str:
+        """The data source queried for ``database_id`` (notion-client 3.x), looked up once per database."""
+        source = self._data_sources.get(database_id)
+        if source is None:
+            database = await self._call("databases.retrieve", self.client.databases.retrieve, database_id=database_id)
+            source = self._data_sources[database_id] = first_data_source(database)
+        return source
+
+    async def query_database(self, database_id: str, **kwargs: Any) -> Dict[str, Any]:
+        """Fetch one page of query results."""
+        logger.debug("Querying Notion database %s with params %s", database_id, kwargs)
+        if queries_data_sources(self.client):
+            source = await self.data_source_id(database_id)
+            return await self._call("data_sources.query", self.client.data_sources.query, data_source_id=source, **kwargs)
+        return await self._call("databases.query", self.client.databases.query, database_id=database_id, **kwargs)
+
+    async def iter_database(
+        self,
+        database_id: str,
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        filter_properties: Optional[List[str]] = None,
+        page_size: int = NOTION_PAGE_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every row matching ``filter``/``sorts``, following ``next_cursor``.
+
+        Filtering, sorting and property selection are done by Notion. The request for
+        the next page is in flight while the caller consumes the current one, so at
+        most two pages are held in memory.
+        """
+        params: Dict[str, Any] = {"page_size": min(page_size, NOTION_PAGE_SIZE)}
+        if filter:
+            params["filter"] = filter
+        if sorts:
+            params["sorts"] = sorts
+        if filter_properties:
+            params["filter_properties"] = filter_properties
+
+        pending: Optional[asyncio.Task] = asyncio.ensure_future(self.query_database(database_id, **params))
+        pages = 0
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
+                pages += 1
+                cursor = response.get("next_cursor")
+                if response.get("has_more") and cursor:
+                    pending = asyncio.ensure_future(self.query_database(database_id, **params, start_cursor=cursor))
+                for row in response.get("results", []):
+                    yield row
+        finally:
+            if pending is not None:
+                pending.cancel()
+            logger.debug("Read %d result page(s) from Notion database %s", pages, database_id)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncNotionClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
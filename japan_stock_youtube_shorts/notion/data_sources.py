@@ -0,0 +1,25 @@
+"""
+Database queries across notion-client versions.
+
+notion-client 3.x speaks Notion-Version 2025-09-03, where ``databases.query`` is
+gone: rows are queried from one of the database's data sources, whose id differs
+from the database id and is listed by ``databases.retrieve``. Both the sync and
+the async client resolve it with these helpers and cache it per database.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+
+def queries_data_sources(client: Any) -> bool:
+    """True when ``client`` (a notion-client ``Client``/``AsyncClient``) has no ``databases.query``."""
+    return not hasattr(client.databases, "query")
+
+
+def first_data_source(database: Mapping[str, Any]) -> str:
+    """The data source id to query, from a ``databases.retrieve`` response."""
+    sources = database.get("data_sources") or []
+    if not sources:
+        raise ValueError(f"Notion database {database.get('id', '?')} has no data sources to query.")
+    return sources[0]["id"]
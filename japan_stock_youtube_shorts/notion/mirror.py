@@ -0,0 +1,192 @@
+"""
+Local SQLite mirror of the Video_Artifacts database.
+
+Lookups such as "next version of artifact X" or "pages in status Y" are answered
+from indexed local tables. The mirror is refreshed incrementally by querying only
+pages whose ``last_edited_time`` is at or after the last one seen.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config import ASSETS_DIR
+from .properties import find_property, property_text, title_text
+
+logger = logging.getLogger(__name__)
+
+_VERSION_SUFFIX = re.compile(r"[_-]?v?\d+$", re.IGNORECASE)
+
+
+def normalize_id(notion_id: str) -> str:
+    """Notion ids appear both with and without dashes."""
+    return notion_id.replace("-", "").lower()
+
+
+def artifact_base(artifact_id: str) -> str:
+    """Strip a trailing version (``DOE_script_v3`` -> ``DOE_script``, ``IDEA_02`` -> ``IDEA``)."""
+    return _VERSION_SUFFIX.sub("", artifact_id) or artifact_id
+
+
+@dataclass(frozen=True)
+class MirrorRow:
+    page_id: str
+    name: str
+    artifact_id: str
+    artifact_type: str
+    version: Optional[int]
+    status: str
+    last_edited: str
+
+
+def row_from_page(page: Dict[str, Any]) -> MirrorRow:
+    properties = page.get("properties", {})
+    name = title_text(properties)
+    artifact_id = property_text(find_property(properties, "artifact_id")) or name
+    version_text = property_text(find_property(properties, "version"))
+    try:
+        version: Optional[int] = int(float(version_text)) if version_text else None
+    except ValueError:
+        version = None
+    return MirrorRow(
+        page_id=page["id"],
+        name=name,
+        artifact_id=artifact_id,
+        artifact_type=property_text(find_property(properties, "artifact_type")),
+        version=version,
+        status=property_text(find_property(properties, "status")),
+        last_edited=page.get("last_edited_time", ""),
+    )
+
+
+class NotionMirror:
+    """SQLite index of artifact pages keyed by page id."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or Path(os.getenv("NOTION_MIRROR_PATH") or ASSETS_DIR / "cache" / "notion_mirror.sqlite3")
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                page_id TEXT PRIMARY KEY,
+                database_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                artifact_id TEXT NOT NULL,
+                artifact_base TEXT NOT NULL,
+                artifact_type TEXT NOT NULL,
+                version INTEGER,
+                status TEXT NOT NULL,
+                last_edited TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS pages_artifact ON pages (database_id, artifact_id);
+            CREATE INDEX IF NOT EXISTS pages_base_version ON pages (database_id, artifact_base, version);
+            CREATE INDEX IF NOT EXISTS pages_type_version ON pages (database_id, artifact_type, version);
+            CREATE INDEX IF NOT EXISTS pages_status ON pages (database_id, status);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                database_id TEXT PRIMARY KEY,
+                watermark TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def upsert(self, database_id: str, pages: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace mirrored pages; archived/trashed pages are removed."""
+        database_id = normalize_id(database_id)
+        count = 0
+        with self._lock:
+            for page in pages:
+                if page.get("archived") or page.get("in_trash"):
+                    self._conn.execute("DELETE FROM pages WHERE page_id = ?", (page["id"],))
+                    continue
+                row = row_from_page(page)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        row.page_id,
+                        database_id,
+                        row.name,
+                        row.artifact_id,
+                        artifact_base(row.artifact_id),
+                        row.artifact_type,
+                        row.version,
+                        row.status,
+                        row.last_edited,
+                    ),
+                )
+                count += 1
+            self._conn.commit()
+        return count
+
+    def watermark(self, database_id: str) -> Optional[str]:
+        database_id = normalize_id(database_id)
+        with self._lock:
+            row = self._conn.execute("SELECT watermark FROM sync_state WHERE database_id = ?", (database_id,)).fetchone()
+        return row[0] if row else None
+
+    def synced_at(self, database_id: str) -> Optional[float]:
+        database_id = normalize_id(database_id)
+        with self._lock:
+            row = self._conn.execute("SELECT synced_at FROM sync_state WHERE database_id = ?", (database_id,)).fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, database_id: str, watermark: str) -> None:
+        database_id = normalize_id(database_id)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (database_id, watermark, synced_at) VALUES (?, ?, ?)",
+                (database_id, watermark, time.time()),
+            )
+            self._conn.commit()
+
+    def reset(self, database_id: str) -> None:
+        database_id = normalize_id(database_id)
+        with self._lock:
+            self._conn.execute("DELETE FROM pages WHERE database_id = ?", (database_id,))
+            self._conn.execute("DELETE FROM sync_state WHERE database_id = ?", (database_id,))
+            self._conn.commit()
+
+    def max_edited(self, database_id: str) -> Optional[str]:
+        database_id = normalize_id(database_id)
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(last_edited) FROM pages WHERE database_id = ?", (database_id,)).fetchone()
+        return row[0] if row else None
+
+    def next_version(self, database_id: str, artifact: Optional[str] = None, *, artifact_type: Optional[str] = None) -> int:
+        """1 + the highest mirrored version for ``artifact`` (a base id such as ``DOE_script``) and/or type."""
+        clauses, params = ["database_id = ?"], [normalize_id(database_id)]
+        if artifact:
+            clauses.append("artifact_base = ?")
+            params.append(artifact_base(artifact))
+        if artifact_type:
+            clauses.append("artifact_type = ?")
+            params.append(artifact_type)
+        with self._lock:
+            row = self._conn.execute(f"SELECT MAX(version) FROM pages WHERE {' AND '.join(clauses)}", params).fetchone()
+        return (row[0] or 0) + 1
+
+    def pages_in_status(self, database_id: str, status: str, *, artifact_type: Optional[str] = None) -> List[MirrorRow]:
+        query = "SELECT page_id, name, artifact_id, artifact_type, version, status, last_edited FROM pages WHERE database_id = ? AND status = ?"
+        params: List[Any] = [normalize_id(database_id), status]
+        if artifact_type:
+            query += " AND artifact_type = ?"
+            params.append(artifact_type)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY last_edited", params).fetchall()
+        return [MirrorRow(*row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
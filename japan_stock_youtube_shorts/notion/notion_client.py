@@ -6,40 +6,190 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any, Dict, Optional
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from notion_client import Client
 from notion_client.errors import APIResponseError
 
 from ..config import RuntimeConfig
+from ..metrics import get_metrics
 from ..utils import retry_with_backoff
+from .data_sources import first_data_source, queries_data_sources
+from .mirror import MirrorRow, NotionMirror
 
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """Thread-safe pacing of calls to at most ``rate`` per second."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Wait for the next slot and return the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+        return max(slot - now, 0.0)
+
+
+# Notion allows an average of ~3 requests per second per integration.
+_limiter = RateLimiter(float(os.getenv("NOTION_REQUESTS_PER_SECOND", "3")))
+
+
 class NotionClient:
     """Simple wrapper that centralizes authentication and common helpers."""
 
-    def __init__(self, token: Optional[str] = None, runtime: Optional[RuntimeConfig] = None) -> None:
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        runtime: Optional[RuntimeConfig] = None,
+        *,
+        limiter: Optional[RateLimiter] = None,
+        **client_options: Any,
+    ) -> None:
         self.runtime = runtime or RuntimeConfig.from_env()
         self.token = token or os.getenv("NOTION_API_KEY")
         if not self.token:
             raise ValueError(
                 "NOTION_API_KEY is required. Configure via GitHub secrets or environment variables; avoid printing the token."
             )
-        self.client = Client(auth=self.token)
+        self.client = Client(auth=self.token, **client_options)
+        self.limiter = limiter or _limiter
+        self._mirror: Optional[NotionMirror] = None
+        self._data_sources: Dict[str, str] = {}
+
+    @property
+    def mirror(self) -> NotionMirror:
+        if self._mirror is None:
+            self._mirror = NotionMirror()
+        return self._mirror
+
+    def _request(self, operation: str, method: Callable[..., Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        """Rate-limit and time one API call."""
+        metrics = get_metrics()
+        metrics.inc("notion_throttle_seconds", self.limiter.acquire())
+        with metrics.timer("notion_request_seconds", operation=operation):
+            return method(**kwargs)
+
+    @staticmethod
+    def _database_id(database_id: Optional[str]) -> str:
+        resolved = database_id or os.getenv("NOTION_DATABASE_ID")
+        if not resolved:
+            raise ValueError("NOTION_DATABASE_ID is required for database lookups.")
+        return resolved
+
+    def data_source_id(self, database_id: str) -> str:
+        """The data source queried for ``database_id`` (notion-client 3.x), looked up once per database."""
+        source = self._data_sources.get(database_id)
+        if source is None:
+            database = self._request("databases.retrieve", self.client.databases.retrieve, database_id=database_id)
+            source = self._data_sources[database_id] = first_data_source(database)
+        return source
 
     @retry_with_backoff()
     def query_database(self, database_id: str, **kwargs: Any) -> Dict[str, Any]:
         """Query a database with optional filter/sort parameters."""
         logger.debug("Querying Notion database %s with params %s", database_id, kwargs)
-        return self.client.databases.query(database_id=database_id, **kwargs)
+        if queries_data_sources(self.client):
+            source = self.data_source_id(database_id)
+            return self._request("data_sources.query", self.client.data_sources.query, data_source_id=source, **kwargs)
+        return self._request("databases.query", self.client.databases.query, database_id=database_id, **kwargs)
+
+    def iter_database(self, database_id: str, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """Yield every row of a query, following ``next_cursor``."""
+        cursor = None
+        while True:
+            params = dict(kwargs, page_size=100)
+            if cursor:
+                params["start_cursor"] = cursor
+            response = self.query_database(database_id, **params)
+            yield from response.get("results", [])
+            cursor = response.get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                return
+
+    def sync_mirror(self, database_id: Optional[str] = None, *, full: bool = False, max_age: float = 0.0) -> int:
+        """
+        Bring the local mirror up to date and return the number of pages refreshed.
+
+        Only pages edited at or after the last seen ``last_edited_time`` are fetched
+        (that timestamp has minute precision, so the boundary minute is re-read).
+        ``full`` rebuilds the mirror, which also drops pages deleted in Notion.
+        Nothing is fetched if the last sync is younger than ``max_age`` seconds.
+        """
+        database_id = self._database_id(database_id)
+        mirror = self.mirror
+        synced_at = mirror.synced_at(database_id)
+        if not full and max_age and synced_at and time.time() - synced_at < max_age:
+            return 0
+        if full:
+            mirror.reset(database_id)
+        watermark = mirror.watermark(database_id)
+        query: Dict[str, Any] = {"sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}]}
+        if watermark:
+            query["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": watermark}}
+        count = 0
+        chunk: List[Dict[str, Any]] = []
+        for page in self.iter_database(database_id, **query):
+            chunk.append(page)
+            if len(chunk) >= 100:
+                count += mirror.upsert(database_id, chunk)
+                chunk = []
+        count += mirror.upsert(database_id, chunk)
+        mirror.mark_synced(database_id, mirror.max_edited(database_id) or watermark or "")
+        logger.info("Notion mirror synced %d page(s) for database %s", count, database_id)
+        return count
+
+    def next_version(
+        self,
+        artifact: Optional[str] = None,
+        *,
+        artifact_type: Optional[str] = None,
+        database_id: Optional[str] = None,
+        max_age: float = 60.0,
+    ) -> int:
+        """Next version number for ``artifact`` (e.g. ``DOE_script``), answered from the mirror."""
+        database_id = self._database_id(database_id)
+        self.sync_mirror(database_id, max_age=max_age)
+        return self.mirror.next_version(database_id, artifact, artifact_type=artifact_type)
+
+    def pages_in_status(
+        self,
+        status: str,
+        *,
+        artifact_type: Optional[str] = None,
+        database_id: Optional[str] = None,
+        max_age: float = 60.0,
+    ) -> List[MirrorRow]:
+        """Mirrored pages whose status equals ``status``."""
+        database_id = self._database_id(database_id)
+        self.sync_mirror(database_id, max_age=max_age)
+        return self.mirror.pages_in_status(database_id, status, artifact_type=artifact_type)
+
+    def create_page(self, database_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a database row and record it in the mirror (not retried: creates are not idempotent)."""
+        if self.runtime.dry_run:
+            logger.info("[dry-run] Skipping Notion page creation in %s", database_id)
+            return {"dry_run": True, "database_id": database_id, "properties": properties}
+        logger.info("Creating page in Notion database %s", database_id)
+        page = self._request("pages.create", self.client.pages.create, parent={"database_id": database_id}, properties=properties)
+        self.mirror.upsert(database_id, [page])
+        return page
 
     @retry_with_backoff()
     def retrieve_page(self, page_id: str) -> Dict[str, Any]:
         """Retrieve a single page."""
         logger.debug("Retrieving Notion page %s", page_id)
-        return self.client.pages.retrieve(page_id=page_id)
+        return self._request("pages.retrieve", self.client.pages.retrieve, page_id=page_id)
 
     @retry_with_backoff()
     def update_page_properties(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
@@ -49,7 +199,11 @@ class NotionClient:
             return {"dry_run": True, "page_id": page_id, "properties": properties}
         logger.info("Updating properties on Notion page %s", page_id)
         logger.debug("Properties payload keys: %s", list(properties.keys()))
-        return self.client.pages.update(page_id=page_id, properties=properties)
+        page = self._request("pages.update", self.client.pages.update, page_id=page_id, properties=properties)
+        parent = page.get("parent", {}) if isinstance(page, dict) else {}
+        if self._mirror is not None and parent.get("database_id"):
+            self._mirror.upsert(parent["database_id"], [page])
+        return page
 
     @retry_with_backoff()
     def set_status(self, page_id: str, status_name: str) -> Dict[str, Any]:
@@ -66,7 +220,9 @@ class NotionClient:
             logger.info("[dry-run] Skipping Notion comment append for %s", page_id)
             return {"dry_run": True, "page_id": page_id, "content": content}
         logger.info("Appending comment to page %s", page_id)
-        return self.client.comments.create(
+        return self._request(
+            "comments.create",
+            self.client.comments.create,
             parent={"page_id": page_id},
             rich_text=[{"type": "text", "text": {"content": content}}],
         )
@@ -78,3 +234,21 @@ class NotionClient:
             self.append_comment(page_id, message)
         except APIResponseError:
             logger.error("Failed to log exception to Notion for %s", page_id, exc_info=True)
+
+
+_shared: Dict[Tuple[Optional[str], Optional[RuntimeConfig]], NotionClient] = {}
+_shared_lock = threading.Lock()
+
+
+def get_notion_client(runtime: Optional[RuntimeConfig] = None, token: Optional[str] = None) -> NotionClient:
+    """
+    Return a process-wide ``NotionClient`` so the HTTP session and rate limiter are reused.
+
+    Without ``runtime`` the first client created from the environment is returned.
+    """
+    key = (token, runtime)
+    with _shared_lock:
+        client = _shared.get(key)
+        if client is None:
+            client = _shared[key] = NotionClient(token=token, runtime=runtime)
+        return client
@@ -0,0 +1,40 @@
+"""
+Helpers for reading values out of Notion property payloads.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+
+def property_text(prop: Optional[Dict[str, Any]]) -> str:
+    """Plain-text value of a title/rich_text/select/status/url/number/formula property."""
+    if not prop:
+        return ""
+    kind = prop.get("type")
+    value = prop.get(kind) if kind else None
+    if kind in {"title", "rich_text"}:
+        return "".join(part.get("plain_text") or part.get("text", {}).get("content", "") for part in value or []).strip()
+    if kind in {"select", "status"}:
+        return (value or {}).get("name", "")
+    if kind == "formula":
+        return str((value or {}).get((value or {}).get("type", ""), "") or "")
+    return "" if value is None else str(value)
+
+
+def find_property(properties: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    """Look up ``name`` case-insensitively (the databases mix ``status`` and ``Status``)."""
+    if name in properties:
+        return properties[name]
+    lowered = name.lower()
+    for key, value in properties.items():
+        if key.lower() == lowered:
+            return value
+    return None
+
+
+def title_text(properties: Dict[str, Any]) -> str:
+    for value in properties.values():
+        if isinstance(value, dict) and value.get("type") == "title":
+            return property_text(value)
+    return ""
@@ -0,0 +1,129 @@
+"""
+Coalescing queue for Notion page property updates.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from ..config import RuntimeConfig
+from .notion_client import NotionClient, get_notion_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+    properties: Dict[str, Any] = field(default_factory=dict)
+    futures: List[Future] = field(default_factory=list)
+
+
+class NotionWriteQueue:
+    """
+    Merge property updates per page and send each page's merge as one ``pages.update``.
+
+    Updates enqueued for a page that is still waiting for a worker are folded into
+    the same request (later values win per property). Writes to one page never
+    overlap: updates arriving while its request is in flight are merged and sent
+    after that request returns, so an older value cannot land after a newer one.
+    Workers share one ``NotionClient`` whose rate limiter keeps the integration
+    under Notion's limit.
+    """
+
+    def __init__(
+        self,
+        client: Optional[NotionClient] = None,
+        *,
+        runtime: Optional[RuntimeConfig] = None,
+        workers: int = 3,
+    ) -> None:
+        self._client = client
+        self.runtime = runtime
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notion-write")
+        self._pending: Dict[str, _PendingWrite] = {}
+        self._running: Set[str] = set()
+        self._inflight: List[Future] = []
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.merged = 0
+        self.failures: Dict[str, BaseException] = {}
+
+    @property
+    def client(self) -> NotionClient:
+        if self._client is None:
+            self._client = get_notion_client(self.runtime)
+        return self._client
+
+    def enqueue(self, page_id: str, properties: Dict[str, Any]) -> Future:
+        """Schedule ``properties`` for ``page_id``; the future resolves to the API response."""
+        future: Future = Future()
+        with self._lock:
+            pending = self._pending.get(page_id)
+            if pending is None:
+                pending = self._pending[page_id] = _PendingWrite()
+                if page_id not in self._running:
+                    self._inflight.append(self._pool.submit(self._write, page_id))
+            else:
+                self.merged += 1
+            pending.properties.update(properties)
+            pending.futures.append(future)
+        return future
+
+    def _write(self, page_id: str) -> None:
+        with self._lock:
+            pending = self._pending.pop(page_id)
+            self._running.add(page_id)
+            self.requests += 1
+        result: Any = None
+        # Whatever escapes below, every caller waiting on this page is released.
+        error: Optional[BaseException] = RuntimeError(f"Notion update for {page_id} did not complete")
+        try:
+            result = self.client.update_page_properties(page_id, pending.properties)
+            error = None
+        except Exception as exc:  # noqa: BLE001
+            error = exc
+            logger.error("Notion update failed for %s: %s", page_id, exc)
+            with self._lock:
+                self.failures[page_id] = exc
+            if self._client is not None:
+                try:
+                    self._client.log_exception(page_id, exc)
+                except Exception as log_exc:  # noqa: BLE001
+                    logger.warning("Could not log the Notion failure for %s: %s", page_id, log_exc)
+        finally:
+            for future in pending.futures:
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+            with self._lock:
+                # Updates that arrived during the call go out next, never alongside it.
+                if page_id in self._pending:
+                    self._inflight.append(self._pool.submit(self._write, page_id))
+                else:
+                    self._running.discard(page_id)
+
+    def flush(self) -> None:
+        """Block until every update enqueued so far has been written (or failed)."""
+        while True:
+            with self._lock:
+                inflight, self._inflight = self._inflight, []
+            if not inflight:
+                break
+            # Follow-up writes are chained onto ``_inflight`` before their predecessor finishes.
+            wait(inflight)
+        logger.info("Notion write queue: %d request(s), %d update(s) merged", self.requests, self.merged)
+
+    def close(self) -> None:
+        self.flush()
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "NotionWriteQueue":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
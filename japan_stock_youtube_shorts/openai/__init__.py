@@ -1,7 +1,28 @@
 """OpenAI wrappers for prompt and code generation."""
 
-from .prompt_generator import PromptContext, PromptGenerator
-from .codex_helper import CodexHelper
-from .health import healthcheck
+from __future__ import annotations
 
-__all__ = ["PromptContext", "PromptGenerator", "CodexHelper", "healthcheck"]
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .async_generator import AsyncPromptGenerator, BackgroundScriptGenerator, TokenBucket
+    from .codex_helper import CodexHelper
+    from .health import healthcheck
+    from .packed_generator import PackedScriptGenerator
+    from .prompt_generator import PromptContext, PromptGenerator
+
+_EXPORTS = {
+    "PromptContext": ".prompt_generator",
+    "PromptGenerator": ".prompt_generator",
+    "AsyncPromptGenerator": ".async_generator",
+    "BackgroundScriptGenerator": ".async_generator",
+    "TokenBucket": ".async_generator",
+    "PackedScriptGenerator": ".packed_generator",
+    "CodexHelper": ".codex_helper",
+    "healthcheck": ".health",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,285 @@
+"""
+Concurrent script generation on ``AsyncOpenAI`` with rate-limit awareness.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from ..config import RuntimeConfig
+from ..metrics import get_metrics
+from ..utils import is_retryable, retry_after_seconds, status_code
+from .client import async_openai_client
+from .completion_cache import CacheMode, CompletionCache, get_cache
+from .prompt_generator import (
+    DRY_RUN_SCRIPT,
+    SCRIPT_SYSTEM_PROMPT,
+    PromptContext,
+    PromptGenerator,
+    StockSummary,
+    build_script_prompt,
+    record_usage,
+)
+
+logger = logging.getLogger(__name__)
+
+COMPLETION_TOKEN_ALLOWANCE = 800
+
+
+def parse_reset(value: str) -> Optional[float]:
+    """Parse OpenAI reset durations such as ``"1s"``, ``"6m0s"`` or ``"20ms"`` into seconds."""
+    units = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value)
+    if not parts:
+        return None
+    return sum(float(amount) * units[unit] for amount, unit in parts)
+
+
+def estimate_tokens(messages: Sequence[Mapping[str, str]]) -> int:
+    """Rough upper bound on tokens for a request (Japanese text is ~1 token per character)."""
+    return sum(len(message.get("content", "")) for message in messages) + COMPLETION_TOKEN_ALLOWANCE
+
+
+@dataclass
+class _Bucket:
+    capacity: float
+    level: float
+    updated: float = field(default_factory=time.monotonic)
+    blocked_until: float = 0.0
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / 60.0
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def delay_for(self, amount: float, now: float) -> float:
+        self.refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_per_second
+
+
+class TokenBucket:
+    """
+    Request + token limiter refilled per minute.
+
+    Starts from configured RPM/TPM quotas and is re-synchronised from the
+    ``x-ratelimit-*`` headers of every response, so the local view never drifts far
+    from what the API reports.
+    """
+
+    def __init__(self, *, requests_per_minute: float = 500, tokens_per_minute: float = 200_000) -> None:
+        self.requests = _Bucket(capacity=requests_per_minute, level=requests_per_minute)
+        self.tokens = _Bucket(capacity=tokens_per_minute, level=tokens_per_minute)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                delay = max(self.requests.delay_for(1, now), self.tokens.delay_for(tokens, now))
+                if delay <= 0:
+                    self.requests.level -= 1
+                    self.tokens.level -= min(tokens, self.tokens.capacity)
+                    return
+                logger.debug("Rate limiter waiting %.2fs", delay)
+                await asyncio.sleep(delay)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        now = time.monotonic()
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            limit = headers.get(f"x-ratelimit-limit-{kind}")
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            reset = headers.get(f"x-ratelimit-reset-{kind}")
+            if limit:
+                bucket.refill(now)
+                bucket.capacity = float(limit)
+            if remaining is None:
+                continue
+            bucket.refill(now)
+            bucket.level = min(bucket.level, float(remaining))
+            reset_seconds = parse_reset(reset) if reset else None
+            if float(remaining) <= 0 and reset_seconds:
+                bucket.blocked_until = max(bucket.blocked_until, now + reset_seconds)
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """Charge the difference between the estimated and reported token usage."""
+        self.tokens.level -= actual - min(estimated, self.tokens.capacity)
+
+    def pause(self, seconds: float) -> None:
+        until = time.monotonic() + seconds
+        for bucket in (self.requests, self.tokens):
+            bucket.blocked_until = max(bucket.blocked_until, until)
+
+
+class AsyncPromptGenerator:
+    """Generate many scripts concurrently within the org's RPM/TPM quotas."""
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        runtime: Optional[RuntimeConfig] = None,
+        *,
+        concurrency: int = 8,
+        limiter: Optional[TokenBucket] = None,
+        max_attempts: int = 6,
+        base_delay: float = 1.0,
+        cache: Optional[CompletionCache] = None,
+    ) -> None:
+        self.runtime = runtime or RuntimeConfig.from_env()
+        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self.client = None if self.runtime.dry_run else async_openai_client(api_key).with_options(max_retries=0)
+        self.cache = None if self.runtime.dry_run else cache or get_cache()
+        self.limiter = limiter or TokenBucket(
+            requests_per_minute=float(os.getenv("OPENAI_RPM_LIMIT", "500")),
+            tokens_per_minute=float(os.getenv("OPENAI_TPM_LIMIT", "200000")),
+        )
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        hinted = retry_after_seconds(exc)
+        if hinted is not None:
+            return hinted
+        return min(self.base_delay * 2 ** (attempt - 1), 30.0) * random.uniform(0.8, 1.2)
+
+    async def complete(
+        self,
+        system: str,
+        messages: List[Dict[str, str]],
+        *,
+        temperature: float = PromptGenerator.temperature,
+        cache_mode: Optional[CacheMode] = None,
+    ) -> str:
+        """
+        Execute a chat completion (or serve it from the completion cache).
+
+        ``temperature`` defaults to the sync generator's, so both paths (and the
+        Batch API collector) produce the same cache keys for the same prompt.
+        """
+        if self.runtime.dry_run:
+            logger.info("[dry-run] Skipping OpenAI request; returning placeholder content.")
+            return DRY_RUN_SCRIPT
+        if self.cache is None:
+            return await self._request(system, messages, temperature)
+        return await self.cache.acached(
+            lambda: self._request(system, messages, temperature),
+            model=self.model,
+            system=system,
+            messages=messages,
+            temperature=temperature,
+            mode=cache_mode or self.runtime.llm_cache,
+        )
+
+    async def _request(self, system: str, messages: List[Dict[str, str]], temperature: float) -> str:
+        """Send one completion request, retrying only retryable errors."""
+        if not self.client:
+            raise RuntimeError("OpenAI client unavailable.")
+        payload = [{"role": "system", "content": system}, *messages]
+        estimate = estimate_tokens(payload)
+        async with self._semaphore:
+            for attempt in range(1, self.max_attempts + 1):
+                await self.limiter.acquire(estimate)
+                try:
+                    with get_metrics().timer("openai_request_seconds", model=self.model):
+                        raw = await self.client.chat.completions.with_raw_response.create(
+                            model=self.model,
+                            messages=payload,
+                            temperature=temperature,
+                        )
+                except Exception as exc:  # noqa: BLE001
+                    if not is_retryable(exc) or attempt == self.max_attempts:
+                        raise
+                    get_metrics().inc("retries", operation="AsyncPromptGenerator._request")
+                    delay = self._backoff(attempt, exc)
+                    if status_code(exc) == 429:
+                        self.limiter.pause(delay)
+                    logger.warning("OpenAI request failed (%s); retry %d/%d in %.1fs", exc, attempt, self.max_attempts - 1, delay)
+                    await asyncio.sleep(delay)
+                    continue
+                self.limiter.update_from_headers(raw.headers)
+                response = raw.parse()
+                if response.usage is not None:
+                    self.limiter.reconcile(estimate, response.usage.total_tokens)
+                record_usage(self.model, response.usage)
+                return response.choices[0].message.content or ""
+        raise RuntimeError("OpenAI request did not complete.")
+
+    async def generate_script(self, context: PromptContext, stock_summary: StockSummary, *, cache_mode: Optional[CacheMode] = None) -> str:
+        prompt = build_script_prompt(context, stock_summary)
+        return await self.complete(SCRIPT_SYSTEM_PROMPT, [{"role": "user", "content": prompt}], cache_mode=cache_mode)
+
+    async def generate_scripts(
+        self,
+        items: Sequence[Tuple[PromptContext, StockSummary]],
+        *,
+        return_exceptions: bool = False,
+    ) -> List[Union[str, BaseException]]:
+        """Generate scripts for (context, summary) pairs, preserving input order."""
+        logger.info("Generating %d scripts concurrently on model=%s", len(items), self.model)
+        tasks = [self.generate_script(context, summary) for context, summary in items]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.close()
+
+
+class BackgroundScriptGenerator:
+    """
+    ``AsyncPromptGenerator`` on its own event-loop thread, for thread-pool callers.
+
+    ``submit`` starts a request at once and returns a ``concurrent.futures.Future``,
+    so the batch script stage can wait on single rows while every request shares
+    one concurrency limit and rate limiter.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="openai-async", daemon=True)
+        self._thread.start()
+        self.generator = AsyncPromptGenerator(**kwargs)
+
+    def submit(self, context: PromptContext, stock_summary: StockSummary) -> "Future[str]":
+        return asyncio.run_coroutine_threadsafe(self.generator.generate_script(context, stock_summary), self._loop)
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.generator.aclose(), self._loop).result()
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+
+def generate_scripts(items: Sequence[Tuple[PromptContext, StockSummary]], **kwargs: Any) -> List[Union[str, BaseException]]:
+    """Synchronous entry point: run ``AsyncPromptGenerator.generate_scripts`` to completion."""
+    return_exceptions = kwargs.pop("return_exceptions", False)
+
+    async def _run() -> List[Union[str, BaseException]]:
+        generator = AsyncPromptGenerator(**kwargs)
+        try:
+            return await generator.generate_scripts(items, return_exceptions=return_exceptions)
+        finally:
+            await generator.aclose()
+
+    return asyncio.run(_run())
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from openai import OpenAI
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
 
 
-def openai_client(api_key: Optional[str] = None) -> OpenAI:
+def _api_key(api_key: Optional[str]) -> str:
     key = api_key or os.getenv("OPENAI_API_KEY")
     if not key:
         raise ValueError("OPENAI_API_KEY is required. Configure via GitHub secrets or environment.")
-    return OpenAI(api_key=key)
+    return key
+
+
+# The SDK takes most of a second to import, so it is loaded with the first client.
+def openai_client(api_key: Optional[str] = None) -> OpenAI:
+    from openai import OpenAI
+
+    return OpenAI(api_key=_api_key(api_key))
+
+
+def async_openai_client(api_key: Optional[str] = None) -> AsyncOpenAI:
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=_api_key(api_key))
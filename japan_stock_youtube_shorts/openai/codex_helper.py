@@ -6,11 +6,12 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Optional
+from typing import Dict, List, Optional
 
 from ..config import RuntimeConfig
 from ..utils import retry_with_backoff
 from .client import openai_client
+from .completion_cache import CacheMode, CompletionCache, get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +22,34 @@ class CodexHelper:
     chart builders or ffmpeg command templates.
     """
 
-    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None, runtime: Optional[RuntimeConfig] = None) -> None:
+    system_prompt = "You generate minimal, runnable Python scripts without explanations."
+    temperature = 0.2
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        runtime: Optional[RuntimeConfig] = None,
+        cache: Optional[CompletionCache] = None,
+    ) -> None:
         self.runtime = runtime or RuntimeConfig.from_env()
         self.model = model or os.getenv("OPENAI_CODING_MODEL", "gpt-4.1")
         self.client = None if self.runtime.dry_run else openai_client(api_key)
+        self.cache = None if self.runtime.dry_run else cache or get_cache()
 
     @retry_with_backoff(attempts=4)
-    def request_snippet(self, instruction: str) -> str:
+    def _request(self, messages: List[Dict[str, str]]) -> str:
+        if not self.client:
+            raise RuntimeError("OpenAI client unavailable.")
+        logger.info("Generating code snippet with model=%s", self.model)
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "system", "content": self.system_prompt}, *messages],
+            temperature=self.temperature,
+        )
+        return response.choices[0].message.content or ""
+
+    def request_snippet(self, instruction: str, *, cache_mode: Optional[CacheMode] = None) -> str:
         """
         Ask the model for a code snippet based on the given instruction.
         The response is returned verbatim so that callers can save or execute it.
@@ -35,18 +57,14 @@ class CodexHelper:
         if self.runtime.dry_run:
             logger.info("[dry-run] Skipping OpenAI snippet generation.")
             return "# dry-run placeholder"
-        if not self.client:
-            raise RuntimeError("OpenAI client unavailable.")
-        logger.info("Generating code snippet with model=%s", self.model)
-        response = self.client.chat.completions.create(
+        messages = [{"role": "user", "content": instruction}]
+        if self.cache is None:
+            return self._request(messages)
+        return self.cache.cached(
+            lambda: self._request(messages),
             model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You generate minimal, runnable Python scripts without explanations.",
-                },
-                {"role": "user", "content": instruction},
-            ],
-            temperature=0.2,
+            system=self.system_prompt,
+            messages=messages,
+            temperature=self.temperature,
+            mode=cache_mode or self.runtime.llm_cache,
         )
-        return response.choices[0].message.content or ""
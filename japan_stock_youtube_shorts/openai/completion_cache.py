@@ -0,0 +1,224 @@
+"""
+Persistent, content-addressed cache for chat completions.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..config import ASSETS_DIR, LLMCacheMode
+from ..metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+CacheMode = LLMCacheMode
+CACHE_MODES = ("use", "refresh", "bypass")
+
+
+def completion_key(
+    model: str,
+    system: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    response_format: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Hash everything that determines a completion's content."""
+    request: Dict[str, Any] = {"model": model, "system": system, "messages": messages, "temperature": temperature}
+    if response_format is not None:
+        # Only added when set, so keys of plain-text completions stay valid.
+        request["response_format"] = response_format
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def describe(self) -> str:
+        return f"hits={self.hits} misses={self.misses} bypassed={self.bypassed} hit_rate={self.hit_rate:.0%}"
+
+
+class CompletionCache:
+    """
+    SQLite-backed store of completion text keyed by ``completion_key``.
+
+    Entries older than ``max_age`` are ignored and purged; beyond ``max_entries``
+    the least recently used rows are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        max_entries: int = 20_000,
+        max_age: timedelta = timedelta(days=30),
+    ) -> None:
+        self.path = path or Path(os.getenv("OPENAI_CACHE_PATH") or ASSETS_DIR / "cache" / "completions.sqlite3")
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, content TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS completions_accessed ON completions (accessed)")
+        self._conn.commit()
+        self.evict()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT content, created FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.max_age.total_seconds():
+                return None
+            self._conn.execute("UPDATE completions SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row[0]
+
+    def put(self, key: str, model: str, content: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, model, content, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, model, content, now, now),
+            )
+            self._conn.commit()
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """Drop expired rows and trim to ``max_entries`` by least-recent access."""
+        cutoff = time.time() - self.max_age.total_seconds()
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM completions WHERE created < ?", (cutoff,)).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM completions WHERE key IN ("
+                "SELECT key FROM completions ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            self._conn.commit()
+        if removed:
+            logger.info("Evicted %d cached completion(s)", removed)
+        return removed
+
+    def lookup(self, key: str, mode: CacheMode) -> Optional[str]:
+        """Cached content for ``key`` under ``mode``, counting the hit/miss/bypass."""
+        content = self.get(key) if mode == "use" else None
+        with self._lock:
+            if mode == "bypass":
+                self.stats.bypassed += 1
+                result = "bypass"
+            elif content is None:
+                self.stats.misses += 1
+                result = "miss"
+            else:
+                self.stats.hits += 1
+                result = "hit"
+        get_metrics().inc("cache_lookups", cache="completion", result=result)
+        if content is not None:
+            logger.info("Completion cache hit (%s)", key[:12])
+        return content
+
+    def cached(
+        self,
+        compute: Callable[[], str],
+        *,
+        model: str,
+        system: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        response_format: Optional[Dict[str, Any]] = None,
+        mode: CacheMode = "use",
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        """
+        Return a cached completion or call ``compute`` and store its result.
+
+        With ``accept``, only content it approves is stored, and a cached entry it
+        rejects is dropped and recomputed instead of being replayed on every run.
+        """
+        key = completion_key(model, system, messages, temperature, response_format)
+        content = self.lookup(key, mode)
+        if content is not None:
+            if accept is None or accept(content):
+                return content
+            logger.warning("Dropping unusable cached completion (%s)", key[:12])
+            self.discard(key)
+        content = compute()
+        if mode != "bypass" and content and (accept is None or accept(content)):
+            self.put(key, model, content)
+        return content
+
+    async def acached(
+        self,
+        compute: Callable[[], Awaitable[str]],
+        *,
+        model: str,
+        system: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        response_format: Optional[Dict[str, Any]] = None,
+        mode: CacheMode = "use",
+    ) -> str:
+        """Async counterpart of ``cached``."""
+        key = completion_key(model, system, messages, temperature, response_format)
+        content = self.lookup(key, mode)
+        if content is not None:
+            return content
+        content = await compute()
+        if mode != "bypass" and content:
+            self.put(key, model, content)
+        return content
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[CompletionCache] = None
+_default_lock = threading.Lock()
+
+
+def get_cache() -> CompletionCache:
+    """Return the process-wide completion cache."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = CompletionCache()
+        return _default_cache
+
+
+def report_cache_stats() -> Optional[CacheStats]:
+    """Log the hit rate of the process-wide cache if it was used during this run."""
+    if _default_cache is None:
+        return None
+    logger.info("LLM completion cache: %s", _default_cache.stats.describe())
+    return _default_cache.stats
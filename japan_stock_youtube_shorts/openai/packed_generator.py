@@ -0,0 +1,229 @@
+"""
+Generate scripts for several tickers in one structured-output request.
+
+Every single-ticker request repeats the system prompt, the 株鍛 introduction and
+the policy block. A packed request sends them once for K tickers, asks for
+``{"scripts": [{"ticker": ..., "script": ...}]}`` under a strict JSON schema, and
+any ticker the reply leaves out falls back to the single-ticker request.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..metrics import get_metrics
+from .completion_cache import CacheMode
+from .prompt_generator import (
+    DRY_RUN_SCRIPT,
+    SCRIPT_INTRO,
+    SCRIPT_POLICY,
+    SCRIPT_SYSTEM_PROMPT,
+    PromptContext,
+    PromptGenerator,
+    StockSummary,
+    ticker_section,
+)
+
+logger = logging.getLogger(__name__)
+
+PackItem = Tuple[PromptContext, StockSummary]
+
+
+@dataclass(frozen=True)
+class ModelLimits:
+    context: int
+    max_output: int
+
+
+# Context window and maximum completion tokens; model names match by prefix.
+MODEL_LIMITS: Dict[str, ModelLimits] = {
+    "gpt-4o-mini": ModelLimits(128_000, 16_384),
+    "gpt-4o": ModelLimits(128_000, 16_384),
+    "gpt-4.1": ModelLimits(1_047_576, 32_768),
+    "gpt-4-turbo": ModelLimits(128_000, 4_096),
+    "gpt-3.5-turbo": ModelLimits(16_385, 4_096),
+}
+# Unknown models get the smallest limits above.
+DEFAULT_LIMITS = ModelLimits(16_385, 4_096)
+
+# Completion tokens budgeted per script, JSON framing included (~1 token per Japanese character).
+SCRIPT_TOKENS = 800
+# Share of the model limits a pack may plan to use.
+HEADROOM = 0.8
+# Beyond this a pack gains little and a bad reply costs too many fallbacks.
+MAX_PACK_SIZE = 16
+
+PACKED_SYSTEM_PROMPT = (
+    SCRIPT_SYSTEM_PROMPT + " You write one independent script per requested ticker and answer in the requested JSON format."
+)
+
+PACKED_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ticker_scripts",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "scripts": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"ticker": {"type": "string"}, "script": {"type": "string"}},
+                        "required": ["ticker", "script"],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["scripts"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def model_limits(model: str) -> ModelLimits:
+    for name in sorted(MODEL_LIMITS, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_LIMITS[name]
+    return DEFAULT_LIMITS
+
+
+def pack_size(model: str, *, section_tokens: int = 400, script_tokens: int = SCRIPT_TOKENS) -> int:
+    """
+    Largest K whose K scripts fit the model's output limit and whose prompt plus
+    output fit its context window, each with ``HEADROOM``.
+
+    ``section_tokens`` is the size of one ticker's facts section; the output limit
+    is almost always the binding one.
+    """
+    limits = model_limits(model)
+    preamble = len(PACKED_SYSTEM_PROMPT) + len(SCRIPT_INTRO) + len(SCRIPT_POLICY) + 200
+    by_output = int(limits.max_output * HEADROOM) // script_tokens
+    by_context = int(limits.context * HEADROOM - preamble) // (section_tokens + script_tokens)
+    return max(1, min(MAX_PACK_SIZE, by_output, by_context))
+
+
+def build_packed_prompt(items: Sequence[PackItem]) -> str:
+    """One prompt asking for a script per item, with the shared instructions stated once."""
+    ctas = {context.call_to_action for context, _ in items}
+    shared_cta = ctas.pop() if len(ctas) == 1 else None
+    parts = [
+        SCRIPT_INTRO,
+        f"以下の{len(items)}銘柄について、銘柄ごとに独立した台本を1本ずつ作成してください。\n\n",
+        SCRIPT_POLICY,
+    ]
+    if shared_cta is not None:
+        parts.append(f"CTA（各台本の最後に入れる）:\n{shared_cta}\n\n")
+    parts.append("【出力形式】\nscripts 配列に銘柄ごとの ticker（見出しと同じ表記）と script（台本本文）を入れる。\n\n")
+    for context, stock_summary in items:
+        parts.append(f"### {context.ticker}\n{ticker_section(context, stock_summary)}")
+        if shared_cta is None:
+            parts.append(f"CTA:\n{context.call_to_action}\n\n")
+    prompt = "".join(parts)
+    logger.debug("Built packed script prompt: %s", prompt)
+    return prompt
+
+
+def parse_packed_response(text: str, tickers: Sequence[str]) -> Dict[str, str]:
+    """
+    Non-empty scripts from a packed reply, keyed by ticker.
+
+    Tickers that were not requested are ignored; an unparseable reply yields ``{}``.
+    """
+    try:
+        entries = json.loads(text).get("scripts")
+    except (json.JSONDecodeError, AttributeError) as exc:
+        logger.warning("Packed reply is not the expected JSON object: %s", exc)
+        return {}
+    wanted = set(tickers)
+    scripts: Dict[str, str] = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        ticker, script = entry.get("ticker"), entry.get("script")
+        if ticker not in wanted:
+            logger.warning("Packed reply contains an unrequested ticker %r", ticker)
+        elif isinstance(script, str) and script.strip() and ticker not in scripts:
+            scripts[ticker] = script.strip()
+    return scripts
+
+
+class PackedScriptGenerator:
+    """Split items into packs of ``pack_size`` (automatic by default) and generate each in one request."""
+
+    def __init__(self, generator: PromptGenerator, *, pack_size: Optional[int] = None) -> None:
+        self.generator = generator
+        self.pack_size = pack_size
+
+    def size(self, items: Sequence[PackItem]) -> int:
+        if self.pack_size:
+            return max(1, self.pack_size)
+        longest = max((len(ticker_section(context, summary)) for context, summary in items), default=0)
+        return pack_size(self.generator.model, section_tokens=longest)
+
+    def packs(self, items: Sequence[PackItem]) -> List[List[PackItem]]:
+        """Consecutive packs of up to ``size`` items; a ticker appears at most once per pack."""
+        limit = self.size(items)
+        packs: List[List[PackItem]] = []
+        current: List[PackItem] = []
+        for item in items:
+            if len(current) >= limit or any(context.ticker == item[0].ticker for context, _ in current):
+                packs.append(current)
+                current = []
+            current.append(item)
+        if current:
+            packs.append(current)
+        return packs
+
+    def generate_pack(
+        self, items: Sequence[PackItem], *, fallback: bool = True, cache_mode: Optional[CacheMode] = None
+    ) -> Dict[str, str]:
+        """
+        Scripts for one pack, keyed by ticker.
+
+        Missing tickers are generated one by one when ``fallback`` is set and are
+        left out of the result otherwise.
+        """
+        tickers = [context.ticker for context, _ in items]
+        if self.generator.runtime.dry_run:
+            logger.info("[dry-run] Skipping packed OpenAI request for %d ticker(s)", len(items))
+            return {ticker: DRY_RUN_SCRIPT for ticker in tickers}
+        if len(items) == 1:
+            context, summary = items[0]
+            return {context.ticker: self.generator.generate_script(context, summary, cache_mode=cache_mode)}
+        text = self.generator.complete(
+            PACKED_SYSTEM_PROMPT,
+            [{"role": "user", "content": build_packed_prompt(items)}],
+            cache_mode=cache_mode,
+            response_format=PACKED_RESPONSE_FORMAT,
+            # A truncated or partial reply is not cached, so the next run asks again.
+            accept=lambda reply: len(parse_packed_response(reply, tickers)) == len(set(tickers)),
+        )
+        scripts = parse_packed_response(text, tickers)
+        missing = [item for item in items if item[0].ticker not in scripts]
+        metrics = get_metrics()
+        metrics.inc("script_pack_tickers", len(items) - len(missing), model=self.generator.model, outcome="ok")
+        if missing:
+            metrics.inc("script_pack_tickers", len(missing), model=self.generator.model, outcome="missing")
+            logger.warning(
+                "Packed reply has no script for %s%s",
+                ", ".join(context.ticker for context, _ in missing),
+                "; generating them one by one" if fallback else "",
+            )
+        if fallback:
+            for context, summary in missing:
+                scripts[context.ticker] = self.generator.generate_script(context, summary, cache_mode=cache_mode)
+        return scripts
+
+    def generate(self, items: Sequence[PackItem], *, cache_mode: Optional[CacheMode] = None) -> Dict[str, str]:
+        """Scripts for every item, keyed by ticker (the last item wins for a repeated ticker)."""
+        scripts: Dict[str, str] = {}
+        packs = self.packs(items)
+        logger.info("Generating %d script(s) in %d packed request(s)", len(items), len(packs))
+        for pack in packs:
+            scripts.update(self.generate_pack(pack, cache_mode=cache_mode))
+        return scripts
@@ -6,18 +6,29 @@ from __future__ import annotations
 
 import logging
 import os
+import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional
-
-from openai import APIError
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Union
 
 from ..config import RuntimeConfig
+from ..metrics import get_metrics
 from ..utils import retry_with_backoff
 from .client import openai_client
+from .completion_cache import CacheMode, CompletionCache, completion_key, get_cache
 
 logger = logging.getLogger(__name__)
 
 
+class RenderableSummary(Protocol):
+    """Structured price facts (e.g. ``market.summary.MarketSummary``)."""
+
+    def render(self) -> str:
+        ...
+
+
+StockSummary = Union[str, RenderableSummary]
+
+
 @dataclass
 class PromptContext:
     """Metadata used to build consistent prompts."""
@@ -28,59 +39,250 @@ class PromptContext:
     style: str = "concise, upbeat Japanese narration suitable for YouTube Shorts"
     call_to_action: str = "チャンネル登録と高評価もよろしくお願いします！"
 
+    def render_facts(self, stock_summary: StockSummary) -> str:
+        """Render the price facts section from a plain string or a structured summary."""
+        return stock_summary if isinstance(stock_summary, str) else stock_summary.render()
 
-class PromptGenerator:
-    """Compose prompts and fetch completions from OpenAI."""
 
-    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None, runtime: Optional[RuntimeConfig] = None) -> None:
-        self.runtime = runtime or RuntimeConfig.from_env()
-        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        if self.runtime.dry_run:
-            self.client = None
-        else:
-            self.client = openai_client(api_key)
+SCRIPT_SYSTEM_PROMPT = (
+    "You are a Japanese equity analyst focused on long-term thinking. "
+    "You do not exaggerate or hype stock movements. "
+    "You clearly distinguish between factual price movements and interpretation. "
+    "Your goal is to help viewers think better about stocks, not to give buy/sell advice."
+)
 
-    def build_script_prompt(self, context: PromptContext, stock_summary: str) -> str:
-    """Construct a prompt instructing the model to create a narration."""
-    prompt = (
-        f"あなたは『株鍛（かぶたん）』というコンセプトで、"
-        f"視聴者の投資思考を鍛える短編解説動画の台本を作成します。\n\n"
+
+SCRIPT_INTRO = "あなたは『株鍛（かぶたん）』というコンセプトで、視聴者の投資思考を鍛える短編解説動画の台本を作成します。\n\n"
+SCRIPT_POLICY = (
+    "【解説方針】\n"
+    "- 起きた事実と解釈を分けて説明する\n"
+    "- 値動きを断定しない\n"
+    "- 投資家心理としてどう読めるかに触れる\n\n"
+)
+
+
+def ticker_section(context: PromptContext, stock_summary: StockSummary) -> str:
+    """The per-ticker part of a script prompt: ticker, period and price facts."""
+    return (
         f"【対象銘柄】\n{context.ticker}（{context.company_name}）\n\n"
         f"【対象期間】\n{context.timeframe}\n\n"
-        f"【事実（価格データの要約）】\n{stock_summary}\n\n"
-        "【解説方針】\n"
-        "- 起きた事実と解釈を分けて説明する\n"
-        "- 値動きを断定しない\n"
-        "- 投資家心理としてどう読めるかに触れる\n\n"
-        f"CTA:\n{context.call_to_action}\n"
+        f"【事実（価格データの要約）】\n{context.render_facts(stock_summary)}\n\n"
     )
 
+
+def build_script_prompt(context: PromptContext, stock_summary: StockSummary) -> str:
+    """Construct a prompt instructing the model to create a narration."""
+    prompt = SCRIPT_INTRO + ticker_section(context, stock_summary) + SCRIPT_POLICY + f"CTA:\n{context.call_to_action}\n"
+
     logger.debug("Built script prompt: %s", prompt)
     return prompt
 
 
+def record_usage(model: str, usage: Any) -> None:
+    """Count prompt/completion tokens from a response's ``usage`` (object or dict)."""
+    if usage is None:
+        return
+    metrics = get_metrics()
+    for kind in ("prompt", "completion"):
+        value = usage.get(f"{kind}_tokens") if isinstance(usage, dict) else getattr(usage, f"{kind}_tokens", None)
+        if value:
+            metrics.inc("openai_tokens", value, model=model, kind=kind)
 
-    @retry_with_backoff(attempts=4)
-    def complete(self, system: str, messages: List[Dict[str, str]]) -> str:
-        """Execute a chat completion call."""
+
+@dataclass
+class StreamStats:
+    """Timing of one streamed completion, final once its stream is exhausted."""
+
+    model: str
+    ttft: Optional[float] = None
+    seconds: float = 0.0
+    tokens: int = 0
+    cached: bool = False
+
+    @property
+    def tokens_per_second(self) -> float:
+        generating = self.seconds - (self.ttft or 0.0)
+        return self.tokens / generating if generating > 0 else 0.0
+
+    def describe(self) -> str:
+        if self.cached:
+            return "served from cache"
+        ttft = "n/a" if self.ttft is None else f"{self.ttft:.2f}s"
+        return f"{self.tokens} token(s) in {self.seconds:.2f}s, TTFT {ttft}, {self.tokens_per_second:.1f} tokens/s"
+
+
+class CompletionStream:
+    """
+    Iterator over the text deltas of one completion as they arrive.
+
+    ``text`` is everything received so far. Cache hits and dry runs yield the whole
+    text as a single delta.
+    """
+
+    def __init__(self, deltas: Iterator[str], stats: StreamStats) -> None:
+        self._deltas = deltas
+        self._parts: List[str] = []
+        self.stats = stats
+
+    def __iter__(self) -> Iterator[str]:
+        for delta in self._deltas:
+            self._parts.append(delta)
+            yield delta
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+
+DRY_RUN_SCRIPT = "これはドライラン用のサンプル台本です。"
+
+
+class PromptGenerator:
+    """Compose prompts and fetch completions from OpenAI."""
+
+    temperature = 0.6
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        runtime: Optional[RuntimeConfig] = None,
+        cache: Optional[CompletionCache] = None,
+    ) -> None:
+        self.runtime = runtime or RuntimeConfig.from_env()
+        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
         if self.runtime.dry_run:
-            logger.info("[dry-run] Skipping OpenAI request; returning placeholder content.")
-            return "これはドライラン用のサンプル台本です。"
+            self.client = None
+            self.cache = None
+        else:
+            self.client = openai_client(api_key)
+            self.cache = cache or get_cache()
+
+    def build_script_prompt(self, context: PromptContext, stock_summary: StockSummary) -> str:
+        """Construct a prompt instructing the model to create a narration."""
+        return build_script_prompt(context, stock_summary)
+
+    @retry_with_backoff(attempts=4)
+    def _request(self, system: str, messages: List[Dict[str, str]], *, response_format: Optional[Dict[str, Any]] = None) -> str:
         if not self.client:
             raise RuntimeError("OpenAI client unavailable.")
         logger.info("Requesting completion on model=%s", self.model)
-        response = self.client.chat.completions.create(
+        extra = {"response_format": response_format} if response_format else {}
+        metrics = get_metrics()
+        with metrics.timer("openai_request_seconds", model=self.model):
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "system", "content": system}, *messages],
+                temperature=self.temperature,
+                **extra,
+            )
+        record_usage(self.model, response.usage)
+        return response.choices[0].message.content or ""
+
+    @retry_with_backoff(attempts=4)
+    def _open_stream(self, system: str, messages: List[Dict[str, str]]) -> Any:
+        # Errors before the first chunk (throttling, 5xx, connect) are retried here;
+        # a stream that breaks halfway fails the call.
+        return self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "system", "content": system}, *messages],
-            temperature=0.6,
+            temperature=self.temperature,
+            stream=True,
+            stream_options={"include_usage": True},
         )
-        return response.choices[0].message.content or ""
 
-    def generate_script(self, context: PromptContext, stock_summary: str) -> str:
+    def _stream_request(
+        self, system: str, messages: List[Dict[str, str]], stats: StreamStats, *, key: Optional[str], mode: CacheMode
+    ) -> Iterator[str]:
+        if not self.client:
+            raise RuntimeError("OpenAI client unavailable.")
+        logger.info("Streaming completion on model=%s", self.model)
+        start = time.perf_counter()
+        parts: List[str] = []
+        usage = None
+        with self._open_stream(system, messages) as response:
+            for chunk in response:
+                usage = getattr(chunk, "usage", None) or usage
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                if stats.ttft is None:
+                    stats.ttft = time.perf_counter() - start
+                parts.append(delta)
+                yield delta
+        stats.seconds = time.perf_counter() - start
+        # Servers that omit usage get one token per content chunk as an estimate.
+        stats.tokens = getattr(usage, "completion_tokens", None) or len(parts)
+        record_usage(self.model, usage)
+        metrics = get_metrics()
+        metrics.observe("openai_request_seconds", stats.seconds, model=self.model)
+        if stats.ttft is not None:
+            metrics.observe("openai_ttft_seconds", stats.ttft, model=self.model)
+            metrics.observe("openai_generation_seconds", stats.seconds - stats.ttft, model=self.model)
+        logger.info("Streamed completion on model=%s: %s", self.model, stats.describe())
+        text = "".join(parts)
+        if self.cache is not None and key and mode != "bypass" and text:
+            self.cache.put(key, self.model, text)
+
+    def stream(self, system: str, messages: List[Dict[str, str]], *, cache_mode: Optional[CacheMode] = None) -> CompletionStream:
+        """
+        Streaming counterpart of ``complete``: iterate the result for text deltas.
+
+        The completion cache is consulted first; a streamed result is stored once
+        it has been received in full.
+        """
+        stats = StreamStats(self.model)
+        if self.runtime.dry_run:
+            logger.info("[dry-run] Skipping OpenAI request; returning placeholder content.")
+            return CompletionStream(iter([DRY_RUN_SCRIPT]), stats)
+        mode = cache_mode or self.runtime.llm_cache
+        key = None
+        if self.cache is not None:
+            key = completion_key(self.model, system, messages, self.temperature)
+            content = self.cache.lookup(key, mode)
+            if content is not None:
+                stats.cached = True
+                return CompletionStream(iter([content]), stats)
+        return CompletionStream(self._stream_request(system, messages, stats, key=key, mode=mode), stats)
+
+    def complete(
+        self,
+        system: str,
+        messages: List[Dict[str, str]],
+        *,
+        cache_mode: Optional[CacheMode] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        """
+        Execute a chat completion call.
+
+        Identical requests (including ``response_format``) are answered from the
+        completion cache; pass ``cache_mode="refresh"`` to regenerate or ``"bypass"``
+        to skip the cache. Replies that ``accept`` rejects are never cached.
+        """
+        if self.runtime.dry_run:
+            logger.info("[dry-run] Skipping OpenAI request; returning placeholder content.")
+            return DRY_RUN_SCRIPT
+        if self.cache is None:
+            return self._request(system, messages, response_format=response_format)
+        return self.cache.cached(
+            lambda: self._request(system, messages, response_format=response_format),
+            model=self.model,
+            system=system,
+            messages=messages,
+            temperature=self.temperature,
+            response_format=response_format,
+            mode=cache_mode or self.runtime.llm_cache,
+            accept=accept,
+        )
+
+    def generate_script(self, context: PromptContext, stock_summary: StockSummary, *, cache_mode: Optional[CacheMode] = None) -> str:
         """End-to-end helper to create a script from context + summary."""
         prompt = self.build_script_prompt(context, stock_summary)
-        system = ( "You are a Japanese equity analyst focused on long-term thinking. " 
-                  "You do not exaggerate or hype stock movements. "
-                  "You clearly distinguish between factual price movements and interpretation. "
-                  "Your goal is to help viewers think better about stocks, not to give buy/sell advice." )
-        return self.complete(system, [{"role": "user", "content": prompt}])
+        return self.complete(SCRIPT_SYSTEM_PROMPT, [{"role": "user", "content": prompt}], cache_mode=cache_mode)
+
+    def stream_script(self, context: PromptContext, stock_summary: StockSummary, *, cache_mode: Optional[CacheMode] = None) -> CompletionStream:
+        """``generate_script`` as a stream of text deltas."""
+        prompt = self.build_script_prompt(context, stock_summary)
+        return self.stream(SCRIPT_SYSTEM_PROMPT, [{"role": "user", "content": prompt}], cache_mode=cache_mode)
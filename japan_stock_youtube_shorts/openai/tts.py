@@ -0,0 +1,53 @@
+"""
+OpenAI text-to-speech backend for the narration stage.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Optional
+
+from ..metrics import get_metrics
+from ..utils import retry_with_backoff
+from .client import openai_client
+
+logger = logging.getLogger(__name__)
+
+# ``response_format="pcm"``: headerless 16-bit little-endian mono at 24 kHz.
+OPENAI_TTS_SAMPLE_RATE = 24_000
+
+
+class OpenAITTSBackend:
+    """Synthesize one sentence per ``audio.speech`` request as raw PCM."""
+
+    sample_rate = OPENAI_TTS_SAMPLE_RATE
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        voice: Optional[str] = None,
+        *,
+        instructions: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> None:
+        self.model = model or os.getenv("OPENAI_TTS_MODEL", "gpt-4o-mini-tts")
+        self.voice = voice or os.getenv("OPENAI_TTS_VOICE", "alloy")
+        self.instructions = instructions or os.getenv("OPENAI_TTS_INSTRUCTIONS") or None
+        self.client = openai_client(api_key)
+
+    @property
+    def identity(self) -> str:
+        """Everything besides the text that changes the audio (part of the cache key)."""
+        return f"openai:{self.model}:{self.voice}:{self.instructions or ''}:{self.sample_rate}"
+
+    @retry_with_backoff(attempts=4)
+    def synthesize(self, text: str) -> bytes:
+        extra = {"instructions": self.instructions} if self.instructions else {}
+        metrics = get_metrics()
+        with metrics.timer("tts_request_seconds", backend="openai", model=self.model):
+            response = self.client.audio.speech.create(
+                model=self.model, voice=self.voice, input=text, response_format="pcm", **extra
+            )
+        metrics.inc("tts_characters", len(text), backend="openai", model=self.model)
+        return response.content
@@ -1,7 +1,27 @@
 """High-level pipelines for creating assets."""
 
-from .generate_chart import create_price_chart
-from .generate_script import generate_script_for_ticker
-from .generate_video import assemble_video
+from __future__ import annotations
 
-__all__ = ["create_price_chart", "generate_script_for_ticker", "assemble_video"]
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .generate_chart import create_price_chart
+    from .generate_script import generate_script_for_ticker
+    from .generate_video import assemble_chart_video, assemble_short, assemble_video
+    from .narration import narrate_script
+    from .screen import screen_universe
+
+_EXPORTS = {
+    "create_price_chart": ".generate_chart",
+    "generate_script_for_ticker": ".generate_script",
+    "assemble_video": ".generate_video",
+    "assemble_short": ".generate_video",
+    "assemble_chart_video": ".generate_video",
+    "narrate_script": ".narration",
+    "screen_universe": ".screen",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
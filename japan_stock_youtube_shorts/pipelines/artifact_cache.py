@@ -0,0 +1,246 @@
+"""
+Content-addressed cache for rendered charts and videos.
+
+Artifacts are stored once under ``assets/templates/.artifacts`` keyed by a digest of
+everything that determines their bytes. A later run with the same inputs gets the
+existing file hard-linked (or copied, across filesystems) to its own output path
+instead of rendering again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional
+
+from ..config import ASSETS_DIR, LLMCacheMode
+from ..metrics import get_metrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def file_digest(path: Path, *, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def frame_digest(frame: pd.DataFrame) -> str:
+    """Digest of a price frame's index and values."""
+    import pandas as pd
+
+    hashed = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+    digest = hashlib.sha256(hashed.tobytes())
+    digest.update(",".join(map(str, frame.columns)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def artifact_key(kind: str, **parts: Any) -> str:
+    """Hash the named inputs of a render (values must be JSON-serialisable or ``repr``-stable)."""
+    payload = json.dumps({"kind": kind, **parts}, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _same_file(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Batch workers are threads of one process, so the pid alone is not unique.
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copy2(source, tmp)
+    os.replace(tmp, target)
+
+
+def _adopt(source: Path, target: Path) -> None:
+    """Link ``source`` in as the object ``target``; an object stored first by another worker is kept."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        return
+    except OSError:
+        _link_or_copy(source, target)
+
+
+class ArtifactCache:
+    """
+    Digest -> file store with an SQLite index of objects and the run paths linked to them.
+
+    ``gc`` keeps the templates tree under ``max_bytes`` by evicting the least recently
+    used objects together with their links inside the tree. Files the cache did not
+    create are never removed.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        *,
+        index_path: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.root = root or Path(os.getenv("ARTIFACT_CACHE_ROOT") or ASSETS_DIR / "templates")
+        self.objects = self.root / ".artifacts"
+        self.index_path = index_path or ASSETS_DIR / "cache" / "artifacts.sqlite3"
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("ARTIFACT_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES)))
+        self._lock = threading.Lock()
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            "key TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS links (path TEXT PRIMARY KEY, key TEXT NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS artifacts_accessed ON artifacts (accessed)")
+        self._conn.commit()
+
+    def _object_path(self, key: str, suffix: str) -> Path:
+        return self.objects / key[:2] / f"{key}{suffix}"
+
+    def lookup(self, key: str, output: Path) -> Optional[Path]:
+        """Materialize a cached artifact at ``output``; ``None`` on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM artifacts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        source = Path(row[0])
+        if not source.exists():
+            with self._lock:
+                self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                self._conn.commit()
+            return None
+        if not (output.exists() and os.path.samefile(source, output)):
+            _link_or_copy(source, output)
+        with self._lock:
+            self._conn.execute("UPDATE artifacts SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._conn.execute("INSERT OR REPLACE INTO links (path, key) VALUES (?, ?)", (str(output.resolve()), key))
+            self._conn.commit()
+        logger.info("Artifact cache hit (%s) -> %s", key[:12], output)
+        return output
+
+    def store(self, key: str, output: Path) -> Path:
+        """Adopt a freshly rendered ``output`` as the object for ``key``."""
+        target = self._object_path(key, output.suffix)
+        if not target.exists():
+            _adopt(output, target)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts (key, path, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, str(target), target.stat().st_size, now, now),
+            )
+            self._conn.execute("INSERT OR REPLACE INTO links (path, key) VALUES (?, ?)", (str(output.resolve()), key))
+            self._conn.commit()
+        return output
+
+    def materialize(self, key: str, output: Path, render: Callable[[Path], Path], *, mode: LLMCacheMode = "use") -> Path:
+        """Return ``output`` from the cache, or ``render`` it and remember the result."""
+        if mode == "use":
+            cached = self.lookup(key, output)
+            get_metrics().inc("cache_lookups", cache="artifact", result="miss" if cached is None else "hit")
+            if cached is not None:
+                return cached
+        else:
+            get_metrics().inc("cache_lookups", cache="artifact", result="bypass" if mode == "bypass" else "miss")
+        if output.exists():
+            # Never render into a file that may be hard-linked to a cached object.
+            output.unlink()
+        rendered = render(output)
+        if mode != "bypass":
+            self.store(key, rendered)
+        return rendered
+
+    def _tree_bytes(self) -> int:
+        seen = set()
+        total = 0
+        for path in self.root.rglob("*"):
+            try:
+                stat = path.lstat()
+            except FileNotFoundError:
+                continue
+            if path.is_file() and (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                total += stat.st_size
+        return total
+
+    def _remove(self, paths: Iterable[Path]) -> int:
+        freed = 0
+        for path in paths:
+            try:
+                stat = path.stat()
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            if stat.st_nlink == 1:
+                freed += stat.st_size
+        return freed
+
+    def gc(self, max_bytes: Optional[int] = None) -> int:
+        """Evict least recently used artifacts until the tree fits; returns bytes freed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        usage = self._tree_bytes()
+        if usage <= limit:
+            return 0
+        with self._lock:
+            entries = self._conn.execute("SELECT key, path FROM artifacts ORDER BY accessed ASC").fetchall()
+        freed = 0
+        evicted = 0
+        root = self.root.resolve()
+        for key, object_path in entries:
+            if usage - freed <= limit:
+                break
+            with self._lock:
+                links = [Path(row[0]) for row in self._conn.execute("SELECT path FROM links WHERE key = ?", (key,))]
+            # Only remove links that still point at this object; a path may have been re-rendered since.
+            obj = Path(object_path)
+            inside = [path for path in links if root in path.parents and _same_file(path, obj)]
+            freed += self._remove([*inside, Path(object_path)])
+            evicted += 1
+            shard = Path(object_path).parent
+            if shard.is_dir() and not any(shard.iterdir()):
+                shard.rmdir()
+            with self._lock:
+                self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                self._conn.execute("DELETE FROM links WHERE key = ?", (key,))
+                self._conn.commit()
+        logger.info("Artifact GC evicted %d artifact(s), freed %.1f MiB", evicted, freed / 1024**2)
+        return freed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_caches: Dict[int, ArtifactCache] = {}
+_default_lock = threading.Lock()
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """Return this process's artifact cache (SQLite connections are not shared across forks)."""
+    with _default_lock:
+        cache = _default_caches.get(os.getpid())
+        if cache is None:
+            cache = _default_caches[os.getpid()] = ArtifactCache()
+        return cache
@@ -0,0 +1,579 @@
+"""
+Run the fetch -> script -> narration / chart -> video pipeline for every row of a ticker manifest.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ..config import ASSETS_DIR, RuntimeConfig
+from ..market.history import HistoryProvider, get_provider
+from ..market.summary import DEFAULT_BENCHMARK, MarketSummary, summarize_frames
+from ..metrics import get_metrics
+from ..notion.write_queue import NotionWriteQueue
+from ..openai.async_generator import BackgroundScriptGenerator
+from ..openai.packed_generator import PackedScriptGenerator
+from ..openai.prompt_generator import PromptContext, PromptGenerator
+from .chart_export import ExportProfile
+from .chart_renderer import LANDSCAPE_STYLE, ChartStyle, warm_renderer
+from .generate_chart import create_price_chart
+from .generate_script import generate_script_for_ticker, publish_script
+from .generate_video import assemble_chart_video, assemble_short, assemble_video
+from .narration import TTSBackendName, narrate_script
+from .run_journal import RunJournal
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("script", "narration", "chart", "video")
+
+
+@dataclass
+class BatchRow:
+    """One manifest entry."""
+
+    ticker: str
+    company: str
+    period: str = "1mo"
+    notion_page: Optional[str] = None
+    audio: Optional[Path] = None
+
+
+@dataclass
+class StageLimits:
+    """Maximum concurrent workers per stage."""
+
+    script: int = 4
+    narration: int = 2
+    chart: int = field(default_factory=lambda: os.cpu_count() or 2)
+    video: int = 2
+
+
+@dataclass
+class RowResult:
+    row: BatchRow
+    outputs: Dict[str, str] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    resumed: List[str] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.errors)
+
+
+@dataclass
+class BatchReport:
+    results: List[RowResult]
+
+    @property
+    def failed_rows(self) -> List[RowResult]:
+        return [result for result in self.results if result.failed]
+
+    def summary(self) -> str:
+        done = Counter(stage for result in self.results for stage in result.outputs)
+        failed = Counter(stage for result in self.results for stage in result.errors)
+        resumed = Counter(stage for result in self.results for stage in result.resumed)
+        lines = [f"Batch finished: {len(self.results) - len(self.failed_rows)}/{len(self.results)} rows succeeded"]
+        for stage in ("fetch", *STAGES):
+            if done[stage] or failed[stage]:
+                extra = f" (resumed={resumed[stage]})" if resumed[stage] else ""
+                lines.append(f"  {stage:<9} ok={done[stage]} failed={failed[stage]}{extra}")
+        for result in self.failed_rows:
+            for stage, error in result.errors.items():
+                lines.append(f"  FAILED {result.row.ticker} [{stage}]: {error}")
+        return "\n".join(lines)
+
+
+def _optional_path(value: Any) -> Optional[Path]:
+    return Path(value) if value else None
+
+
+def _row_from_mapping(data: Dict[str, Any]) -> BatchRow:
+    return BatchRow(
+        ticker=str(data["ticker"]).strip(),
+        company=str(data.get("company") or data["ticker"]).strip(),
+        period=str(data.get("period") or "1mo").strip(),
+        notion_page=(str(data["notion_page"]).strip() or None) if data.get("notion_page") else None,
+        audio=_optional_path(data.get("audio")),
+    )
+
+
+def check_unique(rows: Sequence[BatchRow]) -> None:
+    """Reject repeated tickers: their rows would write the same output files at the same time."""
+    repeated = sorted(ticker for ticker, count in Counter(row.ticker for row in rows).items() if count > 1)
+    if repeated:
+        raise ValueError(f"Manifest lists ticker(s) more than once: {', '.join(repeated)}")
+
+
+def load_manifest(path: Path) -> List[BatchRow]:
+    """Read a CSV or YAML manifest of (ticker, company, period, notion_page[, audio]) rows."""
+    if path.suffix.lower() in {".yml", ".yaml"}:
+        try:
+            import yaml
+        except ImportError as exc:
+            raise RuntimeError("YAML manifests require PyYAML (pip install pyyaml); use CSV otherwise.") from exc
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or []
+        entries = data.get("rows", []) if isinstance(data, dict) else data
+    else:
+        with path.open(newline="", encoding="utf-8") as handle:
+            entries = [entry for entry in csv.DictReader(handle) if entry.get("ticker")]
+    rows = [_row_from_mapping(entry) for entry in entries]
+    check_unique(rows)
+    logger.info("Loaded %d manifest rows from %s", len(rows), path)
+    return rows
+
+
+@dataclass
+class StageOutcome:
+    """What a stage worker hands back; exceptions are captured as ``error``."""
+
+    output: Optional[str] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+    metrics: Optional[Dict[str, Any]] = None
+
+
+def _run_stage(func: Callable[..., str], *args: Any) -> StageOutcome:
+    start = time.perf_counter()
+    outcome = StageOutcome()
+    try:
+        outcome.output = func(*args)
+    except Exception as exc:  # noqa: BLE001
+        outcome.error = repr(exc)
+    outcome.seconds = time.perf_counter() - start
+    if multiprocessing.parent_process() is not None:
+        # Worker processes ship their metrics back with the result.
+        outcome.metrics = get_metrics().drain()
+    return outcome
+
+
+def _render_chart(
+    row: BatchRow,
+    history: pd.DataFrame,
+    output: Path,
+    runtime: RuntimeConfig,
+    style: ChartStyle,
+    exports: Sequence[ExportProfile] = (),
+) -> str:
+    return str(
+        create_price_chart(
+            row.ticker, period=row.period, output_path=output, runtime_config=runtime, history=history, style=style, exports=exports
+        )
+    )
+
+
+def _narrate(script: str, output: Path, runtime: RuntimeConfig, backend: TTSBackendName) -> str:
+    return str(narrate_script(Path(script), output_path=output, backend_name=backend, runtime_config=runtime))
+
+
+def _render_video(image: str, audio: Path, output: Path, runtime: RuntimeConfig) -> str:
+    return str(assemble_video(Path(image), audio, output_path=output, runtime_config=runtime))
+
+
+def _render_chart_video(
+    row: BatchRow, history: pd.DataFrame, audio: Path, output: Path, runtime: RuntimeConfig, style: ChartStyle
+) -> str:
+    return str(
+        assemble_chart_video(
+            row.ticker, audio, period=row.period, output_path=output, runtime_config=runtime, history=history, style=style
+        )
+    )
+
+
+def _render_short(
+    row: BatchRow, history: pd.DataFrame, audio: Path, script: Optional[str], output: Path, runtime: RuntimeConfig
+) -> str:
+    return str(
+        assemble_short(
+            row.ticker,
+            audio,
+            company=row.company,
+            period=row.period,
+            output_path=output,
+            script_path=Path(script) if script else None,
+            runtime_config=runtime,
+            history=history,
+        )
+    )
+
+
+class BatchOrchestrator:
+    """
+    Execute manifest rows as a small DAG over stage-specific worker pools.
+
+    Price data is fetched once per period in a grouped download. Script generation
+    (OpenAI + Notion, I/O bound) and narration of rows without an ``audio`` file run
+    on thread pools; chart and video rendering (CPU bound) run on process pools
+    unless ``use_processes`` is disabled. A video starts once its chart and audio exist.
+
+    Every stage outcome is written to ``journal``; with ``resume`` set, stages the
+    journal already marks as finished (with unchanged outputs) are not run again.
+
+    Unless a ``generator`` is given, scripts are requested up front on an
+    ``AsyncPromptGenerator`` (at most ``limits.script`` in flight, paced by the
+    ``x-ratelimit-*`` headers) and the script workers publish each one as it lands.
+    With ``pack_size`` set, scripts are requested K tickers at a time (``0`` picks K
+    from the model limits, see ``packed_generator``); a ticker the packed reply
+    misses is generated on its own.
+
+    With ``shorts`` set, the video stage composes the multi-scene Short (see
+    ``shorts_composer``) from the price history and narration instead of looping
+    the chart image, so it does not wait for the chart stage. Without a chart
+    stage, the video worker draws the chart itself and loops the in-memory frame.
+    ``chart_exports`` adds thumbnail/preview files from the chart's single draw.
+    """
+
+    def __init__(
+        self,
+        *,
+        runtime: RuntimeConfig,
+        limits: Optional[StageLimits] = None,
+        stages: Sequence[str] = STAGES,
+        output_dir: Optional[Path] = None,
+        provider: Optional[HistoryProvider] = None,
+        generator: Optional[PromptGenerator] = None,
+        use_processes: bool = True,
+        chart_style: ChartStyle = LANDSCAPE_STYLE,
+        journal: Optional[RunJournal] = None,
+        resume: bool = False,
+        pack_size: Optional[int] = None,
+        tts_backend: TTSBackendName = "openai",
+        shorts: bool = False,
+        chart_exports: Sequence[ExportProfile] = (),
+    ) -> None:
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+        self.runtime = runtime
+        self.limits = limits or StageLimits()
+        self.stages = tuple(stages)
+        self.output_dir = output_dir or ASSETS_DIR / "templates"
+        self.provider = provider or get_provider(dry_run=runtime.dry_run)
+        self.generator = generator
+        self.use_processes = use_processes
+        self.chart_style = chart_style
+        self.journal = journal or RunJournal(runtime.run_id, dry_run=runtime.dry_run)
+        self.resume = resume
+        self.pack_size = pack_size
+        self.tts_backend = tts_backend
+        self.shorts = shorts
+        self.chart_exports = tuple(chart_exports)
+        self.summaries: Dict[int, MarketSummary] = {}
+        self.notion_queue: Optional[NotionWriteQueue] = None
+        self.packed: Dict[int, Future] = {}
+        self.requested: Dict[int, Future] = {}
+
+    @property
+    def _video_from_history(self) -> bool:
+        """Whether the video worker draws from the price history rather than waiting for a chart file."""
+        return self.shorts or "chart" not in self.stages
+
+    def _output(self, row: BatchRow, suffix: str) -> Path:
+        return self.output_dir / f"{self.runtime.run_id}_{row.ticker}_{suffix}"
+
+    def _pending(self, result: RowResult, stage: str) -> bool:
+        return stage in self.stages and stage not in result.outputs
+
+    def _restore(self, results: List[RowResult]) -> None:
+        for result in results:
+            for stage in self.stages:
+                output = self.journal.completed(result.row.ticker, stage)
+                if output is not None:
+                    result.outputs[stage] = output
+                    result.resumed.append(stage)
+        resumed = sum(len(result.resumed) for result in results)
+        logger.info("Resuming run %s: %d finished stage(s) reused", self.runtime.run_id, resumed)
+
+    def _existing_script(self, result: RowResult) -> None:
+        """Without a script stage, narrate the script an earlier run wrote; a row without one fails."""
+        path = self._output(result.row, "script.md")
+        output = self.journal.completed(result.row.ticker, "script") or (str(path) if path.is_file() else None)
+        if output is None:
+            result.errors["narration"] = f"Missing script for {result.row.ticker} (expected {path}); run the script stage first"
+            self._record(result, "narration")
+            return
+        result.outputs["script"] = output
+        result.resumed.append("script")
+
+    def _fetch(self, rows: Sequence[BatchRow], results: List[RowResult], indexes: Iterable[int]) -> Dict[int, pd.DataFrame]:
+        histories: Dict[int, pd.DataFrame] = {}
+        self.summaries = {}
+        by_period: Dict[str, List[int]] = {}
+        for index in indexes:
+            by_period.setdefault(rows[index].period, []).append(index)
+        for period, indexes in by_period.items():
+            start = time.perf_counter()
+            try:
+                frames = self.provider.prefetch([rows[i].ticker for i in indexes] + [DEFAULT_BENCHMARK], period=period)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Bulk fetch failed for period %s: %s", period, exc)
+                get_metrics().record_stage("fetch", time.perf_counter() - start, status="failed", period=period, tickers=len(indexes))
+                for i in indexes:
+                    results[i].errors["fetch"] = repr(exc)
+                continue
+            get_metrics().record_stage("fetch", time.perf_counter() - start, period=period, tickers=len(indexes))
+            for i in indexes:
+                frame = frames.get(rows[i].ticker)
+                if frame is None or frame.empty:
+                    results[i].errors["fetch"] = f"No price data for ticker {rows[i].ticker}"
+                else:
+                    histories[i] = frame
+                    results[i].outputs["fetch"] = f"{len(frame)} bars"
+            summaries = summarize_frames(
+                {rows[i].ticker: histories[i] for i in indexes if i in histories},
+                period=period,
+                benchmark=frames.get(DEFAULT_BENCHMARK),
+            )
+            for i in indexes:
+                if rows[i].ticker in summaries:
+                    self.summaries[i] = summaries[rows[i].ticker]
+        return histories
+
+    def _submit_packs(self, pool: Executor, rows: Sequence[BatchRow], indexes: Iterable[int]) -> None:
+        """Start the packed requests; ``_script`` picks each row's script from its pack."""
+        packer = PackedScriptGenerator(self.generator, pack_size=self.pack_size or None)
+        ready = [index for index in indexes if index in self.summaries]
+        items = [
+            (PromptContext(ticker=rows[i].ticker, company_name=rows[i].company, timeframe=rows[i].period), self.summaries[i])
+            for i in ready
+        ]
+        # Packs keep the item order, so rows map onto them in sequence.
+        positions = iter(ready)
+        packs = packer.packs(items)
+        for pack in packs:
+            future = pool.submit(packer.generate_pack, pack, fallback=False)
+            for _ in pack:
+                self.packed[next(positions)] = future
+        logger.info("Requesting %d script(s) in %d packed request(s)", len(items), len(packs))
+
+    def _submit_requests(self, requests: BackgroundScriptGenerator, rows: Sequence[BatchRow], indexes: Iterable[int]) -> None:
+        """Start one async request per row; ``_script`` waits for its own."""
+        for i in indexes:
+            if i in self.summaries:
+                context = PromptContext(ticker=rows[i].ticker, company_name=rows[i].company, timeframe=rows[i].period)
+                self.requested[i] = requests.submit(context, self.summaries[i])
+        logger.info("Requesting %d script(s) concurrently (limit %d)", len(self.requested), self.limits.script)
+
+    def _script(self, index: int, row: BatchRow) -> str:
+        output = self._output(row, "script.md")
+        request = self.requested.get(index)
+        if request is not None:
+            publish_script(
+                row.ticker,
+                request.result(),
+                runtime=self.runtime,
+                output_path=output,
+                notion_page_id=row.notion_page,
+                notion_queue=self.notion_queue,
+            )
+            return str(output)
+        pack = self.packed.get(index)
+        if pack is not None:
+            try:
+                script = pack.result().get(row.ticker)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Packed request for %s failed (%s); generating it alone", row.ticker, exc)
+                script = None
+            if script is not None:
+                publish_script(
+                    row.ticker,
+                    script,
+                    runtime=self.runtime,
+                    output_path=output,
+                    notion_page_id=row.notion_page,
+                    notion_queue=self.notion_queue,
+                )
+                return str(output)
+        generate_script_for_ticker(
+            row.ticker,
+            row.company,
+            period=row.period,
+            notion_page_id=row.notion_page,
+            output_path=output,
+            generator=self.generator,
+            runtime_config=self.runtime,
+            provider=self.provider,
+            stock_summary=self.summaries.get(index),
+            notion_queue=self.notion_queue,
+        )
+        return str(output)
+
+    def _executor(self, workers: int, *, processes: bool, initializer: Optional[Callable[..., None]] = None, initargs: Tuple = ()) -> Executor:
+        if processes and self.use_processes:
+            return ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initializer,
+                initargs=initargs,
+            )
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def _log_progress(self, results: List[RowResult], pending: int) -> None:
+        done = Counter(stage for result in results for stage in result.outputs)
+        failed = sum(1 for result in results if result.failed)
+        logger.info(
+            "Progress: %s | failed rows=%d | in flight=%d",
+            ", ".join(f"{stage} {done[stage]}/{len(results)}" for stage in self.stages),
+            failed,
+            pending,
+        )
+
+    def _record(self, result: RowResult, stage: str) -> None:
+        if stage in result.errors:
+            self.journal.record_failed(result.row.ticker, stage, result.errors[stage])
+        else:
+            self.journal.record_done(result.row.ticker, stage, result.outputs[stage])
+
+    def run(self, rows: Sequence[BatchRow]) -> BatchReport:
+        check_unique(rows)
+        results = [RowResult(row=row) for row in rows]
+        if self.resume:
+            self._restore(results)
+        if "script" not in self.stages:
+            for result in results:
+                if self._pending(result, "narration") and result.row.audio is None:
+                    self._existing_script(result)
+        scripts = [result.row for result in results if self._pending(result, "script")]
+        use_requests = self.generator is None and self.pack_size is None and bool(scripts)
+        if self.generator is None and scripts:
+            self.generator = PromptGenerator(runtime=self.runtime)
+        self.notion_queue = NotionWriteQueue(runtime=self.runtime) if any(row.notion_page for row in scripts) else None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Price history is only needed by rows with a script or chart (or a video drawn from it) still to produce.
+        needs_history = ("script", "chart", "video") if self._video_from_history else ("script", "chart")
+        histories = self._fetch(
+            rows,
+            results,
+            [i for i, result in enumerate(results) if any(self._pending(result, stage) for stage in needs_history)],
+        )
+
+        script_pool = self._executor(self.limits.script, processes=False)
+        narration_pool = self._executor(self.limits.narration, processes=False)
+        pack_pool = self._executor(self.limits.script, processes=False)
+        self.packed = {}
+        self.requested = {}
+        if self.pack_size is not None:
+            self._submit_packs(pack_pool, rows, [i for i in histories if self._pending(results[i], "script")])
+        requests = BackgroundScriptGenerator(runtime=self.runtime, concurrency=self.limits.script) if use_requests else None
+        if requests is not None:
+            self._submit_requests(requests, rows, [i for i in histories if self._pending(results[i], "script")])
+        # Chart workers build their figure template up front; see chart_renderer.
+        chart_pool = self._executor(self.limits.chart, processes=True, initializer=warm_renderer, initargs=(self.chart_style,))
+        video_pool = self._executor(self.limits.video, processes=True)
+        pending: Dict[Future, Tuple[int, str]] = {}
+
+        def submit_narration(index: int) -> None:
+            result = results[index]
+            if not self._pending(result, "narration") or "script" not in result.outputs:
+                return
+            if result.row.audio is not None:
+                result.skipped.append("narration")
+                return
+            output = self._output(result.row, "narration.wav")
+            future = narration_pool.submit(_run_stage, _narrate, result.outputs["script"], output, self.runtime, self.tts_backend)
+            pending[future] = (index, "narration")
+
+        def submit_video(index: int) -> None:
+            result = results[index]
+            ready = index in histories if self._video_from_history else "chart" in result.outputs
+            if not self._pending(result, "video") or not ready:
+                return
+            audio = result.row.audio or result.outputs.get("narration")
+            if audio is None:
+                # Otherwise the narration has not finished (or failed).
+                if "narration" not in self.stages:
+                    result.errors["video"] = f"No audio for {result.row.ticker}; add the narration stage or an audio column"
+                    self._record(result, "video")
+                return
+            output = self._output(result.row, "video.mp4")
+            if self.shorts:
+                script = result.outputs.get("script")
+                args: Tuple[Any, ...] = (_render_short, result.row, histories[index], Path(audio), script, output, self.runtime)
+            elif self._video_from_history:
+                args = (_render_chart_video, result.row, histories[index], Path(audio), output, self.runtime, self.chart_style)
+            else:
+                args = (_render_video, result.outputs["chart"], Path(audio), output, self.runtime)
+            future = video_pool.submit(_run_stage, *args)
+            pending[future] = (index, "video")
+
+        try:
+            for index, history in histories.items():
+                row = rows[index]
+                if self._pending(results[index], "script"):
+                    pending[script_pool.submit(_run_stage, self._script, index, row)] = (index, "script")
+                if self._pending(results[index], "chart"):
+                    output = self._output(row, "chart.png")
+                    future = chart_pool.submit(
+                        _run_stage, _render_chart, row, history, output, self.runtime, self.chart_style, self.chart_exports
+                    )
+                    pending[future] = (index, "chart")
+            for index, result in enumerate(results):
+                if "script" in result.resumed:
+                    submit_narration(index)
+                if "chart" in result.resumed or self._video_from_history:
+                    submit_video(index)
+
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index, stage = pending.pop(future)
+                    result = results[index]
+                    try:
+                        outcome = future.result()
+                    except Exception as exc:  # noqa: BLE001
+                        # The worker itself died (e.g. a broken process pool).
+                        outcome = StageOutcome(error=repr(exc))
+                    get_metrics().merge(outcome.metrics)
+                    get_metrics().record_stage(
+                        stage, outcome.seconds, ticker=result.row.ticker, status="failed" if outcome.error else "ok"
+                    )
+                    if outcome.error is not None:
+                        logger.error("Stage %s failed for %s: %s", stage, result.row.ticker, outcome.error)
+                        result.errors[stage] = outcome.error
+                    else:
+                        result.outputs[stage] = outcome.output or ""
+                    # Scripts with a Notion update are journaled once the write queue has flushed.
+                    if not (stage == "script" and self.notion_queue is not None and result.row.notion_page):
+                        self._record(result, stage)
+                    if stage == "script":
+                        submit_narration(index)
+                    # Videos drawn from the history were submitted up front or wait for narration.
+                    if stage == "narration" or (stage == "chart" and not self._video_from_history):
+                        submit_video(index)
+                self._log_progress(results, len(pending))
+        finally:
+            for pool in (script_pool, pack_pool, narration_pool, chart_pool, video_pool):
+                pool.shutdown(wait=True)
+            if requests is not None:
+                requests.close()
+            if self.notion_queue is not None:
+                self.notion_queue.close()
+
+        if self.notion_queue is not None:
+            for result in results:
+                if not result.row.notion_page or "script" in result.resumed:
+                    continue
+                if "script" not in result.outputs and "script" not in result.errors:
+                    continue
+                exc = self.notion_queue.failures.get(result.row.notion_page)
+                if exc is not None and "script" in result.outputs:
+                    result.errors["notion"] = repr(exc)
+                    # Leave the script pending so a resumed run retries the Notion update too.
+                    self.journal.record_failed(result.row.ticker, "script", repr(exc))
+                else:
+                    self._record(result, "script")
+
+        report = BatchReport(results)
+        logger.info("Batch finished: %d/%d rows failed", len(report.failed_rows), len(results))
+        return report
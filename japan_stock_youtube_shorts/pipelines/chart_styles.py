@@ -0,0 +1,87 @@
+"""
+Chart output geometry and colours, and the image export profiles.
+
+Kept free of matplotlib so the CLI can list the styles without loading a renderer.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Literal, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ChartStyle:
+    """Output geometry and colours; axes placement is fixed so no layout pass is needed."""
+
+    name: str
+    width_px: int
+    height_px: int
+    dpi: int
+    # Axes rectangle in figure fractions: (left, bottom, width, height).
+    axes_rect: Tuple[float, float, float, float]
+    line_color: str = "#d81b60"
+    line_width: float = 2.0
+    title_size: float = 12.0
+    label_size: float = 10.0
+    tick_size: float = 9.0
+    face_color: str = "white"
+    text_color: str = "black"
+    grid_alpha: float = 0.3
+
+    @property
+    def figsize(self) -> Tuple[float, float]:
+        return self.width_px / self.dpi, self.height_px / self.dpi
+
+
+# Same 1200x800 output as the original ``plt.subplots(figsize=(6, 4))`` + dpi=200 chart.
+LANDSCAPE_STYLE = ChartStyle(name="landscape", width_px=1200, height_px=800, dpi=200, axes_rect=(0.14, 0.14, 0.82, 0.76))
+
+# 1080x1920 (9:16) for YouTube Shorts; the chart sits in the middle band so captions fit above and below.
+SHORTS_STYLE = ChartStyle(
+    name="shorts",
+    width_px=1080,
+    height_px=1920,
+    dpi=120,
+    axes_rect=(0.14, 0.30, 0.80, 0.42),
+    line_width=4.0,
+    title_size=26.0,
+    label_size=18.0,
+    tick_size=15.0,
+    face_color="#111111",
+    text_color="white",
+    grid_alpha=0.2,
+)
+
+CHART_STYLES: Dict[str, ChartStyle] = {style.name: style for style in (LANDSCAPE_STYLE, SHORTS_STYLE)}
+
+
+ImageFormat = Literal["png", "webp", "jpeg"]
+IMAGE_FORMATS = ("png", "webp", "jpeg")
+_SUFFIXES = {"png": ".png", "webp": ".webp", "jpeg": ".jpg"}
+
+
+@dataclass(frozen=True)
+class ExportProfile:
+    """Output format, width (height keeps the aspect ratio; ``None`` = as drawn) and quality of one export."""
+
+    name: str
+    format: ImageFormat = "png"
+    width: Optional[int] = None
+    # WebP/JPEG quality.
+    quality: int = 85
+    # PNG: quantize to a 256-colour palette.
+    palette: bool = True
+
+    @property
+    def suffix(self) -> str:
+        return _SUFFIXES[self.format]
+
+
+# The chart as drawn (a 1080x1920 Short with the shorts style), a small thumbnail and a Notion page preview.
+FULL_PROFILE = ExportProfile("full")
+THUMBNAIL_PROFILE = ExportProfile("thumbnail", "webp", width=480, quality=80)
+NOTION_PROFILE = ExportProfile("notion", "jpeg", width=720, quality=85)
+EXPORT_PROFILES: Dict[str, ExportProfile] = {
+    profile.name: profile for profile in (FULL_PROFILE, THUMBNAIL_PROFILE, NOTION_PROFILE)
+}
@@ -0,0 +1,278 @@
+"""
+Encode Shorts clips by driving ffmpeg directly instead of through MoviePy.
+
+Two modes are supported:
+
+* ``render_still`` loops one image under the narration with ``-tune stillimage``;
+  ffmpeg does all the work and nothing is decoded frame-by-frame in Python.
+  ``render_still_frame`` does the same for an RGBA array already in memory (a
+  chart straight from the Agg buffer), so no PNG is encoded and decoded again.
+* ``render_reveal`` streams raw RGBA frames from the chart template's Agg buffer
+  into ffmpeg's stdin for an animated price-line reveal, without temporary files.
+
+``stream_frames`` is the shared pipe-to-ffmpeg path. The Shorts composer uses it
+with frames that are already YUV 4:2:0 and sends only the frames that changed,
+each with its frame number, so held frames cost the encoder nothing.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import struct
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, List, Literal, Optional, Sequence, Tuple
+
+from ..metrics import get_metrics
+from .chart_styles import SHORTS_STYLE, ChartStyle
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Audio already in AAC can be muxed as-is.
+STREAM_COPY_AUDIO = {".m4a", ".aac"}
+REVEAL_SHARE = 0.8
+# IVF framing for timestamped raw frames: size (u32) and presentation time (u64), little-endian.
+_IVF_FRAME = struct.Struct("<IQ")
+
+# Still-image renderers: this module, or MoviePy (see ``generate_video``).
+VideoBackend = Literal["ffmpeg", "moviepy"]
+VIDEO_BACKENDS = ("ffmpeg", "moviepy")
+
+
+@dataclass(frozen=True)
+class EncoderOptions:
+    """ffmpeg video encoder settings shared by the CLI and the batch runner."""
+
+    encoder: str = "libx264"
+    preset: str = "veryfast"
+    threads: int = 0
+    crf: int = 23
+
+    def video_args(self, *, still: bool = False) -> List[str]:
+        args = ["-c:v", self.encoder, "-pix_fmt", "yuv420p"]
+        if self.encoder in {"libx264", "libx265"}:
+            args += ["-preset", self.preset, "-crf", str(self.crf)]
+            if still:
+                args += ["-tune", "stillimage"]
+        elif self.preset:
+            args += ["-preset", self.preset]
+        if self.threads:
+            args += ["-threads", str(self.threads)]
+        return args
+
+
+@lru_cache(maxsize=1)
+def ffmpeg_exe() -> str:
+    """Locate ffmpeg: ``FFMPEG_BINARY``, then ``PATH``, then the binary bundled with MoviePy."""
+    configured = os.getenv("FFMPEG_BINARY")
+    if configured:
+        return configured
+    found = shutil.which("ffmpeg")
+    if found:
+        return found
+    try:
+        import imageio_ffmpeg
+    except ImportError as exc:
+        raise RuntimeError("ffmpeg not found; install it or set FFMPEG_BINARY.") from exc
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+
+def audio_duration(path: Path) -> float:
+    """Read the container duration that ffmpeg reports for ``path``."""
+    result = subprocess.run([ffmpeg_exe(), "-hide_banner", "-i", str(path)], capture_output=True, text=True)
+    match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+    if not match:
+        raise ValueError(f"Could not determine duration of {path}")
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _audio_args(audio_path: Path) -> List[str]:
+    if audio_path.suffix.lower() in STREAM_COPY_AUDIO:
+        return ["-c:a", "copy"]
+    return ["-c:a", "aac", "-b:a", "192k"]
+
+
+def _run(command: List[str], *, stdin: Optional[int] = None) -> subprocess.Popen:
+    logger.debug("Running %s", " ".join(command))
+    return subprocess.Popen(command, stdin=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def _finish(process: subprocess.Popen, output: Path) -> Path:
+    _, stderr = process.communicate()
+    if process.returncode != 0:
+        message = stderr.decode("utf-8", "replace").strip().splitlines()[-5:]
+        raise RuntimeError(f"ffmpeg failed ({process.returncode}) for {output}: " + " | ".join(message))
+    return output
+
+
+def render_still(
+    image_path: Path,
+    audio_path: Path,
+    output: Path,
+    *,
+    fps: int = 30,
+    options: Optional[EncoderOptions] = None,
+) -> Path:
+    """
+    Loop ``image_path`` for the length of ``audio_path``.
+
+    The image is decoded and converted once per second and duplicated up to ``fps``
+    at the encoder, with a long GOP since the picture never changes.
+    """
+    options = options or EncoderOptions()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    command = [
+        ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y",
+        "-loop", "1", "-framerate", "1", "-i", str(image_path),
+        "-i", str(audio_path),
+        # yuv420p needs even dimensions.
+        "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2",
+        *options.video_args(still=True),
+        "-r", str(fps), "-g", str(fps * 10),
+        *_audio_args(audio_path),
+        "-shortest", "-movflags", "+faststart",
+        str(output),
+    ]  # fmt: skip
+    with get_metrics().timer("render_seconds", kind="ffmpeg_still"):
+        return _finish(_run(command), output)
+
+
+def render_still_frame(
+    rgba: np.ndarray,
+    audio_path: Path,
+    output: Path,
+    *,
+    fps: int = 30,
+    options: Optional[EncoderOptions] = None,
+) -> Path:
+    """
+    Loop the ``(height, width, 4)`` RGBA array ``rgba`` for the length of ``audio_path``.
+
+    The single raw frame is piped in and converted once; the ``loop`` filter
+    repeats the converted frame.
+    """
+    options = options or EncoderOptions()
+    height, width = rgba.shape[:2]
+    output.parent.mkdir(parents=True, exist_ok=True)
+    command = [
+        ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-framerate", "1", "-i", "pipe:0",
+        "-i", str(audio_path),
+        "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2,format=yuv420p,loop=loop=-1:size=1",
+        *options.video_args(still=True),
+        "-r", str(fps), "-g", str(fps * 10),
+        *_audio_args(audio_path),
+        "-shortest", "-movflags", "+faststart",
+        str(output),
+    ]  # fmt: skip
+    with get_metrics().timer("render_seconds", kind="ffmpeg_still"):
+        process = _run(command, stdin=subprocess.PIPE)
+        assert process.stdin is not None
+        try:
+            process.stdin.write(rgba.tobytes())
+        except BrokenPipeError:
+            logger.error("ffmpeg closed its input early while rendering %s", output)
+        return _finish(process, output)
+
+
+def _ivf_header(width: int, height: int, fps: int) -> bytes:
+    # fourcc I420 makes ffmpeg's IVF demuxer hand the payload to the rawvideo decoder as yuv420p.
+    return b"DKIF" + struct.pack("<HH4sHHIII", 0, 32, b"I420", width, height, fps, 1, 0) + bytes(4)
+
+
+def stream_frames(
+    frames: Iterable[Any],
+    audio_path: Path,
+    output: Path,
+    *,
+    size: Tuple[int, int],
+    fps: int = 30,
+    pix_fmt: str = "rgba",
+    timestamps: bool = False,
+    options: Optional[EncoderOptions] = None,
+    extra_args: Sequence[str] = (),
+    kind: str = "ffmpeg_stream",
+) -> Path:
+    """
+    Pipe raw ``pix_fmt`` frames of ``size`` (width, height) into ffmpeg under the narration.
+
+    With ``timestamps`` set, ``frames`` yields ``(frame_number, frame)`` pairs of
+    ``yuv420p`` frames and may skip numbers: the frames are wrapped in IVF, which
+    carries a timestamp per frame, and encoded at a variable frame rate so a frame
+    is held on screen until the next one instead of being re-encoded.
+    """
+    options = options or EncoderOptions()
+    width, height = size
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if timestamps:
+        if pix_fmt != "yuv420p":
+            raise ValueError("Timestamped frames must be yuv420p")
+        source = ["-f", "ivf", "-i", "pipe:0"]
+        extra_args = ["-fps_mode", "passthrough", *extra_args]
+    else:
+        source = ["-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{width}x{height}", "-framerate", str(fps), "-i", "pipe:0"]
+    command = [
+        ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y",
+        *source,
+        "-i", str(audio_path),
+        "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2",
+        *options.video_args(),
+        *extra_args,
+        *_audio_args(audio_path),
+        "-shortest", "-movflags", "+faststart",
+        str(output),
+    ]  # fmt: skip
+    with get_metrics().timer("render_seconds", kind=kind):
+        process = _run(command, stdin=subprocess.PIPE)
+        assert process.stdin is not None
+        try:
+            if timestamps:
+                process.stdin.write(_ivf_header(width, height, fps))
+                for number, frame in frames:
+                    process.stdin.write(_IVF_FRAME.pack(len(frame), number))
+                    process.stdin.write(frame)
+            else:
+                for frame in frames:
+                    process.stdin.write(frame)
+        except BrokenPipeError:
+            logger.error("ffmpeg closed its input early while rendering %s", output)
+        # communicate() flushes and closes stdin, then collects stderr.
+        return _finish(process, output)
+
+
+def render_reveal(
+    ticker: str,
+    history: pd.DataFrame,
+    audio_path: Path,
+    output: Path,
+    *,
+    period: str = "1mo",
+    style: ChartStyle = SHORTS_STYLE,
+    fps: int = 30,
+    options: Optional[EncoderOptions] = None,
+) -> Path:
+    """Animate the closing-price line over the first part of the narration, then hold."""
+    duration = audio_duration(audio_path)
+    frames = max(1, round(duration * fps))
+    from .chart_renderer import get_renderer
+
+    renderer = get_renderer(style)
+    return stream_frames(
+        renderer.reveal_frames(ticker, history, period=period, frames=frames, reveal_frames=round(frames * REVEAL_SHARE)),
+        audio_path,
+        output,
+        size=renderer.figure.canvas.get_width_height(),
+        fps=fps,
+        options=options,
+        kind="ffmpeg_reveal",
+    )
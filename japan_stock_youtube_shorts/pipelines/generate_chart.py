@@ -6,16 +6,18 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Sequence
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-import yfinance as yf
 
 from ..config import RuntimeConfig
+from ..market.history import HistoryProvider, get_provider
+from .artifact_cache import artifact_key, frame_digest, get_artifact_cache
+from .chart_export import ExportProfile, export_path, profile_for, write_chart
+from .chart_renderer import CHART_VERSION, LANDSCAPE_STYLE, ChartStyle, get_renderer
 
 logger = logging.getLogger(__name__)
-plt.switch_backend("Agg")
 
 
 def _default_output(ticker: str, run_id: str) -> Path:
@@ -23,36 +25,61 @@ def _default_output(ticker: str, run_id: str) -> Path:
     return root / "japan_stock_youtube_shorts" / "assets" / "templates" / "charts" / f"{run_id}_{ticker}_chart.png"
 
 
-def download_history(ticker: str, period: str = "1mo", *, dry_run: bool = False) -> pd.DataFrame:
+def download_history(ticker: str, period: str = "1mo", *, dry_run: bool = False, provider: Optional[HistoryProvider] = None) -> pd.DataFrame:
     logger.info("Downloading price history for %s (%s)", ticker, period)
     if dry_run:
         logger.info("[dry-run] Returning dummy price history for %s", ticker)
-        dates = pd.date_range(end=pd.Timestamp.today(), periods=5)
-        return pd.DataFrame({"Close": [1, 2, 3, 4, 5], "High": [1, 2, 3, 4, 5], "Low": [1, 2, 3, 4, 5]}, index=dates)
-    data = yf.download(ticker, period=period, progress=False)
-    if data.empty:
-        raise ValueError(f"No data for ticker {ticker}")
-    return data
+    history_provider = provider or get_provider(dry_run=dry_run)
+    return history_provider.get(ticker, period=period)
 
 
-def create_price_chart(ticker: str, *, period: str = "1mo", output_path: Optional[Path] = None, runtime_config: Optional[RuntimeConfig] = None) -> Path:
+def create_price_chart(
+    ticker: str,
+    *,
+    period: str = "1mo",
+    output_path: Optional[Path] = None,
+    runtime_config: Optional[RuntimeConfig] = None,
+    provider: Optional[HistoryProvider] = None,
+    history: Optional[pd.DataFrame] = None,
+    style: ChartStyle = LANDSCAPE_STYLE,
+    exports: Sequence[ExportProfile] = (),
+) -> Path:
     """
     Generate a closing-price line chart and return the output path.
+
+    Pass ``history`` to render already-fetched data (e.g. from a batch prefetch).
+    The figure template for ``style`` is built once per process and reused, and an
+    identical chart rendered before is served from the artifact cache.
+
+    Each profile in ``exports`` (thumbnail, Notion preview, ...) is written next to
+    the chart as ``<stem>_<profile><suffix>`` (see ``chart_export.export_path``);
+    the chart is drawn at most once for all of them.
     """
     runtime = runtime_config or RuntimeConfig.from_env()
-    history = download_history(ticker, period=period, dry_run=runtime.dry_run)
+    if history is None:
+        history = download_history(ticker, period=period, dry_run=runtime.dry_run, provider=provider)
     output = output_path or _default_output(ticker, runtime.run_id)
-    output.parent.mkdir(parents=True, exist_ok=True)
-
-    fig, ax = plt.subplots(figsize=(6, 4))
-    history["Close"].plot(ax=ax, color="#d81b60", linewidth=2)
-    ax.set_title(f"{ticker} closing price ({period})")
-    ax.set_ylabel("Price (JPY)")
-    ax.set_xlabel("Date")
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    fig.savefig(output, dpi=200)
-    plt.close(fig)
+    drawn: List[np.ndarray] = []
+
+    def render(path: Path, profile: Optional[ExportProfile]) -> Path:
+        renderer = get_renderer(style)
+        if profile is None:
+            # Vector formats are saved by matplotlib.
+            return renderer.render(ticker, history, path, period=period)
+        # One draw serves the chart and every export that is not cached.
+        if not drawn:
+            drawn.append(renderer.rgba(ticker, history, period=period))
+        return write_chart(drawn[0], profile, path)
+
+    data = frame_digest(history[["Close"]])
+    targets = [(output, profile_for(output)), *((export_path(output, profile), profile) for profile in exports)]
+    for path, profile in targets:
+        key = artifact_key(
+            "chart", version=CHART_VERSION, style=style, ticker=ticker, period=period, data=data, profile=profile or path.suffix
+        )
+        get_artifact_cache().materialize(
+            key, path, lambda target, profile=profile: render(target, profile), mode=runtime.artifact_cache
+        )
 
     logger.info("Chart saved to %s (run_id=%s)", output, runtime.run_id)
     return output
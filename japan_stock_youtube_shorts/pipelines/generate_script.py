@@ -6,37 +6,47 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Optional
-
-import pandas as pd
-import yfinance as yf
+from typing import TYPE_CHECKING, Optional
 
 from ..config import RuntimeConfig
 from ..notion import updater
-from ..openai.prompt_generator import PromptContext, PromptGenerator
+from ..notion.notion_client import get_notion_client
+from ..notion.write_queue import NotionWriteQueue
+from ..openai.prompt_generator import PromptContext, PromptGenerator, StockSummary
+from .script_stream import ScriptStreamWriter, SentenceCallback
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from ..market.history import HistoryProvider
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_stock_summary(ticker: str, period: str = "1mo", *, dry_run: bool = False) -> str:
+def fetch_stock_summary(ticker: str, period: str = "1mo", *, dry_run: bool = False, provider: Optional[HistoryProvider] = None) -> str:
     """Download recent data and format a concise summary."""
     if dry_run:
         logger.info("[dry-run] Skipping stock data download for %s", ticker)
         return f"{ticker} ({period}) dummy summary"
 
+    # pandas/numpy are only needed past this point, so dry runs start without them.
+    from ..market.history import get_provider
+    from ..market.summary import DEFAULT_BENCHMARK, summarize_frames
+
     logger.info("Fetching %s price history for %s", period, ticker)
-    data: pd.DataFrame = yf.download(ticker, period=period, progress=False)
+    history_provider = provider or get_provider()
+    data: pd.DataFrame = history_provider.get(ticker, period=period)
     if data.empty:
         raise ValueError(f"No price data found for {ticker}")
 
-    start_price = float(data["Close"].iloc[0])
-    end_price = float(data["Close"].iloc[-1])
-    pct_change = ((end_price - start_price) / start_price) * 100
+    benchmark = None
+    if ticker != DEFAULT_BENCHMARK:
+        try:
+            benchmark = history_provider.get(DEFAULT_BENCHMARK, period=period)
+        except ValueError:
+            logger.warning("Benchmark %s unavailable; skipping relative strength", DEFAULT_BENCHMARK)
 
-    summary = (
-        f"{period} closing price: {start_price:.2f} -> {end_price:.2f} "
-        f"({pct_change:+.2f}%). Highest: {data['High'].max():.2f}, Lowest: {data['Low'].min():.2f}."
-    )
+    summary = summarize_frames({ticker: data}, period=period, benchmark=benchmark)[ticker].render()
     logger.debug("Stock summary for %s: %s", ticker, summary)
     return summary
 
@@ -50,27 +60,87 @@ def generate_script_for_ticker(
     output_path: Optional[Path] = None,
     generator: Optional[PromptGenerator] = None,
     runtime_config: Optional[RuntimeConfig] = None,
+    provider: Optional[HistoryProvider] = None,
+    stock_summary: Optional[StockSummary] = None,
+    notion_queue: Optional[NotionWriteQueue] = None,
+    stream: bool = False,
+    on_sentence: Optional[SentenceCallback] = None,
 ) -> str:
     """
     Generate a script and optionally persist it to Notion or the filesystem.
+
+    ``stock_summary`` lets batch callers pass facts computed for the whole universe;
+    ``notion_queue`` defers the Notion write so it can be merged and rate limited.
+    With ``stream=True`` the artifact is written as tokens arrive and ``on_sentence``
+    receives each complete sentence (on a separate thread) before generation ends;
+    Notion is updated once the full script is in.
     """
     runtime = runtime_config or RuntimeConfig.from_env()
     prompt_generator = generator or PromptGenerator(runtime=runtime)
     context = PromptContext(ticker=ticker, company_name=company_name, timeframe=period)
-    stock_summary = fetch_stock_summary(ticker, period=period, dry_run=runtime.dry_run)
+    if stock_summary is None:
+        stock_summary = fetch_stock_summary(ticker, period=period, dry_run=runtime.dry_run, provider=provider)
+    if stream:
+        artifact_path = script_path(ticker, runtime, output_path)
+        completion = prompt_generator.stream_script(context, stock_summary)
+        with ScriptStreamWriter(artifact_path, on_sentence=on_sentence) as writer:
+            for delta in completion:
+                writer.write(delta)
+        script = completion.text
+        logger.info("Streamed script to %s (%d sentence(s), %s)", artifact_path, writer.sentences, completion.stats.describe())
+        push_script(script, runtime=runtime, notion_page_id=notion_page_id, notion_queue=notion_queue)
+        return script
     script = prompt_generator.generate_script(context, stock_summary)
+    publish_script(
+        ticker, script, runtime=runtime, output_path=output_path, notion_page_id=notion_page_id, notion_queue=notion_queue
+    )
+    return script
 
-    artifact_path = output_path or Path("japan_stock_youtube_shorts") / "assets" / "templates" / f"{runtime.run_id}_{ticker}_script.md"
+
+def publish_script(
+    ticker: str,
+    script: str,
+    *,
+    runtime: RuntimeConfig,
+    output_path: Optional[Path] = None,
+    notion_page_id: Optional[str] = None,
+    notion_queue: Optional[NotionWriteQueue] = None,
+) -> Path:
+    """
+    Write the script artifact and, if a page is given, push it to Notion.
+
+    The script and status go out as one page update; with ``notion_queue`` the update
+    is only enqueued and errors surface when the queue is flushed.
+    """
+    artifact_path = script_path(ticker, runtime, output_path)
     artifact_path.parent.mkdir(parents=True, exist_ok=True)
     artifact_path.write_text(script, encoding="utf-8")
     logger.info("Saved script to %s (run_id=%s)", artifact_path, runtime.run_id)
+    push_script(script, runtime=runtime, notion_page_id=notion_page_id, notion_queue=notion_queue)
+    return artifact_path
 
-    if notion_page_id:
-        try:
-            updater.record_script(notion_page_id, script)
-            updater.update_status(notion_page_id, "Script Generated")
-        except Exception as exc:  # noqa: BLE001
-            updater.log_exception(notion_page_id, exc)
-            raise
 
-    return script
+def script_path(ticker: str, runtime: RuntimeConfig, output_path: Optional[Path] = None) -> Path:
+    return output_path or Path("japan_stock_youtube_shorts") / "assets" / "templates" / f"{runtime.run_id}_{ticker}_script.md"
+
+
+def push_script(
+    script: str,
+    *,
+    runtime: RuntimeConfig,
+    notion_page_id: Optional[str] = None,
+    notion_queue: Optional[NotionWriteQueue] = None,
+) -> None:
+    """Send the script and status to ``notion_page_id`` (directly or via ``notion_queue``)."""
+    if not notion_page_id:
+        return
+    properties = {**updater.script_properties(script), **updater.status_properties("Script Generated")}
+    if notion_queue is not None:
+        notion_queue.enqueue(notion_page_id, properties)
+        return
+    notion = get_notion_client(runtime)
+    try:
+        updater.update_properties(notion_page_id, properties, client=notion)
+    except Exception as exc:  # noqa: BLE001
+        updater.log_exception(notion_page_id, exc, client=notion)
+        raise
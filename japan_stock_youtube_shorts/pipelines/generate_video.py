@@ -1,20 +1,62 @@
 """
 Combine audio narration and a chart image into a short MP4 video.
+
+``assemble_chart_video`` draws the chart in memory and loops it without writing
+an image; ``assemble_short`` builds the full multi-scene Short (see ``shorts_composer``).
 """
 
 from __future__ import annotations
 
 import logging
+from dataclasses import asdict
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from moviepy.editor import AudioFileClip, ImageClip
+from ..config import ASSETS_DIR, RuntimeConfig
+from ..market.history import HistoryProvider
+from ..metrics import get_metrics
+from .artifact_cache import artifact_key, file_digest, frame_digest, get_artifact_cache
+from .chart_renderer import CHART_VERSION, LANDSCAPE_STYLE, SHORTS_STYLE, ChartStyle, get_renderer
+from .ffmpeg_video import (
+    VIDEO_BACKENDS,
+    EncoderOptions,
+    VideoBackend,
+    audio_duration,
+    render_reveal,
+    render_still,
+    render_still_frame,
+)
+from .generate_chart import download_history
 
-from ..config import RuntimeConfig
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
+def _render_moviepy(image_path: Path, audio_path: Path, output: Path, *, fps: int, options: EncoderOptions) -> Path:
+    from moviepy.editor import AudioFileClip, ImageClip
+
+    with get_metrics().timer("render_seconds", kind="moviepy"):
+        image_clip = ImageClip(str(image_path))
+        audio_clip = AudioFileClip(str(audio_path))
+        video = image_clip.set_duration(audio_clip.duration).set_audio(audio_clip)
+        video.write_videofile(
+            str(output),
+            fps=fps,
+            codec=options.encoder,
+            audio_codec="aac",
+            preset=options.preset,
+            threads=options.threads or None,
+            verbose=False,
+            logger=None,
+        )
+        video.close()
+        audio_clip.close()
+        image_clip.close()
+    return output
+
+
 def assemble_video(
     image_path: Path,
     audio_path: Path,
@@ -22,27 +64,174 @@ def assemble_video(
     output_path: Optional[Path] = None,
     fps: int = 30,
     runtime_config: Optional[RuntimeConfig] = None,
+    backend: VideoBackend = "ffmpeg",
+    options: Optional[EncoderOptions] = None,
 ) -> Path:
     """
     Merge an audio track with a static image to create a short clip.
+
+    The ``ffmpeg`` backend loops the image inside ffmpeg; ``moviepy`` is the
+    original frame-by-frame path, kept for comparison.
     """
     runtime = runtime_config or RuntimeConfig.from_env()
     output = output_path or image_path.with_name(f"{runtime.run_id}_{image_path.stem}.mp4")
-    image_clip = ImageClip(str(image_path))
-    audio_clip = AudioFileClip(str(audio_path))
-    video = image_clip.set_duration(audio_clip.duration).set_audio(audio_clip)
-
+    options = options or EncoderOptions()
+    if backend not in VIDEO_BACKENDS:
+        raise ValueError(f"Unknown video backend: {backend}")
     output.parent.mkdir(parents=True, exist_ok=True)
-    logger.info("Rendering video to %s (run_id=%s)", output, runtime.run_id)
-    video.write_videofile(
-        str(output),
+
+    def render(path: Path) -> Path:
+        logger.info("Rendering video to %s with %s/%s (run_id=%s)", path, backend, options.encoder, runtime.run_id)
+        if backend == "moviepy":
+            return _render_moviepy(image_path, audio_path, path, fps=fps, options=options)
+        return render_still(image_path, audio_path, path, fps=fps, options=options)
+
+    key = artifact_key(
+        "video",
+        backend=backend,
+        image=file_digest(image_path),
+        audio=file_digest(audio_path),
         fps=fps,
-        codec="libx264",
-        audio_codec="aac",
-        verbose=False,
-        logger=None,
+        options=asdict(options),
     )
-    video.close()
-    audio_clip.close()
-    image_clip.close()
-    return output
+    return get_artifact_cache().materialize(key, output, render, mode=runtime.artifact_cache)
+
+
+def assemble_chart_video(
+    ticker: str,
+    audio_path: Path,
+    *,
+    period: str = "1mo",
+    output_path: Optional[Path] = None,
+    fps: int = 30,
+    runtime_config: Optional[RuntimeConfig] = None,
+    options: Optional[EncoderOptions] = None,
+    provider: Optional[HistoryProvider] = None,
+    history: Optional[pd.DataFrame] = None,
+    style: ChartStyle = LANDSCAPE_STYLE,
+) -> Path:
+    """
+    Loop the price chart under the narration, handing the drawn RGBA buffer to ffmpeg.
+
+    Same picture as ``create_price_chart`` + ``assemble_video`` without the PNG
+    encode/decode in between; use it when the chart image itself is not needed.
+    """
+    runtime = runtime_config or RuntimeConfig.from_env()
+    if history is None:
+        history = download_history(ticker, period=period, dry_run=runtime.dry_run, provider=provider)
+    output = output_path or ASSETS_DIR / "templates" / f"{runtime.run_id}_{ticker}_video.mp4"
+    options = options or EncoderOptions()
+
+    def render(path: Path) -> Path:
+        logger.info("Rendering chart video to %s from the in-memory chart (run_id=%s)", path, runtime.run_id)
+        rgba = get_renderer(style).rgba(ticker, history, period=period)
+        return render_still_frame(rgba, audio_path, path, fps=fps, options=options)
+
+    key = artifact_key(
+        "chart_video",
+        version=CHART_VERSION,
+        style=style,
+        ticker=ticker,
+        period=period,
+        data=frame_digest(history[["Close"]]),
+        audio=file_digest(audio_path),
+        fps=fps,
+        options=asdict(options),
+    )
+    return get_artifact_cache().materialize(key, output, render, mode=runtime.artifact_cache)
+
+
+def assemble_reveal_video(
+    ticker: str,
+    audio_path: Path,
+    *,
+    period: str = "1mo",
+    output_path: Optional[Path] = None,
+    fps: int = 30,
+    runtime_config: Optional[RuntimeConfig] = None,
+    options: Optional[EncoderOptions] = None,
+    provider: Optional[HistoryProvider] = None,
+    style: ChartStyle = SHORTS_STYLE,
+) -> Path:
+    """
+    Render an animated price-line reveal under the narration.
+
+    Chart frames are streamed straight into ffmpeg; no intermediate images are written.
+    """
+    runtime = runtime_config or RuntimeConfig.from_env()
+    history = download_history(ticker, period=period, dry_run=runtime.dry_run, provider=provider)
+    output = output_path or ASSETS_DIR / "templates" / f"{runtime.run_id}_{ticker}_reveal.mp4"
+    options = options or EncoderOptions()
+
+    def render(path: Path) -> Path:
+        logger.info("Rendering animated chart video to %s (run_id=%s)", path, runtime.run_id)
+        return render_reveal(ticker, history, audio_path, path, period=period, style=style, fps=fps, options=options)
+
+    key = artifact_key(
+        "reveal",
+        version=CHART_VERSION,
+        style=style,
+        ticker=ticker,
+        period=period,
+        data=frame_digest(history[["Close"]]),
+        audio=file_digest(audio_path),
+        fps=fps,
+        options=asdict(options),
+    )
+    return get_artifact_cache().materialize(key, output, render, mode=runtime.artifact_cache)
+
+
+def assemble_short(
+    ticker: str,
+    audio_path: Path,
+    *,
+    company: Optional[str] = None,
+    period: str = "1mo",
+    output_path: Optional[Path] = None,
+    subtitles_path: Optional[Path] = None,
+    script_path: Optional[Path] = None,
+    call_to_action: Optional[str] = None,
+    fps: int = 30,
+    runtime_config: Optional[RuntimeConfig] = None,
+    options: Optional[EncoderOptions] = None,
+    provider: Optional[HistoryProvider] = None,
+    history: Optional[pd.DataFrame] = None,
+) -> Path:
+    """
+    Compose a 1080x1920 Short (title, chart reveal, key numbers, CTA) under the narration.
+
+    Subtitles come from ``subtitles_path``, else the SRT the narration stage wrote
+    next to ``audio_path``, else the script at ``script_path`` timed by length.
+    """
+    from .shorts_composer import COMPOSER_VERSION, DEFAULT_CTA, SHORTS_ENCODER, find_font, load_cues, render_short
+
+    runtime = runtime_config or RuntimeConfig.from_env()
+    if history is None:
+        history = download_history(ticker, period=period, dry_run=runtime.dry_run, provider=provider)
+    output = output_path or ASSETS_DIR / "templates" / f"{runtime.run_id}_{ticker}_short.mp4"
+    options = options or SHORTS_ENCODER
+    cta = call_to_action or DEFAULT_CTA
+    cues = load_cues(audio_path, duration=audio_duration(audio_path), subtitles_path=subtitles_path, script_path=script_path)
+
+    def render(path: Path) -> Path:
+        logger.info("Composing Short to %s with %d subtitle cue(s) (run_id=%s)", path, len(cues), runtime.run_id)
+        return render_short(
+            ticker, history, audio_path, path, company=company, period=period, cues=cues, call_to_action=cta, fps=fps, options=options
+        )
+
+    key = artifact_key(
+        "short",
+        version=COMPOSER_VERSION,
+        chart=CHART_VERSION,
+        ticker=ticker,
+        company=company,
+        period=period,
+        data=frame_digest(history),
+        audio=file_digest(audio_path),
+        cues=[(cue.start, cue.end, cue.text) for cue in cues],
+        cta=cta,
+        font=find_font(),
+        fps=fps,
+        options=asdict(options),
+    )
+    return get_artifact_cache().materialize(key, output, render, mode=runtime.artifact_cache)
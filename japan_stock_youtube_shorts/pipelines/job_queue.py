@@ -0,0 +1,178 @@
+"""
+SQLite job queue shared by ``main.py submit`` and the ``main.py serve`` worker.
+
+Submitting is a single insert, so triggers (cron, Actions, a price alert) return
+immediately; a long-running worker claims jobs in submission order and records
+their outcome.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import ASSETS_DIR
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("script", "chart", "video", "idea", "doe")
+# Payload keys each kind needs; video additionally needs ``ticker`` or ``image``.
+REQUIRED_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "script": ("ticker", "company"),
+    "chart": ("ticker",),
+    "video": ("audio",),
+    "idea": (),
+    "doe": (),
+}
+FINISHED = ("done", "failed")
+
+_COLUMNS = "id, kind, payload, dry_run, status, worker, created, started, finished, result, error"
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    dry_run: bool
+    status: str
+    worker: Optional[str]
+    created: float
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return f"#{self.id} {self.kind} {self.payload.get('ticker', '')}".rstrip()
+
+
+def _job(row: tuple) -> Job:
+    job_id, kind, payload, dry_run, status, worker, created, started, finished, result, error = row
+    return Job(job_id, kind, json.loads(payload), bool(dry_run), status, worker, created, started, finished, result, error)
+
+
+def validate_payload(kind: str, payload: Dict[str, Any]) -> None:
+    """Raise ``ValueError`` if ``payload`` cannot be run as a ``kind`` job."""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"unknown job kind {kind!r} (expected one of {', '.join(JOB_KINDS)})")
+    missing = [key for key in REQUIRED_FIELDS[kind] if not payload.get(key)]
+    if kind == "video" and not (payload.get("ticker") or payload.get("image")):
+        missing.append("ticker or image")
+    if missing:
+        raise ValueError(f"{kind} job needs {', '.join(missing)}")
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """Jobs table in ``JOB_QUEUE_PATH`` (default ``assets/cache/jobs.sqlite3``)."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or Path(os.getenv("JOB_QUEUE_PATH") or ASSETS_DIR / "cache" / "jobs.sqlite3")
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit: every statement below is its own transaction.
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, payload TEXT NOT NULL, dry_run INTEGER NOT NULL, "
+            "status TEXT NOT NULL, worker TEXT, created REAL NOT NULL, started REAL, finished REAL, result TEXT, error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+    def submit(self, kind: str, payload: Dict[str, Any], *, dry_run: bool = False) -> int:
+        validate_payload(kind, payload)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (kind, payload, dry_run, status, created) VALUES (?, ?, ?, 'queued', ?)",
+                (kind, json.dumps(payload, ensure_ascii=False), int(dry_run), time.time()),
+            )
+        logger.info("Queued job #%d (%s)", cursor.lastrowid, kind)
+        return int(cursor.lastrowid)
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """Atomically mark the oldest queued job as running for ``worker``."""
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1) "
+                f"RETURNING {_COLUMNS}",
+                (worker, time.time()),
+            ).fetchone()
+        return _job(row) if row else None
+
+    def finish(self, job_id: int, *, result: Optional[str] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished = ?, result = ?, error = ? WHERE id = ?",
+                ("failed" if error else "done", time.time(), result, error, job_id),
+            )
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row else None
+
+    def wait(self, job_id: int, *, timeout: Optional[float] = None, interval: float = 0.2) -> Job:
+        """Poll until the job is done or failed; raises ``TimeoutError``."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                raise KeyError(f"no job #{job_id} in {self.path}")
+            if job.status in FINISHED:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"job #{job_id} still {job.status} after {timeout:g}s")
+            time.sleep(interval)
+
+    def requeue_orphans(self) -> int:
+        """Put back running jobs whose worker process on this host no longer exists."""
+        host = socket.gethostname()
+        with self._lock:
+            rows = self._conn.execute("SELECT id, worker FROM jobs WHERE status = 'running'").fetchall()
+        orphans = []
+        for job_id, worker in rows:
+            worker_host, _, pid = (worker or "").rpartition(":")
+            if worker_host == host and pid.isdigit() and not _alive(int(pid)):
+                orphans.append(job_id)
+        if orphans:
+            with self._lock:
+                self._conn.executemany(
+                    "UPDATE jobs SET status = 'queued', worker = NULL, started = NULL WHERE id = ? AND status = 'running'",
+                    [(job_id,) for job_id in orphans],
+                )
+            logger.warning("Requeued %d job(s) left running by a stopped worker", len(orphans))
+        return len(orphans)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
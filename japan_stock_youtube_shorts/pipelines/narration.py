@@ -0,0 +1,301 @@
+"""
+Narration stage: turn a script artifact into a WAV file through a pluggable TTS backend.
+
+The script is split into sentences (see ``script_stream.split_sentences``), each
+sentence is synthesized on a thread pool, and the clips are joined with a short
+pause. Clips are cached by a hash of the sentence and the backend's voice
+settings, so editing one line of a script only re-synthesizes that line. The
+sentence timings are written next to the audio as SRT for burned-in subtitles.
+
+``Narrator.stream`` accepts sentences one at a time (it is a ``SentenceCallback``
+for ``generate_script_for_ticker(stream=True, on_sentence=...)``), so synthesis of
+the first sentence starts while the model is still writing the rest.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+import wave
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, List, Literal, Optional, Protocol, Tuple, Type
+
+from ..config import ASSETS_DIR, LLMCacheMode, RuntimeConfig
+from ..metrics import get_metrics
+from .script_stream import split_sentences
+from .subtitles import Cue, write_srt
+
+logger = logging.getLogger(__name__)
+
+TTSBackendName = Literal["openai", "tone"]
+TTS_BACKENDS = ("openai", "tone")
+
+# Markdown list/heading markers and emphasis that should not be read aloud.
+_MARKUP_PREFIX = re.compile(r"^\s*(?:#{1,6}|[-*+>]|\d+[.)])\s+")
+_MARKUP_INLINE = re.compile(r"\*\*|__|`")
+
+
+class TTSBackend(Protocol):
+    """Anything that turns one sentence into 16-bit little-endian mono PCM."""
+
+    sample_rate: int
+
+    @property
+    def identity(self) -> str:
+        ...
+
+    def synthesize(self, text: str) -> bytes:
+        ...
+
+
+class ToneBackend:
+    """
+    Offline backend: a quiet tone per character, roughly as long as reading the text.
+
+    Deterministic and free, so tests, dry runs and benchmarks get real WAV files
+    with speech-like timing.
+    """
+
+    def __init__(self, *, sample_rate: int = 16_000, seconds_per_char: float = 0.12) -> None:
+        self.sample_rate = sample_rate
+        self.seconds_per_char = seconds_per_char
+        self._tones: Dict[int, array] = {}
+        self._silence = array("h", bytes(2 * int(sample_rate * seconds_per_char)))
+
+    @property
+    def identity(self) -> str:
+        return f"tone:{self.sample_rate}:{self.seconds_per_char}"
+
+    def _tone(self, pitch: int) -> array:
+        tone = self._tones.get(pitch)
+        if tone is None:
+            length = int(self.sample_rate * self.seconds_per_char)
+            step = 2 * math.pi * (180 + 15 * pitch) / self.sample_rate
+            tone = self._tones[pitch] = array("h", (int(2_000 * math.sin(step * i)) for i in range(length)))
+        return tone
+
+    def synthesize(self, text: str) -> bytes:
+        samples = array("h")
+        for char in text:
+            samples.extend(self._silence if char.isspace() else self._tone(ord(char) % 24))
+        if sys.byteorder == "big":
+            samples.byteswap()
+        return samples.tobytes()
+
+
+def speakable(sentence: str) -> str:
+    """Strip Markdown markers from a script sentence; ``""`` if nothing is left to read."""
+    text = _MARKUP_INLINE.sub("", _MARKUP_PREFIX.sub("", sentence)).strip()
+    return text if any(char.isalnum() for char in text) else ""
+
+
+def script_sentences(script: str) -> List[str]:
+    return [text for text in (speakable(sentence) for sentence in split_sentences(script)) if text]
+
+
+class SentenceAudioCache:
+    """PCM clips under ``TTS_CACHE_DIR`` (default ``assets/cache/tts``), one file per content hash."""
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.root = root or Path(os.getenv("TTS_CACHE_DIR") or ASSETS_DIR / "cache" / "tts")
+
+    @staticmethod
+    def key(identity: str, text: str) -> str:
+        return hashlib.sha256(f"{identity}\n{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pcm"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+class Narrator:
+    """Synthesize a script sentence by sentence with ``workers`` requests in flight."""
+
+    def __init__(
+        self,
+        backend: TTSBackend,
+        *,
+        cache: Optional[SentenceAudioCache] = None,
+        workers: int = 4,
+        pause: float = 0.3,
+        mode: LLMCacheMode = "use",
+    ) -> None:
+        self.backend = backend
+        self.cache = cache or SentenceAudioCache()
+        self.workers = max(1, workers)
+        self.pause = pause
+        self.mode = mode
+
+    def _clip(self, sentence: str) -> Tuple[bytes, bool]:
+        """PCM for ``sentence`` and whether it came from the cache."""
+        key = SentenceAudioCache.key(self.backend.identity, sentence)
+        metrics = get_metrics()
+        if self.mode == "use":
+            cached = self.cache.get(key)
+            metrics.inc("cache_lookups", cache="tts", result="miss" if cached is None else "hit")
+            if cached is not None:
+                return cached, True
+        else:
+            metrics.inc("cache_lookups", cache="tts", result="bypass" if self.mode == "bypass" else "miss")
+        audio = self.backend.synthesize(sentence)
+        if self.mode != "bypass" and audio:
+            self.cache.put(key, audio)
+        return audio, False
+
+    def narrate(self, script: str, output: Path) -> Path:
+        """Write ``script`` as a 16-bit mono WAV at ``output`` and its sentence timings as ``output.srt``."""
+        with self.stream(output) as narration:
+            for sentence in split_sentences(script):
+                narration.feed(sentence)
+            return narration.finish()
+
+    def stream(self, output: Path) -> "NarrationStream":
+        """Narrate sentences to ``output`` as they are fed; see ``NarrationStream``."""
+        return NarrationStream(self, output)
+
+    def _write(self, sentences: List[str], clips: Dict[str, Tuple[bytes, bool]], output: Path, *, start: float) -> Path:
+        rate = self.backend.sample_rate
+        silence = bytes(2 * int(rate * self.pause))
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        cues = []
+        with wave.open(str(tmp), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(rate)
+            for index, sentence in enumerate(sentences):
+                if index:
+                    wav.writeframes(silence)
+                begin = wav.getnframes()
+                wav.writeframes(clips[sentence][0])
+                cues.append(Cue(begin / rate, wav.getnframes() / rate, sentence))
+            frames = wav.getnframes()
+        os.replace(tmp, output)
+        write_srt(output.with_suffix(".srt"), cues)
+        cached = sum(1 for _, hit in clips.values() if hit)
+        seconds = time.perf_counter() - start
+        get_metrics().observe("render_seconds", seconds, kind="narration")
+        logger.info(
+            "Narrated %d sentence(s) to %s: %.1fs of audio, %d synthesized, %d cached, in %.2fs",
+            len(sentences),
+            output,
+            frames / rate,
+            len(clips) - cached,
+            cached,
+            seconds,
+        )
+        return output
+
+
+class NarrationStream:
+    """
+    Synthesize sentences as they are fed; ``finish`` joins them into the WAV.
+
+    ``feed`` only queues work, so it can be called from the thread that reads a
+    streamed completion. Leaving the ``with`` block without ``finish`` cancels
+    sentences that have not started.
+    """
+
+    def __init__(self, narrator: Narrator, output: Path) -> None:
+        self.narrator = narrator
+        self.output = output
+        self._pool = ThreadPoolExecutor(max_workers=narrator.workers, thread_name_prefix="tts")
+        self._sentences: List[str] = []
+        self._clips: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def feed(self, sentence: str) -> None:
+        """Start synthesizing one script sentence (Markdown markers are not read aloud)."""
+        text = speakable(sentence)
+        if not text:
+            return
+        with self._lock:
+            self._sentences.append(text)
+            # Repeated sentences (a recurring CTA, say) are synthesized once.
+            if text not in self._clips:
+                self._clips[text] = self._pool.submit(self.narrator._clip, text)
+
+    def finish(self) -> Path:
+        """Wait for every clip and write the WAV and SRT; returns the WAV path."""
+        with self._lock:
+            sentences, futures = list(self._sentences), dict(self._clips)
+        if not sentences:
+            raise ValueError("Script has no text to narrate")
+        clips = {text: future.result() for text, future in futures.items()}
+        self._pool.shutdown(wait=True)
+        return self.narrator._write(sentences, clips, self.output, start=self._start)
+
+    def __enter__(self) -> "NarrationStream":
+        return self
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException], traceback: Optional[TracebackType]
+    ) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+_backends: Dict[str, TTSBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_tts_backend(name: TTSBackendName = "openai", *, dry_run: bool = False) -> TTSBackend:
+    """Return the process-wide backend called ``name`` (the tone backend for dry runs)."""
+    if name not in TTS_BACKENDS:
+        raise ValueError(f"Unknown TTS backend: {name}")
+    if dry_run and name != "tone":
+        logger.info("[dry-run] Using the offline tone backend instead of %s", name)
+        name = "tone"
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            if name == "openai":
+                from ..openai.tts import OpenAITTSBackend
+
+                backend = OpenAITTSBackend()
+            else:
+                backend = ToneBackend()
+            _backends[name] = backend
+        return backend
+
+
+def narration_path(script_path: Path) -> Path:
+    return ASSETS_DIR / "audio" / f"{script_path.stem.removesuffix('_script')}_narration.wav"
+
+
+def narrate_script(
+    script_path: Path,
+    *,
+    output_path: Optional[Path] = None,
+    backend: Optional[TTSBackend] = None,
+    backend_name: TTSBackendName = "openai",
+    workers: int = 4,
+    runtime_config: Optional[RuntimeConfig] = None,
+) -> Path:
+    """Narrate the script artifact at ``script_path`` (default output: ``assets/audio``)."""
+    runtime = runtime_config or RuntimeConfig.from_env()
+    tts = backend or get_tts_backend(backend_name, dry_run=runtime.dry_run)
+    output = output_path or narration_path(script_path)
+    script = script_path.read_text(encoding="utf-8")
+    return Narrator(tts, workers=workers, mode=runtime.artifact_cache).narrate(script, output)
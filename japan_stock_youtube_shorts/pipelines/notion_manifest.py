@@ -0,0 +1,106 @@
+"""
+Stream batch manifest rows out of a Notion database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from ..notion.async_client import AsyncNotionClient
+from ..notion.properties import property_text
+from .batch import BatchOrchestrator, BatchReport, BatchRow, RowResult
+
+logger = logging.getLogger(__name__)
+
+# Notion property names read for each BatchRow field.
+PROPERTY_NAMES = {"ticker": "Ticker", "company": "Company", "period": "Period", "audio": "Audio"}
+
+
+def row_from_page(page: Dict[str, Any]) -> Optional[BatchRow]:
+    properties = page.get("properties", {})
+    values = {field: property_text(properties.get(name)) for field, name in PROPERTY_NAMES.items()}
+    if not values["ticker"]:
+        return None
+    return BatchRow(
+        ticker=values["ticker"],
+        company=values["company"] or values["ticker"],
+        period=values["period"] or "1mo",
+        notion_page=page["id"],
+        audio=Path(values["audio"]) if values["audio"] else None,
+    )
+
+
+async def iter_manifest(
+    database_id: str,
+    *,
+    status: Optional[str] = None,
+    client: AsyncNotionClient,
+) -> AsyncIterator[BatchRow]:
+    """Yield a ``BatchRow`` per database page, optionally only pages in ``status``."""
+    query_filter = {"property": "Status", "status": {"equals": status}} if status else None
+    sorts = [{"timestamp": "created_time", "direction": "ascending"}]
+    async for page in client.iter_database(database_id, filter=query_filter, sorts=sorts):
+        row = row_from_page(page)
+        if row is None:
+            logger.warning("Skipping Notion page %s without a %s", page.get("id"), PROPERTY_NAMES["ticker"])
+            continue
+        yield row
+
+
+async def _fill(rows: AsyncIterator[BatchRow], queue: "asyncio.Queue[Any]") -> None:
+    """Move ``rows`` into ``queue``, then ``None``; a failed read is queued as its exception."""
+    try:
+        async for row in rows:
+            await queue.put(row)
+    except Exception as exc:  # noqa: BLE001
+        await queue.put(exc)
+        return
+    await queue.put(None)
+
+
+async def _run_streaming(
+    orchestrator: BatchOrchestrator,
+    database_id: str,
+    *,
+    status: Optional[str],
+    chunk_size: int,
+) -> BatchReport:
+    results: List[RowResult] = []
+    chunk: List[BatchRow] = []
+    async with AsyncNotionClient(runtime=orchestrator.runtime) as client:
+        # A separate task reads Notion into a bounded queue, so the next chunk is fetched
+        # while the orchestrator runs the current one in a thread (at most two chunks held).
+        queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=chunk_size)
+        reader = asyncio.create_task(_fill(iter_manifest(database_id, status=status, client=client), queue))
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, Exception):
+                    raise item
+                if item is not None:
+                    chunk.append(item)
+                if chunk and (item is None or len(chunk) >= chunk_size):
+                    results.extend((await asyncio.to_thread(orchestrator.run, chunk)).results)
+                    chunk = []
+                if item is None:
+                    break
+        finally:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+    return BatchReport(results)
+
+
+def run_notion_batch(
+    orchestrator: BatchOrchestrator,
+    database_id: str,
+    *,
+    status: Optional[str] = None,
+    chunk_size: int = 200,
+) -> BatchReport:
+    """Run ``orchestrator`` over a Notion database in chunks of ``chunk_size`` rows."""
+    logger.info("Streaming manifest from Notion database %s (status=%s)", database_id, status or "any")
+    return asyncio.run(_run_streaming(orchestrator, database_id, status=status, chunk_size=chunk_size))
+
@@ -0,0 +1,85 @@
+"""
+Per-run journal of finished pipeline stages, used to resume a failed run.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..config import ASSETS_DIR
+from .artifact_cache import file_digest
+
+logger = logging.getLogger(__name__)
+
+
+class RunJournal:
+    """
+    SQLite record of each (ticker, stage) outcome for one ``run_id``.
+
+    A stage counts as finished on resume only if its output file still exists with
+    the digest recorded when it completed; anything else is run again.
+    """
+
+    def __init__(self, run_id: str, *, dry_run: bool = False, path: Optional[Path] = None) -> None:
+        self.run_id = run_id
+        self.dry_run = dry_run
+        self.path = path or Path(os.getenv("RUN_JOURNAL_PATH") or ASSETS_DIR / "cache" / "runs.sqlite3")
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stages ("
+            "run_id TEXT NOT NULL, ticker TEXT NOT NULL, stage TEXT NOT NULL, dry_run INTEGER NOT NULL, "
+            "status TEXT NOT NULL, output TEXT, digest TEXT, error TEXT, updated REAL NOT NULL, "
+            "PRIMARY KEY (run_id, ticker, stage))"
+        )
+        self._conn.commit()
+
+    def _write(self, ticker: str, stage: str, status: str, output: Optional[str], digest: Optional[str], error: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stages (run_id, ticker, stage, dry_run, status, output, digest, error, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, ticker, stage, int(self.dry_run), status, output, digest, error, time.time()),
+            )
+            self._conn.commit()
+
+    def record_done(self, ticker: str, stage: str, output: str) -> None:
+        path = Path(output)
+        digest = file_digest(path) if path.is_file() else None
+        self._write(ticker, stage, "done", output, digest, None)
+
+    def record_failed(self, ticker: str, stage: str, error: str) -> None:
+        self._write(ticker, stage, "failed", None, None, error)
+
+    def completed(self, ticker: str, stage: str) -> Optional[str]:
+        """Output of a finished stage whose file is unchanged, else ``None``."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output, digest FROM stages WHERE run_id = ? AND ticker = ? AND stage = ? AND status = 'done' AND dry_run = ?",
+                (self.run_id, ticker, stage, int(self.dry_run)),
+            ).fetchone()
+        if row is None:
+            return None
+        output, digest = row
+        path = Path(output)
+        if digest is None or not path.is_file() or file_digest(path) != digest:
+            logger.info("Journal entry for %s [%s] is stale (%s changed or missing); re-running", ticker, stage, output)
+            return None
+        return output
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM stages WHERE run_id = ? GROUP BY status", (self.run_id,)).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
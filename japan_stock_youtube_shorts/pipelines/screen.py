@@ -0,0 +1,103 @@
+"""
+Nightly screen: pick the tickers that deserve a Short and write them as a batch manifest.
+
+``screen_universe`` ranks the ticker master against the cached daily bars in the
+``OHLCVStore`` (see ``market.screener``); ``write_manifest`` writes the picks in
+the CSV layout ``load_manifest`` reads, so ``main.py batch --manifest`` can run
+them directly. The score and the reason columns are extra and ignored by the batch.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from ..config import ASSETS_DIR, RuntimeConfig
+from ..market.history import get_provider
+from ..market.master import load_master, merge_earnings
+from ..market.screener import Candidate, ScreenWeights, compute_signals, rank_candidates, store_panel
+from ..market.store import OHLCVStore
+from ..market.summary import Panel
+from ..metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_COLUMNS = ("ticker", "company", "period", "notion_page", "score", "reason")
+
+
+def manifest_path(run_id: str) -> Path:
+    return ASSETS_DIR / "manifests" / f"{run_id}_screen.csv"
+
+
+def screen_universe(
+    *,
+    master_path: Optional[Path] = None,
+    earnings_path: Optional[Path] = None,
+    top: int = 20,
+    weights: ScreenWeights = ScreenWeights(),
+    min_turnover: float = 1e8,
+    segments: Sequence[str] = (),
+    max_per_sector: Optional[int] = None,
+    earnings_days: int = 7,
+    sync: bool = False,
+    store: Optional[OHLCVStore] = None,
+    runtime_config: Optional[RuntimeConfig] = None,
+    now: Optional[datetime] = None,
+) -> List[Candidate]:
+    """
+    Rank the whole ticker master on cached daily bars and return the best ``top``.
+
+    The screen only reads the store; ``sync=True`` first brings it up to the latest
+    closed session (one grouped download for the tickers that are behind). Dry runs
+    screen the fixture history instead.
+    """
+    runtime = runtime_config or RuntimeConfig.from_env()
+    master = load_master(master_path)
+    if earnings_path is not None:
+        master = merge_earnings(master, earnings_path)
+    tickers = list(master)
+    metrics = get_metrics()
+    store = store or OHLCVStore()
+    if sync and not runtime.dry_run:
+        from ..market.history import YFinanceBackend
+
+        with metrics.timer("market_fetch_seconds", backend="screen_sync"):
+            store.sync(tickers, period="1y", backend=YFinanceBackend(), now=now)
+    with metrics.timer("screen_seconds"):
+        if runtime.dry_run:
+            logger.info("[dry-run] Screening fixture price history instead of the OHLCV store")
+            panel = Panel.from_frames(get_provider(dry_run=True).prefetch(tickers, period="1y"))
+        else:
+            panel = store_panel(store, tickers, period="1y", now=now)
+        picks = rank_candidates(
+            compute_signals(panel, master),
+            master,
+            top=top,
+            weights=weights,
+            min_turnover=min_turnover,
+            segments=segments,
+            max_per_sector=max_per_sector,
+            earnings_days=earnings_days,
+        )
+    missing = len(tickers) - len(panel.tickers)
+    if missing:
+        logger.info("No cached bars for %d of %d ticker(s) (run with --sync to fetch them)", missing, len(tickers))
+    return picks
+
+
+def write_manifest(picks: Sequence[Candidate], path: Path, *, period: str = "1mo") -> Path:
+    """Write ``picks`` as a batch manifest CSV (atomically)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(MANIFEST_COLUMNS)
+        for pick in picks:
+            writer.writerow([pick.ticker, pick.company, period, "", f"{pick.score:.2f}", pick.reason])
+    os.replace(tmp, path)
+    logger.info("Wrote %d screened ticker(s) to %s", len(picks), path)
+    return path
@@ -0,0 +1,256 @@
+"""
+Nightly script generation through the OpenAI Batch API (submit -> poll -> collect).
+
+Every step persists its progress to ``assets/batches/<run_id>.json`` so that an
+interrupted run can be resumed with the same ``run_id``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..config import ASSETS_DIR, RuntimeConfig
+from ..market.history import HistoryProvider, get_provider
+from ..market.summary import summarize_universe
+from ..notion.write_queue import NotionWriteQueue
+from ..openai.client import openai_client
+from ..openai.completion_cache import completion_key, get_cache
+from ..openai.prompt_generator import SCRIPT_SYSTEM_PROMPT, PromptContext, PromptGenerator, build_script_prompt, record_usage
+from .batch import BatchRow
+from .generate_script import fetch_stock_summary, publish_script
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass
+class BatchEntry:
+    custom_id: str
+    ticker: str
+    company: str
+    period: str
+    notion_page: Optional[str]
+    messages: List[Dict[str, str]]
+    output: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchState:
+    run_id: str
+    model: str
+    entries: List[BatchEntry] = field(default_factory=list)
+    input_file_id: Optional[str] = None
+    batch_id: Optional[str] = None
+    status: str = "pending"
+    output_file_id: Optional[str] = None
+    error_file_id: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: Path) -> "BatchState":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["entries"] = [BatchEntry(**entry) for entry in data.get("entries", [])]
+        return cls(**data)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(asdict(self), ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+class ScriptBatchRunner:
+    """Build, submit and collect a Batch API job for one run's worth of scripts."""
+
+    def __init__(
+        self,
+        *,
+        runtime: RuntimeConfig,
+        client: Any = None,
+        model: Optional[str] = None,
+        state_dir: Optional[Path] = None,
+        output_dir: Optional[Path] = None,
+        provider: Optional[HistoryProvider] = None,
+    ) -> None:
+        self.runtime = runtime
+        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self.client = client if client is not None or runtime.dry_run else openai_client()
+        self.state_dir = state_dir or ASSETS_DIR / "batches"
+        self.output_dir = output_dir or ASSETS_DIR / "templates"
+        self.provider = provider or get_provider(dry_run=runtime.dry_run)
+
+    @property
+    def state_path(self) -> Path:
+        return self.state_dir / f"{self.runtime.run_id}.json"
+
+    @property
+    def input_path(self) -> Path:
+        return self.state_dir / f"{self.runtime.run_id}.jsonl"
+
+    def load_state(self) -> Optional[BatchState]:
+        return BatchState.load(self.state_path) if self.state_path.exists() else None
+
+    def _require_state(self) -> BatchState:
+        state = self.load_state()
+        if state is None:
+            raise FileNotFoundError(f"No batch state for run_id={self.runtime.run_id}; submit first.")
+        return state
+
+    def build_entries(self, rows: Sequence[BatchRow]) -> List[BatchEntry]:
+        """Summarize each ticker and build the same prompt ``generate_script`` would send."""
+        summaries = {
+            period: summarize_universe([row.ticker for row in rows if row.period == period], period=period, provider=self.provider)
+            for period in {row.period for row in rows}
+        }
+        entries = []
+        for index, row in enumerate(rows):
+            summary = summaries[row.period].get(row.ticker)
+            if summary is None:
+                summary = fetch_stock_summary(row.ticker, period=row.period, dry_run=self.runtime.dry_run, provider=self.provider)
+            context = PromptContext(ticker=row.ticker, company_name=row.company, timeframe=row.period)
+            messages = [{"role": "user", "content": build_script_prompt(context, summary)}]
+            entries.append(BatchEntry(f"{index}:{row.ticker}", row.ticker, row.company, row.period, row.notion_page, messages))
+        return entries
+
+    def write_input(self, state: BatchState) -> Path:
+        self.input_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.input_path.open("w", encoding="utf-8") as handle:
+            for entry in state.entries:
+                body = {
+                    "model": state.model,
+                    "messages": [{"role": "system", "content": SCRIPT_SYSTEM_PROMPT}, *entry.messages],
+                    "temperature": PromptGenerator.temperature,
+                }
+                line = {"custom_id": entry.custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}
+                handle.write(json.dumps(line, ensure_ascii=False) + "\n")
+        return self.input_path
+
+    def submit(self, rows: Sequence[BatchRow]) -> BatchState:
+        """Create the JSONL input and the batch; a no-op if this run was already submitted."""
+        state = self.load_state()
+        if state is not None and state.batch_id:
+            logger.info("Batch already submitted for run_id=%s (%s)", state.run_id, state.batch_id)
+            return state
+        if state is None:
+            state = BatchState(run_id=self.runtime.run_id, model=self.model, entries=self.build_entries(rows))
+            state.save(self.state_path)
+        path = self.write_input(state)
+        if self.runtime.dry_run:
+            logger.info("[dry-run] Wrote %d batch requests to %s without submitting", len(state.entries), path)
+            return state
+        if not state.input_file_id:
+            with path.open("rb") as handle:
+                state.input_file_id = self.client.files.create(file=handle, purpose="batch").id
+            state.save(self.state_path)
+        batch = self.client.batches.create(
+            input_file_id=state.input_file_id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"run_id": state.run_id},
+        )
+        state.batch_id, state.status = batch.id, batch.status
+        state.save(self.state_path)
+        logger.info("Submitted batch %s with %d requests (run_id=%s)", batch.id, len(state.entries), state.run_id)
+        return state
+
+    def poll(self, *, interval: float = 30.0, timeout: Optional[float] = None) -> BatchState:
+        """Wait until the batch reaches a terminal status (or ``timeout`` seconds pass)."""
+        state = self._require_state()
+        if self.runtime.dry_run or not state.batch_id:
+            return state
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            batch = self.client.batches.retrieve(state.batch_id)
+            state.status = batch.status
+            state.output_file_id = batch.output_file_id
+            state.error_file_id = batch.error_file_id
+            state.save(self.state_path)
+            counts = batch.request_counts
+            logger.info(
+                "Batch %s status=%s (%s/%s done)",
+                batch.id,
+                batch.status,
+                getattr(counts, "completed", "?"),
+                getattr(counts, "total", "?"),
+            )
+            if batch.status in TERMINAL_STATUSES:
+                return state
+            if deadline is not None and time.monotonic() >= deadline:
+                return state
+            time.sleep(interval)
+
+    def _read_results(self, file_id: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        if not file_id:
+            return {}
+        text = self.client.files.content(file_id).text
+        results = {}
+        for line in text.splitlines():
+            if line.strip():
+                record = json.loads(line)
+                results[record["custom_id"]] = record
+        return results
+
+    def collect(self) -> Dict[str, str]:
+        """Fan finished completions out to script artifacts, Notion and the completion cache."""
+        state = self._require_state()
+        if self.runtime.dry_run or state.status != "completed":
+            logger.info("Batch for run_id=%s is %s; nothing to collect", state.run_id, state.status)
+            return {}
+        results = self._read_results(state.output_file_id)
+        results.update(self._read_results(state.error_file_id))
+        cache = get_cache()
+        scripts: Dict[str, str] = {}
+        queue = NotionWriteQueue(runtime=self.runtime) if any(entry.notion_page for entry in state.entries) else None
+        for entry in state.entries:
+            if entry.output:
+                continue
+            record = results.get(entry.custom_id)
+            response = (record or {}).get("response") or {}
+            if response.get("status_code") != 200:
+                entry.error = json.dumps((record or {}).get("error") or response.get("body") or "missing result", ensure_ascii=False)
+                logger.error("Batch request %s failed: %s", entry.custom_id, entry.error)
+                continue
+            script = response["body"]["choices"][0]["message"]["content"] or ""
+            record_usage(state.model, response["body"].get("usage"))
+            output = self.output_dir / f"{state.run_id}_{entry.ticker}_script.md"
+            try:
+                publish_script(
+                    entry.ticker,
+                    script,
+                    runtime=self.runtime,
+                    output_path=output,
+                    notion_page_id=entry.notion_page,
+                    notion_queue=queue,
+                )
+            except Exception as exc:  # noqa: BLE001
+                entry.error = repr(exc)
+                state.save(self.state_path)
+                continue
+            key = completion_key(state.model, SCRIPT_SYSTEM_PROMPT, entry.messages, PromptGenerator.temperature)
+            cache.put(key, state.model, script)
+            entry.output, entry.error = str(output), None
+            scripts[entry.ticker] = script
+            state.save(self.state_path)
+        if queue is not None:
+            queue.close()
+            for entry in state.entries:
+                exc = queue.failures.get(entry.notion_page or "")
+                if exc is not None and entry.output:
+                    # Leave the entry uncollected so a later collect retries the Notion write.
+                    entry.output, entry.error = None, repr(exc)
+                    scripts.pop(entry.ticker, None)
+            state.save(self.state_path)
+        logger.info("Collected %d script(s) for run_id=%s", len(scripts), state.run_id)
+        return scripts
+
+    def run(self, rows: Sequence[BatchRow], *, interval: float = 30.0) -> Dict[str, str]:
+        self.submit(rows)
+        self.poll(interval=interval)
+        return self.collect()
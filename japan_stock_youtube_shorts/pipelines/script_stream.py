@@ -0,0 +1,125 @@
+"""
+Write a streamed script to disk as it arrives and hand complete sentences downstream.
+
+``ScriptStreamWriter`` appends every text delta to the artifact file (flushed, so
+another process can tail it) and passes each finished sentence to a consumer on a
+background thread, so TTS or video preparation can start on the first sentence
+while the model is still generating the rest.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import Callable, List, Optional, TextIO, Type
+
+# Japanese and ASCII sentence terminators; a newline also ends a sentence/section.
+SENTENCE_END = "。．！？!?\n"
+# Closing brackets/quotes that belong to the sentence they follow.
+_TRAILING = "」』）)】\"'"
+
+SentenceCallback = Callable[[str], None]
+
+
+class SentenceSplitter:
+    """Incrementally split text into sentences at ``SENTENCE_END``."""
+
+    def __init__(self) -> None:
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add ``text`` and return the sentences it completed."""
+        self._buffer += text
+        sentences = []
+        start = 0
+        index = 0
+        while index < len(self._buffer):
+            if self._buffer[index] in SENTENCE_END:
+                end = index + 1
+                while end < len(self._buffer) and self._buffer[end] != "\n" and self._buffer[end] in _TRAILING + SENTENCE_END:
+                    end += 1
+                if end == len(self._buffer) and self._buffer[index] != "\n":
+                    # A closing bracket may still follow in the next delta.
+                    break
+                sentence = self._buffer[start:end].strip()
+                if sentence:
+                    sentences.append(sentence)
+                start = index = end
+                continue
+            index += 1
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever is left (a final sentence without a terminator)."""
+        rest, self._buffer = self._buffer.strip(), ""
+        return self.feed(rest + "\n") if rest else []
+
+
+def split_sentences(text: str) -> List[str]:
+    splitter = SentenceSplitter()
+    return splitter.feed(text) + splitter.flush()
+
+
+class ScriptStreamWriter:
+    """
+    Context manager that writes deltas to ``path`` and feeds sentences to ``on_sentence``.
+
+    The consumer runs on its own thread so a slow consumer never stalls the stream;
+    leaving the block waits for it and re-raises its first error.
+    """
+
+    def __init__(self, path: Path, *, on_sentence: Optional[SentenceCallback] = None) -> None:
+        self.path = path
+        self.on_sentence = on_sentence
+        self.sentences = 0
+        self._splitter = SentenceSplitter()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+        self._handle: Optional[TextIO] = None
+
+    def __enter__(self) -> "ScriptStreamWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self.path.open("w", encoding="utf-8")
+        if self.on_sentence is not None:
+            self._thread = threading.Thread(target=self._consume, name="script-sentences", daemon=True)
+            self._thread.start()
+        return self
+
+    def _consume(self) -> None:
+        while True:
+            sentence = self._queue.get()
+            if sentence is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self.on_sentence(sentence)  # type: ignore[misc]
+            except BaseException as exc:  # noqa: BLE001 - surfaced in __exit__
+                self._error = exc
+
+    def _dispatch(self, sentences: List[str]) -> None:
+        self.sentences += len(sentences)
+        if self._thread is not None:
+            for sentence in sentences:
+                self._queue.put(sentence)
+
+    def write(self, delta: str) -> None:
+        self._handle.write(delta)
+        self._handle.flush()
+        self._dispatch(self._splitter.feed(delta))
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException], traceback: Optional[TracebackType]
+    ) -> None:
+        if exc_type is None:
+            self._dispatch(self._splitter.flush())
+        self._handle.close()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+        if exc_type is None and self._error is not None:
+            raise self._error
@@ -0,0 +1,581 @@
+"""
+Compose vertical 1080x1920 Shorts from scenes: a title card, the price-line
+reveal, key-number callouts and a closing CTA, with the narration's subtitles
+burned in.
+
+Every scene is a base frame with its static layers composited once, plus a few
+animations that own a fixed region of the screen. Frames are kept in YUV 4:2:0,
+the encoder's input format, so ffmpeg reads them without a colour conversion.
+Per frame only the regions that change are touched: newly revealed chart
+columns, a callout while it slides in, and the subtitle strip when the active
+cue changes. Frames where nothing changed are not sent at all; the stream is
+timestamped (see ``ffmpeg_video.stream_frames``) and the encoder holds the last
+frame, so the mostly static seconds of a Short are nearly free. No GPU is needed.
+
+Layout keeps the regions apart: callouts in the band above the chart axes,
+subtitles in the band below them.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from ..market.summary import MarketSummary, summarize_frames
+from .chart_renderer import SHORTS_STYLE, get_renderer
+from .ffmpeg_video import EncoderOptions, audio_duration, stream_frames
+from .narration import script_sentences
+from .subtitles import Cue, read_srt, spread_cues
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever scenes or layout change so cached Shorts are re-rendered.
+COMPOSER_VERSION = 1
+
+WIDTH, HEIGHT = SHORTS_STYLE.width_px, SHORTS_STYLE.height_px
+BACKGROUND = SHORTS_STYLE.face_color
+ACCENT = SHORTS_STYLE.line_color
+# Japanese market convention: gains in red, losses in blue.
+UP_COLOR = "#ff5252"
+DOWN_COLOR = "#4fc3f7"
+DEFAULT_CTA = "チャンネル登録と高評価もよろしくお願いします！"
+
+# The encoder dominates a composed Short even with held frames skipped; x264 ultrafast keeps it cheap.
+SHORTS_ENCODER = EncoderOptions(preset="ultrafast", crf=20)
+# Frames are converted with BT.709 limited-range coefficients; say so in the stream.
+BT709_ARGS = ("-colorspace", "bt709", "-color_primaries", "bt709", "-color_trc", "bt709", "-color_range", "tv")
+
+# Japanese fonts, most common install locations first (``SHORTS_FONT`` overrides).
+FONT_CANDIDATES = (
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/opentype/ipaexfont-gothic/ipaexg.ttf",
+    "/System/Library/Fonts/ヒラギノ角ゴシック W6.ttc",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "C:/Windows/Fonts/YuGothB.ttc",
+    "C:/Windows/Fonts/meiryob.ttc",
+)
+FONT_FAMILIES = ("Noto Sans CJK JP", "Hiragino Sans", "Yu Gothic", "Meiryo", "IPAexGothic", "TakaoGothic")
+
+# Characters that must not start a line (kinsoku).
+_NO_LINE_START = set("、。，．,.!?！？」』）)]ー・…ゃゅょっャュョッ")
+
+
+@dataclass(frozen=True)
+class Box:
+    """A pixel rectangle with even edges, so it covers whole 2x2 chroma blocks."""
+
+    left: int
+    top: int
+    right: int
+    bottom: int
+
+    @classmethod
+    def around(cls, left: float, top: float, right: float, bottom: float) -> "Box":
+        """The smallest even-aligned box containing the given edges, clipped to the frame."""
+        return cls(
+            max(0, int(left) // 2 * 2),
+            max(0, int(top) // 2 * 2),
+            min(WIDTH, math.ceil(math.ceil(right) / 2) * 2),
+            min(HEIGHT, math.ceil(math.ceil(bottom) / 2) * 2),
+        )
+
+    @property
+    def width(self) -> int:
+        return self.right - self.left
+
+    @property
+    def height(self) -> int:
+        return self.bottom - self.top
+
+    def slices(self, scale: int = 1) -> Tuple[slice, slice]:
+        return slice(self.top // scale, self.bottom // scale), slice(self.left // scale, self.right // scale)
+
+
+CALLOUT_BOX = Box(0, 100, WIDTH, 500)
+SUBTITLE_BOX = Box(40, 1450, WIDTH - 40, 1790)
+
+_LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+
+def rgb_to_yuv420(rgb: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """BT.709 limited-range Y, U and V planes of an even-sized RGB array (chroma from 2x2 means)."""
+    pixels = rgb.astype(np.float32)
+    height, width = pixels.shape[:2]
+    y = pixels @ _LUMA * (219 / 255) + 16
+    blocks = pixels.reshape(height // 2, 2, width // 2, 2, 3).mean(axis=(1, 3))
+    luma = blocks @ _LUMA
+    u = (blocks[..., 2] - luma) * (224 / 255 / 1.8556) + 128
+    v = (blocks[..., 0] - luma) * (224 / 255 / 1.5748) + 128
+    return tuple(np.clip(plane + 0.5, 0, 255).astype(np.uint8) for plane in (y, u, v))  # type: ignore[return-value]
+
+
+class YUVFrame:
+    """One ``yuv420p`` frame in a single contiguous buffer, the layout ffmpeg reads from the pipe."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width, self.height = width, height
+        luma, chroma = width * height, width * height // 4
+        self.buffer = np.zeros(luma + 2 * chroma, dtype=np.uint8)
+        self.planes = (
+            self.buffer[:luma].reshape(height, width),
+            self.buffer[luma : luma + chroma].reshape(height // 2, width // 2),
+            self.buffer[luma + chroma :].reshape(height // 2, width // 2),
+        )
+
+    @classmethod
+    def from_rgb(cls, rgb: np.ndarray) -> "YUVFrame":
+        frame = cls(rgb.shape[1], rgb.shape[0])
+        for plane, data in zip(frame.planes, rgb_to_yuv420(rgb)):
+            plane[...] = data
+        return frame
+
+    def put(self, box: Box, rgb: np.ndarray) -> None:
+        """Convert ``rgb`` (the size of ``box``) into the frame at ``box``."""
+        for plane, data, scale in zip(self.planes, rgb_to_yuv420(rgb), (1, 2, 2)):
+            plane[box.slices(scale)] = data
+
+    def paste(self, box: Box, patch: "YUVFrame") -> None:
+        """Copy a ``patch`` the size of ``box`` into the frame at ``box``."""
+        for plane, data, scale in zip(self.planes, patch.planes, (1, 2, 2)):
+            plane[box.slices(scale)] = data
+
+    def copy(self, source: "YUVFrame", box: Optional[Box] = None) -> None:
+        """Copy ``box`` (default: everything) from a frame of the same size."""
+        if box is None:
+            self.buffer[...] = source.buffer
+            return
+        for plane, data, scale in zip(self.planes, source.planes, (1, 2, 2)):
+            region = box.slices(scale)
+            plane[region] = data[region]
+
+
+def blend(target: np.ndarray, layer: np.ndarray, x: int, y: int, *, opacity: float = 1.0) -> None:
+    """Alpha-blend the RGBA ``layer`` onto the RGB ``target`` in place at (x, y), clipped to ``target``."""
+    height, width = target.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + layer.shape[1], width), min(y + layer.shape[0], height)
+    if x1 <= x0 or y1 <= y0:
+        return
+    source = layer[y0 - y : y1 - y, x0 - x : x1 - x]
+    alpha = source[..., 3:4].astype(np.uint16)
+    if opacity < 1.0:
+        alpha = (alpha * round(opacity * 255) + 127) // 255
+    region = target[y0:y1, x0:x1]
+    region[...] = (source[..., :3] * alpha + region * (255 - alpha) + 127) // 255
+
+
+@lru_cache(maxsize=None)
+def find_font() -> str:
+    """Path of a font with Japanese glyphs: ``SHORTS_FONT``, a known install, or matplotlib's lookup."""
+    configured = os.getenv("SHORTS_FONT")
+    if configured:
+        return configured
+    for candidate in FONT_CANDIDATES:
+        if Path(candidate).is_file():
+            return candidate
+    from matplotlib import font_manager
+
+    for family in FONT_FAMILIES:
+        try:
+            return font_manager.findfont(font_manager.FontProperties(family=family), fallback_to_default=False)
+        except ValueError:
+            continue
+    fallback = font_manager.findfont("DejaVu Sans")
+    logger.warning("No Japanese font found (set SHORTS_FONT); Japanese text will not render with %s", fallback)
+    return fallback
+
+
+@lru_cache(maxsize=32)
+def _font(size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(find_font(), size)
+
+
+def wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: float) -> List[str]:
+    """Break ``text`` into lines no wider than ``max_width``, by character, keeping Latin words whole."""
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        line = ""
+        for char in paragraph:
+            if line and char not in _NO_LINE_START and font.getlength(line + char) > max_width:
+                cut = line.rfind(" ") if char.isascii() and char.isalnum() else -1
+                if cut > 0:
+                    lines.append(line[:cut])
+                    line = line[cut + 1 :]
+                else:
+                    lines.append(line.rstrip())
+                    line = ""
+                if char == " ":
+                    continue
+            line += char
+        lines.append(line)
+    return lines
+
+
+def text_layer(
+    text: str,
+    *,
+    size: int,
+    color: str = "white",
+    max_width: float = WIDTH - 120,
+    stroke: int = 0,
+    spacing: float = 0.3,
+) -> np.ndarray:
+    """``text`` wrapped to ``max_width`` and centred line by line, as an RGBA array."""
+    font = _font(size)
+    lines = wrap_text(text, font, max_width)
+    ascent, descent = font.getmetrics()
+    pitch = ascent + descent + int(size * spacing)
+    widths = [font.getlength(line) for line in lines]
+    width = int(max(widths)) + 2 * stroke + 2
+    height = pitch * (len(lines) - 1) + ascent + descent + 2 * stroke
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    for index, (line, line_width) in enumerate(zip(lines, widths)):
+        draw.text(
+            ((width - line_width) / 2, stroke + index * pitch),
+            line,
+            font=font,
+            fill=color,
+            stroke_width=stroke,
+            stroke_fill="black",
+        )
+    return np.asarray(image)
+
+
+def card_layer(label: str, value: str, *, color: str, size: Tuple[int, int] = (460, 170)) -> np.ndarray:
+    """A rounded callout card: a small grey label over a large coloured value."""
+    width, height = size
+    image = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle((0, 0, width - 1, height - 1), radius=24, fill=(34, 34, 34, 235), outline=color, width=4)
+    draw.text((width / 2, 48), label, font=_font(34), fill="#bbbbbb", anchor="mm")
+    draw.text((width / 2, 114), value, font=_font(62), fill=color, anchor="mm")
+    return np.asarray(image)
+
+
+def _canvas() -> np.ndarray:
+    return np.full((HEIGHT, WIDTH, 3), ImageColor.getrgb(BACKGROUND), dtype=np.uint8)
+
+
+class Animation(Protocol):
+    """Draws into ``frame`` at scene time ``t`` (only inside its own region); ``True`` if it drew."""
+
+    def reset(self) -> None:
+        ...
+
+    def apply(self, frame: YUVFrame, scene: "Scene", t: float) -> bool:
+        ...
+
+
+class Wipe:
+    """Reveal ``target`` over the scene from left to right inside ``box``, copying only new columns."""
+
+    def __init__(self, target: YUVFrame, box: Box, *, start: float, duration: float) -> None:
+        self.target = target
+        self.box = box
+        self.start = start
+        self.duration = duration
+        self._shown = box.left
+
+    def reset(self) -> None:
+        self._shown = self.box.left
+
+    def apply(self, frame: YUVFrame, scene: "Scene", t: float) -> bool:
+        progress = min(max((t - self.start) / self.duration, 0.0), 1.0) if self.duration > 0 else 1.0
+        edge = self.box.left + int(self.box.width * progress) // 2 * 2
+        if edge <= self._shown:
+            return False
+        frame.copy(self.target, Box(self._shown, self.box.top, edge, self.box.bottom))
+        self._shown = edge
+        return True
+
+
+class SlideIn:
+    """Fade ``layer`` in at (x, y) while it rises ``rise`` pixels; nothing is drawn once it settles."""
+
+    def __init__(self, layer: np.ndarray, x: int, y: int, *, start: float = 0.0, duration: float = 0.45, rise: int = 48) -> None:
+        self.layer = layer
+        self.x, self.y = x, y
+        self.start = start
+        self.duration = duration
+        self.rise = rise
+        self.box = Box.around(x, y, x + layer.shape[1], y + layer.shape[0] + rise)
+        self._settled = False
+
+    def reset(self) -> None:
+        self._settled = False
+
+    def apply(self, frame: YUVFrame, scene: "Scene", t: float) -> bool:
+        if self._settled or t < self.start:
+            return False
+        progress = min((t - self.start) / self.duration, 1.0) if self.duration > 0 else 1.0
+        eased = 1 - (1 - progress) ** 3
+        region = scene.rgb[self.box.slices()].copy()
+        offset = round(self.rise * (1 - eased))
+        blend(region, self.layer, self.x - self.box.left, self.y - self.box.top + offset, opacity=eased)
+        frame.put(self.box, region)
+        self._settled = progress >= 1.0
+        return True
+
+
+@dataclass
+class Scene:
+    """A time span with a static RGB base and the animations drawn over it."""
+
+    name: str
+    start: float
+    end: float
+    rgb: np.ndarray
+    animations: List[Animation] = field(default_factory=list)
+    _yuv: Optional[YUVFrame] = field(default=None, repr=False)
+
+    @property
+    def yuv(self) -> YUVFrame:
+        if self._yuv is None:
+            self._yuv = YUVFrame.from_rgb(self.rgb)
+        return self._yuv
+
+
+class SubtitleTrack:
+    """Cues burned into ``box``; each cue's strip is composited once per scene and then reused."""
+
+    def __init__(self, cues: Sequence[Cue], box: Box = SUBTITLE_BOX, *, sizes: Sequence[int] = (60, 52, 44)) -> None:
+        self.cues = sorted((cue for cue in cues if cue.end > cue.start and cue.text.strip()), key=lambda cue: cue.start)
+        self.box = box
+        self.sizes = sizes
+        self._starts = [cue.start for cue in self.cues]
+        self._strips: Dict[Tuple[str, int], YUVFrame] = {}
+
+    def active(self, t: float) -> Optional[int]:
+        index = bisect_right(self._starts, t) - 1
+        return index if index >= 0 and t < self.cues[index].end else None
+
+    def _layer(self, text: str) -> np.ndarray:
+        # Shrink long sentences until they fit the band.
+        for size in self.sizes:
+            layer = text_layer(text, size=size, max_width=self.box.width - 40, stroke=max(3, size // 12), spacing=0.2)
+            if layer.shape[0] <= self.box.height:
+                break
+        return layer
+
+    def draw(self, frame: YUVFrame, scene: Scene, index: Optional[int]) -> None:
+        if index is None:
+            frame.copy(scene.yuv, self.box)
+            return
+        strip = self._strips.get((scene.name, index))
+        if strip is None:
+            layer = self._layer(self.cues[index].text)
+            region = scene.rgb[self.box.slices()].copy()
+            blend(region, layer, (self.box.width - layer.shape[1]) // 2, (self.box.height - layer.shape[0]) // 2)
+            strip = self._strips[(scene.name, index)] = YUVFrame.from_rgb(region)
+        frame.paste(self.box, strip)
+
+
+class ShortComposer:
+    """Play ``scenes`` back to back as ``yuv420p`` frames, emitting only the frames that changed."""
+
+    def __init__(
+        self, scenes: Sequence[Scene], subtitles: Optional[SubtitleTrack] = None, *, fps: int = 30, max_hold: float = 1.0
+    ) -> None:
+        if not scenes:
+            raise ValueError("A Short needs at least one scene")
+        self.scenes = list(scenes)
+        self.subtitles = subtitles
+        self.fps = fps
+        # Re-send an unchanged frame at least this often (seconds) so players can seek.
+        self.max_hold = max_hold
+
+    def frames(self, duration: float) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Yield ``(frame_number, buffer)`` for the changed frames of ``duration * fps``.
+
+        The last frame is always emitted so the video lasts the full duration. The
+        same buffer is yielded every time and updated in place, so each frame must
+        be consumed (written to the encoder) before the next one is requested.
+        """
+        frame = YUVFrame(WIDTH, HEIGHT)
+        total = max(1, round(duration * self.fps))
+        hold = max(1, round(self.max_hold * self.fps))
+        current = -1
+        cue: Optional[int] = -1
+        emitted = -hold
+        for number in range(total):
+            t = number / self.fps
+            index = max(current, 0)
+            while index < len(self.scenes) - 1 and t >= self.scenes[index].end:
+                index += 1
+            scene = self.scenes[index]
+            changed = index != current
+            if changed:
+                current = index
+                frame.copy(scene.yuv)
+                for animation in scene.animations:
+                    animation.reset()
+                cue = -1
+            for animation in scene.animations:
+                changed = animation.apply(frame, scene, t - scene.start) or changed
+            if self.subtitles is not None:
+                active = self.subtitles.active(t)
+                if active != cue:
+                    self.subtitles.draw(frame, scene, active)
+                    changed = True
+                    cue = active
+            if changed or number - emitted >= hold or number == total - 1:
+                emitted = number
+                yield number, memoryview(frame.buffer)
+
+
+def _price(value: float) -> str:
+    return f"{value:,.0f}" if abs(value) >= 1000 else f"{value:,.1f}"
+
+
+def callouts(summary: MarketSummary) -> List[Tuple[str, str, str]]:
+    """Up to four ``(label, value, colour)`` key numbers for the callout scene."""
+    trend = UP_COLOR if summary.pct_change >= 0 else DOWN_COLOR
+    items = [
+        ("騰落率", f"{summary.pct_change:+.2f}%", trend),
+        ("終値", f"{_price(summary.end)}円", "white"),
+    ]
+    if not math.isnan(summary.volume_ratio):
+        items.append(("出来高（20日中央値比）", f"{summary.volume_ratio:.1f}倍", UP_COLOR if summary.volume_ratio >= 1.5 else "white"))
+    if not math.isnan(summary.close_vs_ma25):
+        items.append(("25日線乖離", f"{summary.close_vs_ma25:+.1f}%", UP_COLOR if summary.close_vs_ma25 >= 0 else DOWN_COLOR))
+    items.append(("高値 / 安値", f"{_price(summary.high)} / {_price(summary.low)}", "white"))
+    return items[:4]
+
+
+def plan_scenes(duration: float, *, with_callouts: bool = True) -> List[Tuple[str, float, float]]:
+    """``(name, start, end)`` for each scene: short title and CTA cards, the chart scenes share the rest."""
+    title = min(2.5, duration * 0.12)
+    cta = min(3.5, duration * 0.15)
+    body = max(duration - title - cta, 0.0)
+    spans = [("title", title), ("chart", body / 2 if with_callouts else body)]
+    if with_callouts:
+        spans.append(("callouts", body / 2))
+    spans.append(("cta", cta))
+    plan, start = [], 0.0
+    for name, length in spans:
+        plan.append((name, start, start + length))
+        start += length
+    return plan
+
+
+def build_scenes(
+    ticker: str,
+    history: pd.DataFrame,
+    duration: float,
+    *,
+    company: Optional[str] = None,
+    period: str = "1mo",
+    summary: Optional[MarketSummary] = None,
+    call_to_action: str = DEFAULT_CTA,
+) -> List[Scene]:
+    """The title, chart, callout and CTA scenes for one ticker over ``duration`` seconds."""
+    empty, full, axes = get_renderer(SHORTS_STYLE).layers(ticker, history, period=period)
+    chart, revealed = np.ascontiguousarray(empty[..., :3]), np.ascontiguousarray(full[..., :3])
+    scenes = []
+    for name, start, end in plan_scenes(duration, with_callouts=summary is not None):
+        length = end - start
+        if name == "title":
+            rgb = _canvas()
+            rgb[560:572, 140 : WIDTH - 140] = ImageColor.getrgb(ACCENT)
+            heading = text_layer(ticker, size=132)
+            animations: List[Animation] = [SlideIn(heading, (WIDTH - heading.shape[1]) // 2, 640)]
+            if company:
+                name_layer = text_layer(company, size=76, color="#dddddd")
+                animations.append(SlideIn(name_layer, (WIDTH - name_layer.shape[1]) // 2, 840, start=0.15))
+            label = text_layer(f"期間: {period}", size=44, color="#aaaaaa")
+            blend(rgb, label, (WIDTH - label.shape[1]) // 2, 1040)
+        elif name == "chart":
+            rgb = chart
+            box = Box.around(*axes)
+            animations = [Wipe(YUVFrame.from_rgb(revealed), box, start=0.0, duration=min(length * 0.8, 8.0))]
+        elif name == "callouts":
+            assert summary is not None
+            rgb = revealed
+            animations = []
+            for index, (label_text, value, color) in enumerate(callouts(summary)):
+                card = card_layer(label_text, value, color=color)
+                x = 60 + (index % 2) * (WIDTH - 120 - card.shape[1])
+                y = CALLOUT_BOX.top + 20 + (index // 2) * (card.shape[0] + 20)
+                animations.append(SlideIn(card, x, y, start=0.2 + 0.5 * index, rise=24))
+        else:
+            rgb = _canvas()
+            closing = text_layer(call_to_action, size=72, max_width=WIDTH - 160)
+            animations = [SlideIn(closing, (WIDTH - closing.shape[1]) // 2, 760)]
+            tag = text_layer(f"{ticker} {company or ''}".strip(), size=48, color="#aaaaaa")
+            blend(rgb, tag, (WIDTH - tag.shape[1]) // 2, 620)
+        scenes.append(Scene(name, start, end, rgb, animations))
+    return scenes
+
+
+def load_cues(
+    audio_path: Path,
+    *,
+    duration: float,
+    subtitles_path: Optional[Path] = None,
+    script_path: Optional[Path] = None,
+) -> List[Cue]:
+    """
+    Subtitle cues for a Short: an explicit SRT, else the narration's sidecar SRT,
+    else the script's sentences spread over the audio, else none.
+    """
+    sidecar = audio_path.with_suffix(".srt")
+    if subtitles_path is not None:
+        return read_srt(subtitles_path)
+    if sidecar.is_file():
+        return read_srt(sidecar)
+    if script_path is not None:
+        logger.info("No subtitle timings for %s; spreading the script over %.1fs", audio_path, duration)
+        return spread_cues(script_sentences(script_path.read_text(encoding="utf-8")), duration)
+    return []
+
+
+def render_short(
+    ticker: str,
+    history: pd.DataFrame,
+    audio_path: Path,
+    output: Path,
+    *,
+    company: Optional[str] = None,
+    period: str = "1mo",
+    cues: Sequence[Cue] = (),
+    call_to_action: str = DEFAULT_CTA,
+    fps: int = 30,
+    options: Optional[EncoderOptions] = None,
+) -> Path:
+    """Compose the Short for ``ticker`` under the narration and stream it into ffmpeg."""
+    duration = audio_duration(audio_path)
+    try:
+        summary: Optional[MarketSummary] = summarize_frames({ticker: history}, period=period, benchmark_name=None).get(ticker)
+    except (KeyError, ValueError) as exc:
+        logger.warning("No key numbers for %s (%s); skipping the callout scene", ticker, exc)
+        summary = None
+    scenes = build_scenes(
+        ticker, history, duration, company=company, period=period, summary=summary, call_to_action=call_to_action
+    )
+    composer = ShortComposer(scenes, SubtitleTrack(cues) if cues else None, fps=fps)
+    return stream_frames(
+        composer.frames(duration),
+        audio_path,
+        output,
+        size=(WIDTH, HEIGHT),
+        fps=fps,
+        pix_fmt="yuv420p",
+        timestamps=True,
+        options=options or SHORTS_ENCODER,
+        extra_args=BT709_ARGS,
+        kind="short",
+    )
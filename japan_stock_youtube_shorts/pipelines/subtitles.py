@@ -0,0 +1,73 @@
+"""
+Subtitle cues for burned-in captions, stored as SRT next to the narration audio.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Sequence
+
+_TIMESTAMP = re.compile(r"(\d+):(\d{2}):(\d{2})[,.](\d{3})")
+
+
+@dataclass(frozen=True)
+class Cue:
+    start: float
+    end: float
+    text: str
+
+
+def _timestamp(seconds: float) -> str:
+    millis = max(0, round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def _seconds(stamp: str) -> float:
+    match = _TIMESTAMP.match(stamp.strip())
+    if not match:
+        raise ValueError(f"Bad SRT timestamp: {stamp!r}")
+    hours, minutes, secs, millis = map(int, match.groups())
+    return hours * 3600 + minutes * 60 + secs + millis / 1000
+
+
+def format_srt(cues: Sequence[Cue]) -> str:
+    blocks = [f"{index}\n{_timestamp(cue.start)} --> {_timestamp(cue.end)}\n{cue.text}\n" for index, cue in enumerate(cues, 1)]
+    return "\n".join(blocks)
+
+
+def parse_srt(text: str) -> List[Cue]:
+    cues = []
+    for block in re.split(r"\n\s*\n", text.replace("\r\n", "\n").strip()):
+        lines = block.splitlines()
+        timing = next((index for index, line in enumerate(lines) if "-->" in line), None)
+        if timing is None:
+            continue
+        start, end = lines[timing].split("-->")
+        cues.append(Cue(_seconds(start), _seconds(end), "\n".join(lines[timing + 1 :]).strip()))
+    return cues
+
+
+def read_srt(path: Path) -> List[Cue]:
+    return parse_srt(path.read_text(encoding="utf-8"))
+
+
+def write_srt(path: Path, cues: Sequence[Cue]) -> Path:
+    path.write_text(format_srt(cues), encoding="utf-8")
+    return path
+
+
+def spread_cues(sentences: Sequence[str], duration: float) -> List[Cue]:
+    """Time ``sentences`` over ``duration`` in proportion to their length (no narration timings known)."""
+    total = sum(len(sentence) for sentence in sentences)
+    cues = []
+    start = 0.0
+    for sentence in sentences:
+        end = start + duration * len(sentence) / total if total else duration
+        cues.append(Cue(start, end, sentence))
+        start = end
+    return cues
@@ -0,0 +1,83 @@
+"""
+Intraday watch: start Shorts work for only the tickers that are moving.
+
+``main.py watch`` runs an ``IntradayMonitor`` over a manifest's tickers. For each
+``TriggerEvent`` the dispatcher renders the session chart straight from the
+monitor's ring buffer (no second download) and queues a script job whose prompt
+carries the move, so a ``main.py serve`` worker writes it while polling goes on.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Mapping, Optional, Sequence
+
+from ..config import ASSETS_DIR, RuntimeConfig
+from ..market.intraday import IntradayMonitor, TriggerEvent
+from ..metrics import get_metrics
+from .batch import BatchRow
+from .chart_styles import SHORTS_STYLE, ChartStyle
+from .generate_chart import create_price_chart
+from .job_queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+INTRADAY_DIR = ASSETS_DIR / "templates" / "intraday"
+WATCH_STAGES = ("script", "chart")
+
+
+class TriggerDispatcher:
+    """Handle a monitor's trigger events: chart the session in-process and queue the script."""
+
+    def __init__(
+        self,
+        monitor: IntradayMonitor,
+        rows: Mapping[str, BatchRow],
+        *,
+        runtime: RuntimeConfig,
+        queue: Optional[JobQueue] = None,
+        stages: Sequence[str] = WATCH_STAGES,
+        output_dir: Optional[Path] = None,
+        style: ChartStyle = SHORTS_STYLE,
+    ) -> None:
+        unknown = sorted(set(stages) - set(WATCH_STAGES))
+        if unknown:
+            raise ValueError(f"Unknown watch stage(s): {', '.join(unknown)}")
+        self.monitor = monitor
+        self.rows = rows
+        self.runtime = runtime
+        self.queue = queue or (JobQueue() if "script" in stages else None)
+        self.stages = tuple(stages)
+        self.output_dir = output_dir or INTRADAY_DIR
+        self.style = style
+        self.failed = 0
+
+    def __call__(self, event: TriggerEvent) -> None:
+        row = self.rows[event.ticker]
+        try:
+            chart = None
+            if "chart" in self.stages:
+                chart = create_price_chart(
+                    event.ticker,
+                    period="1d",
+                    output_path=self.output_dir / f"{self.runtime.run_id}_{event.ticker}_{event.time:%H%M}_chart.png",
+                    runtime_config=self.runtime,
+                    history=self.monitor.frame(event.ticker),
+                    style=self.style,
+                )
+            job_id = None
+            if self.queue is not None:
+                payload = {"ticker": row.ticker, "company": row.company, "period": row.period, "note": event.render()}
+                if row.notion_page:
+                    payload["notion_page"] = row.notion_page
+                job_id = self.queue.submit("script", payload, dry_run=self.runtime.dry_run)
+        except Exception as exc:  # noqa: BLE001
+            # One failed trigger must not stop the watch.
+            logger.error("Could not start work for %s: %s", event.ticker, exc, exc_info=exc)
+            get_metrics().inc("intraday_dispatch_errors")
+            self.failed += 1
+            return
+        logger.info(
+            "%s moved %+.2f%% (%s): chart=%s script job=%s", event.ticker, event.change_pct, event.reason, chart or "-", job_id or "-"
+        )
@@ -0,0 +1,228 @@
+"""
+Long-running worker behind ``main.py serve``.
+
+A cold ``main.py`` invocation pays for the interpreter, pandas/matplotlib imports,
+font lookups, figure templates and fresh OpenAI/Notion HTTP connections before it
+does any work. ``JobWorker`` pays that once: it keeps the clients, the history
+provider and a chart template per worker thread alive, and runs jobs from the
+``JobQueue`` as they arrive.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence
+
+from ..config import ASSETS_DIR, RuntimeConfig
+from ..market.history import get_provider
+from ..metrics import get_metrics
+from ..notion.notion_client import NotionClient, get_notion_client
+from ..openai.prompt_generator import PromptGenerator
+from .chart_renderer import warm_renderer
+from .chart_styles import CHART_STYLES, LANDSCAPE_STYLE, SHORTS_STYLE, ChartStyle
+from .generate_chart import create_price_chart
+from .generate_script import fetch_stock_summary, generate_script_for_ticker
+from .generate_video import assemble_reveal_video, assemble_video
+from .job_queue import Job, JobQueue, worker_name
+
+logger = logging.getLogger(__name__)
+
+JOBS_DIR = ASSETS_DIR / "templates" / "jobs"
+
+
+def _warm_thread(styles: Sequence[ChartStyle]) -> None:
+    for style in styles:
+        warm_renderer(style)
+
+
+class JobWorker:
+    """
+    Claim jobs from ``queue`` and run up to ``concurrency`` of them at once.
+
+    A job submitted with ``--dry-run`` runs dry; a dry-run worker runs every job dry.
+    """
+
+    def __init__(
+        self,
+        *,
+        runtime: RuntimeConfig,
+        queue: Optional[JobQueue] = None,
+        concurrency: int = 2,
+        poll_interval: float = 0.25,
+        styles: Sequence[ChartStyle] = (LANDSCAPE_STYLE, SHORTS_STYLE),
+        on_job_done: Optional[Callable[[Job], None]] = None,
+    ) -> None:
+        self.runtime = runtime
+        self.queue = queue or JobQueue()
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.styles = tuple(styles)
+        self.on_job_done = on_job_done
+        self.name = worker_name()
+        self.failed = 0
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._generators: Dict[bool, PromptGenerator] = {}
+
+    def stop(self) -> None:
+        """Stop claiming jobs; running ones are allowed to finish."""
+        if not self._stop.is_set():
+            logger.info("Worker %s stopping after in-flight jobs", self.name)
+        self._stop.set()
+
+    def _runtime(self, job: Job) -> RuntimeConfig:
+        return replace(self.runtime, dry_run=self.runtime.dry_run or job.dry_run)
+
+    def _generator(self, runtime: RuntimeConfig) -> PromptGenerator:
+        with self._lock:
+            generator = self._generators.get(runtime.dry_run)
+            if generator is None:
+                generator = self._generators[runtime.dry_run] = PromptGenerator(runtime=runtime)
+            return generator
+
+    def _notion(self, runtime: RuntimeConfig) -> NotionClient:
+        return get_notion_client(runtime)
+
+    def warm(self) -> None:
+        """Build the clients the first job would otherwise pay for."""
+        started = time.perf_counter()
+        get_provider()
+        for name, build in (("OpenAI", self._generator), ("Notion", self._notion)):
+            try:
+                build(self.runtime)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("%s client not ready (%s); jobs that need it will fail", name, exc)
+        logger.info("Worker %s warmed up in %.2fs", self.name, time.perf_counter() - started)
+
+    def _output(self, job: Job, suffix: str) -> Path:
+        if job.payload.get("output"):
+            return Path(job.payload["output"])
+        return JOBS_DIR / f"job{job.id}_{job.payload.get('ticker', job.kind)}{suffix}"
+
+    def run_job(self, job: Job) -> str:
+        """Run one job and return its result (usually an output path)."""
+        runtime = self._runtime(job)
+        payload = job.payload
+        period = payload.get("period", "1mo")
+
+        if job.kind == "script":
+            output = self._output(job, "_script.md")
+            summary = None
+            if payload.get("note"):
+                # Extra facts from the submitter, e.g. the intraday move that triggered the job.
+                facts = fetch_stock_summary(payload["ticker"], period=period, dry_run=runtime.dry_run)
+                summary = f"{facts}\n{payload['note']}"
+            generate_script_for_ticker(
+                payload["ticker"],
+                payload["company"],
+                period=period,
+                notion_page_id=payload.get("notion_page"),
+                output_path=output,
+                generator=self._generator(runtime),
+                runtime_config=runtime,
+                stock_summary=summary,
+            )
+            return str(output)
+
+        if job.kind == "chart":
+            output = self._output(job, "_chart.png")
+            style = CHART_STYLES[payload.get("style", "landscape")]
+            return str(create_price_chart(payload["ticker"], period=period, output_path=output, runtime_config=runtime, style=style))
+
+        if job.kind == "video":
+            output = self._output(job, ".mp4")
+            audio = Path(payload["audio"])
+            if payload.get("image"):
+                image = Path(payload["image"])
+                return str(assemble_video(image, audio, output_path=output, runtime_config=runtime))
+            return str(assemble_reveal_video(payload["ticker"], audio, period=period, output_path=output, runtime_config=runtime))
+
+        if job.kind in {"idea", "doe"}:
+            return self._task(job.kind, payload, runtime)
+
+        raise ValueError(f"unknown job kind {job.kind!r}")
+
+    def _task(self, kind: str, payload: Dict[str, str], runtime: RuntimeConfig) -> str:
+        from ..tasks import doe_pipeline, idea_pipeline
+
+        notion = self._notion(runtime)
+        client = self._generator(runtime).client
+        if kind == "idea":
+            version = notion.next_version("IDEA", artifact_type="idea")
+            topic = payload.get("topic") or "DOE（株主資本配当率）"
+            if runtime.dry_run:
+                logger.info("[dry-run] Skipping idea generation for %s", topic)
+                ideas = f"[dry-run] ideas after {topic}"
+            else:
+                ideas = idea_pipeline.generate_next_ideas(topic, client=client)
+            idea_pipeline.insert_idea_into_notion(ideas, version, notion)
+            return f"IDEA_{version:02d}"
+
+        version = notion.next_version("DOE_script", artifact_type="script")
+        if runtime.dry_run:
+            logger.info("[dry-run] Skipping DOE summary generation")
+            text = "[dry-run] DOE summary"
+        else:
+            text = doe_pipeline.generate_doe_summary(client=client)
+        doe_pipeline.insert_new_page(text, version, notion)
+        return f"DOE_script_v{version}"
+
+    def _finish(self, job: Job, future: Future) -> None:
+        seconds = time.time() - (job.started or time.time())
+        try:
+            result, error = future.result(), None
+        except Exception as exc:  # noqa: BLE001
+            result, error = None, f"{type(exc).__name__}: {exc}"
+            logger.error("Job %s failed: %s", job.label, error, exc_info=exc)
+            self.failed += 1
+        self.queue.finish(job.id, result=result, error=error)
+        get_metrics().record_stage(
+            job.kind, seconds, ticker=job.payload.get("ticker"), status="failed" if error else "ok", job=job.id
+        )
+        logger.info("Job %s %s in %.2fs%s", job.label, "failed" if error else "done", seconds, f": {result}" if result else "")
+        if self.on_job_done is not None:
+            self.on_job_done(job)
+
+    def serve(self, *, max_jobs: Optional[int] = None, drain: bool = False) -> int:
+        """
+        Run jobs until ``stop()`` is called; returns the number of jobs run.
+
+        ``max_jobs`` stops after that many claims and ``drain`` stops once the queue
+        is empty, e.g. for a scheduled run that works off whatever was submitted.
+        """
+        self.queue.requeue_orphans()
+        self.warm()
+        claimed = 0
+        inflight: Dict[Future, Job] = {}
+        logger.info("Worker %s serving %s (concurrency=%d)", self.name, self.queue.path, self.concurrency)
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="job", initializer=_warm_thread, initargs=(self.styles,)
+        ) as pool:
+            # Build each thread's figure templates now rather than on its first chart job. The
+            # tasks wait for each other, so the pool has to start all ``concurrency`` threads.
+            barrier = threading.Barrier(self.concurrency)
+            wait([pool.submit(barrier.wait, 30) for _ in range(self.concurrency)])
+            while True:
+                while not self._stop.is_set() and len(inflight) < self.concurrency and (max_jobs is None or claimed < max_jobs):
+                    job = self.queue.claim(self.name)
+                    if job is None:
+                        break
+                    claimed += 1
+                    logger.info("Running job %s%s", job.label, " [dry-run]" if self._runtime(job).dry_run else "")
+                    inflight[pool.submit(self.run_job, job)] = job
+                idle = not inflight
+                if idle and (self._stop.is_set() or drain or (max_jobs is not None and claimed >= max_jobs)):
+                    break
+                if idle:
+                    self._stop.wait(self.poll_interval)
+                    continue
+                done, _ = wait(list(inflight), timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._finish(inflight.pop(future), future)
+        logger.info("Worker %s stopped after %d job(s) (%d failed)", self.name, claimed, self.failed)
+        return claimed
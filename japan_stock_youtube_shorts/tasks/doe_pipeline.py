@@ -7,17 +7,23 @@ Minimal, runnable steps for:
 from __future__ import annotations
 
 import os
-from notion_client import Client
+from typing import TYPE_CHECKING, Optional
 
+from japan_stock_youtube_shorts.config import RuntimeConfig
+from japan_stock_youtube_shorts.notion.notion_client import NotionClient
 from japan_stock_youtube_shorts.openai.client import openai_client
+from japan_stock_youtube_shorts.openai.completion_cache import get_cache, report_cache_stats
 
+if TYPE_CHECKING:
+    from openai import OpenAI
 
-def generate_doe_summary() -> str:
+
+def generate_doe_summary(client: Optional[OpenAI] = None) -> str:
     """
     OpenAI を使って、株初心者向けに
     DOE（株主還元指標）を60字以内で説明する。
     """
-    client = openai_client()
+    client = client or openai_client()
 
     messages = [
         {
@@ -30,26 +36,35 @@ def generate_doe_summary() -> str:
         },
     ]
 
-    response = client.chat.completions.create(
+    def request() -> str:
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            temperature=0.4,
+        )
+        return response.choices[0].message.content.strip()
+
+    return get_cache().cached(
+        request,
         model="gpt-4o-mini",
-        messages=messages,
+        system=messages[0]["content"],
+        messages=messages[1:],
         temperature=0.4,
+        mode=RuntimeConfig.from_env().llm_cache,
     )
 
-    return response.choices[0].message.content.strip()
 
-
-def insert_new_page(content: str, version: int) -> None:
+def insert_new_page(content: str, version: int, notion: Optional[NotionClient] = None) -> None:
     """
     生成した DOE 説明文を
     Notion の Video_Artifacts データベースに1行追加する。
     """
-    notion = Client(auth=os.environ["NOTION_API_KEY"])
+    notion = notion or NotionClient()
     database_id = os.environ["NOTION_DATABASE_ID"]
 
-    page = notion.pages.create(
-        parent={"database_id": database_id},
-        properties={
+    page = notion.create_page(
+        database_id,
+        {
             "Name": {
                 "title": [
                     {"text": {"content": f"DOE_script_v{version}"}}
@@ -77,16 +92,19 @@ def insert_new_page(content: str, version: int) -> None:
         },
     )
 
-    print(f"New DOE script page created: {page['url']}")
+    print(f"New DOE script page created: {page.get('url', '(dry-run)')}")
 
 
 def main() -> None:
     """
     ローカル実行・GitHub Actions のどちらからも呼べるエントリポイント。
     """
-    version = 1  # 次回以降は 2, 3 とインクリメント
+    notion = NotionClient()
+    # ローカルのミラーから次のバージョン番号を求める（API は差分同期のみ）
+    version = notion.next_version("DOE_script", artifact_type="script")
     text = generate_doe_summary()
-    insert_new_page(text, version)
+    insert_new_page(text, version, notion)
+    report_cache_stats()
 
 
 if __name__ == "__main__":
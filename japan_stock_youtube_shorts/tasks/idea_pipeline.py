@@ -7,15 +7,22 @@ Task:
 from __future__ import annotations
 
 import os
-from notion_client import Client
+from typing import TYPE_CHECKING, Optional
+
+from japan_stock_youtube_shorts.config import RuntimeConfig
+from japan_stock_youtube_shorts.notion.notion_client import NotionClient
 from japan_stock_youtube_shorts.openai.client import openai_client
+from japan_stock_youtube_shorts.openai.completion_cache import get_cache, report_cache_stats
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 
-def generate_next_ideas(previous_topic: str) -> str:
+def generate_next_ideas(previous_topic: str, client: Optional[OpenAI] = None) -> str:
     """
     株初心者向け Shorts の次テーマ案を3つ生成する
     """
-    client = openai_client()
+    client = client or openai_client()
 
     messages = [
         {
@@ -44,25 +51,34 @@ def generate_next_ideas(previous_topic: str) -> str:
         },
     ]
 
-    response = client.chat.completions.create(
+    def request() -> str:
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            temperature=0.5,
+        )
+        return response.choices[0].message.content.strip()
+
+    return get_cache().cached(
+        request,
         model="gpt-4o-mini",
-        messages=messages,
+        system=messages[0]["content"],
+        messages=messages[1:],
         temperature=0.5,
+        mode=RuntimeConfig.from_env().llm_cache,
     )
 
-    return response.choices[0].message.content.strip()
 
-
-def insert_idea_into_notion(content: str, version: int = 1) -> None:
+def insert_idea_into_notion(content: str, version: int = 1, notion: Optional[NotionClient] = None) -> None:
     """
     アイデア案を Notion に新規ページとして保存
     """
-    notion = Client(auth=os.environ["NOTION_API_KEY"])
+    notion = notion or NotionClient()
     database_id = os.environ["NOTION_DATABASE_ID"]
 
-    page = notion.pages.create(
-        parent={"database_id": database_id},
-        properties={
+    page = notion.create_page(
+        database_id,
+        {
             "Name": {
                 "title": [
                     {"text": {"content": f"IDEA_{version:02d}"}}
@@ -86,15 +102,17 @@ def insert_idea_into_notion(content: str, version: int = 1) -> None:
     )
 
     print("Idea page created:")
-    print(page["url"])
+    print(page.get("url", "(dry-run)"))
 
 
 def main() -> None:
     previous_topic = "DOE（株主資本配当率）"
-    version = 1
+    notion = NotionClient()
+    version = notion.next_version("IDEA", artifact_type="idea")
 
     ideas = generate_next_ideas(previous_topic)
-    insert_idea_into_notion(ideas, version)
+    insert_idea_into_notion(ideas, version, notion)
+    report_cache_stats()
 
 
 if __name__ == "__main__":
@@ -1,25 +1,130 @@
 from __future__ import annotations
 
 import logging
-from typing import Callable, TypeVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Callable, Optional, Tuple, Type, TypeVar
 
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity import RetryCallState, retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from .metrics import get_metrics
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
+RETRYABLE_STATUS = frozenset({408, 409, 429})
+
+
+@lru_cache(maxsize=1)
+def _transient_errors() -> Tuple[Type[BaseException], ...]:
+    """Network-level exception types from the HTTP stacks used by the SDKs."""
+    errors: list[Type[BaseException]] = [ConnectionError, TimeoutError]
+    try:
+        import httpx
+
+        errors.append(httpx.TransportError)
+    except ImportError:
+        pass
+    try:
+        from openai import APIConnectionError
+
+        errors.append(APIConnectionError)
+    except ImportError:
+        pass
+    try:
+        from notion_client.errors import RequestTimeoutError
+
+        errors.append(RequestTimeoutError)
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+def status_code(exc: BaseException) -> Optional[int]:
+    """Return the HTTP status attached to an OpenAI/Notion error, if any."""
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    True for throttling, server-side and network errors.
+
+    Client errors such as 400/401/404 are never retried since repeating the same
+    request cannot succeed.
+    """
+    status = status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS or status >= 500
+    return isinstance(exc, _transient_errors())
+
+
+def _headers(exc: BaseException) -> Any:
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    return headers
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Read ``retry-after-ms``/``retry-after`` from an error response, if present."""
+    headers = _headers(exc)
+    if not headers:
+        return None
+    millis = headers.get("retry-after-ms")
+    if millis:
+        try:
+            return max(float(millis) / 1000, 0.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _wait_with_retry_after(base: float, cap: float = 60.0) -> Callable[[RetryCallState], float]:
+    exponential = wait_exponential(multiplier=base, min=base, max=10)
+
+    def wait(retry_state: RetryCallState) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        hinted = retry_after_seconds(exc) if exc else None
+        if hinted is not None:
+            return min(hinted, cap)
+        return exponential(retry_state)
+
+    return wait
+
+
+def _count_retry(retry_state: RetryCallState) -> None:
+    operation = getattr(retry_state.fn, "__qualname__", "unknown")
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    get_metrics().inc("retries", operation=operation)
+    logger.warning("%s failed (%s); retry %d", operation, exc, retry_state.attempt_number)
+
 
 def retry_with_backoff(*, attempts: int = 3, base: float = 1.0) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
     Decorator factory that retries functions with exponential backoff.
-    Intended for rate-limited HTTP APIs such as OpenAI and Notion.
+    Intended for rate-limited HTTP APIs such as OpenAI and Notion: only retryable
+    errors (see ``is_retryable``) are retried, and ``Retry-After`` hints are honoured.
     """
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         return retry(
-            wait=wait_exponential(multiplier=base, min=base, max=10),
+            wait=_wait_with_retry_after(base),
             stop=stop_after_attempt(attempts),
-            retry=retry_if_exception_type(Exception),
+            retry=retry_if_exception(is_retryable),
+            before_sleep=_count_retry,
             reraise=True,
         )(func)
 
@@ -1,15 +1,24 @@
 import argparse
 import logging
+import os
+import time
+from dataclasses import replace
 from pathlib import Path
+from typing import List, Tuple
 
 from dotenv import load_dotenv
 
-from japan_stock_youtube_shorts.config import RuntimeConfig
-from japan_stock_youtube_shorts.notion.health import healthcheck as notion_healthcheck
-from japan_stock_youtube_shorts.openai.health import healthcheck as openai_healthcheck
-from japan_stock_youtube_shorts.pipelines.generate_chart import create_price_chart
-from japan_stock_youtube_shorts.pipelines.generate_script import generate_script_for_ticker
-from japan_stock_youtube_shorts.pipelines.generate_video import assemble_video
+from japan_stock_youtube_shorts.config import ASSETS_DIR, RuntimeConfig
+from japan_stock_youtube_shorts.metrics import get_metrics, write_report, write_textfile
+from japan_stock_youtube_shorts.openai.completion_cache import CACHE_MODES, report_cache_stats
+from japan_stock_youtube_shorts.pipelines.chart_styles import CHART_STYLES, EXPORT_PROFILES, ExportProfile
+from japan_stock_youtube_shorts.pipelines.ffmpeg_video import VIDEO_BACKENDS
+from japan_stock_youtube_shorts.pipelines.job_queue import JOB_KINDS
+from japan_stock_youtube_shorts.pipelines.narration import TTS_BACKENDS
+
+# Everything heavier (pandas, matplotlib, yfinance, the OpenAI/Notion SDKs) is
+# imported inside the command that needs it; ``python -m
+# japan_stock_youtube_shorts.bench.importtime`` checks the startup budget.
 
 
 def configure_logging(level: str) -> None:
@@ -26,6 +35,22 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--dry-run", action="store_true", help="Skip external API calls and writes.")
     parser.add_argument("--run-id", help="Provide a run identifier (otherwise autogenerated).")
     parser.add_argument("--log-level", default="INFO", help="Logging level (INFO, WARN, ERROR, DEBUG).")
+    parser.add_argument(
+        "--llm-cache",
+        choices=CACHE_MODES,
+        help="Completion cache mode: use (default), refresh (regenerate and store), bypass.",
+    )
+    parser.add_argument(
+        "--artifact-cache",
+        choices=CACHE_MODES,
+        help="Rendered chart/video cache mode: use (default), refresh, bypass.",
+    )
+
+    parser.add_argument(
+        "--metrics-dir",
+        type=Path,
+        help="Where to write <run_id>.json and the shorts.prom textfile (default: METRICS_DIR or assets/metrics).",
+    )
 
     script_parser = subparsers.add_parser("script", help="Generate a narration script.")
     script_parser.add_argument("--ticker", required=True, help="Ticker symbol (e.g. 7203.T).")
@@ -33,56 +58,508 @@ def parse_args() -> argparse.Namespace:
     script_parser.add_argument("--period", default="1mo", help="yfinance period (default: 1mo).")
     script_parser.add_argument("--notion-page", help="Optional Notion page ID to update.")
     script_parser.add_argument("--output", type=Path, help="Path to save the generated script.")
+    script_parser.add_argument("--stream", action="store_true", help="Stream the completion: print and save sentences as they arrive.")
+    script_parser.add_argument(
+        "--narrate",
+        nargs="?",
+        const=True,
+        type=Path,
+        help="Also narrate while streaming: TTS starts on the first sentence (WAV path optional, default: assets/audio/).",
+    )
+    script_parser.add_argument("--tts-backend", choices=TTS_BACKENDS, default="openai", help="TTS backend for --narrate.")
 
     chart_parser = subparsers.add_parser("chart", help="Create a price chart image.")
     chart_parser.add_argument("--ticker", required=True, help="Ticker symbol.")
     chart_parser.add_argument("--period", default="1mo", help="yfinance period.")
-    chart_parser.add_argument("--output", type=Path, help="Where to write the chart PNG.")
+    chart_parser.add_argument("--output", type=Path, help="Chart image path (.png/.webp/.jpg; .svg/.pdf via matplotlib).")
+    chart_parser.add_argument("--style", choices=sorted(CHART_STYLES), default="landscape", help="Chart layout (shorts = 1080x1920).")
+    chart_parser.add_argument("--exports", default="", help=f"Extra copies from the same draw: {', '.join(EXPORT_PROFILES)}.")
 
     video_parser = subparsers.add_parser("video", help="Combine audio + image into a clip.")
-    video_parser.add_argument("--image", type=Path, required=True, help="Path to an image to show.")
+    video_source = video_parser.add_mutually_exclusive_group(required=True)
+    video_source.add_argument("--image", type=Path, help="Path to an image to show.")
+    video_source.add_argument("--ticker", help="Render an animated price-line reveal for this ticker instead.")
+    video_parser.add_argument("--period", default="1mo", help="yfinance period for --ticker.")
+    video_parser.add_argument("--still", action="store_true", help="With --ticker: loop the finished chart instead of the reveal.")
     video_parser.add_argument("--audio", type=Path, required=True, help="Narration audio file.")
     video_parser.add_argument("--output", type=Path, help="Target MP4 path.")
     video_parser.add_argument("--fps", type=int, default=30, help="Frames per second.")
+    video_parser.add_argument("--backend", choices=VIDEO_BACKENDS, default="ffmpeg", help="Still-image renderer.")
+    video_parser.add_argument("--encoder", default="libx264", help="ffmpeg video encoder (e.g. libx264, h264_nvenc).")
+    video_parser.add_argument("--preset", default="veryfast", help="Encoder preset.")
+    video_parser.add_argument("--threads", type=int, default=0, help="Encoder threads (0 = ffmpeg default).")
+
+    short_parser = subparsers.add_parser("short", help="Compose a 1080x1920 Short: title, chart, key numbers, CTA, subtitles.")
+    short_parser.add_argument("--ticker", required=True, help="Ticker symbol.")
+    short_parser.add_argument("--company", help="Company name for the title card.")
+    short_parser.add_argument("--period", default="1mo", help="yfinance period.")
+    short_parser.add_argument("--audio", type=Path, required=True, help="Narration audio file.")
+    short_parser.add_argument("--subtitles", type=Path, help="SRT cues (default: the narration's .srt, else --script).")
+    short_parser.add_argument("--script", type=Path, help="Script to subtitle by sentence length when no SRT exists.")
+    short_parser.add_argument("--output", type=Path, help="Target MP4 path.")
+    short_parser.add_argument("--fps", type=int, default=30, help="Frames per second.")
+    short_parser.add_argument("--encoder", default="libx264", help="ffmpeg video encoder.")
+    short_parser.add_argument("--preset", default="ultrafast", help="Encoder preset.")
+    short_parser.add_argument("--threads", type=int, default=0, help="Encoder threads (0 = ffmpeg default).")
+
+    narrate_parser = subparsers.add_parser("narrate", help="Synthesize narration audio from a script file.")
+    narrate_parser.add_argument("--script", type=Path, required=True, help="Script artifact (text/Markdown).")
+    narrate_parser.add_argument("--output", type=Path, help="Target WAV path (default: assets/audio/).")
+    narrate_parser.add_argument("--backend", choices=TTS_BACKENDS, default="openai", help="TTS backend (tone = offline placeholder).")
+    narrate_parser.add_argument("--workers", type=int, default=4, help="Sentences synthesized concurrently.")
+
+    batch_parser = subparsers.add_parser("batch", help="Run script/chart/video for every row of a manifest.")
+    batch_source = batch_parser.add_mutually_exclusive_group(required=True)
+    batch_source.add_argument("--manifest", type=Path, help="CSV/YAML with ticker,company,period,notion_page[,audio].")
+    batch_source.add_argument("--notion-database", help="Stream rows (Ticker/Company/Period/Audio) from this Notion database.")
+    batch_parser.add_argument("--notion-status", help="Only Notion rows whose Status equals this value.")
+    batch_parser.add_argument("--stages", default="script,narration,chart,video", help="Comma-separated stages to run.")
+    batch_parser.add_argument("--script-workers", type=int, default=4, help="Concurrent script requests (async, rate limited).")
+    batch_parser.add_argument("--narration-workers", type=int, default=2, help="Concurrent script narrations (threads).")
+    batch_parser.add_argument("--tts-backend", choices=TTS_BACKENDS, default="openai", help="Narration TTS backend.")
+    batch_parser.add_argument("--chart-workers", type=int, default=os.cpu_count() or 2, help="Concurrent chart renders (processes).")
+    batch_parser.add_argument("--video-workers", type=int, default=2, help="Concurrent video renders (processes).")
+    batch_parser.add_argument("--threads-only", action="store_true", help="Use threads instead of processes for rendering.")
+    batch_parser.add_argument("--output-dir", type=Path, help="Directory for generated artifacts.")
+    batch_parser.add_argument("--chart-style", choices=sorted(CHART_STYLES), default="landscape", help="Chart layout (shorts = 1080x1920).")
+    batch_parser.add_argument("--chart-exports", default="", help=f"Extra chart copies: {', '.join(EXPORT_PROFILES)}.")
+    batch_parser.add_argument("--shorts", action="store_true", help="Compose multi-scene 1080x1920 Shorts in the video stage.")
+    batch_parser.add_argument("--resume", action="store_true", help="Skip stages already finished under --run-id (see the run journal).")
+    batch_parser.add_argument(
+        "--pack", type=int, nargs="?", const=0, metavar="K", help="Request scripts K tickers per call (default K: from the model limits)."
+    )
+
+    script_batch_parser = subparsers.add_parser("script-batch", help="Generate manifest scripts via the OpenAI Batch API.")
+    script_batch_parser.add_argument("action", choices=["submit", "poll", "collect", "run"], help="Step to run (resumable by --run-id).")
+    script_batch_parser.add_argument("--manifest", type=Path, help="Manifest CSV/YAML (required for submit/run).")
+    script_batch_parser.add_argument("--interval", type=float, default=30.0, help="Polling interval in seconds.")
+    script_batch_parser.add_argument("--timeout", type=float, help="Stop polling after this many seconds.")
+
+    screen_parser = subparsers.add_parser("screen", help="Rank the ticker master on cached prices and write a batch manifest.")
+    screen_parser.add_argument("--master", type=Path, help="Ticker master CSV (default: TICKER_MASTER or assets/data/ticker_master.csv).")
+    screen_parser.add_argument("--earnings", type=Path, help="ticker,earnings_date CSV overriding the master's dates.")
+    screen_parser.add_argument("--top", type=int, default=20, help="Tickers to pick.")
+    screen_parser.add_argument("--min-turnover", type=float, default=1e8, help="Minimum median daily turnover in JPY.")
+    screen_parser.add_argument("--segments", default="", help="Comma-separated market segments to keep (e.g. プライム).")
+    screen_parser.add_argument("--max-per-sector", type=int, help="Cap on picks from one sector.")
+    screen_parser.add_argument("--earnings-days", type=int, default=7, help="Boost tickers reporting within this many days.")
+    screen_parser.add_argument("--sync", action="store_true", help="Refresh the OHLCV store before screening.")
+    screen_parser.add_argument("--period", default="1mo", help="Period written to the manifest rows.")
+    screen_parser.add_argument("--output", type=Path, help="Manifest path (default: assets/manifests/<run_id>_screen.csv).")
+
+    gc_parser = subparsers.add_parser("cache-gc", help="Trim cached charts/videos under assets/templates (LRU).")
+    gc_parser.add_argument("--max-mb", type=int, help="Size budget in MiB (default: ARTIFACT_CACHE_MAX_BYTES or 2 GiB).")
 
     subparsers.add_parser("healthcheck", help="Run OpenAI and Notion connectivity checks.")
 
+    serve_parser = subparsers.add_parser("serve", help="Run queued jobs in a warm, long-running worker.")
+    serve_parser.add_argument("--concurrency", type=int, default=2, help="Jobs run at once (threads).")
+    serve_parser.add_argument("--poll-interval", type=float, default=0.25, help="Seconds between queue polls when idle.")
+    serve_parser.add_argument("--max-jobs", type=int, help="Exit after running this many jobs.")
+    serve_parser.add_argument("--drain", action="store_true", help="Exit once the queue is empty.")
+
+    watch_parser = subparsers.add_parser("watch", help="Poll 1-minute bars for a watchlist and start Shorts for tickers that move.")
+    watch_parser.add_argument("--manifest", type=Path, required=True, help="CSV/YAML watchlist (ticker,company,period,notion_page).")
+    watch_parser.add_argument("--replay", type=Path, help="Replay bars recorded with --record instead of polling yfinance.")
+    watch_parser.add_argument("--record", type=Path, help="Append every polled bar to this CSV (for --replay).")
+    watch_parser.add_argument("--interval", type=float, default=60.0, help="Seconds between live polls.")
+    watch_parser.add_argument("--max-polls", type=int, help="Stop after this many polls.")
+    watch_parser.add_argument("--move-pct", type=float, default=3.0, help="Trigger on this %% move vs the previous close.")
+    watch_parser.add_argument("--window", type=int, default=5, help="Indicator window in bars (minutes).")
+    watch_parser.add_argument("--window-move-pct", type=float, default=1.5, help="Trigger on this %% move within the window.")
+    watch_parser.add_argument("--volume-ratio", type=float, default=0.0, help="Also require window volume at this multiple of the session pace.")
+    watch_parser.add_argument("--cooldown", type=float, default=30.0, help="Minutes before a ticker can trigger again.")
+    watch_parser.add_argument("--stages", default="script,chart", help="What a trigger starts: chart (rendered here) and/or script (queued for serve).")
+    watch_parser.add_argument("--chart-style", choices=sorted(CHART_STYLES), default="shorts", help="Layout of the intraday chart.")
+    watch_parser.add_argument("--output-dir", type=Path, help="Where intraday charts go (default: assets/templates/intraday).")
+
+    submit_parser = subparsers.add_parser("submit", help="Queue a job for `serve` (JOB_QUEUE_PATH).")
+    submit_parser.add_argument("kind", choices=JOB_KINDS, help="Job type.")
+    submit_parser.add_argument("--ticker", help="Ticker symbol (script/chart/video).")
+    submit_parser.add_argument("--company", help="Company name (script).")
+    submit_parser.add_argument("--period", help="yfinance period (default: 1mo).")
+    submit_parser.add_argument("--notion-page", help="Notion page to update with the script.")
+    submit_parser.add_argument("--style", choices=sorted(CHART_STYLES), help="Chart layout.")
+    submit_parser.add_argument("--audio", type=Path, help="Narration audio (video).")
+    submit_parser.add_argument("--image", type=Path, help="Still image instead of a price reveal (video).")
+    submit_parser.add_argument("--topic", help="Previous topic to follow on from (idea).")
+    submit_parser.add_argument("--note", help="Extra facts for the script prompt, e.g. an intraday move (script).")
+    submit_parser.add_argument("--output", type=Path, help="Output path (default: assets/templates/jobs/).")
+    submit_parser.add_argument("--wait", action="store_true", help="Block until the job finishes; exit 1 if it failed.")
+    submit_parser.add_argument("--timeout", type=float, help="Give up waiting after this many seconds.")
+
     return parser.parse_args()
 
 
-def main() -> None:
+def parse_exports(value: str) -> List[ExportProfile]:
+    """Comma-separated export profile names, e.g. ``thumbnail,notion``."""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in EXPORT_PROFILES]
+    if unknown:
+        raise SystemExit(f"Unknown export profile(s): {', '.join(unknown)} (choose from {', '.join(EXPORT_PROFILES)})")
+    return [EXPORT_PROFILES[name] for name in names]
+
+
+def write_metrics(args: argparse.Namespace, runtime: RuntimeConfig, *, started: float, status: str, failed_rows: int) -> None:
+    """Write the JSON run report and, outside dry runs, the OpenMetrics textfile."""
+    metrics = get_metrics()
+    directory = args.metrics_dir or Path(os.getenv("METRICS_DIR") or ASSETS_DIR / "metrics")
+    duration = time.time() - started
+    metrics.set("run_duration_seconds", duration, command=args.command)
+    metrics.set("run_failed_rows", failed_rows, command=args.command)
+    metrics.set("last_run_timestamp_seconds", time.time(), command=args.command)
+    write_report(
+        metrics,
+        directory / f"{runtime.run_id}.json",
+        run_id=runtime.run_id,
+        command=args.command,
+        dry_run=runtime.dry_run,
+        status=status,
+        duration=duration,
+    )
+    if runtime.dry_run:
+        logging.getLogger(__name__).info("[dry-run] Skipping metrics textfile update")
+        return
+    write_textfile(metrics, directory / "shorts.prom")
+
+
+def main() -> int:
     args = parse_args()
     load_dotenv()
-    runtime = RuntimeConfig.from_env(run_id=args.run_id, log_level=args.log_level, dry_run=args.dry_run)
+    runtime = RuntimeConfig.from_env(
+        run_id=args.run_id,
+        log_level=args.log_level,
+        dry_run=args.dry_run,
+        llm_cache=args.llm_cache,
+        artifact_cache=args.artifact_cache,
+    )
     configure_logging(runtime.log_level)
     logging.getLogger(__name__).info("Run started (run_id=%s, dry_run=%s)", runtime.run_id, runtime.dry_run)
+    started = time.time()
+    status, failed_rows = "error", 0
+    try:
+        code, failed_rows = run_command(args, runtime)
+        status = "ok" if code == 0 else "failed"
+        return code
+    finally:
+        # A submit is one insert; its report would only overwrite the worker's textfile.
+        if args.command != "submit":
+            write_metrics(args, runtime, started=started, status=status, failed_rows=failed_rows)
+
 
+def run_command(args: argparse.Namespace, runtime: RuntimeConfig) -> Tuple[int, int]:
+    """Dispatch one CLI command; returns (exit code, failed batch rows)."""
     if args.command == "script":
-        script = generate_script_for_ticker(
+        from contextlib import nullcontext
+
+        from japan_stock_youtube_shorts.pipelines.generate_script import generate_script_for_ticker, script_path
+
+        stream = args.stream or args.narrate is not None
+        narration = nullcontext()
+        if args.narrate is not None:
+            from japan_stock_youtube_shorts.pipelines.narration import Narrator, get_tts_backend, narration_path
+
+            audio = narration_path(script_path(args.ticker, runtime, args.output)) if args.narrate is True else args.narrate
+            backend = get_tts_backend(args.tts_backend, dry_run=runtime.dry_run)
+            narration = Narrator(backend, mode=runtime.artifact_cache).stream(audio)
+
+        def on_sentence(sentence: str) -> None:
+            print(sentence, flush=True)
+            if args.narrate is not None:
+                narration.feed(sentence)
+
+        with narration:
+            script = generate_script_for_ticker(
+                args.ticker,
+                args.company,
+                period=args.period,
+                notion_page_id=args.notion_page,
+                output_path=args.output,
+                runtime_config=runtime,
+                stream=stream,
+                on_sentence=on_sentence if stream else None,
+            )
+            if args.narrate is not None:
+                print(f"Narration saved to {narration.finish()}")
+        if not stream:
+            print(script)
+
+    elif args.command == "chart":
+        from japan_stock_youtube_shorts.pipelines.generate_chart import create_price_chart
+
+        output = create_price_chart(
             args.ticker,
-            args.company,
             period=args.period,
-            notion_page_id=args.notion_page,
             output_path=args.output,
             runtime_config=runtime,
+            style=CHART_STYLES[args.style],
+            exports=parse_exports(args.exports),
         )
-        print(script)
-
-    elif args.command == "chart":
-        output = create_price_chart(args.ticker, period=args.period, output_path=args.output, runtime_config=runtime)
         print(f"Chart saved to {output}")
 
     elif args.command == "video":
-        output = assemble_video(args.image, args.audio, output_path=args.output, fps=args.fps, runtime_config=runtime)
+        from japan_stock_youtube_shorts.pipelines.ffmpeg_video import EncoderOptions
+        from japan_stock_youtube_shorts.pipelines.generate_video import (
+            assemble_chart_video,
+            assemble_reveal_video,
+            assemble_video,
+        )
+
+        options = EncoderOptions(encoder=args.encoder, preset=args.preset, threads=args.threads)
+        if args.ticker and args.still:
+            output = assemble_chart_video(
+                args.ticker,
+                args.audio,
+                period=args.period,
+                output_path=args.output,
+                fps=args.fps,
+                runtime_config=runtime,
+                options=options,
+                style=CHART_STYLES["shorts"],
+            )
+        elif args.ticker:
+            output = assemble_reveal_video(
+                args.ticker,
+                args.audio,
+                period=args.period,
+                output_path=args.output,
+                fps=args.fps,
+                runtime_config=runtime,
+                options=options,
+            )
+        else:
+            output = assemble_video(
+                args.image,
+                args.audio,
+                output_path=args.output,
+                fps=args.fps,
+                runtime_config=runtime,
+                backend=args.backend,
+                options=options,
+            )
         print(f"Video saved to {output}")
 
+    elif args.command == "short":
+        from japan_stock_youtube_shorts.pipelines.generate_video import assemble_short
+        from japan_stock_youtube_shorts.pipelines.shorts_composer import SHORTS_ENCODER
+
+        output = assemble_short(
+            args.ticker,
+            args.audio,
+            company=args.company,
+            period=args.period,
+            output_path=args.output,
+            subtitles_path=args.subtitles,
+            script_path=args.script,
+            fps=args.fps,
+            runtime_config=runtime,
+            options=replace(SHORTS_ENCODER, encoder=args.encoder, preset=args.preset, threads=args.threads),
+        )
+        print(f"Short saved to {output}")
+
+    elif args.command == "narrate":
+        from japan_stock_youtube_shorts.pipelines.narration import narrate_script
+
+        output = narrate_script(
+            args.script, output_path=args.output, backend_name=args.backend, workers=args.workers, runtime_config=runtime
+        )
+        print(f"Narration saved to {output}")
+
+    elif args.command == "batch":
+        from japan_stock_youtube_shorts.pipelines.artifact_cache import get_artifact_cache
+        from japan_stock_youtube_shorts.pipelines.batch import BatchOrchestrator, StageLimits, load_manifest
+        from japan_stock_youtube_shorts.pipelines.notion_manifest import run_notion_batch
+
+        if args.resume and not args.run_id:
+            raise SystemExit("--resume requires the --run-id of the run to continue")
+        orchestrator = BatchOrchestrator(
+            runtime=runtime,
+            limits=StageLimits(
+                script=args.script_workers, narration=args.narration_workers, chart=args.chart_workers, video=args.video_workers
+            ),
+            stages=[stage.strip() for stage in args.stages.split(",") if stage.strip()],
+            output_dir=args.output_dir,
+            use_processes=not args.threads_only,
+            chart_style=CHART_STYLES[args.chart_style],
+            resume=args.resume,
+            pack_size=args.pack,
+            tts_backend=args.tts_backend,
+            shorts=args.shorts,
+            chart_exports=parse_exports(args.chart_exports),
+        )
+        if args.notion_database:
+            report = run_notion_batch(orchestrator, args.notion_database, status=args.notion_status)
+        else:
+            try:
+                rows = load_manifest(args.manifest)
+            except ValueError as exc:
+                raise SystemExit(str(exc)) from exc
+            report = orchestrator.run(rows)
+        get_artifact_cache().gc()
+        print(report.summary())
+        if report.failed_rows:
+            report_cache_stats()
+            logging.getLogger(__name__).info("Run finished with failures (run_id=%s)", runtime.run_id)
+            return 1, len(report.failed_rows)
+
+    elif args.command == "script-batch":
+        from japan_stock_youtube_shorts.pipelines.batch import load_manifest
+        from japan_stock_youtube_shorts.pipelines.script_batch import ScriptBatchRunner
+
+        runner = ScriptBatchRunner(runtime=runtime)
+        if args.action in {"submit", "run"} and not args.manifest:
+            raise SystemExit("--manifest is required for script-batch submit/run")
+        if args.action == "submit":
+            state = runner.submit(load_manifest(args.manifest))
+            print(f"Batch {state.batch_id or '(not submitted)'} for run_id={state.run_id}: {state.status}")
+        elif args.action == "poll":
+            state = runner.poll(interval=args.interval, timeout=args.timeout)
+            print(f"Batch {state.batch_id} for run_id={state.run_id}: {state.status}")
+        elif args.action == "collect":
+            print(f"Collected {len(runner.collect())} script(s) for run_id={runtime.run_id}")
+        else:
+            print(f"Collected {len(runner.run(load_manifest(args.manifest), interval=args.interval))} script(s) for run_id={runtime.run_id}")
+
+    elif args.command == "screen":
+        from japan_stock_youtube_shorts.pipelines.screen import manifest_path, screen_universe, write_manifest
+
+        try:
+            picks = screen_universe(
+                master_path=args.master,
+                earnings_path=args.earnings,
+                top=args.top,
+                min_turnover=args.min_turnover,
+                segments=[segment.strip() for segment in args.segments.split(",") if segment.strip()],
+                max_per_sector=args.max_per_sector,
+                earnings_days=args.earnings_days,
+                sync=args.sync,
+                runtime_config=runtime,
+            )
+        except FileNotFoundError as exc:
+            raise SystemExit(str(exc)) from exc
+        for rank, pick in enumerate(picks, 1):
+            print(f"{rank:>3}. {pick.ticker:<8} {pick.company} [{pick.sector or '-'}] score={pick.score:.2f}: {pick.reason}")
+        output = write_manifest(picks, args.output or manifest_path(runtime.run_id), period=args.period)
+        print(f"Manifest saved to {output}")
+
+    elif args.command == "cache-gc":
+        from japan_stock_youtube_shorts.pipelines.artifact_cache import get_artifact_cache
+
+        freed = get_artifact_cache().gc(None if args.max_mb is None else args.max_mb * 1024**2)
+        print(f"Freed {freed / 1024**2:.1f} MiB of cached artifacts")
+
     elif args.command == "healthcheck":
+        from japan_stock_youtube_shorts.notion.health import healthcheck as notion_healthcheck
+        from japan_stock_youtube_shorts.openai.health import healthcheck as openai_healthcheck
+
         openai_healthcheck()
         notion_healthcheck()
         print("Healthcheck completed.")
 
+    elif args.command == "serve":
+        import signal
+
+        from japan_stock_youtube_shorts.pipelines.worker import JobWorker
+
+        started = time.time()
+        worker = JobWorker(
+            runtime=runtime,
+            concurrency=args.concurrency,
+            poll_interval=args.poll_interval,
+            # Keep the textfile current while the worker runs, not only when it exits.
+            on_job_done=lambda job: write_metrics(args, runtime, started=started, status="running", failed_rows=worker.failed),
+        )
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: worker.stop())
+        worker.serve(max_jobs=args.max_jobs, drain=args.drain)
+        if worker.failed:
+            logging.getLogger(__name__).info("Worker finished with %d failed job(s) (run_id=%s)", worker.failed, runtime.run_id)
+            return 1, worker.failed
+
+    elif args.command == "watch":
+        import signal
+        from datetime import timedelta
+
+        from japan_stock_youtube_shorts.market.history import get_provider
+        from japan_stock_youtube_shorts.market.intraday import (
+            IntradayMonitor,
+            LiveSource,
+            RecordingSource,
+            ReplaySource,
+            TriggerRule,
+            previous_closes,
+            synthetic_session,
+        )
+        from japan_stock_youtube_shorts.pipelines.batch import load_manifest
+        from japan_stock_youtube_shorts.pipelines.watch import TriggerDispatcher
+
+        rows = {row.ticker: row for row in load_manifest(args.manifest)}
+        references = None
+        if args.replay:
+            source = ReplaySource.from_csv(args.replay)
+        elif runtime.dry_run:
+            logging.getLogger(__name__).info("[dry-run] Replaying a synthetic session instead of polling yfinance")
+            source = ReplaySource(synthetic_session(list(rows), movers=0.3))
+        else:
+            source = LiveSource()
+            references = previous_closes(get_provider(), list(rows))
+        if args.record:
+            source = RecordingSource(source, args.record)
+        monitor = IntradayMonitor(
+            list(rows),
+            source,
+            rule=TriggerRule(
+                move_pct=args.move_pct,
+                window_move_pct=args.window_move_pct,
+                volume_ratio=args.volume_ratio,
+                cooldown=timedelta(minutes=args.cooldown),
+            ),
+            window=args.window,
+            references=references,
+        )
+        try:
+            dispatcher = TriggerDispatcher(
+                monitor,
+                rows,
+                runtime=runtime,
+                stages=[stage.strip() for stage in args.stages.split(",") if stage.strip()],
+                output_dir=args.output_dir,
+                style=CHART_STYLES[args.chart_style],
+            )
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from exc
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: monitor.stop())
+        fired = monitor.run(dispatcher, interval=args.interval, max_polls=args.max_polls)
+        print(f"Watched {len(rows)} ticker(s) for {monitor.polls} poll(s): {fired} trigger(s)")
+        if dispatcher.failed:
+            return 1, dispatcher.failed
+
+    elif args.command == "submit":
+        from japan_stock_youtube_shorts.pipelines.job_queue import JobQueue
+
+        fields = ("ticker", "company", "period", "notion_page", "style", "audio", "image", "topic", "note", "output")
+        payload = {name: str(getattr(args, name)) for name in fields if getattr(args, name) is not None}
+        queue = JobQueue()
+        try:
+            job_id = queue.submit(args.kind, payload, dry_run=runtime.dry_run)
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from exc
+        print(f"Queued job #{job_id} ({args.kind})")
+        if args.wait:
+            try:
+                job = queue.wait(job_id, timeout=args.timeout)
+            except TimeoutError as exc:
+                raise SystemExit(f"{exc}; is `main.py serve` running?") from exc
+            print(f"Job #{job_id} {job.status}: {job.result or job.error}")
+            if job.status == "failed":
+                return 1, 1
+        return 0, 0
+
+    report_cache_stats()
     logging.getLogger(__name__).info("Run finished (run_id=%s)", runtime.run_id)
+    return 0, 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,38 @@
+"""
+Shared fixtures: every test runs offline and keeps its state files under ``tmp_path``.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from japan_stock_youtube_shorts.config import RuntimeConfig
+
+# State the pipelines keep under assets/ unless these point elsewhere.
+STATE_PATHS = {
+    "JOB_QUEUE_PATH": "jobs.sqlite3",
+    "NOTION_MIRROR_PATH": "notion_mirror.sqlite3",
+    "OHLCV_STORE_DIR": "ohlcv",
+    "OPENAI_CACHE_PATH": "completions.sqlite3",
+    "RUN_JOURNAL_PATH": "runs.sqlite3",
+    "TTS_CACHE_DIR": "tts",
+    "ARTIFACT_CACHE_ROOT": "templates",
+}
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    for name, relative in STATE_PATHS.items():
+        monkeypatch.setenv(name, str(tmp_path / "state" / relative))
+    for name in ("OPENAI_BASE_URL", "RUN_ID", "DRY_RUN"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture
+def runtime() -> RuntimeConfig:
+    return RuntimeConfig(dry_run=False, run_id="test", log_level="WARN", llm_cache="bypass", artifact_cache="bypass")
+
+
+@pytest.fixture
+def dry_runtime() -> RuntimeConfig:
+    return RuntimeConfig(dry_run=True, run_id="test", log_level="WARN", llm_cache="bypass", artifact_cache="bypass")
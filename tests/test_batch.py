@@ -0,0 +1,91 @@
+"""
+Dry-run batch DAG: one failing row does not stop the others, and the CLI reports it.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from japan_stock_youtube_shorts.market.history import FixtureBackend, HistoryProvider
+from japan_stock_youtube_shorts.openai.prompt_generator import PromptGenerator
+from japan_stock_youtube_shorts.pipelines.batch import BatchOrchestrator, BatchRow, StageLimits, check_unique, load_manifest
+
+ROOT = Path(__file__).resolve().parents[1]
+ROWS = [BatchRow("7203.T", "トヨタ自動車"), BatchRow("6758.T", "ソニーグループ"), BatchRow("9984.T", "ソフトバンクグループ")]
+
+
+class FailingGenerator(PromptGenerator):
+    """Dry-run generator whose script request fails for one ticker."""
+
+    def generate_script(self, context, stock_summary, *, cache_mode=None) -> str:
+        if context.ticker == "6758.T":
+            raise RuntimeError("model unavailable")
+        return super().generate_script(context, stock_summary, cache_mode=cache_mode)
+
+
+def test_failing_stage_only_fails_its_row(dry_runtime, tmp_path):
+    orchestrator = BatchOrchestrator(
+        runtime=dry_runtime,
+        limits=StageLimits(script=2, narration=2, chart=2, video=1),
+        stages=("script", "narration", "chart"),
+        output_dir=tmp_path / "out",
+        provider=HistoryProvider(FixtureBackend()),
+        generator=FailingGenerator(runtime=dry_runtime),
+        use_processes=False,
+        tts_backend="tone",
+    )
+    report = orchestrator.run(ROWS)
+
+    assert [result.row.ticker for result in report.failed_rows] == ["6758.T"]
+    failed = report.failed_rows[0]
+    assert list(failed.errors) == ["script"]
+    assert "model unavailable" in failed.errors["script"]
+    # Narration depends on the script; the chart does not.
+    assert "narration" not in failed.outputs
+    assert "chart" in failed.outputs
+    for result in report.results:
+        if result is not failed:
+            assert {"script", "narration", "chart"} <= set(result.outputs)
+            assert Path(result.outputs["narration"]).is_file()
+    assert "Batch finished: 2/3 rows succeeded" in report.summary()
+    assert "FAILED 6758.T [script]" in report.summary()
+
+
+def test_repeated_tickers_are_rejected(dry_runtime, tmp_path):
+    rows = [*ROWS, BatchRow("7203.T", "トヨタ")]
+    with pytest.raises(ValueError, match="more than once: 7203.T"):
+        check_unique(rows)
+    manifest = tmp_path / "tickers.csv"
+    manifest.write_text("ticker,company\n7203.T,トヨタ\n6758.T,ソニー\n7203.T,トヨタ\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="7203.T"):
+        load_manifest(manifest)
+    orchestrator = BatchOrchestrator(runtime=dry_runtime, output_dir=tmp_path / "out", use_processes=False)
+    with pytest.raises(ValueError):
+        orchestrator.run(rows)
+
+
+def run_cli(tmp_path: Path, manifest: str, *args: str) -> subprocess.CompletedProcess:
+    path = tmp_path / "tickers.csv"
+    path.write_text(manifest, encoding="utf-8")
+    command = [sys.executable, str(ROOT / "main.py"), "--dry-run", "--log-level", "WARN", "--run-id", "cli"]
+    command += ["--metrics-dir", str(tmp_path / "metrics"), "batch", "--manifest", str(path), "--output-dir", str(tmp_path / "out")]
+    return subprocess.run([*command, *args], cwd=tmp_path, capture_output=True, text=True, timeout=120)
+
+
+def test_cli_exit_codes(tmp_path):
+    # Narrating without a script stage fails the row that has no script from an earlier run.
+    done = run_cli(tmp_path, "ticker,company,audio\n7203.T,トヨタ,\n", "--stages", "narration", "--tts-backend", "tone")
+    assert done.returncode == 1, done.stderr
+    assert "FAILED 7203.T [narration]" in done.stdout
+
+    ok = run_cli(tmp_path, "ticker,company\n7203.T,トヨタ\n", "--stages", "script,narration", "--tts-backend", "tone")
+    assert ok.returncode == 0, ok.stderr
+    assert "Batch finished: 1/1 rows succeeded" in ok.stdout
+
+    repeated = run_cli(tmp_path, "ticker,company\n7203.T,トヨタ\n7203.T,トヨタ\n", "--stages", "script")
+    assert repeated.returncode == 1
+    assert "more than once: 7203.T" in repeated.stderr
@@ -0,0 +1,79 @@
+"""
+JPX trading days: national holidays, the year-end closure and settled sessions.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+import pytest
+
+from japan_stock_youtube_shorts.market.calendar import DEFAULT_CALENDAR, JST, JPXCalendar, national_holidays
+from japan_stock_youtube_shorts.market.store import period_start
+
+# Cabinet Office lists, including substitute (振替休日) and sandwiched (国民の休日) days.
+HOLIDAYS_2025 = [
+    (1, 1), (1, 13), (2, 11), (2, 23), (2, 24), (3, 20), (4, 29), (5, 3), (5, 4), (5, 5), (5, 6),
+    (7, 21), (8, 11), (9, 15), (9, 23), (10, 13), (11, 3), (11, 23), (11, 24),
+]  # fmt: skip
+HOLIDAYS_2026 = [
+    (1, 1), (1, 12), (2, 11), (2, 23), (3, 20), (4, 29), (5, 3), (5, 4), (5, 5), (5, 6),
+    (7, 20), (8, 11), (9, 21), (9, 22), (9, 23), (10, 12), (11, 3), (11, 23),
+]  # fmt: skip
+
+
+@pytest.mark.parametrize("year, expected", [(2025, HOLIDAYS_2025), (2026, HOLIDAYS_2026)])
+def test_national_holidays(year, expected):
+    assert sorted(national_holidays(year)) == [date(year, month, day) for month, day in expected]
+
+
+def test_year_end_closure():
+    calendar = DEFAULT_CALENDAR
+    assert not calendar.is_trading_day(date(2026, 12, 31))
+    assert not calendar.is_trading_day(date(2026, 1, 2))
+    assert calendar.is_trading_day(date(2026, 12, 30))
+    assert calendar.next_trading_day(date(2026, 12, 30)) == date(2027, 1, 4)
+    assert calendar.previous_trading_day(date(2026, 1, 5)) == date(2025, 12, 30)
+
+
+def test_golden_week_and_extra_closures():
+    assert list(DEFAULT_CALENDAR.trading_days(date(2026, 4, 30), date(2026, 5, 8))) == [
+        date(2026, 4, 30),
+        date(2026, 5, 1),
+        date(2026, 5, 7),
+        date(2026, 5, 8),
+    ]
+    closed = JPXCalendar(extra_closures=frozenset({date(2026, 5, 7)}))
+    assert closed.next_trading_day(date(2026, 5, 1)) == date(2026, 5, 8)
+
+
+@pytest.mark.parametrize(
+    "now, expected",
+    [
+        (datetime(2026, 10, 19, 15, 59, tzinfo=JST), date(2026, 10, 16)),  # Monday before the bar settles
+        (datetime(2026, 10, 19, 16, 0, tzinfo=JST), date(2026, 10, 19)),
+        (datetime(2026, 10, 19, 7, 0, tzinfo=timezone.utc), date(2026, 10, 19)),  # 16:00 JST
+        (datetime(2026, 10, 18, 12, 0, tzinfo=JST), date(2026, 10, 16)),  # Sunday
+        (datetime(2026, 10, 12, 18, 0, tzinfo=JST), date(2026, 10, 9)),  # Sports Day
+        (datetime(2026, 5, 7, 8, 0, tzinfo=JST), date(2026, 5, 1)),  # after Golden Week
+        (datetime(2027, 1, 4, 9, 30, tzinfo=JST), date(2026, 12, 30)),  # first session of the year still open
+    ],
+)
+def test_latest_closed_session(now, expected):
+    assert DEFAULT_CALENDAR.latest_closed_session(now) == expected
+
+
+def test_session_hours():
+    assert DEFAULT_CALENDAR.is_session_open(datetime(2026, 10, 16, 9, 0, tzinfo=JST))
+    assert not DEFAULT_CALENDAR.is_session_open(datetime(2026, 10, 16, 11, 45, tzinfo=JST))
+    assert not DEFAULT_CALENDAR.is_session_open(datetime(2026, 10, 16, 15, 30, tzinfo=JST))
+    assert not DEFAULT_CALENDAR.is_session_open(datetime(2026, 10, 12, 10, 0, tzinfo=JST))
+
+
+def test_period_start_counts_trading_days():
+    assert period_start("5d", date(2026, 10, 16)) == date(2026, 10, 9)
+    assert period_start("1mo", date(2026, 10, 16)) == date(2026, 9, 16)
+    assert period_start("ytd", date(2026, 10, 16)) == date(2026, 1, 1)
+    assert period_start("max", date(2026, 10, 16)) is None
+    with pytest.raises(ValueError):
+        period_start("fortnight", date(2026, 10, 16))
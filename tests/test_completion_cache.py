@@ -0,0 +1,117 @@
+"""
+Completion cache modes and eviction against a temporary SQLite file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import timedelta
+from typing import List
+
+import pytest
+
+from japan_stock_youtube_shorts.openai.completion_cache import CompletionCache, completion_key
+
+MESSAGES = [{"role": "user", "content": "7203.T の台本"}]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CompletionCache(tmp_path / "completions.sqlite3")
+    yield cache
+    cache.close()
+
+
+def counting(replies: List[str]):
+    calls: List[str] = []
+
+    def compute() -> str:
+        calls.append("call")
+        return replies[len(calls) - 1]
+
+    return compute, calls
+
+
+def ask(cache: CompletionCache, compute, mode: str) -> str:
+    return cache.cached(compute, model="gpt-4o-mini", system="system", messages=MESSAGES, temperature=0.6, mode=mode)
+
+
+def test_use_mode_serves_repeats_from_the_cache(cache):
+    compute, calls = counting(["first", "second"])
+    assert ask(cache, compute, "use") == "first"
+    assert ask(cache, compute, "use") == "first"
+    assert len(calls) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_refresh_regenerates_and_overwrites(cache):
+    compute, calls = counting(["first", "second"])
+    ask(cache, compute, "use")
+    assert ask(cache, compute, "refresh") == "second"
+    assert ask(cache, lambda: pytest.fail("should be cached"), "use") == "second"
+    assert len(calls) == 2
+
+
+def test_bypass_neither_reads_nor_writes(cache):
+    compute, calls = counting(["first", "second", "third"])
+    ask(cache, compute, "use")
+    assert ask(cache, compute, "bypass") == "second"
+    assert ask(cache, compute, "use") == "first"
+    assert len(calls) == 2
+    assert cache.stats.bypassed == 1
+
+
+def test_empty_replies_are_not_stored(cache):
+    compute, calls = counting(["", "text"])
+    assert ask(cache, compute, "use") == ""
+    assert ask(cache, compute, "use") == "text"
+    assert len(calls) == 2
+
+
+def test_key_covers_every_request_field():
+    base = completion_key("gpt-4o-mini", "system", MESSAGES, 0.6)
+    assert base != completion_key("gpt-4o", "system", MESSAGES, 0.6)
+    assert base != completion_key("gpt-4o-mini", "other", MESSAGES, 0.6)
+    assert base != completion_key("gpt-4o-mini", "system", [{"role": "user", "content": "6758.T"}], 0.6)
+    assert base != completion_key("gpt-4o-mini", "system", MESSAGES, 0.7)
+
+
+def test_async_cached(cache):
+    async def compute() -> str:
+        return "async"
+
+    async def run() -> str:
+        return await cache.acached(compute, model="gpt-4o-mini", system="system", messages=MESSAGES, temperature=0.6)
+
+    assert asyncio.run(run()) == "async"
+    assert cache.get(completion_key("gpt-4o-mini", "system", MESSAGES, 0.6)) == "async"
+
+
+def test_evicts_least_recently_used_beyond_max_entries(tmp_path):
+    cache = CompletionCache(tmp_path / "lru.sqlite3", max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, "gpt-4o-mini", key)
+        time.sleep(0.01)
+    cache.get("a")  # "b" is now the least recently used
+    assert cache.evict() == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == "a" and cache.get("c") == "c"
+    cache.close()
+
+
+def test_expired_entries_are_ignored_and_purged(tmp_path):
+    path = tmp_path / "age.sqlite3"
+    cache = CompletionCache(path, max_age=timedelta(days=30))
+    cache.put("old", "gpt-4o-mini", "stale")
+    cache.put("new", "gpt-4o-mini", "fresh")
+    with cache._conn:
+        cache._conn.execute("UPDATE completions SET created = ? WHERE key = 'old'", (time.time() - 31 * 86_400,))
+    assert cache.get("old") is None
+    assert cache.get("new") == "fresh"
+    cache.close()
+
+    # Opening the cache purges what has expired.
+    reopened = CompletionCache(path, max_age=timedelta(days=30))
+    assert reopened._conn.execute("SELECT key FROM completions").fetchall() == [("new",)]
+    reopened.close()
@@ -0,0 +1,81 @@
+"""
+One grouped fetch per (ticker, period, interval), shared by the script and chart pipelines.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+import pandas as pd
+import pytest
+
+from japan_stock_youtube_shorts.bench.fixtures import synthetic_history
+from japan_stock_youtube_shorts.market.history import FixtureBackend, HistoryProvider
+from japan_stock_youtube_shorts.market.summary import DEFAULT_BENCHMARK
+from japan_stock_youtube_shorts.pipelines.generate_chart import create_price_chart
+from japan_stock_youtube_shorts.pipelines.generate_script import fetch_stock_summary
+
+TICKERS = ["7203.T", "6758.T"]
+
+
+class CountingBackend(FixtureBackend):
+    """Serves only its own frames (no placeholder for unknown tickers) and records every call."""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]) -> None:
+        super().__init__(frames)
+        self.calls: List[Tuple[Tuple[str, ...], str, str]] = []
+
+    def fetch(self, tickers: Sequence[str], *, period: str, interval: str) -> Dict[str, pd.DataFrame]:
+        self.calls.append((tuple(tickers), period, interval))
+        return {ticker: self.frames[ticker].copy() for ticker in tickers if ticker in self.frames}
+
+
+@pytest.fixture
+def backend() -> CountingBackend:
+    return CountingBackend({ticker: synthetic_history(60, seed=i) for i, ticker in enumerate([*TICKERS, DEFAULT_BENCHMARK])})
+
+
+def test_script_and_chart_share_one_grouped_fetch(backend, runtime, tmp_path):
+    provider = HistoryProvider(backend)
+    frames = provider.prefetch([*TICKERS, DEFAULT_BENCHMARK], period="3mo")
+    assert set(frames) == {*TICKERS, DEFAULT_BENCHMARK}
+
+    for ticker in TICKERS:
+        assert fetch_stock_summary(ticker, "3mo", provider=provider).startswith("3mo closing price")
+        chart = create_price_chart(ticker, period="3mo", output_path=tmp_path / f"{ticker}.png", runtime_config=runtime, provider=provider)
+        assert chart.stat().st_size > 0
+
+    assert backend.calls == [((*TICKERS, DEFAULT_BENCHMARK), "3mo", "1d")]
+
+
+def test_cache_is_keyed_by_period_and_interval(backend):
+    provider = HistoryProvider(backend)
+    provider.prefetch(TICKERS, period="1mo")
+    provider.prefetch(TICKERS, period="1mo")
+    provider.prefetch(TICKERS, period="3mo")
+    provider.prefetch(TICKERS, period="1mo", interval="1h")
+    # Only tickers not cached for that key are requested.
+    provider.prefetch([*TICKERS, DEFAULT_BENCHMARK], period="1mo")
+    assert backend.calls == [
+        (tuple(TICKERS), "1mo", "1d"),
+        (tuple(TICKERS), "3mo", "1d"),
+        (tuple(TICKERS), "1mo", "1h"),
+        ((DEFAULT_BENCHMARK,), "1mo", "1d"),
+    ]
+
+
+def test_absent_tickers_are_reported(backend, caplog):
+    provider = HistoryProvider(backend)
+    with caplog.at_level(logging.WARNING, logger="japan_stock_youtube_shorts.market.history"):
+        frames = provider.prefetch([TICKERS[0], "0000.T", "9999.T"], period="1mo")
+    assert list(frames) == [TICKERS[0]]
+    assert "No price data returned for: 0000.T, 9999.T" in caplog.text
+    with pytest.raises(ValueError, match="No price data for ticker 0000.T"):
+        provider.get("0000.T", period="1mo")
+
+
+def test_fixture_backend_serves_placeholders_offline():
+    frames = HistoryProvider(FixtureBackend()).prefetch(["1301.T"], period="1mo")
+    assert list(frames["1301.T"].columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert not frames["1301.T"].empty
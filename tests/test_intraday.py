@@ -0,0 +1,107 @@
+"""
+Intraday indicators and triggers, driven by replayed sessions.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from japan_stock_youtube_shorts.market.calendar import JST
+from japan_stock_youtube_shorts.market.intraday import (
+    CLOSE,
+    OPEN,
+    SESSION_BARS,
+    VOLUME,
+    Bars,
+    IntradayMonitor,
+    ReplaySource,
+    TriggerRule,
+    synthetic_session,
+)
+
+DAY = date(2026, 10, 15)
+NEXT_DAY = date(2026, 10, 16)
+QUIET = TriggerRule(move_pct=100.0, window_move_pct=100.0)
+
+
+def minute(day: date, hour: int, minutes: int) -> int:
+    return pd.Timestamp(datetime.combine(day, time(hour, minutes)), tz=JST).as_unit("ns").value
+
+
+def flat_bars(closes: list[float], *, day: date = DAY) -> Bars:
+    times = np.array([minute(day, 9, 0) + i * 60 * 10**9 for i in range(len(closes))], dtype="i8")
+    close = np.asarray(closes, dtype="f8")
+    return Bars(times, np.column_stack([close, close, close, close, np.full(len(close), 1_000.0)]))
+
+
+@pytest.mark.parametrize("capacity", [SESSION_BARS, 41])
+def test_running_window_sums_match_a_full_recompute(capacity):
+    window = 7
+    session = synthetic_session(["7203.T"], day=DAY, seed=3)["7203.T"]
+    monitor = IntradayMonitor(["7203.T"], ReplaySource({"7203.T": session}), rule=QUIET, window=window, capacity=capacity)
+    indicators = monitor.indicators["7203.T"]
+    closes, volumes = session.values[:, CLOSE], session.values[:, VOLUME]
+
+    # 330 bars through a 41-slot ring wraps (and re-sums) eight times.
+    for n in range(1, len(session) + 1):
+        monitor.step()
+        assert indicators.bars == n
+        recent = slice(max(0, n - window), n)
+        assert indicators.sma == pytest.approx(closes[recent].mean(), rel=1e-12)
+        assert indicators.vwap == pytest.approx((closes[:n] * volumes[:n]).sum() / volumes[:n].sum(), rel=1e-12)
+        if n > window:
+            earlier = (volumes[:n].sum() - volumes[recent].sum()) / (n - window)
+            assert indicators.volume_ratio == pytest.approx(volumes[recent].mean() / earlier, rel=1e-9)
+            assert indicators.window_change_pct == pytest.approx((closes[n - 1] / closes[n - 1 - window] - 1) * 100, rel=1e-12)
+    assert monitor.source.exhausted
+
+
+def test_repeats_needs_cooldown_and_a_bigger_or_reversed_move():
+    rule = TriggerRule(move_pct=3.0, cooldown=timedelta(minutes=30))
+    fired_at = minute(DAY, 9, 30)
+    assert not rule.repeats(fired_at, 4.0, minute(DAY, 9, 59), 9.0)
+    assert not rule.repeats(fired_at, 4.0, minute(DAY, 10, 0), 6.5)
+    assert rule.repeats(fired_at, 4.0, minute(DAY, 10, 0), 7.0)
+    assert rule.repeats(fired_at, 4.0, minute(DAY, 10, 0), -0.5)
+    assert rule.repeats(fired_at, 4.0, minute(NEXT_DAY, 9, 0), 4.0)
+
+
+def test_replayed_reversal_fires_again_only_after_the_cooldown():
+    # +4% from 9:10, reversing to -4% at 9:20, which is inside the 30-minute cooldown.
+    bars = flat_bars([100.0] * 10 + [104.0] * 10 + [96.0] * 40)
+    rule = TriggerRule(move_pct=3.0, window_move_pct=100.0, min_bars=5, cooldown=timedelta(minutes=30))
+    monitor = IntradayMonitor(["7203.T"], ReplaySource({"7203.T": bars}), rule=rule, references={"7203.T": 100.0})
+    events = []
+    while not monitor.source.exhausted:
+        events.extend(monitor.step())
+    assert [(f"{event.time:%H:%M}", event.reason, round(event.change_pct, 6)) for event in events] == [
+        ("09:10", "move", 4.0),
+        ("09:40", "move", -4.0),
+    ]
+    assert events[0].reference_label == "previous close"
+
+
+def test_new_day_rolls_the_reference_to_the_previous_close():
+    first = synthetic_session(["7203.T"], day=DAY, seed=1)["7203.T"]
+    second = synthetic_session(["7203.T"], day=NEXT_DAY, seed=2, start_price=2_100.0)["7203.T"]
+    both = Bars(np.concatenate([first.times, second.times]), np.concatenate([first.values, second.values]))
+    monitor = IntradayMonitor(["7203.T"], ReplaySource({"7203.T": both}, step=len(first)), rule=QUIET)
+    indicators = monitor.indicators["7203.T"]
+
+    monitor.step()
+    assert indicators.reference is None
+    assert indicators.base == first.values[0, OPEN]
+    assert indicators.bars == len(first)
+
+    monitor.step()
+    assert indicators.reference == first.values[-1, CLOSE]
+    assert indicators.open == second.values[0, OPEN]
+    assert indicators.bars == len(second)
+    assert indicators.high == second.values[:, 1].max()
+    assert indicators.vwap == pytest.approx(
+        (second.values[:, CLOSE] * second.values[:, VOLUME]).sum() / second.values[:, VOLUME].sum(), rel=1e-12
+    )
@@ -0,0 +1,112 @@
+"""
+Sentence-level TTS: the offline tone backend, the clip cache and streamed narration.
+"""
+
+from __future__ import annotations
+
+import threading
+import wave
+from typing import Iterator, List
+
+import pytest
+
+from japan_stock_youtube_shorts.openai.prompt_generator import CompletionStream, StreamStats
+from japan_stock_youtube_shorts.pipelines.generate_script import generate_script_for_ticker
+from japan_stock_youtube_shorts.pipelines.narration import Narrator, SentenceAudioCache, ToneBackend
+
+SCRIPT = "トヨタの株価は上昇しました。\n出来高も増えています。\nチャンネル登録をお願いします！"
+
+
+class RecordingBackend(ToneBackend):
+    """Tone backend that records every sentence it synthesizes."""
+
+    def __init__(self) -> None:
+        super().__init__(sample_rate=8_000, seconds_per_char=0.01)
+        self.synthesized: List[str] = []
+        self.first = threading.Event()
+
+    def synthesize(self, text: str) -> bytes:
+        self.synthesized.append(text)
+        self.first.set()
+        return super().synthesize(text)
+
+
+def wav_seconds(path) -> float:
+    with wave.open(str(path), "rb") as wav:
+        return wav.getnframes() / wav.getframerate()
+
+
+def test_tone_backend_is_deterministic_and_paced_by_length():
+    backend = ToneBackend(sample_rate=8_000, seconds_per_char=0.05)
+    audio = backend.synthesize("株価 上昇")
+    assert len(audio) == 2 * 5 * int(8_000 * 0.05)
+    assert audio == ToneBackend(sample_rate=8_000, seconds_per_char=0.05).synthesize("株価 上昇")
+    assert backend.identity != ToneBackend(sample_rate=16_000, seconds_per_char=0.05).identity
+
+
+def test_sentence_cache_keys_on_voice_and_text(tmp_path):
+    cache = SentenceAudioCache(tmp_path)
+    key = SentenceAudioCache.key("tone:8000:0.01", "株価は上昇しました。")
+    assert cache.get(key) is None
+    cache.put(key, b"\x01\x02")
+    assert cache.get(key) == b"\x01\x02"
+    assert key != SentenceAudioCache.key("tone:16000:0.01", "株価は上昇しました。")
+    assert key != SentenceAudioCache.key("tone:8000:0.01", "株価は下落しました。")
+
+
+def test_editing_one_sentence_resynthesizes_only_that_sentence(tmp_path):
+    cache = SentenceAudioCache(tmp_path / "tts")
+    first = RecordingBackend()
+    output = Narrator(first, cache=cache).narrate(SCRIPT + "\nチャンネル登録をお願いします！", tmp_path / "a.wav")
+    # The repeated closing line is synthesized once.
+    assert sorted(first.synthesized) == sorted(SCRIPT.split("\n"))
+    assert wav_seconds(output) > 0
+    assert output.with_suffix(".srt").read_text(encoding="utf-8").count("-->") == 4
+
+    second = RecordingBackend()
+    Narrator(second, cache=cache).narrate(SCRIPT.replace("増えています", "減っています"), tmp_path / "b.wav")
+    assert second.synthesized == ["出来高も減っています。"]
+
+    bypass = RecordingBackend()
+    Narrator(bypass, cache=cache, mode="bypass").narrate(SCRIPT, tmp_path / "c.wav")
+    assert len(bypass.synthesized) == 3
+
+
+def test_markup_only_script_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="no text to narrate"):
+        Narrator(RecordingBackend(), cache=SentenceAudioCache(tmp_path)).narrate("# \n---\n", tmp_path / "empty.wav")
+
+
+def test_streamed_script_starts_tts_on_the_first_sentence(runtime, tmp_path):
+    backend = RecordingBackend()
+    seen_before_rest: List[bool] = []
+
+    class StreamingGenerator:
+        def stream_script(self, context, stock_summary, **kwargs) -> CompletionStream:
+            def deltas() -> Iterator[str]:
+                yield "トヨタの株価は"
+                yield "上昇しました。\n"
+                # The rest is held back until TTS has picked up the first sentence.
+                seen_before_rest.append(backend.first.wait(5))
+                yield "出来高も増えています。\nチャンネル登録をお願いします！"
+
+            return CompletionStream(deltas(), StreamStats("test"))
+
+    narrator = Narrator(backend, cache=SentenceAudioCache(tmp_path / "tts"))
+    with narrator.stream(tmp_path / "streamed.wav") as narration:
+        script = generate_script_for_ticker(
+            "7203.T",
+            "トヨタ自動車",
+            stock_summary="facts",
+            generator=StreamingGenerator(),
+            runtime_config=runtime,
+            output_path=tmp_path / "script.md",
+            stream=True,
+            on_sentence=narration.feed,
+        )
+        output = narration.finish()
+
+    assert seen_before_rest == [True]
+    assert backend.synthesized[0] == "トヨタの株価は上昇しました。"
+    assert script == SCRIPT
+    assert output.with_suffix(".srt").read_text(encoding="utf-8").count("-->") == 3
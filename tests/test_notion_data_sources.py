@@ -0,0 +1,46 @@
+"""
+Notion reads against the installed notion-client and the local fake server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from japan_stock_youtube_shorts.bench.fake_servers import FakeNotionHandler, serve
+from japan_stock_youtube_shorts.notion.async_client import AsyncNotionClient, AsyncRateLimiter
+from japan_stock_youtube_shorts.notion.data_sources import first_data_source, queries_data_sources
+from japan_stock_youtube_shorts.notion.notion_client import NotionClient, RateLimiter
+
+ROWS = 250
+
+
+def test_sync_mirror_reads_every_page(runtime):
+    with serve(FakeNotionHandler, rows=ROWS) as server:
+        client = NotionClient(token="test", runtime=runtime, limiter=RateLimiter(0), base_url=server.url)
+        assert client.next_version("DOE_script", database_id="db", max_age=0) == 1
+        assert client.sync_mirror("db", full=True) == ROWS
+        assert len(client.mirror.pages_in_status("db", "")) == ROWS
+    if queries_data_sources(client.client):
+        assert client._data_sources == {"db": "db-source"}
+
+
+def test_async_iter_database_streams_every_row(runtime):
+    async def read(url: str) -> tuple[int, bool]:
+        async with AsyncNotionClient(token="test", runtime=runtime, limiter=AsyncRateLimiter(0), base_url=url) as reader:
+            first = len([row async for row in reader.iter_database("db")])
+            second = len([row async for row in reader.iter_database("db", page_size=50)])
+            return first + second, queries_data_sources(reader.client)
+
+    with serve(FakeNotionHandler, rows=ROWS) as server:
+        rows, lookup = asyncio.run(read(server.url))
+        assert rows == 2 * ROWS
+        # One request per result page, plus one data source lookup shared by both reads on notion-client 3.x.
+        assert server.requests == -(-ROWS // 100) + -(-ROWS // 50) + int(lookup)
+
+
+def test_first_data_source_requires_one():
+    assert first_data_source({"id": "db", "data_sources": [{"id": "a"}, {"id": "b"}]}) == "a"
+    with pytest.raises(ValueError):
+        first_data_source({"id": "db", "data_sources": []})
@@ -0,0 +1,82 @@
+"""
+Per-page ordering and merging in the Notion write queue.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from japan_stock_youtube_shorts.notion.write_queue import NotionWriteQueue
+
+
+class BlockingClient:
+    """Records every update; the first call for a page waits until ``release`` is set."""
+
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.active: Dict[str, int] = {}
+        self.overlaps = 0
+        self._lock = threading.Lock()
+
+    def update_page_properties(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.calls.append((page_id, dict(properties)))
+            self.active[page_id] = self.active.get(page_id, 0) + 1
+            self.overlaps += self.active[page_id] > 1
+            first = len(self.calls) == 1
+        if first:
+            self.started.set()
+            assert self.release.wait(5)
+        with self._lock:
+            self.active[page_id] -= 1
+        return {"id": page_id, "properties": properties}
+
+    def log_exception(self, page_id: str, exc: BaseException) -> None:
+        pass
+
+
+def test_updates_during_a_write_follow_it_instead_of_racing():
+    client = BlockingClient()
+    with NotionWriteQueue(client, workers=3) as queue:
+        first = queue.enqueue("page", {"Status": "scripted"})
+        assert client.started.wait(5)
+        second = queue.enqueue("page", {"Status": "charted"})
+        third = queue.enqueue("page", {"Status": "uploaded", "URL": "https://youtu.be/x"})
+        other = queue.enqueue("other", {"Status": "scripted"})
+        client.release.set()
+        queue.flush()
+
+    assert client.overlaps == 0
+    page_calls = [properties for page_id, properties in client.calls if page_id == "page"]
+    assert page_calls == [{"Status": "scripted"}, {"Status": "uploaded", "URL": "https://youtu.be/x"}]
+    assert first.result()["properties"] == {"Status": "scripted"}
+    assert second.result() is third.result()
+    assert other.done()
+    assert (queue.requests, queue.merged) == (3, 1)
+
+
+def test_failed_write_still_releases_followers():
+    class FailingClient(BlockingClient):
+        def update_page_properties(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+            result = super().update_page_properties(page_id, properties)
+            if properties["Status"] == "scripted":
+                raise RuntimeError("boom")
+            return result
+
+    client = FailingClient()
+    with NotionWriteQueue(client) as queue:
+        first = queue.enqueue("page", {"Status": "scripted"})
+        assert client.started.wait(5)
+        second = queue.enqueue("page", {"Status": "charted"})
+        client.release.set()
+        queue.flush()
+
+    with pytest.raises(RuntimeError, match="boom"):
+        first.result()
+    assert second.result()["properties"] == {"Status": "charted"}
+    assert "page" in queue.failures
@@ -0,0 +1,79 @@
+"""
+Packed script requests and what they leave in the completion cache.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from japan_stock_youtube_shorts.openai.completion_cache import CompletionCache, completion_key
+from japan_stock_youtube_shorts.openai.packed_generator import (
+    PACKED_RESPONSE_FORMAT,
+    PACKED_SYSTEM_PROMPT,
+    PackedScriptGenerator,
+    build_packed_prompt,
+)
+from japan_stock_youtube_shorts.openai.prompt_generator import PromptContext, PromptGenerator
+
+ITEMS = [(PromptContext("7203.T", "トヨタ自動車"), "facts A"), (PromptContext("6758.T", "ソニーグループ"), "facts B")]
+FULL_REPLY = json.dumps({"scripts": [{"ticker": "7203.T", "script": "packed A"}, {"ticker": "6758.T", "script": "packed B"}]})
+
+
+class ScriptedGenerator(PromptGenerator):
+    """Answers requests from a list of canned replies instead of the API."""
+
+    def __init__(self, replies: List[str], **kwargs: Any) -> None:
+        super().__init__(api_key="test", **kwargs)
+        self.replies = replies
+        self.requests: List[Optional[Dict[str, Any]]] = []
+
+    def _request(self, system: str, messages: List[Dict[str, str]], *, response_format: Optional[Dict[str, Any]] = None) -> str:
+        self.requests.append(response_format)
+        return self.replies.pop(0)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CompletionCache(tmp_path / "completions.sqlite3")
+    yield cache
+    cache.close()
+
+
+def packed_key(model: str) -> str:
+    messages = [{"role": "user", "content": build_packed_prompt(ITEMS)}]
+    return completion_key(model, PACKED_SYSTEM_PROMPT, messages, PromptGenerator.temperature, PACKED_RESPONSE_FORMAT)
+
+
+def test_truncated_packed_reply_is_not_cached(runtime, cache):
+    generator = ScriptedGenerator(['{"scripts": [{"ticker": "7203.T", "script": "packed A"}', "single A", "single B"], runtime=runtime, cache=cache)
+    packed = PackedScriptGenerator(generator)
+
+    assert packed.generate_pack(ITEMS, cache_mode="use") == {"7203.T": "single A", "6758.T": "single B"}
+    assert cache.get(packed_key(generator.model)) is None
+
+    generator.replies = [FULL_REPLY]
+    assert packed.generate_pack(ITEMS, cache_mode="use") == {"7203.T": "packed A", "6758.T": "packed B"}
+    assert generator.requests == [PACKED_RESPONSE_FORMAT, None, None, PACKED_RESPONSE_FORMAT]
+
+    # The complete reply was stored, so the next run makes no request.
+    assert packed.generate_pack(ITEMS, cache_mode="use") == {"7203.T": "packed A", "6758.T": "packed B"}
+    assert len(generator.requests) == 4
+
+
+def test_partial_cached_reply_is_dropped_and_refetched(runtime, cache):
+    generator = ScriptedGenerator([FULL_REPLY], runtime=runtime, cache=cache)
+    key = packed_key(generator.model)
+    cache.put(key, generator.model, json.dumps({"scripts": [{"ticker": "7203.T", "script": "stale A"}]}))
+
+    assert PackedScriptGenerator(generator).generate_pack(ITEMS, cache_mode="use") == {"7203.T": "packed A", "6758.T": "packed B"}
+    assert cache.get(key) == FULL_REPLY
+
+
+def test_response_format_is_part_of_the_key():
+    messages = [{"role": "user", "content": "prompt"}]
+    plain = completion_key("gpt-4o-mini", "system", messages, 0.6)
+    assert plain == completion_key("gpt-4o-mini", "system", messages, 0.6, None)
+    assert plain != completion_key("gpt-4o-mini", "system", messages, 0.6, PACKED_RESPONSE_FORMAT)
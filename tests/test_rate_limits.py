@@ -0,0 +1,127 @@
+"""
+OpenAI pacing: the token bucket, retry classification and Retry-After parsing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import httpx
+import pytest
+
+from japan_stock_youtube_shorts.openai.async_generator import AsyncPromptGenerator, TokenBucket, parse_reset
+from japan_stock_youtube_shorts.openai.prompt_generator import PromptGenerator
+from japan_stock_youtube_shorts.utils import is_retryable, retry_after_seconds
+
+
+class APIError(Exception):
+    """Shaped like the OpenAI/Notion SDK errors: a status code and response headers."""
+
+    def __init__(self, status: Optional[int], headers: Optional[Dict[str, str]] = None) -> None:
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+        self.headers = headers
+
+
+def test_bucket_waits_for_the_refill():
+    # 6,000 requests/minute refill at 100/s, so an empty bucket frees one request in 10ms.
+    bucket = TokenBucket(requests_per_minute=6_000, tokens_per_minute=1_000_000)
+    bucket.requests.level = 0.0
+    started = time.monotonic()
+    asyncio.run(bucket.acquire(100))
+    assert time.monotonic() - started >= 0.009
+    assert bucket.requests.level == pytest.approx(0.0, abs=0.5)
+    assert bucket.tokens.level == pytest.approx(1_000_000 - 100, abs=1)
+
+
+def test_bucket_delays_and_caps_large_requests():
+    bucket = TokenBucket(requests_per_minute=60, tokens_per_minute=6_000)
+    now = bucket.tokens.updated
+    bucket.tokens.level = 1_000.0
+    assert bucket.tokens.delay_for(500, now) == 0.0
+    assert bucket.tokens.delay_for(1_600, now) == pytest.approx(6.0)
+    # A request larger than the whole quota waits for a full bucket rather than forever.
+    assert bucket.tokens.delay_for(50_000, now) == pytest.approx(50.0)
+
+
+def test_bucket_follows_rate_limit_headers():
+    bucket = TokenBucket(requests_per_minute=500, tokens_per_minute=200_000)
+    bucket.update_from_headers(
+        {
+            "x-ratelimit-limit-requests": "100",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "2s",
+            "x-ratelimit-limit-tokens": "40000",
+            "x-ratelimit-remaining-tokens": "12000",
+            "x-ratelimit-reset-tokens": "6m0s",
+        }
+    )
+    now = time.monotonic()
+    assert bucket.requests.capacity == 100
+    assert bucket.tokens.capacity == 40_000
+    assert bucket.tokens.level == pytest.approx(12_000, abs=1)
+    assert 1.9 < bucket.requests.delay_for(1, now) <= 2.0
+    # Tokens remain, so only the request bucket is blocked until its reset.
+    assert bucket.tokens.blocked_until == 0.0
+
+    bucket.reconcile(estimated=1_000, actual=1_500)
+    assert bucket.tokens.level == pytest.approx(11_500, abs=1)
+
+
+def test_parse_reset():
+    assert parse_reset("1s") == 1.0
+    assert parse_reset("6m0s") == 360.0
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("1h2m3.5s") == pytest.approx(3723.5)
+    assert parse_reset("soon") is None
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (APIError(429), True),
+        (APIError(408), True),
+        (APIError(409), True),
+        (APIError(500), True),
+        (APIError(503), True),
+        (APIError(400), False),
+        (APIError(401), False),
+        (APIError(404), False),
+        (ConnectionResetError(), True),
+        (TimeoutError(), True),
+        (httpx.ConnectTimeout("timed out"), True),
+        (ValueError("bad prompt"), False),
+    ],
+)
+def test_is_retryable(exc, expected):
+    assert is_retryable(exc) is expected
+
+
+def test_retry_after_forms():
+    assert retry_after_seconds(APIError(429, {"retry-after-ms": "1500", "retry-after": "9"})) == 1.5
+    assert retry_after_seconds(APIError(429, {"retry-after": "7"})) == 7.0
+    assert retry_after_seconds(APIError(429, {"retry-after": "-3"})) == 0.0
+    when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 28.0 <= retry_after_seconds(APIError(503, {"retry-after": when})) <= 30.0
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(minutes=5), usegmt=True)
+    assert retry_after_seconds(APIError(503, {"retry-after": past})) == 0.0
+    assert retry_after_seconds(APIError(503, {"retry-after": "later"})) is None
+    assert retry_after_seconds(APIError(503, {"retry-after-ms": "x", "retry-after": "2"})) == 2.0
+    assert retry_after_seconds(APIError(500)) is None
+
+
+def test_retry_after_reads_the_response_headers():
+    exc = Exception("throttled")
+    exc.response = SimpleNamespace(headers={"retry-after": "4"})  # type: ignore[attr-defined]
+    assert retry_after_seconds(exc) == 4.0
+
+
+def test_async_default_temperature_matches_the_sync_generator():
+    default = inspect.signature(AsyncPromptGenerator.complete).parameters["temperature"].default
+    assert default == PromptGenerator.temperature
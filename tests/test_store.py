@@ -0,0 +1,122 @@
+"""
+Delta sync of the on-disk OHLCV store against a fixture backend at fixed times.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from japan_stock_youtube_shorts.market.calendar import DEFAULT_CALENDAR, JST
+from japan_stock_youtube_shorts.market.history import FixtureBackend
+from japan_stock_youtube_shorts.market.store import OHLCVStore
+
+TICKERS = ["7203.T", "6758.T"]
+FRIDAY_MORNING = datetime(2026, 10, 16, 10, 0, tzinfo=JST)  # Thursday's bar is the latest final one
+FRIDAY_EVENING = datetime(2026, 10, 16, 18, 0, tzinfo=JST)
+NEXT_TUESDAY = datetime(2026, 10, 20, 18, 0, tzinfo=JST)
+
+
+def daily_frame(start: date, end: date, *, seed: int) -> pd.DataFrame:
+    days = list(DEFAULT_CALENDAR.trading_days(start, end))
+    close = 1_000.0 + seed * 100 + np.arange(len(days), dtype="f8")
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.full(len(days), 10_000.0)},
+        index=pd.DatetimeIndex(days, name="Date"),
+    )
+
+
+class SessionBackend(FixtureBackend):
+    """Daily bars through the last trading day up to ``now`` (a partial bar on a session day); records calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.now = FRIDAY_MORNING
+        self.dropped: Set[str] = set()
+        self.calls: List[Tuple[str, Tuple[str, ...], str]] = []
+
+    def _frame(self, ticker: str) -> pd.DataFrame:
+        return daily_frame(date(2026, 1, 5), self.now.date(), seed=TICKERS.index(ticker))
+
+    def fetch(self, tickers: Sequence[str], *, period: str, interval: str) -> Dict[str, pd.DataFrame]:
+        self.calls.append(("fetch", tuple(tickers), period))
+        return {ticker: self._frame(ticker) for ticker in tickers}
+
+    def fetch_range(self, tickers: Sequence[str], *, start: date, end: date, interval: str) -> Dict[str, pd.DataFrame]:
+        self.calls.append(("range", tuple(tickers), f"{start}..{end}"))
+        window = slice(pd.Timestamp(start), pd.Timestamp(end))
+        return {ticker: self._frame(ticker).loc[window] for ticker in tickers if ticker not in self.dropped}
+
+
+@pytest.fixture
+def store(tmp_path) -> OHLCVStore:
+    return OHLCVStore(tmp_path / "ohlcv")
+
+
+@pytest.fixture
+def backend() -> SessionBackend:
+    return SessionBackend()
+
+
+def last_date(store: OHLCVStore, ticker: str) -> date:
+    return store.read_records(ticker)["date"][-1].astype("O")
+
+
+def checked_through(store: OHLCVStore, ticker: str) -> str:
+    return json.loads((store.root / f"{ticker}.json").read_text(encoding="utf-8"))["checked_through"]
+
+
+def test_backfill_drops_the_unsettled_session_and_is_not_repeated(store, backend):
+    store.sync(TICKERS, period="1mo", backend=backend, now=FRIDAY_MORNING)
+    assert backend.calls == [("fetch", tuple(TICKERS), "1mo")]
+    # Friday's partial bar is not stored before the session has settled.
+    assert last_date(store, "7203.T") == date(2026, 10, 15)
+    assert checked_through(store, "7203.T") == "2026-10-15"
+
+    store.sync(TICKERS, period="1mo", backend=backend, now=FRIDAY_MORNING)
+    store.sync(TICKERS, period="5d", backend=backend, now=FRIDAY_MORNING)
+    assert len(backend.calls) == 1
+
+
+def test_delta_sync_requests_only_new_sessions(store, backend):
+    store.sync(TICKERS, period="1mo", backend=backend, now=FRIDAY_MORNING)
+    before = len(store.read_records("7203.T"))
+
+    backend.now = NEXT_TUESDAY
+    store.sync(TICKERS, period="1mo", backend=backend, now=NEXT_TUESDAY)
+    assert backend.calls[-1] == ("range", tuple(TICKERS), "2026-10-16..2026-10-20")
+    records = store.read_records("7203.T")
+    assert len(records) == before + 3
+    assert list(records["date"][-3:].astype("O")) == [date(2026, 10, 16), date(2026, 10, 19), date(2026, 10, 20)]
+    assert np.all(np.diff(records["date"].astype("i8")) > 0)
+    assert store.read_records("6758.T")["Close"][-1] == backend._frame("6758.T")["Close"].iloc[-1]
+
+
+def test_tickers_without_returned_bars_stay_due(store, backend):
+    store.sync(TICKERS, period="1mo", backend=backend, now=FRIDAY_MORNING)
+    backend.now = FRIDAY_EVENING
+    backend.dropped = {"6758.T"}
+    store.sync(TICKERS, period="1mo", backend=backend, now=FRIDAY_EVENING)
+    assert checked_through(store, "7203.T") == "2026-10-16"
+    assert checked_through(store, "6758.T") == "2026-10-15"
+    assert last_date(store, "6758.T") == date(2026, 10, 15)
+
+    backend.dropped = set()
+    store.sync(TICKERS, period="1mo", backend=backend, now=FRIDAY_EVENING)
+    assert backend.calls[-1] == ("range", ("6758.T",), "2026-10-16..2026-10-16")
+    assert last_date(store, "6758.T") == date(2026, 10, 16)
+
+
+def test_wider_period_backfills_again_and_reads_the_window(store, backend):
+    store.sync(["7203.T"], period="5d", backend=backend, now=FRIDAY_EVENING)
+    store.sync(["7203.T"], period="3mo", backend=backend, now=FRIDAY_EVENING)
+    assert [call[0] for call in backend.calls] == ["fetch", "fetch"]
+
+    window = store.load(["7203.T"], period="5d", backend=backend, now=FRIDAY_EVENING)["7203.T"]
+    assert len(backend.calls) == 2
+    assert list(window.index.date) == [date(2026, 10, 9), *(date(2026, 10, day) for day in (13, 14, 15, 16))]
@@ -0,0 +1,20 @@
+"""
+Job worker start-up.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import List
+
+from japan_stock_youtube_shorts.pipelines import worker as worker_module
+from japan_stock_youtube_shorts.pipelines.job_queue import JobQueue
+from japan_stock_youtube_shorts.pipelines.worker import JobWorker
+
+
+def test_every_pool_thread_warms_its_figure_templates(dry_runtime, tmp_path, monkeypatch):
+    warmed: List[str] = []
+    monkeypatch.setattr(worker_module, "_warm_thread", lambda styles: warmed.append(threading.current_thread().name))
+    job_worker = JobWorker(runtime=dry_runtime, queue=JobQueue(tmp_path / "jobs.sqlite3"), concurrency=4, poll_interval=0.01)
+    assert job_worker.serve(drain=True) == 0
+    assert len(set(warmed)) == 4